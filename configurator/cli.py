@@ -36,6 +36,8 @@ SecretsManager = LazyLoader("configurator.core.secrets", "SecretsManager")
 AuditEventType = LazyLoader("configurator.core.audit", "AuditEventType")
 AuditLogger = LazyLoader("configurator.core.audit", "AuditLogger")
 FileIntegrityMonitor = LazyLoader("configurator.core.file_integrity", "FileIntegrityMonitor")
+ArtifactMirror = LazyLoader("configurator.core.mirror", "ArtifactMirror")
+MirrorBuilder = LazyLoader("configurator.core.mirror", "MirrorBuilder")
 RBACManager = LazyLoader("configurator.rbac.rbac_manager", "RBACManager")
 UserLifecycleManager = LazyLoader("configurator.users.lifecycle_manager", "UserLifecycleManager")
 UserStatus = LazyLoader("configurator.users.lifecycle_manager", "UserStatus")
@@ -168,6 +170,15 @@ def main(ctx: click.Context, verbose: bool, quiet: bool):
     default="compact",
     help="UI output mode (compact=default, verbose=detailed, minimal=text, json=structured)",
 )
+@click.option(
+    "--mirror",
+    help="Offline mirror (directory or http(s) URL) built with 'mirror build'",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Re-run modules even if their desired state is already applied",
+)
 @click.pass_context
 def install(
     ctx: click.Context,
@@ -187,10 +198,15 @@ def install(
     ssh_key: Optional[str],
     sudo_timeout: Optional[int],
     ui_mode: str,
+    mirror: Optional[str],
+    force: bool,
 ):
     """
     Install and configure the workstation.
 
+    Re-runs skip modules whose desired state is already applied; use
+    --force to run them anyway.
+
     Examples:
 
       # Interactive wizard (recommended for beginners)
@@ -201,6 +217,9 @@ def install(
 
       # Install specific modules
       vps-configurator install --profile beginner --modules "system,security" -y
+
+      # Install from an offline mirror
+      vps-configurator install --profile beginner --mirror /srv/vps-mirror -y
     """
     # Update logger if verbose flag passed to subcommand
     if verbose:
@@ -295,7 +314,13 @@ def install(
         sys.exit(1)
 
     # Create installer and run
-    reporter = ProgressReporter(console)
+    if mode_enum == UIMode.JSON:
+        from configurator.core.reporter import get_reporter
+
+        # Structured events only, on stdout (JSON logs go to stderr)
+        reporter = get_reporter("headless")
+    else:
+        reporter = ProgressReporter(console)
     installer = Installer(
         config=config_manager,
         logger=logger,
@@ -330,11 +355,26 @@ def install(
     if dry_run:
         console.print("[yellow]DRY RUN MODE - No changes will be made[/yellow]\n")
 
+    if mirror:
+        from configurator.core.mirror import set_active_mirror
+
+        try:
+            artifact_mirror = ArtifactMirror(mirror, logger=logger)
+            console.print(
+                f"[cyan]Using offline mirror {mirror} "
+                f"({len(artifact_mirror.entries)} artifacts)[/cyan]\n"
+            )
+        except Exception as e:
+            logger.error(f"Cannot open mirror {mirror}: {e}")
+            sys.exit(1)
+        set_active_mirror(artifact_mirror)
+
     # Run installation
     success = installer.install(
         skip_validation=skip_validation,
         dry_run=dry_run,
         parallel=not no_parallel,
+        force=force,
     )
 
     sys.exit(0 if success else 1)
@@ -530,7 +570,16 @@ def visualize(profile: Optional[str], format: str, output: Optional[str]):
         sys.exit(1)
 
     if format == "ascii":
-        viz = DependencyGraphVisualizer(modules)
+        durations = None
+        try:
+            from configurator.core.state.durations import DurationModel
+            from configurator.core.state.manager import StateManager
+
+            durations = DurationModel.from_state(StateManager()) or None
+        except Exception:
+            pass  # No history yet: fall back to rough estimates
+
+        viz = DependencyGraphVisualizer(modules, durations=durations)
         console.print(f"\n[bold]Dependency Graph for '{profile_name}' Profile[/bold]\n")
         console.print(viz.render_tree())
 
@@ -857,6 +906,25 @@ def fim_check():
         sys.exit(1)
 
 
+@fim.command("watch")
+def fim_watch():
+    """Watch monitored files and report changes as they happen."""
+    # FileIntegrityMonitor already lazy imported
+
+    def report(violation):
+        console.print(f"[red]⚠ {violation['path']}[/red]: {violation['details']}")
+
+    try:
+        fim = FileIntegrityMonitor()
+        console.print("[green]FIM watch started[/green] [dim](Ctrl+C to stop)[/dim]")
+        fim.watch(on_violation=report)
+    except KeyboardInterrupt:
+        console.print("\nStopping FIM watch...")
+    except Exception as e:
+        console.print(f"[red]Error in FIM watch: {e}[/red]")
+        sys.exit(1)
+
+
 @fim.command("update")
 @click.argument("file_path")
 def fim_update(file_path: str):
@@ -1076,6 +1144,163 @@ def cache_clear(days: Optional[int]):
         sys.exit(1)
 
 
+@main.group()
+def history():
+    """Installation history."""
+
+
+@history.command("stats")
+@click.option("--days", type=int, help="Only runs from the last N days")
+@click.option("--this-host", is_flag=True, help="Only runs on hosts of this host's class")
+def history_stats(days: Optional[int], this_host: bool):
+    """Show module run times and installation outcomes."""
+    import time
+
+    from rich.table import Table
+
+    from configurator.core.state.durations import DurationModel, format_duration, host_class
+    from configurator.core.state.manager import StateManager
+
+    try:
+        manager = StateManager()
+        host = host_class()
+        since = time.time() - days * 86400 if days else None
+        modules = manager.get_duration_stats(since=since, host_class=host if this_host else None)
+        installations = manager.get_installation_stats()
+        model = DurationModel.from_state(manager, host=host)
+    except Exception as e:
+        console.print(f"[red]Error reading installation history: {e}[/red]")
+        sys.exit(1)
+
+    console.print("\n[bold]Installation History[/bold]\n")
+    by_status = installations["by_status"]
+    if by_status:
+        console.print(
+            "Installations: "
+            + ", ".join(f"{count} {status}" for status, count in sorted(by_status.items()))
+        )
+        if installations["avg_seconds"] is not None:
+            console.print(f"Average run: {format_duration(installations['avg_seconds'])}")
+    console.print(f"Host class: [cyan]{host}[/cyan]\n")
+
+    if not modules:
+        console.print("[yellow]No module runs recorded yet.[/yellow]")
+        return
+
+    def seconds(value: Optional[float]) -> str:
+        return format_duration(value) if value is not None else "-"
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Module", style="cyan")
+    table.add_column("Runs", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Avg", justify="right")
+    table.add_column("Min", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("Expected (p50 / p90)", justify="right")
+    table.add_column("Last Run")
+
+    for row in modules:
+        estimate = model.estimate(row["module_name"])
+        expected = f"{seconds(estimate.median)} / {seconds(estimate.p90)}" if estimate else "-"
+        table.add_row(
+            row["module_name"],
+            str(row["runs"]),
+            str(row["failures"]),
+            seconds(row["avg_seconds"]),
+            seconds(row["min_seconds"]),
+            seconds(row["max_seconds"]),
+            expected,
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(row["last_run"])),
+        )
+
+    console.print(table)
+    console.print()
+
+
+@main.group()
+def mirror():
+    """Build and verify offline artifact mirrors."""
+
+
+@mirror.command("build")
+@click.option(
+    "--profile",
+    "-p",
+    type=click.Choice(["beginner", "intermediate", "advanced"]),
+    default=None,
+    help="Profile whose artifacts to mirror",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, path_type=Path),
+    default=None,
+    help="Path to custom configuration file",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Mirror directory to create or update",
+)
+@click.pass_context
+def mirror_build(ctx: click.Context, profile: Optional[str], config: Optional[Path], output: Path):
+    """
+    Fetch every artifact a profile needs into a mirror bundle.
+
+    Downloads are verified against security/checksums.yaml. Re-running
+    against an existing bundle only fetches what changed.
+    """
+    from configurator.core.mirror import resolve_profile_artifacts
+    from configurator.security.supply_chain import SupplyChainValidator
+
+    logger = ctx.obj["logger"]
+
+    try:
+        config_manager = ConfigManager(config_file=config, profile=profile)
+        artifacts = resolve_profile_artifacts(config_manager, logger)
+        checksums = SupplyChainValidator(config_manager.config, logger).checksums
+
+        console.print(f"\n[bold]Building mirror:[/bold] {output} ({len(artifacts)} artifacts)\n")
+        builder = MirrorBuilder(output, checksums=checksums, logger=logger)
+        report = builder.build(artifacts, profile=profile)
+    except Exception as e:
+        console.print(f"[red]Error building mirror: {e}[/red]")
+        sys.exit(1)
+
+    console.print(f"Stored: [green]{len(report.stored)}[/green]")
+    console.print(f"Unchanged: {len(report.reused)}")
+    console.print(f"Size: {report.total_bytes / 1024 / 1024:.1f} MB")
+
+    if report.failed:
+        console.print(f"\n[red]Failed: {len(report.failed)}[/red]")
+        for key, reason in report.failed.items():
+            console.print(f"  [red]✗[/red] {key}: {reason}")
+        sys.exit(1)
+
+    console.print("\n[green]✓ Mirror is complete[/green]")
+
+
+@mirror.command("verify")
+@click.argument("location", type=click.Path(exists=True, file_okay=False, path_type=Path))
+def mirror_verify(location: Path):
+    """Re-hash every object in a mirror bundle."""
+    try:
+        problems = ArtifactMirror(str(location)).verify()
+    except Exception as e:
+        console.print(f"[red]Error verifying mirror: {e}[/red]")
+        sys.exit(1)
+
+    if problems:
+        for problem in problems:
+            console.print(f"[red]✗[/red] {problem}")
+        sys.exit(1)
+
+    console.print("[green]✓ All mirror objects match the index[/green]")
+
+
 @main.group()
 def status():
     """Check system status."""
@@ -1210,12 +1435,22 @@ def vuln():
 @click.option(
     "--auto-remediate", is_flag=True, help="Automatically upgrade vulnerable system packages"
 )
-def vuln_scan(target, format, auto_remediate):
+@click.option(
+    "--details",
+    type=click.Choice(["all", "medium", "high", "critical"]),
+    default="all",
+    help="Lowest severity reported in full (others are only counted; saves memory)",
+)
+def vuln_scan(target, format, auto_remediate, details):
     """Scan for vulnerabilities."""
     from configurator.security.vuln_report import VulnReportGenerator
-    from configurator.security.vulnerability_scanner import VulnerabilityManager
+    from configurator.security.vulnerability_scanner import (
+        VulnerabilityManager,
+        VulnerabilitySeverity,
+    )
 
-    manager = VulnerabilityManager()
+    detail_threshold = None if details == "all" else VulnerabilitySeverity(details)
+    manager = VulnerabilityManager(detail_threshold=detail_threshold)
     results = []
 
     console.print(f"[bold blue]Starting Vulnerability Scan (Target: {target})...[/bold blue]")
@@ -1267,13 +1502,18 @@ def vuln_scan(target, format, auto_remediate):
 @vuln.command(name="monitor")
 @click.option("--interval", type=int, default=24, help="Scan interval in hours")
 @click.option("--auto-remediate", is_flag=True, help="Enable auto-remediation for scheduled scans")
-def vuln_monitor(interval, auto_remediate):
+@click.option(
+    "--full", is_flag=True, help="Scan the whole system every time, not just changed packages"
+)
+def vuln_monitor(interval, auto_remediate, full):
     """Start continuous vulnerability monitoring."""
     import time
 
     from configurator.security.vuln_monitor import VulnerabilityMonitor
 
-    monitor = VulnerabilityMonitor(interval_hours=interval, auto_remediate=auto_remediate)
+    monitor = VulnerabilityMonitor(
+        interval_hours=interval, auto_remediate=auto_remediate, incremental=not full
+    )
     monitor.start()
 
     console.print(f"[green]Vulnerability Monitor started. Scanning every {interval} hours.[/green]")
@@ -2049,6 +2289,35 @@ def ssh_status(as_json):
             )
 
 
+@ssh.command(name="watch")
+@click.option("--auto-rotate", is_flag=True, help="Rotate keys when their rotation is due")
+def ssh_watch(auto_rotate):
+    """Enforce key rotation, expiry and grace-period revocation (runs until interrupted)."""
+    from configurator.security.ssh_manager import SSHKeyManager
+
+    try:
+        manager = SSHKeyManager(auto_rotate=auto_rotate)
+        manager.add_notify_callback(
+            lambda event, key: console.print(
+                f"[yellow]{event.replace('_', ' ').capitalize()}: {key.user}/{key.key_id}[/yellow]"
+            )
+        )
+
+        next_due = manager.scheduler.next_due()
+        console.print("[green]SSH key watcher started[/green]")
+        if next_due:
+            console.print(f"[dim]Next deadline: {next_due.strftime('%Y-%m-%d %H:%M:%S')}[/dim]")
+        console.print("[dim]Press Ctrl+C to stop.[/dim]")
+
+        manager.scheduler.run()
+
+    except KeyboardInterrupt:
+        console.print("\nStopping watcher...")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        sys.exit(1)
+
+
 @ssh.command(name="harden")
 @click.option(
     "--disable-password", is_flag=True, default=True, help="Disable password authentication"
@@ -3801,5 +4070,31 @@ def temp_access_check_expired(ctx: click.Context):
         sys.exit(1)
 
 
+@temp_access.command("watch")
+@click.pass_context
+def temp_access_watch(ctx: click.Context):
+    """Enforce expirations as they fall due (runs until interrupted)."""
+    logger = ctx.obj.get("logger")
+
+    try:
+        temp_mgr = TempAccessManager(logger=logger)
+
+        next_due = temp_mgr.scheduler.next_due()
+        console.print("[green]Temporary access watcher started[/green]")
+        if next_due:
+            console.print(f"[dim]Next deadline: {next_due.strftime('%Y-%m-%d %H:%M:%S')}[/dim]")
+        console.print("[dim]Press Ctrl+C to stop.[/dim]")
+
+        temp_mgr.scheduler.run()
+
+    except KeyboardInterrupt:
+        console.print("\nStopping watcher...")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        if logger:
+            logger.exception("Temporary access watcher failed")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
@@ -8,22 +8,21 @@ Handles:
 - Default values
 """
 
+import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional, cast
 
 import yaml
 
-try:
-    from pydantic import ValidationError
-except ImportError:
-    ValidationError = None
-
+from configurator.config_snapshot import SnapshotCache, build_index, load_yaml_file
 from configurator.exceptions import ConfigurationError
 
 # Default paths
 CONFIG_DIR = Path(__file__).parent.parent / "config"
 PROFILES_DIR = CONFIG_DIR / "profiles"
 
+_MISSING = object()
+
 
 class ConfigManager:
     """
@@ -35,9 +34,15 @@ class ConfigManager:
     3. User configuration (--config flag)
     4. Command-line overrides
 
-    Later sources override earlier ones.
+    Later sources override earlier ones. The merged result of 1-3 is cached
+    on disk (see configurator.config_snapshot) and lookups go through a
+    flattened dotted-key index; use ``set`` rather than mutating ``config``
+    in place so the index stays current.
     """
 
+    # Sections a module's configuration may live under, in lookup order
+    MODULE_SECTIONS = ("tools", "tools.editors", "languages", "networking", "monitoring")
+
     # Default configuration values
     DEFAULTS: Dict[str, Any] = {
         "system": {
@@ -196,6 +201,7 @@ class ConfigManager:
         self,
         config_file: Optional[Path] = None,
         profile: Optional[str] = None,
+        snapshot_cache: Optional[SnapshotCache] = None,
     ):
         """
         Initialize configuration manager.
@@ -203,6 +209,8 @@ class ConfigManager:
         Args:
             config_file: Optional custom config file path (string or Path)
             profile: Profile name (beginner, intermediate, advanced)
+            snapshot_cache: Cache for merged configurations (default: per-user
+                cache dir, unless disabled with VPS_CONFIG_CACHE=0)
         """
         # Convert config_file to Path if it's a string
         self.config_file: Optional[Path] = None
@@ -214,11 +222,65 @@ class ConfigManager:
 
         self.profile = profile
         self._config: Dict[str, Any] = {}
+        self._index: Optional[Dict[str, Any]] = None
+        self._module_views: Dict[str, Dict[str, Any]] = {}
+
+        if snapshot_cache is None and SnapshotCache.enabled():
+            snapshot_cache = SnapshotCache()
+        self.snapshot_cache = snapshot_cache
 
         self._load_config()
 
     def _load_config(self) -> None:
         """Load configuration from all sources."""
+        if self.profile and self.profile not in self.PROFILES:
+            raise ConfigurationError(
+                what=f"Unknown profile: {self.profile}",
+                why=f"Valid profiles are: {', '.join(self.PROFILES.keys())}",
+                how="Use one of the valid profile names",
+            )
+
+        if self.config_file and not self.config_file.exists():
+            raise ConfigurationError(
+                what=f"Configuration file not found: {self.config_file}",
+                why="The specified configuration file does not exist",
+                how=f"Check the path and try again: {self.config_file}",
+            )
+
+        self._invalidate()
+
+        # Reuse the merged result if no source changed since it was cached
+        key = None
+        if self.snapshot_cache is not None:
+            key = self.snapshot_cache.key(self._source_files(), self._fingerprint())
+            cached = self.snapshot_cache.load(key) if key else None
+            if cached is not None:
+                self._config = cached
+                return
+
+        self._config = self._merge_sources()
+
+        if key and self.snapshot_cache is not None:
+            self.snapshot_cache.store(key, self._config)
+
+    def _source_files(self) -> List[Path]:
+        """Files merged into the configuration, in merge order."""
+        sources = [CONFIG_DIR / "default.yaml"]
+        if self.profile:
+            sources.append(PROFILES_DIR / f"{self.profile}.yaml")
+        if self.config_file:
+            sources.append(self.config_file.resolve())
+        return sources
+
+    def _fingerprint(self) -> str:
+        """Inputs besides the source files: built-in defaults and the profile."""
+        profile_config = self.PROFILES[self.profile]["config"] if self.profile else None
+        return json.dumps(
+            [self.profile, self.DEFAULTS, profile_config], sort_keys=True, default=repr
+        )
+
+    def _merge_sources(self) -> Dict[str, Any]:
+        """Merge defaults, default.yaml, the profile and the user file."""
         # Start with defaults
         self._config = self._deep_copy(self.DEFAULTS)
 
@@ -229,13 +291,6 @@ class ConfigManager:
 
         # Load profile if specified
         if self.profile:
-            if self.profile not in self.PROFILES:
-                raise ConfigurationError(
-                    what=f"Unknown profile: {self.profile}",
-                    why=f"Valid profiles are: {', '.join(self.PROFILES.keys())}",
-                    how="Use one of the valid profile names",
-                )
-
             # Load profile defaults
             self._merge_config(self.PROFILES[self.profile]["config"])
 
@@ -246,20 +301,15 @@ class ConfigManager:
 
         # Load custom config file if specified
         if self.config_file:
-            if not self.config_file.exists():
-                raise ConfigurationError(
-                    what=f"Configuration file not found: {self.config_file}",
-                    why="The specified configuration file does not exist",
-                    how=f"Check the path and try again: {self.config_file}",
-                )
             self._merge_config(self._load_yaml(self.config_file))
 
+        return self._config
+
     def _load_yaml(self, path: Path) -> Dict[str, Any]:
         """Load a YAML file."""
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-                return cast(Dict[str, Any], data) if data else {}
+            data = load_yaml_file(path)
+            return cast(Dict[str, Any], data) if data else {}
         except yaml.YAMLError as e:
             raise ConfigurationError(
                 what=f"Invalid YAML in {path}",
@@ -303,16 +353,12 @@ class ConfigManager:
         Returns:
             Configuration value
         """
-        keys = key.split(".")
-        value = self._config
-
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
+        index = self._index
+        if index is None:
+            index = self._index = build_index(self._config)
 
-        return value
+        value = index.get(key, _MISSING)
+        return default if value is _MISSING else value
 
     def set(self, key: str, value: Any) -> None:
         """
@@ -331,6 +377,48 @@ class ConfigManager:
             config = config[k]
 
         config[keys[-1]] = value
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Drop the dotted-key index and module views after a change."""
+        self._index = None
+        self._module_views = {}
+
+    def _module_paths(self, module_name: str) -> List[str]:
+        return [f"{section}.{module_name}" for section in self.MODULE_SECTIONS] + [module_name]
+
+    def get_module_config(self, module_name: str) -> Dict[str, Any]:
+        """
+        Get the configuration section for a module.
+
+        The first of tools.<name>, tools.editors.<name>, languages.<name>,
+        networking.<name>, monitoring.<name> and <name> that exists is used;
+        the security module also receives ``security_advanced``. Views are
+        computed once and reused until the configuration changes.
+
+        Args:
+            module_name: Name of the module
+
+        Returns:
+            Module configuration (empty if none)
+        """
+        view = self._module_views.get(module_name)
+        if view is not None:
+            return view
+
+        view = {}
+        for path in self._module_paths(module_name):
+            value = self.get(path)
+            if value is not None:
+                view = value if isinstance(value, dict) else {"enabled": value}
+                if module_name == "security":
+                    advanced_security = self.get("security_advanced", {})
+                    if isinstance(advanced_security, dict) and advanced_security:
+                        view = {**view, "security_advanced": advanced_security}
+                break
+
+        self._module_views[module_name] = view
+        return view
 
     @property
     def config(self) -> Dict[str, Any]:
@@ -348,17 +436,8 @@ class ConfigManager:
             True if module is enabled
         """
         # Check common paths for module configuration
-        paths = [
-            f"tools.{module_name}.enabled",
-            f"tools.editors.{module_name}.enabled",
-            f"languages.{module_name}.enabled",
-            f"networking.{module_name}.enabled",
-            f"monitoring.{module_name}.enabled",
-            f"{module_name}.enabled",
-        ]
-
-        for path in paths:
-            value = self.get(path)
+        for path in self._module_paths(module_name):
+            value = self.get(f"{path}.enabled")
             if value is not None:
                 return bool(value)
 
@@ -423,11 +502,16 @@ class ConfigManager:
             ConfigurationError if configuration is invalid
         """
         try:
-            if ValidationError is None:
-                raise ImportError("Pydantic not installed")
+            # Imported on demand: pydantic alone outweighs the rest of CLI startup
+            from pydantic import ValidationError
 
             from configurator.config_schema import Config
+        except ImportError:
+            # Fallback if pydantic not found (should be installed)
+            self.validate_legacy()
+            return True
 
+        try:
             # Use Config model to validate
             # This handles type checking, constraints, and custom logic
             Config(**self._config)
@@ -471,10 +555,6 @@ class ConfigManager:
                 why=why,
                 how=how,
             )
-        except ImportError:
-            # Fallback if pydantic not found (should be installed)
-            self.validate_legacy()
-            return True
 
     def validate_legacy(self) -> bool:
         """Legacy validation logic."""
@@ -0,0 +1,215 @@
+"""
+Compiled configuration snapshots.
+
+Parsing default.yaml and the profile files with the pure-Python YAML loader
+dominates CLI cold start. This module provides:
+
+- YAML loading through libyaml's CSafeLoader when PyYAML was built with it
+- An on-disk cache of the merged configuration, keyed by the stat signature
+  of every source file, so unchanged sources are never reparsed
+- A flattened dotted-key index for O(1) ``ConfigManager.get`` lookups
+"""
+
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml_file(path: Path) -> Any:
+    """Parse a YAML file with the fastest available safe loader."""
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
+def build_index(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a nested config into {"a.b.c": value} for every reachable key.
+
+    Intermediate dicts are indexed too. Keys that ``get`` could never reach
+    by splitting on dots (non-strings, or strings containing a dot) are
+    skipped, so lookups behave exactly like walking the tree.
+    """
+    index: Dict[str, Any] = {}
+    stack = [("", data)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            if not isinstance(key, str) or "." in key:
+                continue
+            dotted = prefix + key
+            index[dotted] = value
+            if isinstance(value, dict):
+                stack.append((dotted + ".", value))
+    return index
+
+
+def _is_json_native(obj: Any) -> bool:
+    """Check that obj survives a JSON round trip unchanged."""
+    if isinstance(obj, dict):
+        return all(isinstance(k, str) and _is_json_native(v) for k, v in obj.items())
+    if isinstance(obj, list):
+        return all(_is_json_native(item) for item in obj)
+    return obj is None or isinstance(obj, (str, int, float, bool))
+
+
+class SnapshotCache:
+    """
+    Stores merged configurations on disk, keyed by their sources.
+
+    A snapshot is only reused when every source file has the same path,
+    size, inode, mtime and ctime as when it was written. Sources modified
+    within the last two seconds bypass the cache, since a same-tick rewrite
+    could leave the stat signature unchanged.
+
+    Snapshots are only read from a directory and files owned by the
+    effective user and not writable by anyone else: a planted snapshot
+    would otherwise become the configuration of the next (root) run.
+    """
+
+    FORMAT_VERSION = 1
+    MAX_ENTRIES = 32
+    RACY_WINDOW_NS = 2_000_000_000
+    ROOT_CACHE_DIR = Path("/var/cache/debian-vps-configurator/config")
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize SnapshotCache.
+
+        Args:
+            cache_dir: Directory for snapshots (default: per-user cache dir)
+        """
+        self.cache_dir = cache_dir or self.default_dir()
+
+    @staticmethod
+    def default_dir() -> Path:
+        """
+        $VPS_CONFIG_CACHE_DIR, else /var/cache/debian-vps-configurator/config
+        for root, else $XDG_CACHE_HOME (or ~/.cache)/debian-vps-configurator.
+
+        Root never uses $HOME or $XDG_CACHE_HOME, which sudo may leave
+        pointing at the invoking user's directories.
+        """
+        override = os.environ.get("VPS_CONFIG_CACHE_DIR")
+        if override:
+            return Path(override)
+        if os.geteuid() == 0:
+            return SnapshotCache.ROOT_CACHE_DIR
+        base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+        return Path(base) / "debian-vps-configurator" / "config"
+
+    @staticmethod
+    def enabled() -> bool:
+        """Snapshots can be switched off with VPS_CONFIG_CACHE=0."""
+        return os.environ.get("VPS_CONFIG_CACHE", "1") not in ("0", "false", "no")
+
+    def key(self, sources: Iterable[Path], fingerprint: str) -> Optional[str]:
+        """
+        Derive the cache key for a set of source files.
+
+        Args:
+            sources: Files merged into the configuration (missing ones allowed)
+            fingerprint: Anything else the result depends on (built-in defaults, profile)
+
+        Returns:
+            Hex key, or None if a source is too fresh to trust its stat signature
+        """
+        now = time.time_ns()
+        parts: list = [self.FORMAT_VERSION, fingerprint]
+
+        for path in sources:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                parts.append([str(path), None])
+                continue
+            if st.st_mtime_ns + self.RACY_WINDOW_NS >= now:
+                return None
+            parts.append([str(path), st.st_size, st.st_ino, st.st_mtime_ns, st.st_ctime_ns])
+
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    @staticmethod
+    def _is_private(st: os.stat_result) -> bool:
+        """Owned by the effective user and not writable by group or others."""
+        return st.st_uid == os.geteuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def _trusted_dir(self) -> bool:
+        try:
+            st = os.lstat(self.cache_dir)
+        except OSError:
+            return False
+        if not stat.S_ISDIR(st.st_mode) or not self._is_private(st):
+            logger.warning(f"Ignoring config snapshot cache {self.cache_dir}: unsafe ownership")
+            return False
+        return True
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a snapshot, or None if absent, unreadable or not trusted."""
+        if not self._trusted_dir():
+            return None
+        try:
+            fd = os.open(self.cache_dir / f"{key}.json", os.O_RDONLY | os.O_NOFOLLOW)
+        except OSError:
+            return None
+        try:
+            with os.fdopen(fd, "r", encoding="utf-8") as f:
+                st = os.fstat(f.fileno())
+                if not stat.S_ISREG(st.st_mode) or not self._is_private(st):
+                    logger.warning(f"Ignoring config snapshot {key}: unsafe ownership")
+                    return None
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def store(self, key: str, data: Dict[str, Any]) -> bool:
+        """
+        Write a snapshot atomically.
+
+        Configurations holding values JSON cannot represent exactly (dates,
+        non-string keys) are not cached. Failures are silent: the cache is
+        only an accelerator.
+
+        Returns:
+            True if the snapshot was written
+        """
+        if not _is_json_native(data):
+            return False
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+            if not self._trusted_dir():
+                return False
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=".snapshot-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp, self.cache_dir / f"{key}.json")
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+            self._prune()
+        except OSError as e:
+            logger.debug(f"Cannot write config snapshot: {e}")
+            return False
+        return True
+
+    def _prune(self) -> None:
+        """Keep only the most recently written snapshots."""
+        snapshots = sorted(
+            self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime_ns, reverse=True
+        )
+        for stale in snapshots[self.MAX_ENTRIES :]:
+            stale.unlink(missing_ok=True)
@@ -0,0 +1,382 @@
+"""
+Directed acyclic graph engine for module dependencies.
+
+One list-backed graph shared by the installer, the dependency registry and
+the dependency visualizer:
+
+- Kahn layering and topological order in O(V + E)
+- Tarjan strongly connected components for cycle reporting (linear, unlike
+  enumerating every elementary cycle)
+- Memoized transitive closure as per-node bitsets
+- Critical (longest weighted) path
+
+Edges point from a prerequisite to the node that needs it.
+"""
+
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+Weight = Union[Dict[str, float], Callable[[str], float]]
+
+
+class CycleError(ValueError):
+    """Raised when an operation needs an acyclic graph but cycles exist."""
+
+    def __init__(self, cycles: List[List[str]], message: Optional[str] = None):
+        self.cycles = cycles
+        rendered = "; ".join(" -> ".join(cycle) for cycle in cycles)
+        super().__init__(message or f"Circular dependency detected: {rendered}")
+
+
+class DAG:
+    """
+    Dependency graph stored as adjacency lists over integer node ids.
+
+    Derived data (layers, closure) is computed on first use and dropped
+    whenever the graph changes.
+
+    Usage:
+        dag = DAG()
+        dag.add_edge("system", "security")
+        dag.add_edge("security", "docker")
+        dag.layers()               # [["system"], ["security"], ["docker"]]
+        dag.ancestors("docker")    # {"system", "security"}
+    """
+
+    def __init__(self) -> None:
+        self._index: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._succ: List[List[int]] = []
+        self._pred: List[List[int]] = []
+        self._edges: Set[Tuple[int, int]] = set()
+
+        self._layers: Optional[List[List[int]]] = None
+        self._ancestor_bits: Optional[List[int]] = None
+        self._descendant_bits: Optional[List[int]] = None
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def _invalidate(self) -> None:
+        self._layers = None
+        self._ancestor_bits = None
+        self._descendant_bits = None
+
+    def add_node(self, name: str) -> int:
+        """Add a node (no-op if present) and return its id."""
+        node = self._index.get(name)
+        if node is None:
+            node = len(self._names)
+            self._index[name] = node
+            self._names.append(name)
+            self._succ.append([])
+            self._pred.append([])
+            self._invalidate()
+        return node
+
+    def add_edge(self, before: str, after: str) -> None:
+        """Require before to come ahead of after (duplicate edges are ignored)."""
+        u = self.add_node(before)
+        v = self.add_node(after)
+        if (u, v) in self._edges:
+            return
+        self._edges.add((u, v))
+        self._succ[u].append(v)
+        self._pred[v].append(u)
+        self._invalidate()
+
+    # ------------------------------------------------------------------
+    # Inspection
+    # ------------------------------------------------------------------
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edges)
+
+    def nodes(self) -> List[str]:
+        """Nodes in insertion order."""
+        return list(self._names)
+
+    def successors(self, name: str) -> List[str]:
+        return [self._names[v] for v in self._succ[self._index[name]]]
+
+    def predecessors(self, name: str) -> List[str]:
+        return [self._names[u] for u in self._pred[self._index[name]]]
+
+    def in_degree(self, name: str) -> int:
+        return len(self._pred[self._index[name]])
+
+    def _to_names(self, ids: Iterable[int]) -> List[str]:
+        return [self._names[i] for i in ids]
+
+    # ------------------------------------------------------------------
+    # Ordering
+    # ------------------------------------------------------------------
+
+    def _layer_ids(self) -> List[List[int]]:
+        if self._layers is not None:
+            return self._layers
+
+        in_degree = [len(pred) for pred in self._pred]
+        current = [node for node, degree in enumerate(in_degree) if degree == 0]
+        layers: List[List[int]] = []
+        placed = 0
+
+        while current:
+            layers.append(current)
+            placed += len(current)
+            ready: List[int] = []
+            for u in current:
+                for v in self._succ[u]:
+                    in_degree[v] -= 1
+                    if in_degree[v] == 0:
+                        ready.append(v)
+            # Keep insertion order within a layer so output is deterministic
+            ready.sort()
+            current = ready
+
+        if placed < len(self._names):
+            raise CycleError(self.find_cycles())
+
+        self._layers = layers
+        return layers
+
+    def layers(self) -> List[List[str]]:
+        """
+        Group nodes into layers whose members only depend on earlier layers.
+
+        Raises:
+            CycleError: If the graph has cycles
+        """
+        return [self._to_names(layer) for layer in self._layer_ids()]
+
+    def topological_order(self) -> List[str]:
+        """
+        Nodes ordered so every edge points forward.
+
+        Raises:
+            CycleError: If the graph has cycles
+        """
+        return [self._names[node] for layer in self._layer_ids() for node in layer]
+
+    # ------------------------------------------------------------------
+    # Cycles
+    # ------------------------------------------------------------------
+
+    def _scc_ids(self) -> List[List[int]]:
+        """Tarjan's algorithm, iterative so deep graphs cannot overflow the stack."""
+        count = len(self._names)
+        index = [-1] * count
+        low = [0] * count
+        on_stack = [False] * count
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(count):
+            if index[root] != -1:
+                continue
+
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, 0)]
+
+            while work:
+                v, i = work[-1]
+                succ = self._succ[v]
+                if i < len(succ):
+                    work[-1] = (v, i + 1)
+                    w = succ[i]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, 0))
+                    elif on_stack[w]:
+                        low[v] = min(low[v], index[w])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[v])
+
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+
+        return components
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """All strongly connected components (singletons included)."""
+        return [self._to_names(sorted(component)) for component in self._scc_ids()]
+
+    def _cycle_through(self, start: int, members: Set[int]) -> List[int]:
+        """Shortest cycle from start back to itself inside one component."""
+        parent: Dict[int, int] = {start: -1}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            for v in self._succ[u]:
+                if v == start:
+                    path = []
+                    node = u
+                    while node != -1:
+                        path.append(node)
+                        node = parent[node]
+                    return [*reversed(path), start]
+                if v in members and v not in parent:
+                    parent[v] = u
+                    queue.append(v)
+        return [start, start]
+
+    def find_cycles(self) -> List[List[str]]:
+        """
+        Report one cycle per cyclic component.
+
+        Returns:
+            Closed paths such as ["a", "b", "a"]; empty for a DAG
+        """
+        cycles = []
+        for component in self._scc_ids():
+            if len(component) == 1 and (component[0], component[0]) not in self._edges:
+                continue
+            start = min(component)
+            cycles.append(self._to_names(self._cycle_through(start, set(component))))
+        cycles.sort(key=lambda cycle: self._index[cycle[0]])
+        return cycles
+
+    def is_acyclic(self) -> bool:
+        try:
+            self._layer_ids()
+        except CycleError:
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Transitive closure
+    # ------------------------------------------------------------------
+
+    def _ancestors(self) -> List[int]:
+        if self._ancestor_bits is None:
+            bits = [0] * len(self._names)
+            for layer in self._layer_ids():
+                for v in layer:
+                    acc = 0
+                    for u in self._pred[v]:
+                        acc |= bits[u] | (1 << u)
+                    bits[v] = acc
+            self._ancestor_bits = bits
+        return self._ancestor_bits
+
+    def _descendants(self) -> List[int]:
+        if self._descendant_bits is None:
+            bits = [0] * len(self._names)
+            for layer in reversed(self._layer_ids()):
+                for u in layer:
+                    acc = 0
+                    for v in self._succ[u]:
+                        acc |= bits[v] | (1 << v)
+                    bits[u] = acc
+            self._descendant_bits = bits
+        return self._descendant_bits
+
+    def _bits_to_names(self, bits: int) -> Set[str]:
+        names = set()
+        while bits:
+            lowest = bits & -bits
+            names.add(self._names[lowest.bit_length() - 1])
+            bits ^= lowest
+        return names
+
+    def ancestors(self, name: str) -> Set[str]:
+        """
+        Everything name transitively depends on.
+
+        Raises:
+            CycleError: If the graph has cycles
+        """
+        return self._bits_to_names(self._ancestors()[self._index[name]])
+
+    def descendants(self, name: str) -> Set[str]:
+        """
+        Everything that transitively depends on name.
+
+        Raises:
+            CycleError: If the graph has cycles
+        """
+        return self._bits_to_names(self._descendants()[self._index[name]])
+
+    def reaches(self, before: str, after: str) -> bool:
+        """Check in O(1) (after the closure is built) whether after depends on before."""
+        return bool(self._ancestors()[self._index[after]] >> self._index[before] & 1)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def critical_path(self, weight: Optional[Weight] = None) -> Tuple[float, List[str]]:
+        """
+        Longest weighted chain of dependencies.
+
+        With unlimited parallelism this chain bounds the total run time.
+
+        Args:
+            weight: Node weights as a mapping or callable (default 1 per node;
+                nodes missing from a mapping weigh 0)
+
+        Returns:
+            (total weight, nodes along the path)
+
+        Raises:
+            CycleError: If the graph has cycles
+        """
+
+        def cost(name: str) -> float:
+            if weight is None:
+                return 1.0
+            if callable(weight):
+                return weight(name)
+            return weight.get(name, 0.0)
+
+        count = len(self._names)
+        finish = [0.0] * count
+        via = [-1] * count
+        best = -1
+
+        for layer in self._layer_ids():
+            for v in layer:
+                start = 0.0
+                for u in self._pred[v]:
+                    if via[v] == -1 or finish[u] > start:
+                        start = finish[u]
+                        via[v] = u
+                finish[v] = start + cost(self._names[v])
+                if best == -1 or finish[v] > finish[best]:
+                    best = v
+
+        if best == -1:
+            return 0.0, []
+
+        path = []
+        node = best
+        while node != -1:
+            path.append(self._names[node])
+            node = via[node]
+        return finish[best], path[::-1]
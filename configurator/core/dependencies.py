@@ -7,7 +7,7 @@ This acts as the source of truth for execution order.
 
 from typing import Dict, List
 
-import networkx as nx
+from configurator.core.dag import DAG, CycleError
 
 COMPLETE_MODULE_DEPENDENCIES: Dict[str, List[str]] = {
     # Phase 1: System base (no dependencies)
@@ -45,18 +45,15 @@ COMPLETE_MODULE_DEPENDENCIES: Dict[str, List[str]] = {
 
 def validate_dependencies() -> bool:
     """Validate dependency graph has no cycles."""
-    graph = nx.DiGraph()
+    graph = DAG()
     for module, deps in COMPLETE_MODULE_DEPENDENCIES.items():
         graph.add_node(module)
         for dep in deps:
             graph.add_edge(dep, module)
 
     # Check for cycles
-    try:
-        cycles = list(nx.simple_cycles(graph))
-        if cycles:
-            raise ValueError(f"Circular dependencies detected: {cycles}")
-    except nx.NetworkXNoCycle:
-        pass  # No cycles, good!
+    cycles = graph.find_cycles()
+    if cycles:
+        raise CycleError(cycles, f"Circular dependencies detected: {cycles}")
 
     return True
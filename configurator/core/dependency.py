@@ -1,8 +1,8 @@
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-import networkx as nx
+from configurator.core.dag import DAG, CycleError, Weight
 
 
 @dataclass
@@ -18,10 +18,12 @@ class ModuleDependency:
 class DependencyGraph:
     """
     Build and analyze module dependency graph using Kahn's algorithm.
+
+    Backed by the shared DAG engine; see configurator.core.dag.
     """
 
     def __init__(self, logger: Optional[logging.Logger] = None):
-        self.graph = nx.DiGraph()
+        self.graph = DAG()
         self.logger = logger or logging.getLogger(__name__)
         self.module_info: Dict[str, ModuleDependency] = {}
 
@@ -44,11 +46,8 @@ class DependencyGraph:
         )
 
         # Add edges for dependencies
-        if depends_on:
-            for dependency in depends_on:
-                if dependency not in self.graph:
-                    self.graph.add_node(dependency)
-                self.graph.add_edge(dependency, name)
+        for dependency in depends_on or []:
+            self.graph.add_edge(dependency, name)
 
     def get_execution_batches(self) -> List[List[str]]:
         """
@@ -57,62 +56,50 @@ class DependencyGraph:
             List of batches, where each batch contains modules
             that can be executed in parallel
         """
-        batches = []
-        # Create a working copy of in-degrees
-        in_degree = dict(self.graph.in_degree())
-
-        while in_degree:
-            # Find all nodes with in-degree 0 (no unresolved dependencies)
-            batch = [node for node, degree in in_degree.items() if degree == 0]
-
-            if not batch:
-                # Circular dependency detected
-                remaining_nodes = list(in_degree.keys())
-                raise ValueError(
-                    f"Circular dependency detected among: {remaining_nodes}\n"
-                    "Please check module dependencies for cycles."
-                )
-
+        try:
+            layers = self.graph.layers()
+        except CycleError as e:
+            raise CycleError(
+                e.cycles, f"{e}\nPlease check module dependencies for cycles."
+            ) from None
+
+        batches: List[List[str]] = []
+        for layer in layers:
             # Separate force_sequential modules
-            sequential_modules = [
-                m for m in batch if self.module_info.get(m, ModuleDependency(m)).force_sequential
-            ]
-            parallel_modules = [
-                m
-                for m in batch
-                if not self.module_info.get(m, ModuleDependency(m)).force_sequential
-            ]
+            sequential_modules = [m for m in layer if self._is_sequential(m)]
+            parallel_modules = [m for m in layer if not self._is_sequential(m)]
 
             # Add sequential modules in separate batches
-            for module in sequential_modules:
-                batches.append([module])
-                self._remove_node_and_update_degrees(module, in_degree)
+            batches.extend([module] for module in sequential_modules)
 
             # Add parallel modules together
             if parallel_modules:
                 batches.append(parallel_modules)
-                for module in parallel_modules:
-                    self._remove_node_and_update_degrees(module, in_degree)
 
         return batches
 
-    def _remove_node_and_update_degrees(self, node: str, in_degree: Dict[str, int]) -> None:
-        """Remove node from graph and update in-degrees of successors"""
-        if node in in_degree:
-            del in_degree[node]
+    def _is_sequential(self, name: str) -> bool:
+        info = self.module_info.get(name)
+        return info.force_sequential if info else False
+
+    def critical_path(self, durations: Optional[Weight] = None) -> Tuple[float, List[str]]:
+        """
+        Longest chain of dependent modules, weighted by expected duration.
+
+        Args:
+            durations: Seconds per module (mapping or callable); default 1 each
 
-        for successor in self.graph.successors(node):
-            if successor in in_degree:
-                in_degree[successor] -= 1
+        Returns:
+            (total duration, modules along the chain)
+        """
+        return self.graph.critical_path(durations)
 
     def validate(self) -> bool:
         """Validate dependency graph."""
-        try:
-            cycles = list(nx.simple_cycles(self.graph))
-            if cycles:
-                raise ValueError(f"Circular dependencies detected: {cycles}")
-        except nx.NetworkXNoCycle:
-            pass
+        # Kahn ordering is cached for get_execution_batches; SCCs only run on failure
+        if not self.graph.is_acyclic():
+            cycles = self.graph.find_cycles()
+            raise CycleError(cycles, f"Circular dependencies detected: {cycles}")
 
         # Check all dependencies exist
         for node in self.graph.nodes():
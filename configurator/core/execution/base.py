@@ -1,3 +1,4 @@
+import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -16,6 +17,8 @@ class ExecutionContext:
     priority: int = 50
     dependencies: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    state_manager: Optional[Any] = None  # StateManager; enables skipping converged modules
+    expected_duration: Optional[float] = None  # Seconds, from the duration model
 
 
 @dataclass
@@ -35,10 +38,89 @@ class ExecutionResult:
         """Get status icon."""
         return "✅" if self.success else "❌"
 
+    @property
+    def converged(self) -> bool:
+        """True if the module was skipped because its desired state was already applied."""
+        return bool(self.metadata.get("converged"))
+
 
 class ExecutorInterface(ABC):
     """Abstract base class for execution engines."""
 
+    logger: logging.Logger
+
+    def _skip_if_converged(
+        self,
+        context: ExecutionContext,
+        callback: Optional[Callable[..., Any]],
+    ) -> Optional[ExecutionResult]:
+        """
+        Return a "converged" result if the module's desired state is already applied.
+
+        A module is converged when its fingerprint matches the one recorded
+        after its last successful run and its live-system probe still passes.
+        Forced and dry runs always execute.
+        """
+        module = context.module_instance
+        if (
+            context.state_manager is None
+            or context.force
+            or context.dry_run
+            or not hasattr(module, "state_fingerprint")
+        ):
+            return None
+
+        started_at = datetime.now()
+        try:
+            recorded = context.state_manager.get_module_fingerprint(context.module_name)
+            if recorded is None or recorded != module.state_fingerprint():
+                return None
+            if not module.probe_converged():
+                return None
+        except Exception as e:
+            self.logger.debug(f"Convergence check failed for {context.module_name}: {e}")
+            return None
+
+        completed_at = datetime.now()
+        self.logger.info(f"{context.module_name}: desired state already applied, skipping")
+        if callback:
+            callback(context.module_name, "converged", {})
+
+        return ExecutionResult(
+            module_name=context.module_name,
+            success=True,
+            started_at=started_at,
+            completed_at=completed_at,
+            duration_seconds=(completed_at - started_at).total_seconds(),
+            metadata={"converged": True},
+        )
+
+    def _attach_state_manager(self, context: ExecutionContext) -> None:
+        """Give the module the state manager, for its step checkpoints."""
+        if context.state_manager is not None:
+            context.module_instance.state_manager = context.state_manager
+
+    def _step_timings(self, context: ExecutionContext) -> Dict[str, float]:
+        """Per-step durations the module recorded (resumed steps take 0s)."""
+        timings = getattr(context.module_instance, "step_timings", None)
+        return dict(timings) if isinstance(timings, dict) else {}
+
+    def _record_convergence(self, context: ExecutionContext, success: bool) -> None:
+        """Remember the fingerprint after a successful run; forget it after a failed one."""
+        module = context.module_instance
+        if (
+            context.state_manager is None
+            or context.dry_run
+            or not hasattr(module, "state_fingerprint")
+        ):
+            return
+
+        try:
+            fingerprint = module.state_fingerprint() if success else None
+            context.state_manager.record_module_fingerprint(context.module_name, fingerprint)
+        except Exception as e:
+            self.logger.warning(f"Could not record state of {context.module_name}: {e}")
+
     @abstractmethod
     def execute(
         self,
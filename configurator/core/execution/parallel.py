@@ -52,6 +52,11 @@ class ParallelExecutor(ExecutorInterface):
 
         results = {}
 
+        # Longest expected first: a long module started last would run on alone
+        # after the others finish. Modules without estimates keep their order.
+        if any(c.expected_duration for c in contexts):
+            contexts = sorted(contexts, key=lambda c: -(c.expected_duration or 0.0))
+
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             # Submit all tasks
             future_to_context = {
@@ -87,6 +92,25 @@ class ParallelExecutor(ExecutorInterface):
         callback: Optional[Callable[..., Any]],
     ) -> ExecutionResult:
         """Execute a single module."""
+        converged = self._skip_if_converged(context, callback)
+        if converged is not None:
+            return converged
+
+        self._attach_state_manager(context)
+        result = self._run_module(context, callback)
+        self._record_convergence(context, result.success)
+
+        step_timings = self._step_timings(context)
+        if step_timings:
+            result.metadata["step_timings"] = step_timings
+        return result
+
+    def _run_module(
+        self,
+        context: ExecutionContext,
+        callback: Optional[Callable[..., Any]],
+    ) -> ExecutionResult:
+        """Validate, configure and verify a module."""
         module = context.module_instance
         started_at = datetime.now()
         thread_name = threading.current_thread().name
@@ -145,6 +169,11 @@ class ParallelExecutor(ExecutorInterface):
                     f"[{thread_name}] Module {context.module_name} has no configure method, skipping"
                 )
 
+            # Deferred daemon-reload and service restarts, once each
+            if hasattr(module, "apply_pending_service_actions"):
+                if not module.apply_pending_service_actions():
+                    raise Exception(f"Service restarts failed for {context.module_name}")
+
             # Verify
             if callback:
                 callback(context.module_name, "verifying", {})
@@ -45,7 +45,11 @@ class PipelineExecutor(ExecutorInterface):
         results = {}
 
         for context in contexts:
-            result = self._execute_pipeline(context, callback)
+            result = self._skip_if_converged(context, callback)
+            if result is None:
+                self._attach_state_manager(context)
+                result = self._execute_pipeline(context, callback)
+                self._record_convergence(context, result.success)
             results[context.module_name] = result
 
         return results
@@ -74,6 +78,7 @@ class PipelineExecutor(ExecutorInterface):
             # Success
             completed_at = datetime.now()
             duration = (completed_at - started_at).total_seconds()
+            step_timings = self._report_steps(context, callback)
 
             if callback:
                 callback(context.module_name, "completed", {"duration": duration})
@@ -84,12 +89,15 @@ class PipelineExecutor(ExecutorInterface):
                 started_at=started_at,
                 completed_at=completed_at,
                 duration_seconds=duration,
+                metadata={"step_timings": step_timings} if step_timings else {},
             )
 
         except Exception as e:
             completed_at = datetime.now()
             duration = (completed_at - started_at).total_seconds()
 
+            step_timings = self._report_steps(context, callback)
+
             if callback:
                 callback(context.module_name, "failed", {"error": str(e)})
 
@@ -100,8 +108,30 @@ class PipelineExecutor(ExecutorInterface):
                 completed_at=completed_at,
                 duration_seconds=duration,
                 error=e,
+                metadata={"step_timings": step_timings} if step_timings else {},
             )
 
+    def _report_steps(
+        self,
+        context: ExecutionContext,
+        callback: Optional[Callable[..., Any]],
+    ) -> Dict[str, float]:
+        """Log and report how long each of the module's steps took."""
+        step_timings = self._step_timings(context)
+        resumed = getattr(context.module_instance, "resumed_steps", None) or []
+
+        for step, seconds in step_timings.items():
+            note = " (resumed)" if step in resumed else ""
+            self.logger.info(f"{context.module_name}: {step} {seconds:.1f}s{note}")
+            if callback:
+                callback(
+                    context.module_name,
+                    "step_completed",
+                    {"step": step, "duration": seconds, "resumed": step in resumed},
+                )
+
+        return step_timings
+
     def _create_pipeline(
         self, context: ExecutionContext
     ) -> Generator[Tuple[str, bool, Dict[str, Any]], None, None]:
@@ -129,6 +159,10 @@ class PipelineExecutor(ExecutorInterface):
         else:
             yield ("configuring", True, {"skipped": True})
 
+        # Stage 3b: Deferred daemon-reload and service restarts, once each
+        if hasattr(module, "apply_pending_service_actions"):
+            yield ("restarting_services", module.apply_pending_service_actions(), {})
+
         # Stage 4: Post-configure hooks (if exists)
         if hasattr(module, "post_configure"):
             yield ("post_configure", module.post_configure(), {})
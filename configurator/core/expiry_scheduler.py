@@ -0,0 +1,525 @@
+"""
+Deadline-driven expiry scheduler.
+
+Temporary access grants, SSH key rotation and certificate expiry all boil
+down to "do something at time T". Instead of rescanning every registry on a
+fixed interval, subsystems push their deadlines into a shared min-heap and
+the scheduler wakes exactly when the earliest one is due.
+
+Features:
+- Min-heap of deadlines with O(log n) schedule/cancel
+- One pending entry per key (rescheduling replaces the old deadline)
+- Action handlers registered by name (revoke, rotate, notify, ...)
+- JSON persistence next to the owning registry, reloaded when another
+  process rewrites it
+- Failed or unhandled entries are retried with exponential backoff
+- Optional background thread that sleeps until the next deadline
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ExpiryHandler = Callable[["ExpiryEntry"], None]
+
+
+@dataclass
+class ExpiryEntry:
+    """
+    A single scheduled deadline.
+
+    Attributes:
+        key: Unique identifier (e.g. "temp-access:alice:expire")
+        due_at: When the action should run
+        action: Handler name to dispatch to
+        payload: Arbitrary JSON-serializable handler arguments
+        attempts: Failed dispatch attempts so far
+    """
+
+    key: str
+    due_at: datetime
+    action: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to dictionary."""
+        return {
+            "key": self.key,
+            "due_at": self.due_at.isoformat(),
+            "action": self.action,
+            "payload": self.payload,
+            "attempts": self.attempts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExpiryEntry":
+        """Deserialize from dictionary."""
+        return cls(
+            key=data["key"],
+            due_at=datetime.fromisoformat(data["due_at"]),
+            action=data["action"],
+            payload=data.get("payload", {}),
+            attempts=data.get("attempts", 0),
+        )
+
+
+class ExpiryScheduler:
+    """
+    Min-heap scheduler for expiry deadlines.
+
+    Cancelled and rescheduled entries are removed lazily: the heap keeps a
+    sequence number per push and stale heap items are skipped when popped.
+
+    Usage:
+        scheduler = ExpiryScheduler(state_file=Path("/var/lib/.../schedule.json"))
+        scheduler.register_handler("temp_access.expire", on_expire)
+        scheduler.schedule("temp-access:alice:expire", expires_at, "temp_access.expire")
+
+        # Either poll explicitly...
+        scheduler.dispatch_due()
+        # ...or let a background thread wake at the next deadline
+        scheduler.start()
+    """
+
+    # Backoff for failed handlers: 1 min, 2 min, 4 min, ... capped at 1 hour
+    RETRY_BASE_SECONDS = 60.0
+    RETRY_MAX_SECONDS = 3600.0
+
+    # How often a persisted scheduler's run() loop checks the state file for
+    # changes made by other processes
+    RELOAD_INTERVAL_SECONDS = 30.0
+
+    def __init__(
+        self,
+        state_file: Optional[Path] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize ExpiryScheduler.
+
+        Args:
+            state_file: JSON file to persist the schedule (None = in-memory only)
+            logger: Optional logger instance
+        """
+        self.state_file = state_file
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._entries: Dict[str, Tuple[int, ExpiryEntry]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._handlers: Dict[str, ExpiryHandler] = {}
+
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Stat signature of the state file as last read or written, and the
+        # keys changed in memory since then (these win when merging)
+        self._state_sig: Optional[Tuple[int, int, int, int]] = None
+        self._touched: Set[str] = set()
+
+        self.restored = self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _stat_state_file(self) -> Optional[Tuple[int, int, int, int]]:
+        if self.state_file is None:
+            return None
+        try:
+            st = self.state_file.stat()
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+    def _read_state_file(self) -> Optional[Dict[str, ExpiryEntry]]:
+        try:
+            with open(self.state_file, "r") as f:  # type: ignore[arg-type]
+                data = json.load(f)
+            entries = [ExpiryEntry.from_dict(item) for item in data.get("entries", [])]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.error(f"Failed to load expiry schedule: {e}")
+            return None
+        return {entry.key: entry for entry in entries}
+
+    def _load(self) -> bool:
+        """
+        Load persisted entries.
+
+        Returns:
+            True if a schedule file was found and read
+        """
+        if self.state_file is None:
+            return False
+
+        sig = self._stat_state_file()
+        on_disk = self._read_state_file()
+        if on_disk is None:
+            return False
+
+        for entry in on_disk.values():
+            self._push(entry)
+        self._state_sig = sig
+
+        self.logger.debug(f"Loaded {len(self._entries)} scheduled expiries")
+        return True
+
+    def _sync(self) -> bool:
+        """
+        Merge changes another process wrote to the state file.
+
+        Entries this instance scheduled, cancelled or dispatched since the
+        last sync keep their local state; every other key follows the file.
+
+        Returns:
+            True if the file had changed
+        """
+        sig = self._stat_state_file()
+        if sig is None or sig == self._state_sig:
+            return False
+
+        on_disk = self._read_state_file()
+        if on_disk is None:
+            return False
+
+        for key in list(self._entries):
+            if key not in on_disk and key not in self._touched:
+                del self._entries[key]
+        for key, entry in on_disk.items():
+            current = self._entries.get(key)
+            if key in self._touched or (current and current[1] == entry):
+                continue
+            self._push(entry)
+
+        self._compact()
+        self._state_sig = sig
+        self._wakeup.set()
+        return True
+
+    def reload(self) -> bool:
+        """
+        Pick up deadlines added, moved or cancelled by other processes.
+
+        Long-running dispatchers call this before each dispatch so that
+        short-lived CLI invocations (grant, extend, revoke) take effect.
+
+        Returns:
+            True if the state file had changed
+        """
+        if self.state_file is None:
+            return False
+        with self._lock:
+            return self._sync()
+
+    def save(self) -> None:
+        """Persist pending entries, merged with concurrent changes, to the state file."""
+        if self.state_file is None:
+            return
+
+        with self._lock:
+            self._sync()
+            data = {"entries": [entry.to_dict() for _, entry in self._entries.values()]}
+
+            try:
+                tmp_file = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+                with open(tmp_file, "w") as f:
+                    json.dump(data, f, indent=2)
+                try:
+                    tmp_file.chmod(0o600)
+                except PermissionError:
+                    pass
+                tmp_file.replace(self.state_file)
+
+                self._state_sig = self._stat_state_file()
+                self._touched.clear()
+            except (PermissionError, OSError) as e:
+                self.logger.debug(f"Failed to save expiry schedule: {e}")
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def register_handler(self, action: str, handler: ExpiryHandler) -> None:
+        """
+        Register the callable that runs when an entry with this action is due.
+
+        Args:
+            action: Action name (e.g. "ssh_key.rotate")
+            handler: Callable receiving the due ExpiryEntry
+        """
+        self._handlers[action] = handler
+
+    def _push(self, entry: ExpiryEntry) -> None:
+        seq = next(self._counter)
+        self._entries[entry.key] = (seq, entry)
+        heapq.heappush(self._heap, (entry.due_at.timestamp(), seq, entry.key))
+
+    def schedule(
+        self,
+        key: str,
+        due_at: datetime,
+        action: str,
+        payload: Optional[Dict[str, Any]] = None,
+        persist: bool = True,
+    ) -> ExpiryEntry:
+        """
+        Schedule (or reschedule) an action.
+
+        Args:
+            key: Unique entry key; an existing entry with the same key is replaced
+            due_at: When the action is due
+            action: Handler name
+            payload: Handler arguments
+            persist: Save the schedule immediately
+
+        Returns:
+            The scheduled ExpiryEntry
+        """
+        entry = ExpiryEntry(key=key, due_at=due_at, action=action, payload=payload or {})
+
+        with self._lock:
+            self._push(entry)
+            self._compact()
+            self._touched.add(key)
+
+        if persist:
+            self.save()
+        self._wakeup.set()
+        return entry
+
+    def cancel(self, key: str, persist: bool = True) -> bool:
+        """
+        Cancel a pending entry.
+
+        Args:
+            key: Entry key
+            persist: Save the schedule immediately
+
+        Returns:
+            True if an entry was removed
+        """
+        with self._lock:
+            removed = self._entries.pop(key, None) is not None
+            self._compact()
+            self._touched.add(key)
+
+        if removed:
+            if persist:
+                self.save()
+            self._wakeup.set()
+        return removed
+
+    def cancel_prefix(self, prefix: str, persist: bool = True) -> int:
+        """
+        Cancel every pending entry whose key starts with prefix.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            self._compact()
+            self._touched.update(keys)
+
+        if keys:
+            if persist:
+                self.save()
+            self._wakeup.set()
+        return len(keys)
+
+    def get(self, key: str) -> Optional[ExpiryEntry]:
+        """Get the pending entry for key, if any."""
+        item = self._entries.get(key)
+        return item[1] if item else None
+
+    def _compact(self) -> None:
+        """Rebuild the heap once stale items outnumber live ones."""
+        if len(self._heap) > 2 * len(self._entries) + 32:
+            self._heap = [
+                (entry.due_at.timestamp(), seq, key) for key, (seq, entry) in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def _discard_stale(self) -> None:
+        """Drop cancelled/rescheduled items from the top of the heap."""
+        while self._heap:
+            _, seq, key = self._heap[0]
+            current = self._entries.get(key)
+            if current is not None and current[0] == seq:
+                return
+            heapq.heappop(self._heap)
+
+    def next_due(self) -> Optional[datetime]:
+        """Get the earliest pending deadline."""
+        with self._lock:
+            self._discard_stale()
+            if not self._heap:
+                return None
+            return self._entries[self._heap[0][2]][1].due_at
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> Optional[float]:
+        """
+        Seconds until the earliest pending deadline.
+
+        Returns:
+            0.0 if something is already due, None if nothing is scheduled
+        """
+        due = self.next_due()
+        if due is None:
+            return None
+        now = now or datetime.now()
+        return max(0.0, (due - now).total_seconds())
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[ExpiryEntry]:
+        """
+        Remove and return every entry due at or before now, earliest first.
+
+        Args:
+            now: Reference time (defaults to datetime.now())
+        """
+        now_ts = (now or datetime.now()).timestamp()
+        due: List[ExpiryEntry] = []
+
+        with self._lock:
+            while True:
+                self._discard_stale()
+                if not self._heap or self._heap[0][0] > now_ts:
+                    break
+                _, _, key = heapq.heappop(self._heap)
+                due.append(self._entries.pop(key)[1])
+            self._touched.update(entry.key for entry in due)
+
+        return due
+
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds to wait before retrying an entry that failed `attempts` times."""
+        return min(self.RETRY_BASE_SECONDS * 2 ** (attempts - 1), self.RETRY_MAX_SECONDS)
+
+    def _retry(self, entry: ExpiryEntry) -> None:
+        """Re-queue a failed entry unless its handler already scheduled a replacement."""
+        with self._lock:
+            if entry.key in self._entries:
+                return
+            attempts = entry.attempts + 1
+            due_at = datetime.now() + timedelta(seconds=self.retry_delay(attempts))
+            self._push(
+                ExpiryEntry(entry.key, due_at, entry.action, entry.payload, attempts=attempts)
+            )
+            self._touched.add(entry.key)
+
+        self.logger.info(
+            f"Retrying {entry.key} at {due_at.strftime('%Y-%m-%d %H:%M:%S')} (attempt {attempts + 1})"
+        )
+
+    def dispatch_due(self, now: Optional[datetime] = None) -> List[ExpiryEntry]:
+        """
+        Pop due entries and run their handlers.
+
+        The state file is reloaded first if another process changed it.
+        Handler failures are logged and do not stop the remaining entries;
+        failed entries, and entries nobody handles yet, are re-queued with
+        exponential backoff. Handlers may schedule follow-up entries (e.g. a
+        grace-period revoke).
+
+        Returns:
+            Entries that were dispatched
+        """
+        self.reload()
+
+        due = self.pop_due(now)
+        if not due:
+            return due
+
+        for entry in due:
+            handler = self._handlers.get(entry.action)
+            if handler is None:
+                self.logger.warning(f"No handler for expiry action '{entry.action}' ({entry.key})")
+                self._retry(entry)
+                continue
+
+            try:
+                handler(entry)
+            except Exception as e:
+                self.logger.error(f"Expiry handler '{entry.action}' failed for {entry.key}: {e}")
+                self._retry(entry)
+
+        self.save()
+        return due
+
+    # ------------------------------------------------------------------
+    # Background dispatch
+    # ------------------------------------------------------------------
+
+    def run(self, max_wait: Optional[float] = None) -> None:
+        """
+        Dispatch entries until stop() is called, sleeping until the next deadline.
+
+        The loop wakes early whenever the schedule changes. With a state file
+        it also wakes every RELOAD_INTERVAL_SECONDS to pick up deadlines
+        written by other processes.
+
+        Args:
+            max_wait: Upper bound on a single sleep in seconds (None = unbounded,
+                or RELOAD_INTERVAL_SECONDS when persisted)
+        """
+        if max_wait is None and self.state_file is not None:
+            max_wait = self.RELOAD_INTERVAL_SECONDS
+
+        while not self._stop.is_set():
+            self.dispatch_due()
+
+            timeout = self.seconds_until_next()
+            if max_wait is not None:
+                timeout = max_wait if timeout is None else min(timeout, max_wait)
+
+            self._wakeup.clear()
+            # A schedule() between dispatch and clear() is caught by re-checking
+            if self.seconds_until_next() == 0.0:
+                continue
+            self._wakeup.wait(timeout)
+
+    def start(self, max_wait: Optional[float] = None) -> None:
+        """
+        Start dispatching in a background daemon thread.
+
+        Args:
+            max_wait: Upper bound on a single sleep in seconds (None = unbounded)
+        """
+        if self._thread and self._thread.is_alive():
+            self.logger.warning("Expiry scheduler already running")
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, args=(max_wait,), name="expiry-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
@@ -0,0 +1,384 @@
+"""
+Batch installer for VS Code-compatible editor extensions.
+
+Installing extensions one ``code --install-extension`` call at a time costs
+an Electron start-up per extension, and each one is fetched from the
+marketplace again on every run. ExtensionInstaller instead:
+
+- reads the installed extensions straight from the extensions directory
+  and leaves present ones (at the pinned version, if any) alone
+- downloads the missing VSIX packages concurrently into a local cache,
+  stored by SHA256 and reused across runs and editors
+- installs all of them with a single CLI invocation
+
+Usage:
+    installer = ExtensionInstaller("code", extensions_dir, run=module.run)
+    report = installer.install(["ms-python.python", "eamodio.gitlens@15.0.0"])
+"""
+
+import json
+import logging
+import os
+import re
+import shlex
+import threading
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, TypedDict
+
+from configurator.utils.command import CommandResult
+from configurator.utils.download import DownloadTask, get_download_engine
+from configurator.utils.file_lock import file_lock
+from configurator.utils.hashing import get_hash_service
+
+Runner = Callable[..., CommandResult]
+
+MARKETPLACE_VSIX_URL = (
+    "https://marketplace.visualstudio.com/_apis/public/gallery/publishers/"
+    "{publisher}/vsextensions/{name}/{version}/vspackage"
+)
+
+_EXTENSION_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9-]*\.[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+@dataclass(frozen=True)
+class ExtensionSpec:
+    """A requested extension: ``publisher.name`` or ``publisher.name@version``."""
+
+    id: str
+    version: Optional[str] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "ExtensionSpec":
+        """
+        Parse an extension specification.
+
+        Raises:
+            ValueError: If spec is not a valid extension identifier
+        """
+        ext_id, _, version = spec.strip().partition("@")
+        if not _EXTENSION_ID.match(ext_id) or (version and not re.match(r"^[\w.+-]+$", version)):
+            raise ValueError(f"Invalid extension identifier: {spec!r}")
+        return cls(ext_id.lower(), version or None)
+
+    @property
+    def publisher(self) -> str:
+        return self.id.split(".", 1)[0]
+
+    @property
+    def name(self) -> str:
+        return self.id.split(".", 1)[1]
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.id}@{self.version or 'latest'}"
+
+    def __str__(self) -> str:
+        return self.cache_key if self.version else self.id
+
+
+@dataclass
+class ExtensionReport:
+    """Outcome of an extension installation."""
+
+    installed: List[str] = field(default_factory=list)
+    already_present: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    from_cache: List[str] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return not self.failed
+
+
+class _IndexEntry(TypedDict):
+    """A cached package in the VSIX cache index."""
+
+    sha256: str
+    version: str
+    fetched_at: float
+
+
+class VsixCache:
+    """
+    Content-addressed store of VSIX packages.
+
+    Files are kept as ``<sha256>.vsix``; index.json maps ``id@version`` (or
+    ``id@latest``) to a digest. Pinned versions are reused indefinitely,
+    ``latest`` entries for latest_ttl seconds.
+    """
+
+    DEFAULT_CACHE_DIR = Path("/var/cache/debian-vps-configurator/vsix")
+    DEFAULT_LATEST_TTL = 24 * 3600
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        latest_ttl: float = DEFAULT_LATEST_TTL,
+        url_template: str = MARKETPLACE_VSIX_URL,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize VsixCache.
+
+        Args:
+            cache_dir: Where packages are stored
+            latest_ttl: Seconds an unpinned ("latest") package is reused
+            url_template: Download URL, formatted with publisher, name and version
+            logger: Optional logger instance
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+        self.latest_ttl = latest_ttl
+        self.url_template = url_template
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default_dir(cls) -> Path:
+        """System cache for root, the user's cache directory otherwise."""
+        if os.geteuid() == 0:
+            return cls.DEFAULT_CACHE_DIR
+        return Path.home() / ".cache" / "debian-vps-configurator" / "vsix"
+
+    @property
+    def index_path(self) -> Path:
+        return self.cache_dir / "index.json"
+
+    def url_for(self, spec: ExtensionSpec) -> str:
+        return self.url_template.format(
+            publisher=spec.publisher, name=spec.name, version=spec.version or "latest"
+        )
+
+    def lookup(self, spec: ExtensionSpec) -> Optional[Path]:
+        """Cached package for spec, if present, fresh and intact."""
+        entry = self._load_index().get(spec.cache_key)
+        if not entry:
+            return None
+        if spec.version is None and time.time() - entry.get("fetched_at", 0) > self.latest_ttl:
+            return None
+
+        path = self.cache_dir / f"{entry['sha256']}.vsix"
+        try:
+            if get_hash_service().hash_file(path) != entry["sha256"]:
+                return None
+        except OSError:
+            return None
+        return path
+
+    def fetch(self, specs: Sequence[ExtensionSpec]) -> Dict[ExtensionSpec, Path]:
+        """
+        Make packages for specs available locally, downloading missing ones concurrently.
+
+        Returns:
+            Mapping of spec to package path, for the specs that could be fetched
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o755)
+
+        found: Dict[ExtensionSpec, Path] = {}
+        missing: List[ExtensionSpec] = []
+        for spec in specs:
+            path = self.lookup(spec)
+            if path is not None:
+                found[spec] = path
+            else:
+                missing.append(spec)
+
+        if not missing:
+            return found
+
+        tasks = [
+            DownloadTask(self.url_for(spec), self.cache_dir / f".{spec.cache_key}.download")
+            for spec in missing
+        ]
+        results = get_download_engine().download_many(tasks)
+
+        stored: Dict[str, _IndexEntry] = {}
+        for spec, result in zip(missing, results, strict=True):
+            if not result.success or not result.sha256:
+                self.logger.warning(f"Could not download {spec}: {result.error}")
+                continue
+
+            version = self._package_version(result.destination)
+            if version is None or (spec.version and version != spec.version):
+                self.logger.warning(f"Downloaded package for {spec} is not a valid VSIX")
+                result.destination.unlink(missing_ok=True)
+                continue
+
+            path = self.cache_dir / f"{result.sha256}.vsix"
+            os.replace(result.destination, path)
+            os.chmod(path, 0o644)
+            found[spec] = path
+            stored[spec.cache_key] = {
+                "sha256": result.sha256,
+                "version": version,
+                "fetched_at": time.time(),
+            }
+
+        if stored:
+            with self._lock, file_lock(str(self.index_path)):
+                index = self._load_index()
+                index.update(stored)
+                tmp = self.index_path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(index, indent=2, sort_keys=True))
+                os.replace(tmp, self.index_path)
+
+        return found
+
+    def _load_index(self) -> Dict[str, _IndexEntry]:
+        try:
+            return json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _package_version(path: Path) -> Optional[str]:
+        """Version from the manifest inside a VSIX, or None if it is not one."""
+        try:
+            with zipfile.ZipFile(path) as archive:
+                manifest = json.loads(archive.read("extension/package.json"))
+            return str(manifest["version"])
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+
+class ExtensionInstaller:
+    """
+    Install editor extensions in one batch.
+
+    Works for any VS Code-compatible CLI (code, cursor): extensions that are
+    not installed yet are fetched through the VSIX cache and passed to a
+    single ``--install-extension`` invocation. Extensions whose package
+    could not be fetched are passed by id, so the editor downloads them
+    itself as before.
+    """
+
+    def __init__(
+        self,
+        cli: str,
+        extensions_dir: Path,
+        run: Runner,
+        cli_prefix: str = "",
+        cli_args: str = "",
+        cache: Optional[VsixCache] = None,
+        dry_run: bool = False,
+        timeout: int = 600,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize ExtensionInstaller.
+
+        Args:
+            cli: Editor command (code, cursor)
+            extensions_dir: The editor's extensions directory for the target user
+            run: Command runner (a module's run())
+            cli_prefix: Prepended to the command (e.g. ``sudo -u alice``)
+            cli_args: Appended to the command (e.g. ``--no-sandbox``)
+            cache: VSIX cache (default: the standard cache directory)
+            dry_run: Report what would be installed without downloading
+            timeout: Timeout of the install command, in seconds
+            logger: Optional logger instance
+        """
+        self.cli = cli
+        self.extensions_dir = Path(extensions_dir)
+        self.run = run
+        self.cli_prefix = cli_prefix
+        self.cli_args = cli_args
+        self.cache = cache or VsixCache(logger=logger)
+        self.dry_run = dry_run
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+
+    def installed_versions(self) -> Dict[str, str]:
+        """Installed extensions (id -> version), read from the extensions directory."""
+        installed: Dict[str, str] = {}
+        manifest = self.extensions_dir / "extensions.json"
+        try:
+            for entry in json.loads(manifest.read_text()):
+                ext_id = entry["identifier"]["id"].lower()
+                if (self.extensions_dir / entry["relativeLocation"]).is_dir():
+                    installed[ext_id] = entry.get("version", "")
+            return installed
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        # Older editors have no extensions.json; directories are named <id>-<version>
+        try:
+            for child in self.extensions_dir.iterdir():
+                match = re.match(r"^(.+?)-(\d[\w.+-]*)$", child.name)
+                if child.is_dir() and match:
+                    installed[match.group(1).lower()] = match.group(2)
+        except OSError:
+            pass
+        return installed
+
+    def install(self, extensions: Sequence[str], retries: int = 2) -> ExtensionReport:
+        """
+        Install the extensions that are not present yet.
+
+        Args:
+            extensions: Extension specifications (``publisher.name[@version]``)
+            retries: Additional batch attempts for extensions still missing
+
+        Returns:
+            ExtensionReport
+        """
+        report = ExtensionReport()
+        specs: List[ExtensionSpec] = []
+        for raw in extensions:
+            try:
+                spec = ExtensionSpec.parse(raw)
+            except ValueError as e:
+                self.logger.warning(str(e))
+                report.failed.append(raw)
+                continue
+            if spec not in specs:
+                specs.append(spec)
+
+        pending = self._missing(specs, report)
+        if not pending:
+            return report
+
+        if self.dry_run:
+            self.run(self._command([str(spec) for spec in pending]), check=False)
+            report.installed.extend(str(spec) for spec in pending)
+            return report
+
+        packages = self.cache.fetch(pending)
+        report.from_cache.extend(str(spec) for spec in pending if spec in packages)
+
+        for attempt in range(retries + 1):
+            targets = [str(packages[spec]) if spec in packages else str(spec) for spec in pending]
+            self.run(self._command(targets), check=False, timeout=self.timeout)
+
+            still_missing = self._missing(pending, None)
+            report.installed.extend(str(s) for s in pending if s not in still_missing)
+            pending = still_missing
+            if not pending:
+                break
+            if attempt < retries:
+                self.logger.info(f"  ⚠ {len(pending)} extension(s) not installed yet, retrying...")
+
+        report.failed.extend(str(spec) for spec in pending)
+        return report
+
+    def _missing(
+        self, specs: Sequence[ExtensionSpec], report: Optional[ExtensionReport]
+    ) -> List[ExtensionSpec]:
+        installed = self.installed_versions()
+        missing = []
+        for spec in specs:
+            version = installed.get(spec.id)
+            if version is not None and (spec.version is None or spec.version == version):
+                if report is not None:
+                    report.already_present.append(str(spec))
+            else:
+                missing.append(spec)
+        return missing
+
+    def _command(self, targets: Sequence[str]) -> str:
+        args = " ".join(f"--install-extension {shlex.quote(t)}" for t in targets)
+        return " ".join(
+            part for part in (self.cli_prefix, self.cli, args, "--force", self.cli_args) if part
+        )
@@ -3,13 +3,16 @@ import hmac
 import json
 import logging
 import os
+import threading
+import time
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from configurator.core.audit import AuditEventType, AuditLogger
 from configurator.exceptions import ConfiguratorError
+from configurator.utils.hashing import get_hash_service
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,32 @@ class FileState:
     gid: int
     mtime: float
     last_check: str
+    # Stat signature for the fast path; zero means "unknown, always rehash"
+    mtime_ns: int = 0
+    ctime_ns: int = 0
+    inode: int = 0
+    dev: int = 0
+    hashed_ns: int = 0
+
+    def stat_matches(self, st: os.stat_result, racy_window_ns: int) -> bool:
+        """
+        Check whether a fresh stat proves the content is unchanged.
+
+        Entries whose mtime/ctime fall within racy_window_ns of the moment
+        they were hashed are never trusted: a same-tick rewrite would leave
+        every stat field identical (the "racy git" problem).
+        """
+        if not self.inode or not self.hashed_ns:
+            return False
+        if max(self.mtime_ns, self.ctime_ns) + racy_window_ns >= self.hashed_ns:
+            return False
+        return (
+            st.st_ino == self.inode
+            and st.st_dev == self.dev
+            and st.st_size == self.size
+            and st.st_mtime_ns == self.mtime_ns
+            and st.st_ctime_ns == self.ctime_ns
+        )
 
 
 class FileIntegrityMonitor:
@@ -35,9 +64,14 @@ class FileIntegrityMonitor:
     Monitors critical system files for unauthorized changes.
 
     Features:
-    - Calculates SHA256 hashes of monitored files
+    - Calculates SHA256 hashes of monitored files (directories are walked)
+    - Stat-first fast path: only files whose size/mtime/ctime/inode changed
+      are rehashed, on the shared hashing pool for large trees
     - Tracks metadata (permissions, ownership, size)
-    - Signs the baseline database with HMAC-SHA256 to prevent tampering
+    - Stores the baseline as per-directory chunks whose digests form a
+      Merkle root signed with HMAC-SHA256, so updates rewrite only the
+      touched chunks
+    - Optional inotify watch mode that checks files as they change
     - Integrates with AuditLogger to report security violations
     """
 
@@ -55,11 +89,21 @@ class FileIntegrityMonitor:
 
     DEFAULT_KEY_PATH = Path("/etc/debian-vps-configurator/.fim_key")
 
+    BASELINE_VERSION = 2
+    # Filesystems with coarse timestamps need a generous window (ext3/FAT: 1-2 s)
+    RACY_WINDOW_NS = 2_000_000_000
+    # Below this many files hashing stays on the calling thread
+    PARALLEL_THRESHOLD = 16
+
     def __init__(self, db_path: Optional[Path] = None, monitored_files: Optional[List[str]] = None):
         self.db_path = db_path or self.DEFAULT_DB_PATH
         self.monitored_files = monitored_files or self.DEFAULT_MONITORED_FILES
         self.baseline: Dict[str, FileState] = {}
         self._hmac_key: Optional[bytes] = None
+        self._chunk_digests: Dict[str, str] = {}
+        self._dirty_chunks: Set[str] = set()
+        # Entries given a fresh stat signature by a check, to be saved
+        self._refreshed: List[str] = []
 
         # Ensure db dir exists
         if not self.db_path.parent.exists():
@@ -103,6 +147,44 @@ class FileIntegrityMonitor:
             return ""
         return hmac.new(self._hmac_key, data_bytes, hashlib.sha256).hexdigest()
 
+    # ------------------------------------------------------------------
+    # Baseline storage
+    # ------------------------------------------------------------------
+
+    @property
+    def chunk_dir(self) -> Path:
+        """Directory holding the per-directory baseline chunks."""
+        return self.db_path.parent / f"{self.db_path.name}.d"
+
+    @staticmethod
+    def _chunk_key(path: str) -> str:
+        return os.path.dirname(path) or "/"
+
+    def _chunk_file(self, chunk_key: str) -> Path:
+        name = hashlib.sha256(chunk_key.encode()).hexdigest()[:32]
+        return self.chunk_dir / f"{name}.json"
+
+    @staticmethod
+    def _digest(payload: Any) -> str:
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    @classmethod
+    def _merkle_root(cls, chunk_digests: Dict[str, str]) -> str:
+        return cls._digest(chunk_digests)
+
+    def _report_tampering(self, msg: str) -> None:
+        logger.critical(msg)
+        try:
+            audit = AuditLogger()
+            audit.log_event(
+                AuditEventType.SECURITY_VIOLATION,
+                "FIM Database Tampering Detected",
+                success=False,
+            )
+        except Exception:
+            pass
+        raise FIMError(msg)
+
     def _load_baseline(self) -> None:
         if not self.db_path.exists():
             return
@@ -112,65 +194,116 @@ class FileIntegrityMonitor:
                 content = f.read()
                 data = json.loads(content)
 
-            # Verify signature if present and key is available
+            if "baseline" in data:
+                self._load_legacy_baseline(data)
+                return
+
+            chunk_digests: Dict[str, str] = data.get("chunks", {})
+            root = data.get("root", "")
+
+            if self._merkle_root(chunk_digests) != root:
+                self._report_tampering("FIM Database Integrity Check Failed! Merkle root mismatch.")
+
+            # Verify signature if key is available (only the root is signed)
             if self._hmac_key:
-                signature = data.get("_signature", "")
-                # Reconstruct data payload to verify
-                # We need to be careful about JSON serialization stability.
-                # A better approach is to sign the 'baseline' dict structure dump.
+                expected_sig = self._calculate_signature(root.encode())
+                if not hmac.compare_digest(expected_sig, data.get("_signature", "")):
+                    self._report_tampering(
+                        "FIM Database Integrity Check Failed! Signature mismatch."
+                    )
+
+            baseline: Dict[str, FileState] = {}
+            for chunk_key, digest in chunk_digests.items():
+                # Every chunk is covered by the (signed) root: one that went
+                # missing must not silently shrink the baseline
+                try:
+                    with open(self._chunk_file(chunk_key), "r") as f:
+                        chunk = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    self._report_tampering(
+                        f"FIM Database Integrity Check Failed! Chunk unreadable: {chunk_key} ({e})"
+                    )
 
-                baseline_data = data.get("baseline", {})
-                canonical_json = json.dumps(baseline_data, sort_keys=True)
+                if chunk.get("directory") != chunk_key or self._digest(chunk) != digest:
+                    self._report_tampering(
+                        f"FIM Database Integrity Check Failed! Chunk mismatch: {chunk_key}"
+                    )
 
-                expected_sig = self._calculate_signature(canonical_json.encode())
+                for k, v in chunk.get("entries", {}).items():
+                    baseline[k] = FileState(**v)
 
-                if not hmac.compare_digest(expected_sig, signature):
-                    msg = "FIM Database Integrity Check Failed! Signature mismatch."
-                    logger.critical(msg)
-                    try:
-                        audit = AuditLogger()
-                        audit.log_event(
-                            AuditEventType.SECURITY_VIOLATION,
-                            "FIM Database Tampering Detected",
-                            success=False,
-                        )
-                    except Exception:
-                        pass
-                    raise FIMError(msg)
-
-            self.baseline = {k: FileState(**v) for k, v in data.get("baseline", {}).items()}
+            self.baseline = baseline
+            self._chunk_digests = dict(chunk_digests)
         except (json.JSONDecodeError, OSError) as e:
             logger.error(f"Failed to load FIM baseline: {e}")
 
+    def _load_legacy_baseline(self, data: Dict[str, Any]) -> None:
+        """Load a version 1 (single signed document) baseline."""
+        if self._hmac_key:
+            signature = data.get("_signature", "")
+            canonical_json = json.dumps(data.get("baseline", {}), sort_keys=True)
+            expected_sig = self._calculate_signature(canonical_json.encode())
+
+            if not hmac.compare_digest(expected_sig, signature):
+                self._report_tampering("FIM Database Integrity Check Failed! Signature mismatch.")
+
+        self.baseline = {k: FileState(**v) for k, v in data.get("baseline", {}).items()}
+        # Rewrite everything in the chunked format on next save
+        self._chunk_digests = {}
+        self._dirty_chunks = {self._chunk_key(path) for path in self.baseline}
+
+    def _mark_dirty(self, path: str) -> None:
+        self._dirty_chunks.add(self._chunk_key(path))
+
     def _save_baseline(self) -> None:
+        """Write dirty chunks, then re-sign the Merkle root."""
         try:
-            # Convert dataclasses to dicts
-            baseline_data = {k: asdict(v) for k, v in self.baseline.items()}
-
-            output_data: Dict[str, Any] = {"baseline": baseline_data}
+            self.chunk_dir.mkdir(parents=True, exist_ok=True)
+            os.chmod(self.chunk_dir, 0o700)
+
+            by_chunk: Dict[str, Dict[str, Any]] = {key: {} for key in self._dirty_chunks}
+            for path, state in self.baseline.items():
+                key = self._chunk_key(path)
+                if key in by_chunk:
+                    by_chunk[key][path] = asdict(state)
+
+            for key, entries in by_chunk.items():
+                chunk_file = self._chunk_file(key)
+                if not entries:
+                    self._chunk_digests.pop(key, None)
+                    chunk_file.unlink(missing_ok=True)
+                    continue
+
+                chunk = {"directory": key, "entries": entries}
+                self._write_json(chunk_file, chunk)
+                self._chunk_digests[key] = self._digest(chunk)
+
+            root = self._merkle_root(self._chunk_digests)
+            output_data: Dict[str, Any] = {
+                "version": self.BASELINE_VERSION,
+                "chunks": self._chunk_digests,
+                "root": root,
+            }
 
             if self._hmac_key:
-                # Sign the canonical content of baseline
-                canonical_json = json.dumps(baseline_data, sort_keys=True)
-                signature = self._calculate_signature(canonical_json.encode())
-                output_data["_signature"] = signature
-
-            with open(self.db_path, "w") as f:
-                json.dump(output_data, f, indent=2)
-            os.chmod(self.db_path, 0o600)
+                output_data["_signature"] = self._calculate_signature(root.encode())
+
+            self._write_json(self.db_path, output_data)
+            self._dirty_chunks.clear()
         except OSError as e:
             logger.error(f"Failed to save FIM baseline: {e}")
 
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any]) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.chmod(tmp_path, 0o600)
+        tmp_path.replace(path)
+
     def _calculate_hash(self, file_path: Path) -> str:
-        sha256 = hashlib.sha256()
         try:
-            with open(file_path, "rb") as f:
-                while True:
-                    data = f.read(65536)
-                    if not data:
-                        break
-                    sha256.update(data)
-            return sha256.hexdigest()
+            return get_hash_service().hash_file(file_path)
         except OSError:
             return ""
 
@@ -181,6 +314,7 @@ class FileIntegrityMonitor:
 
         try:
             stat = path.stat()
+            hashed_ns = time.time_ns()
             file_hash = self._calculate_hash(path)
 
             return FileState(
@@ -192,24 +326,68 @@ class FileIntegrityMonitor:
                 gid=stat.st_gid,
                 mtime=stat.st_mtime,
                 last_check=datetime.now(timezone.utc).isoformat(),
+                mtime_ns=stat.st_mtime_ns,
+                ctime_ns=stat.st_ctime_ns,
+                inode=stat.st_ino,
+                dev=stat.st_dev,
+                hashed_ns=hashed_ns,
             )
         except OSError as e:
             logger.warning(f"Failed to check file {path_str}: {e}")
             return None
 
+    def _get_file_states(self, paths: Iterable[str]) -> Dict[str, Optional[FileState]]:
+        """Hash many files, in a thread pool once the batch is large enough."""
+        paths = list(paths)
+        # hashlib releases the GIL while digesting, so threads scale with I/O and CPU
+        states = get_hash_service().map(
+            self._get_file_state, paths, min_parallel=self.PARALLEL_THRESHOLD
+        )
+        return dict(zip(paths, states, strict=True))
+
+    def _expand_monitored(self) -> Tuple[List[str], List[str]]:
+        """
+        Split monitored entries into files (directories walked) and tree roots.
+
+        Returns:
+            (files, directories)
+        """
+        files: List[str] = []
+        directories = self._monitored_directories()
+        for entry in self.monitored_files:
+            if entry in directories:
+                for root, _dirs, names in os.walk(entry):
+                    for name in names:
+                        full = os.path.join(root, name)
+                        if os.path.isfile(full) and not os.path.islink(full):
+                            files.append(full)
+            else:
+                files.append(entry)
+
+        return files, directories
+
+    def _monitored_directories(self) -> List[str]:
+        return [e for e in self.monitored_files if os.path.isdir(e) and not os.path.islink(e)]
+
     def initialize(self) -> None:
         """Initialize or reset the baseline."""
         logger.info("Initializing FIM baseline...")
         self.baseline = {}
 
-        for file_path in self.monitored_files:
-            state = self._get_file_state(file_path)
+        # Drop every chunk from a previous baseline
+        self._dirty_chunks = set(self._chunk_digests)
+        self._chunk_digests = {}
+
+        files, _ = self._expand_monitored()
+        for file_path, state in self._get_file_states(files).items():
             if state:
                 self.baseline[file_path] = state
-                logger.info(f"Added to baseline: {file_path}")
+                self._mark_dirty(file_path)
+                logger.debug(f"Added to baseline: {file_path}")
             else:
                 logger.debug(f"File not found, skipping: {file_path}")
 
+        logger.info(f"FIM baseline contains {len(self.baseline)} files")
         self._save_baseline()
 
         # Log initialization
@@ -221,6 +399,96 @@ class FileIntegrityMonitor:
         except Exception:
             pass
 
+    def _compare(self, path: str, baseline_state: FileState) -> Optional[Dict[str, Any]]:
+        """
+        Compare one baseline entry with the file on disk.
+
+        Only stats the file; content is rehashed when the stat signature moved.
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = None
+        except OSError as e:
+            logger.warning(f"Failed to check file {path}: {e}")
+            return None
+
+        if st is None:
+            return {
+                "path": path,
+                "type": "file_deleted",
+                "severity": "high",
+                "details": "File exists in baseline but is missing from disk",
+            }
+
+        changes = []
+        if not baseline_state.stat_matches(st, self.RACY_WINDOW_NS):
+            hashed_ns = time.time_ns()
+            current_hash = self._calculate_hash(Path(path))
+            if current_hash != baseline_state.sha256:
+                changes.append("content_modified")
+            elif max(st.st_mtime_ns, st.st_ctime_ns) + self.RACY_WINDOW_NS < hashed_ns:
+                # Unchanged and no longer racy: let later checks take the fast path
+                self._refresh_signature(path, baseline_state, st, hashed_ns)
+        if st.st_mode != baseline_state.mode:
+            changes.append("permissions_modified")
+        if st.st_uid != baseline_state.uid or st.st_gid != baseline_state.gid:
+            changes.append("ownership_modified")
+
+        if not changes:
+            return None
+
+        return {
+            "path": path,
+            "type": "file_modified",
+            "changes": changes,
+            "severity": "high" if "content_modified" in changes else "medium",
+            "details": f"Changes detected: {', '.join(changes)}",
+        }
+
+    def _refresh_signature(
+        self, path: str, state: FileState, st: os.stat_result, hashed_ns: int
+    ) -> None:
+        """Record the stat signature of an entry whose content was just verified."""
+        state.mtime = st.st_mtime
+        state.mtime_ns = st.st_mtime_ns
+        state.ctime_ns = st.st_ctime_ns
+        state.inode = st.st_ino
+        state.dev = st.st_dev
+        state.hashed_ns = hashed_ns
+        self._refreshed.append(path)
+
+    def _save_refreshed(self) -> None:
+        """Write the entries whose stat signature a check refreshed."""
+        refreshed, self._refreshed = self._refreshed, []
+        if refreshed:
+            for path in refreshed:
+                self._mark_dirty(path)
+            self._save_baseline()
+
+    def _added_violation(self, path: str) -> Dict[str, Any]:
+        return {
+            "path": path,
+            "type": "file_added",
+            "severity": "high",
+            "details": "File under a monitored directory is missing from baseline",
+        }
+
+    def _log_violations(self, violations: List[Dict[str, Any]]) -> None:
+        if not violations:
+            return
+        try:
+            audit = AuditLogger()
+            for v in violations:
+                audit.log_event(
+                    AuditEventType.SECURITY_VIOLATION,
+                    f"FIM Violation: {v['path']}",
+                    details=v,
+                    success=False,
+                )
+        except Exception:
+            pass
+
     def check(self) -> List[Dict[str, Any]]:
         """
         Check for changes against baseline.
@@ -234,52 +502,22 @@ class FileIntegrityMonitor:
             logger.warning("No baseline found. Please run 'initialize' first.")
             return []
 
-        for path, baseline_state in self.baseline.items():
-            current_state = self._get_file_state(path)
-
-            if not current_state:
-                # File deleted
-                violation = {
-                    "path": path,
-                    "type": "file_deleted",
-                    "severity": "high",
-                    "details": "File exists in baseline but is missing from disk",
-                }
-                violations.append(violation)
-                continue
+        results = get_hash_service().map(
+            lambda item: self._compare(*item),
+            list(self.baseline.items()),
+            min_parallel=self.PARALLEL_THRESHOLD,
+        )
 
-            # Check for changes
-            changes = []
-            if current_state.sha256 != baseline_state.sha256:
-                changes.append("content_modified")
-            if current_state.mode != baseline_state.mode:
-                changes.append("permissions_modified")
-            if current_state.uid != baseline_state.uid or current_state.gid != baseline_state.gid:
-                changes.append("ownership_modified")
-
-            if changes:
-                modified_violation: Dict[str, Any] = {
-                    "path": path,
-                    "type": "file_modified",
-                    "changes": changes,
-                    "severity": "high" if "content_modified" in changes else "medium",
-                    "details": f"Changes detected: {', '.join(changes)}",
-                }
-                violations.append(modified_violation)
+        violations.extend(v for v in results if v)
+        self._save_refreshed()
+
+        # New files under monitored directories
+        if self._monitored_directories():
+            files, _ = self._expand_monitored()
+            violations.extend(self._added_violation(p) for p in files if p not in self.baseline)
 
         # Log violations
-        if violations:
-            try:
-                audit = AuditLogger()
-                for v in violations:
-                    audit.log_event(
-                        AuditEventType.SECURITY_VIOLATION,
-                        f"FIM Violation: {v['path']}",
-                        details=v,
-                        success=False,
-                    )
-            except Exception:
-                pass
+        self._log_violations(violations)
 
         return violations
 
@@ -288,7 +526,121 @@ class FileIntegrityMonitor:
         state = self._get_file_state(file_path)
         if state:
             self.baseline[file_path] = state
+            self._mark_dirty(file_path)
             self._save_baseline()
             logger.info(f"Updated baseline for: {file_path}")
             return True
         return False
+
+    # ------------------------------------------------------------------
+    # Watch mode
+    # ------------------------------------------------------------------
+
+    def _is_monitored(self, path: str, directories: List[str]) -> bool:
+        if path in self.baseline or path in self.monitored_files:
+            return True
+        return any(path.startswith(d.rstrip("/") + "/") for d in directories)
+
+    def check_paths(self, paths: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Check only the given paths against the baseline.
+
+        Args:
+            paths: Files reported as changed (e.g. by inotify)
+
+        Returns:
+            List of violations
+        """
+        directories = self._monitored_directories()
+        violations: List[Dict[str, Any]] = []
+
+        for path in sorted(set(paths)):
+            if not self._is_monitored(path, directories):
+                continue
+
+            state = self.baseline.get(path)
+            if state is not None:
+                violation = self._compare(path, state)
+                if violation:
+                    violations.append(violation)
+            elif os.path.isfile(path):
+                violations.append(self._added_violation(path))
+
+        self._save_refreshed()
+        self._log_violations(violations)
+        return violations
+
+    def watch(
+        self,
+        on_violation: Optional[Callable[[Dict[str, Any]], None]] = None,
+        stop_event: Optional[threading.Event] = None,
+        settle_seconds: float = 0.5,
+    ) -> None:
+        """
+        Check files as they change using inotify (runs until stop_event is set).
+
+        Events are collected for settle_seconds before checking, so a burst of
+        writes to one file is hashed once. Falls back to a full check() when
+        the kernel event queue overflows.
+
+        Args:
+            on_violation: Called with each violation as it is detected
+            stop_event: Event that ends the loop
+            settle_seconds: Debounce window for event bursts
+
+        Raises:
+            FIMError: If inotify is not available
+        """
+        from configurator.utils import inotify
+
+        if not inotify.is_available():
+            raise FIMError("inotify is not available; use periodic 'fim check' instead")
+
+        stop_event = stop_event or threading.Event()
+        directories = self._monitored_directories()
+
+        watched: Set[str] = set()
+        with inotify.Inotify() as watcher:
+            targets = {os.path.dirname(p) for p in self.baseline} | set(self.monitored_files)
+            for directory in directories:
+                for root, _dirs, _names in os.walk(directory):
+                    targets.add(root)
+
+            for target in sorted(targets):
+                if os.path.isdir(target):
+                    try:
+                        watcher.add_watch(target)
+                        watched.add(target)
+                    except OSError as e:
+                        logger.warning(f"Cannot watch {target}: {e}")
+
+            logger.info(f"FIM watching {len(watched)} directories")
+
+            while not stop_event.is_set():
+                events = watcher.read_events(timeout=1.0)
+                if not events:
+                    continue
+
+                deadline = time.monotonic() + settle_seconds
+                while time.monotonic() < deadline:
+                    remaining = max(0.0, deadline - time.monotonic())
+                    events.extend(watcher.read_events(timeout=remaining))
+
+                if any(e.overflowed for e in events):
+                    violations = self.check()
+                else:
+                    changed = {e.path for e in events}
+                    for path in changed:
+                        # New subdirectories inside monitored trees need their own watch
+                        if path not in watched and os.path.isdir(path):
+                            if self._is_monitored(path, directories):
+                                try:
+                                    watcher.add_watch(path)
+                                    watched.add(path)
+                                except OSError:
+                                    pass
+                    violations = self.check_paths(p for p in changed if p not in watched)
+
+                if on_violation:
+                    for violation in violations:
+                        on_violation(violation)
@@ -0,0 +1,232 @@
+"""
+Shared cache of git repositories for clones across users and modules.
+
+The desktop and terminal setup clone the same handful of repositories
+(oh-my-zsh, powerlevel10k, zsh plugins, themes) once per regular user. The
+cache keeps one shallow bare copy of each, fetched at most once per TTL;
+every checkout is a local clone of it (objects hardlinked where the
+filesystem allows) whose origin is pointed back upstream, so later updates
+go to the real remote.
+
+Usage:
+    cache = get_git_cache()
+    source = cache.ensure("https://github.com/zsh-users/zsh-autosuggestions.git")
+    # git clone <source> <dest> && git -C <dest> remote set-url origin <url>
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shlex
+import shutil
+import stat
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+from configurator.utils.command import CommandResult, run_command
+from configurator.utils.file_lock import file_lock
+
+Runner = Callable[..., CommandResult]
+
+
+class GitObjectCache:
+    """
+    Bare, shallow copies of upstream repositories, shared by every clone.
+
+    A repository is cloned on first use and refreshed with a shallow fetch
+    once its copy is older than the TTL (and at most once per process). The
+    cache directory must belong to the current user and not be writable by
+    others, since every user's checkout is built from it; otherwise the
+    cache is not used.
+    """
+
+    DEFAULT_CACHE_DIR = Path("/var/cache/debian-vps-configurator/git")
+    DEFAULT_TTL = 6 * 3600
+    STAMP_FILE = "vps-configurator-fetched"
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: float = DEFAULT_TTL,
+        depth: int = 1,
+        timeout: int = 600,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize GitObjectCache.
+
+        Args:
+            cache_dir: Where the bare repositories live
+            ttl: Seconds before a cached repository is fetched again
+            depth: History depth kept in the cache
+            timeout: Timeout for a clone or fetch, in seconds
+            logger: Optional logger instance
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+        self.ttl = ttl
+        self.depth = depth
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._locks_guard = threading.Lock()
+        self._refreshed: Set[str] = set()
+        self.network_fetches = 0
+
+    @classmethod
+    def default_dir(cls) -> Path:
+        """System cache for root, the user's cache directory otherwise."""
+        if os.geteuid() == 0:
+            return cls.DEFAULT_CACHE_DIR
+        return Path.home() / ".cache" / "debian-vps-configurator" / "git"
+
+    def repo_path(self, url: str) -> Path:
+        """Location of the cached copy of url."""
+        name = url.rstrip("/").rsplit("/", 1)[-1]
+        name = re.sub(r"\.git$", "", name)
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", name) or "repo"
+        digest = hashlib.sha256(url.encode()).hexdigest()[:12]
+        return self.cache_dir / f"{name}-{digest}.git"
+
+    def ensure(self, url: str, run: Runner = run_command) -> Optional[Path]:
+        """
+        Get an up-to-date local copy of a repository to clone from.
+
+        Args:
+            url: Upstream repository URL
+            run: Command runner (a module's run(), so dry-run applies)
+
+        Returns:
+            Path of the bare repository, or None if it cannot be used (clone
+            from upstream instead). A stale copy is returned if the refresh fails.
+        """
+        if not self._prepare_dir():
+            return None
+
+        path = self.repo_path(url)
+        with self._lock_for(url), file_lock(str(path)):
+            exists = (path / "HEAD").exists()
+            if exists and (url in self._refreshed or self._is_fresh(path)):
+                return path
+
+            ok = self._fetch(url, path, run) if exists else self._clone(url, path, run)
+            if ok and (path / "HEAD").exists():
+                (path / self.STAMP_FILE).touch()
+                self._refreshed.add(url)
+                return path
+
+            if exists:
+                self.logger.warning(f"Could not refresh cached {url}, using the cached copy")
+                self._refreshed.add(url)
+                return path
+            return None
+
+    def _lock_for(self, url: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks[url]
+
+    def _prepare_dir(self) -> bool:
+        """Create the cache directory, and check nobody else can write to it."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o755)
+            st = os.lstat(self.cache_dir)
+        except OSError as e:
+            self.logger.debug(f"Git cache unavailable: {e}")
+            return False
+
+        private = (
+            stat.S_ISDIR(st.st_mode)
+            and st.st_uid == os.geteuid()
+            and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+        )
+        if not private:
+            self.logger.warning(
+                f"Not using git cache {self.cache_dir}: not a directory owned by this user "
+                "and closed to others"
+            )
+        return private
+
+    def _is_fresh(self, path: Path) -> bool:
+        try:
+            age = time.time() - (path / self.STAMP_FILE).stat().st_mtime
+        except OSError:
+            return False
+        return age < self.ttl
+
+    def _clone(self, url: str, path: Path, run: Runner) -> bool:
+        self.logger.info(f"Caching {url}")
+        if path.exists():
+            # Left over from an interrupted clone
+            shutil.rmtree(path, ignore_errors=True)
+        self.network_fetches += 1
+        result = run(
+            shlex.join(
+                [
+                    "git",
+                    "clone",
+                    "--quiet",
+                    "--bare",
+                    "--single-branch",
+                    f"--depth={self.depth}",
+                    # Checkouts run as other users and must be able to read the objects
+                    "--config",
+                    "core.sharedRepository=0644",
+                    url,
+                    str(path),
+                ]
+            ),
+            check=False,
+            timeout=self.timeout,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        )
+        return bool(result.success)
+
+    def _fetch(self, url: str, path: Path, run: Runner) -> bool:
+        self.logger.debug(f"Refreshing cached {url}")
+        self.network_fetches += 1
+        head = run(
+            shlex.join(["git", "--git-dir", str(path), "symbolic-ref", "HEAD"]),
+            check=False,
+            timeout=30,
+        )
+        branch = head.stdout.strip() if head.success else ""
+        if not branch.startswith("refs/heads/"):
+            return False
+
+        result = run(
+            shlex.join(
+                [
+                    "git",
+                    "--git-dir",
+                    str(path),
+                    "fetch",
+                    "--quiet",
+                    "--prune",
+                    f"--depth={self.depth}",
+                    "origin",
+                    f"+{branch}:{branch}",
+                ]
+            ),
+            check=False,
+            timeout=self.timeout,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        )
+        return bool(result.success)
+
+
+_cache: Optional[GitObjectCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_git_cache(**kwargs) -> GitObjectCache:
+    """Get the process-wide git cache (kwargs apply on first call only)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GitObjectCache(**kwargs)
+    return _cache
@@ -12,19 +12,21 @@ from configurator.config import ConfigManager
 from configurator.core.container import Container
 from configurator.core.dependency import DependencyGraph
 from configurator.core.dryrun import DryRunManager
-from configurator.core.execution.base import ExecutionContext
+from configurator.core.execution.base import ExecutionContext, ExecutionResult
 
 if TYPE_CHECKING:
-    pass
+    from configurator.modules.base import ConfigurationModule
 
 
 # Sprint 2 Components
 from configurator.core.execution.hybrid import HybridExecutor
 from configurator.core.hooks.events import HookContext, HookEvent
 from configurator.core.hooks.manager import HooksManager
+from configurator.core.mirror import get_active_mirror
 from configurator.core.reporter.base import ReporterInterface
 from configurator.core.reporter.console import ConsoleReporter
 from configurator.core.rollback import RollbackManager
+from configurator.core.state.durations import DurationModel, format_duration
 from configurator.core.state.manager import StateManager
 from configurator.core.validator import SystemValidator
 from configurator.plugins.loader import PluginManager
@@ -82,7 +84,13 @@ class Installer:
             max_workers=self.config.get("performance.max_workers", 4), logger=self.logger
         )
         self.state_manager = StateManager(logger=self.logger)
-        self.validator_orchestrator = ValidationOrchestrator(logger=self.logger)
+        self.validator_orchestrator = ValidationOrchestrator(
+            logger=self.logger,
+            state_manager=self.state_manager,
+            cache_ttl=self.config.get(
+                "performance.validation_cache_ttl", ValidationOrchestrator.DEFAULT_CACHE_TTL
+            ),
+        )
 
         self.logger.info("Installer initialized with Sprint 2 components")
 
@@ -153,59 +161,7 @@ class Installer:
 
     def _register_modules(self) -> None:
         """Register all available modules."""
-        # Helper for lazy loading to verify class existence and typing without runtime impact
-        # We perform runtime imports here to strictly control loading order and avoid circularity
-        # but the static typing is handled above.
-
-        from configurator.modules.caddy import CaddyModule
-        from configurator.modules.cis_compliance import CISComplianceModule
-        from configurator.modules.cursor import CursorModule
-        from configurator.modules.databases import DatabasesModule
-        from configurator.modules.desktop import DesktopModule
-        from configurator.modules.devops import DevOpsModule
-        from configurator.modules.docker import DockerModule
-        from configurator.modules.git import GitModule
-        from configurator.modules.golang import GolangModule
-        from configurator.modules.java import JavaModule
-        from configurator.modules.neovim import NeovimModule
-        from configurator.modules.netdata import NetdataModule
-        from configurator.modules.nodejs import NodeJSModule
-        from configurator.modules.php import PHPModule
-        from configurator.modules.python import PythonModule
-        from configurator.modules.rbac import RBACModule
-        from configurator.modules.rust import RustModule
-        from configurator.modules.security import SecurityModule
-        from configurator.modules.system import SystemModule
-        from configurator.modules.trivy_scanner import TrivyScannerModule
-        from configurator.modules.utilities import UtilitiesModule
-        from configurator.modules.vscode import VSCodeModule
-        from configurator.modules.wireguard import WireGuardModule
-
-        module_classes = {
-            "system": SystemModule,
-            "security": SecurityModule,
-            "cis_compliance": CISComplianceModule,
-            "trivy_scanner": TrivyScannerModule,
-            "rbac": RBACModule,
-            "desktop": DesktopModule,
-            "python": PythonModule,
-            "nodejs": NodeJSModule,
-            "golang": GolangModule,
-            "rust": RustModule,
-            "java": JavaModule,
-            "php": PHPModule,
-            "docker": DockerModule,
-            "git": GitModule,
-            "databases": DatabasesModule,
-            "devops": DevOpsModule,
-            "utilities": UtilitiesModule,
-            "vscode": VSCodeModule,
-            "cursor": CursorModule,
-            "neovim": NeovimModule,
-            "wireguard": WireGuardModule,
-            "caddy": CaddyModule,
-            "netdata": NetdataModule,
-        }
+        module_classes = get_module_classes()
 
         for name, cls in module_classes.items():
             self.container.factory(
@@ -221,9 +177,18 @@ class Installer:
             )
 
     def install(
-        self, skip_validation: bool = False, dry_run: bool = False, parallel: bool = True
+        self,
+        skip_validation: bool = False,
+        dry_run: bool = False,
+        parallel: bool = True,
+        force: bool = False,
     ) -> bool:
-        """Run the full installation."""
+        """
+        Run the full installation.
+
+        Modules whose desired state is already applied are skipped as
+        "converged" unless force is set.
+        """
         try:
             if dry_run:
                 self.dry_run_manager.enable()
@@ -245,6 +210,11 @@ class Installer:
             self.plugin_manager.load_plugins()
             self.hooks_manager.execute(HookEvent.BEFORE_INSTALLATION)
 
+            # 2.1 Offline mirror: let APT find mirrored packages in its archive cache
+            mirror = get_active_mirror()
+            if mirror is not None and not dry_run:
+                mirror.seed_apt_archives()
+
             # 2.5 User Provisioning (New)
             prov_user = self.config.get("provisioning.user")
             if prov_user:
@@ -398,9 +368,28 @@ class Installer:
                     self.hooks_manager.execute(HookEvent.ON_MODULE_ERROR, context)
                     self.reporter.complete_phase(False, module=module_name)
 
+                elif stage == "step_completed":
+                    note = "resumed" if data.get("resumed") else f"{data['duration']:.1f}s"
+                    self.reporter.update(f"{data['step']} ({note})", module=module_name)
+
+                elif stage == "converged":
+                    self.reporter.start_phase(module_name)
+                    self.reporter.update("Already converged", module=module_name)
+                    self.reporter.complete_phase(True, module=module_name)
+
             total_batches = len(batches)
             self.logger.info(f"Starting execution of {total_batches} batches")
 
+            durations = self._load_duration_model()
+            if durations:
+                self.reporter.set_expected_durations(
+                    durations.expected_many(m for batch in batches for m in batch)
+                )
+                estimate = durations.batches_duration(
+                    batches, workers=self.hybrid_executor.parallel_executor.max_workers
+                )
+                self.logger.info(f"Estimated installation time: {format_duration(estimate)}")
+
             for i, batch in enumerate(batches, 1):
                 self.logger.info(f"Batch {i}/{total_batches}: {', '.join(batch)}")
 
@@ -414,18 +403,29 @@ class Installer:
                         module_instance=module,
                         config=config,
                         dry_run=dry_run,
+                        force=force,
+                        state_manager=self.state_manager,
+                        expected_duration=durations.expected(module_name) if durations else None,
                     )
                     contexts.append(ctx)
 
                 # Execute batch
                 results = self.hybrid_executor.execute(contexts, callback=execution_callback)
                 execution_results.update(results)
+                if not dry_run:
+                    self._record_durations(results)
 
                 # Check for critical failures in batch
                 if any(not r.success for r in results.values()):
                     self.logger.error("Batch failed. Stopping.")
                     break
 
+            converged = [name for name, res in execution_results.items() if res.converged]
+            if converged:
+                self.logger.info(
+                    f"{len(converged)} module(s) already converged: {', '.join(converged)}"
+                )
+
             # 5. Summary
             summary_results = {name: res.success for name, res in execution_results.items()}
             self.reporter.show_summary(summary_results)
@@ -446,29 +446,30 @@ class Installer:
             self.hooks_manager.execute(HookEvent.ON_INSTALLATION_ERROR, error=str(e))
             return False
 
+    def _load_duration_model(self) -> Optional[DurationModel]:
+        """Duration model from past runs, or None without history."""
+        try:
+            model = DurationModel.from_state(self.state_manager)
+        except Exception as e:
+            self.logger.debug(f"Could not load module durations: {e}")
+            return None
+        return model or None
+
+    def _record_durations(self, results: Dict[str, ExecutionResult]) -> None:
+        """Record module run times for the duration model; converged skips are not runs."""
+        for name, result in results.items():
+            if result.converged:
+                continue
+            try:
+                self.state_manager.record_module_duration(
+                    name, result.duration_seconds, success=result.success
+                )
+            except Exception as e:
+                self.logger.debug(f"Could not record duration of {name}: {e}")
+
     def _get_module_config(self, module_name: str) -> Dict[str, Any]:
         """Get configuration for a specific module."""
-        paths = [
-            f"tools.{module_name}",
-            f"tools.editors.{module_name}",
-            f"languages.{module_name}",
-            f"networking.{module_name}",
-            f"monitoring.{module_name}",
-            module_name,
-        ]
-        for path in paths:
-            config = self.config.get(path)
-            if config is not None:
-                module_config = config if isinstance(config, dict) else {"enabled": config}
-                if module_name == "security":
-                    advanced_security = self.config.get("security_advanced", {})
-                    if isinstance(advanced_security, dict) and advanced_security:
-                        module_config = {
-                            **module_config,
-                            "security_advanced": advanced_security,
-                        }
-                return module_config
-        return {}
+        return get_module_config(self.config, module_name)
 
     def rollback(self) -> bool:
         """Rollback changes."""
@@ -510,3 +511,62 @@ class Installer:
         # Show summary
         self.reporter.show_summary(results)
         return all(results.values())
+
+
+def get_module_classes() -> Dict[str, Type["ConfigurationModule"]]:
+    """Map module names to their classes."""
+    # Runtime imports strictly control loading order and avoid circularity
+    from configurator.modules.caddy import CaddyModule
+    from configurator.modules.cis_compliance import CISComplianceModule
+    from configurator.modules.cursor import CursorModule
+    from configurator.modules.databases import DatabasesModule
+    from configurator.modules.desktop import DesktopModule
+    from configurator.modules.devops import DevOpsModule
+    from configurator.modules.docker import DockerModule
+    from configurator.modules.git import GitModule
+    from configurator.modules.golang import GolangModule
+    from configurator.modules.java import JavaModule
+    from configurator.modules.neovim import NeovimModule
+    from configurator.modules.netdata import NetdataModule
+    from configurator.modules.nodejs import NodeJSModule
+    from configurator.modules.php import PHPModule
+    from configurator.modules.python import PythonModule
+    from configurator.modules.rbac import RBACModule
+    from configurator.modules.rust import RustModule
+    from configurator.modules.security import SecurityModule
+    from configurator.modules.system import SystemModule
+    from configurator.modules.trivy_scanner import TrivyScannerModule
+    from configurator.modules.utilities import UtilitiesModule
+    from configurator.modules.vscode import VSCodeModule
+    from configurator.modules.wireguard import WireGuardModule
+
+    return {
+        "system": SystemModule,
+        "security": SecurityModule,
+        "cis_compliance": CISComplianceModule,
+        "trivy_scanner": TrivyScannerModule,
+        "rbac": RBACModule,
+        "desktop": DesktopModule,
+        "python": PythonModule,
+        "nodejs": NodeJSModule,
+        "golang": GolangModule,
+        "rust": RustModule,
+        "java": JavaModule,
+        "php": PHPModule,
+        "docker": DockerModule,
+        "git": GitModule,
+        "databases": DatabasesModule,
+        "devops": DevOpsModule,
+        "utilities": UtilitiesModule,
+        "vscode": VSCodeModule,
+        "cursor": CursorModule,
+        "neovim": NeovimModule,
+        "wireguard": WireGuardModule,
+        "caddy": CaddyModule,
+        "netdata": NetdataModule,
+    }
+
+
+def get_module_config(config: ConfigManager, module_name: str) -> Dict[str, Any]:
+    """Get configuration for a specific module."""
+    return config.get_module_config(module_name)
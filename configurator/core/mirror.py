@@ -0,0 +1,686 @@
+"""
+Offline artifact mirror for fleet installs.
+
+Every server installing the same profile fetches the same installer scripts,
+toolchain archives, git repositories and .deb packages. A mirror bundle holds
+each of them once, content-addressed by SHA256:
+
+    <mirror>/
+        index.json              # artifact key -> object digest and metadata
+        objects/ab/ab12...ef    # file, git bundle or .deb, named by digest
+
+``vps-configurator mirror build --profile X --output DIR`` fills a bundle and
+``vps-configurator install --mirror DIR|URL`` serves every fetch it can from
+it, falling back to the network for anything missing. A remote mirror is the
+same directory behind any static HTTP server.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+import requests
+
+from configurator.exceptions import NetworkError
+from configurator.utils.download import DownloadEngine, DownloadTask, get_download_engine
+from configurator.utils.hashing import get_hash_service
+
+if TYPE_CHECKING:
+    from configurator.config import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_KINDS = ("file", "git", "deb")
+INDEX_VERSION = 1
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _is_sha256(value: Any) -> bool:
+    return isinstance(value, str) and bool(_SHA256_RE.match(value.lower()))
+
+
+def normalize_git_url(url: str) -> str:
+    """Canonical form of a git URL ("…/repo.git", "…/repo" and "…/repo/" match)."""
+    url = url.rstrip("/")
+    return url[:-4] if url.endswith(".git") else url
+
+
+@dataclass
+class Artifact:
+    """
+    Something an install fetches from the network.
+
+    Attributes:
+        kind: "file" (URL), "git" (repository URL) or "deb" (APT package name)
+        source: URL or package name
+        sha256: Expected digest of a file
+        ref: Commit a git repository must contain
+    """
+
+    kind: str
+    source: str
+    sha256: Optional[str] = None
+    ref: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in ARTIFACT_KINDS:
+            raise ValueError(f"Unknown artifact kind: {self.kind}")
+        if self.kind == "git":
+            self.source = normalize_git_url(self.source)
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}:{self.source}"
+
+
+@dataclass
+class MirrorEntry:
+    """An artifact stored in a mirror."""
+
+    kind: str
+    source: str
+    sha256: str
+    size: int
+    ref: Optional[str] = None
+    filename: Optional[str] = None  # original .deb filename
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}:{self.source}"
+
+    @property
+    def object_path(self) -> str:
+        return f"objects/{self.sha256[:2]}/{self.sha256}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to dictionary."""
+        data: Dict[str, Any] = {
+            "kind": self.kind,
+            "source": self.source,
+            "sha256": self.sha256,
+            "size": self.size,
+        }
+        if self.ref:
+            data["ref"] = self.ref
+        if self.filename:
+            data["filename"] = self.filename
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MirrorEntry":
+        """Deserialize from dictionary."""
+        return cls(
+            kind=data["kind"],
+            source=data["source"],
+            sha256=data["sha256"],
+            size=data.get("size", 0),
+            ref=data.get("ref"),
+            filename=data.get("filename"),
+        )
+
+
+def checksum_pins(checksums: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """
+    Collect URL pins from the checksum database (security/checksums.yaml).
+
+    Returns:
+        Mapping of URL to {"sha256": ...} and/or {"commit": ...}; placeholder
+        checksums are ignored
+    """
+    pins: Dict[str, Dict[str, str]] = {}
+
+    def walk(node: Any) -> None:
+        if not isinstance(node, dict):
+            return
+        url = node.get("url")
+        if isinstance(url, str):
+            pin: Dict[str, str] = {}
+            if _is_sha256(node.get("sha256")):
+                pin["sha256"] = node["sha256"].lower()
+            if isinstance(node.get("commit"), str):
+                pin["commit"] = node["commit"]
+            if pin:
+                key = normalize_git_url(url) if "commit" in pin else url
+                pins[key] = pin
+        for value in node.values():
+            walk(value)
+
+    walk(checksums)
+    return pins
+
+
+# ----------------------------------------------------------------------
+# Consuming a mirror
+# ----------------------------------------------------------------------
+
+
+class ArtifactMirror:
+    """
+    Read side of a mirror bundle (local directory or HTTP base URL).
+
+    Every object is verified against its digest before it is handed out.
+
+    Usage:
+        mirror = ArtifactMirror("/srv/vps-mirror")   # or "http://10.0.0.5:8000"
+        set_active_mirror(mirror)
+
+        # DownloadEngine, SecureDownloader and module git clones now use it
+        mirror.seed_apt_archives()
+    """
+
+    INDEX_FILE = "index.json"
+    DEFAULT_CACHE_DIR = Path("/var/cache/debian-vps-configurator/mirror")
+    APT_ARCHIVES_DIR = Path("/var/cache/apt/archives")
+
+    def __init__(
+        self,
+        location: str,
+        engine: Optional[DownloadEngine] = None,
+        cache_dir: Optional[Path] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize ArtifactMirror.
+
+        Args:
+            location: Mirror directory or http(s) base URL
+            engine: Download engine for remote mirrors
+            cache_dir: Where git bundles from a remote mirror are kept
+            logger: Optional logger instance
+        """
+        self.location = str(location).rstrip("/")
+        self.is_remote = self.location.startswith(("http://", "https://"))
+        self.root = None if self.is_remote else Path(self.location)
+        self.engine = engine or get_download_engine()
+        self.cache_dir = cache_dir or self.DEFAULT_CACHE_DIR
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._entries: Optional[Dict[str, MirrorEntry]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    @property
+    def entries(self) -> Dict[str, MirrorEntry]:
+        """Index entries by artifact key (loaded on first use)."""
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._entries = self._load_index()
+        return self._entries
+
+    def _load_index(self) -> Dict[str, MirrorEntry]:
+        """
+        Read index.json.
+
+        Raises:
+            NetworkError: If the index cannot be read. A mirror that was asked
+                for but cannot be used is an error, not an empty mirror: the
+                install would silently go to the network instead.
+        """
+        try:
+            if self.root is not None:
+                data = json.loads((self.root / self.INDEX_FILE).read_text())
+            else:
+                response = self.engine.session.get(
+                    f"{self.location}/{self.INDEX_FILE}", timeout=self.engine.timeout
+                )
+                response.raise_for_status()
+                data = response.json()
+            entries = {}
+            for item in data.get("artifacts", {}).values():
+                entry = MirrorEntry.from_dict(item)
+                entries[entry.key] = entry
+        except (OSError, ValueError, KeyError, AttributeError, requests.RequestException) as e:
+            raise NetworkError(
+                url=f"{self.location}/{self.INDEX_FILE}",
+                what=f"Mirror index unavailable at {self.location}",
+                why=str(e),
+                how=(
+                    "1. Check the mirror path or URL\n"
+                    "2. Rebuild it: vps-configurator mirror build --profile <name> --output <dir>\n"
+                    "3. Or install without --mirror"
+                ),
+            ) from e
+
+        self.logger.debug(f"Loaded mirror index with {len(entries)} artifacts")
+        return entries
+
+    def lookup(self, kind: str, source: str) -> Optional[MirrorEntry]:
+        """Find an artifact in the index."""
+        if kind == "git":
+            source = normalize_git_url(source)
+        return self.entries.get(f"{kind}:{source}")
+
+    def _materialize(self, entry: MirrorEntry, destination: Path) -> bool:
+        """Copy (or download) an object to destination, verifying its digest."""
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.root is None:
+            try:
+                self.engine.fetch(
+                    f"{self.location}/{entry.object_path}",
+                    destination,
+                    expected_sha256=entry.sha256,
+                    use_mirror=False,
+                )
+                return True
+            except (requests.RequestException, NetworkError, OSError) as e:
+                self.logger.warning(f"Mirror fetch failed for {entry.source}: {e}")
+                return False
+
+        source = self.root / entry.object_path
+        partial = destination.with_name(destination.name + ".part")
+        hasher = hashlib.sha256()
+        try:
+            with open(source, "rb") as src, open(partial, "wb") as dst:
+                while True:
+                    block = src.read(1024 * 1024)
+                    if not block:
+                        break
+                    hasher.update(block)
+                    dst.write(block)
+        except OSError as e:
+            partial.unlink(missing_ok=True)
+            self.logger.warning(f"Mirror object unreadable for {entry.source}: {e}")
+            return False
+
+        if hasher.hexdigest() != entry.sha256:
+            partial.unlink(missing_ok=True)
+            self.logger.error(f"Mirror object corrupted for {entry.source}; ignoring it")
+            return False
+
+        os.replace(partial, destination)
+        get_hash_service().remember(destination, entry.sha256)
+        return True
+
+    def fetch_file(self, url: str, destination: Path) -> Optional[str]:
+        """
+        Satisfy a file download from the mirror.
+
+        Returns:
+            SHA256 of the file, or None if the mirror cannot provide it
+        """
+        entry = self.lookup("file", url)
+        if entry is None or not self._materialize(entry, Path(destination)):
+            return None
+
+        self.hits += 1
+        self.logger.debug(f"Served from mirror: {url}")
+        return entry.sha256
+
+    def git_bundle(self, url: str) -> Optional[Path]:
+        """
+        Get a git bundle of a repository, usable as a clone source.
+
+        Returns:
+            Path to the verified bundle, or None if the mirror lacks it
+        """
+        entry = self.lookup("git", url)
+        if entry is None:
+            return None
+
+        if self.root is not None:
+            path = self.root / entry.object_path
+        else:
+            path = self.cache_dir / entry.object_path
+            if not path.exists() and not self._materialize(entry, path):
+                return None
+            path.chmod(0o644)
+
+        try:
+            if not get_hash_service().verify_file(path, entry.sha256):
+                self.logger.error(f"Mirror bundle corrupted for {url}; ignoring it")
+                return None
+        except OSError:
+            return None
+
+        self.hits += 1
+        return path
+
+    def seed_apt_archives(self, archives_dir: Optional[Path] = None) -> int:
+        """
+        Copy mirrored .deb packages into APT's archive cache.
+
+        APT then installs matching versions without downloading them.
+
+        Returns:
+            Number of packages placed
+        """
+        archives_dir = archives_dir or self.APT_ARCHIVES_DIR
+        if not archives_dir.exists():
+            self.logger.debug(f"APT archives directory not found: {archives_dir}")
+            return 0
+
+        seeded = 0
+        for entry in self.entries.values():
+            if entry.kind != "deb" or not entry.filename:
+                continue
+            target = archives_dir / entry.filename
+            if target.exists() and target.stat().st_size == entry.size:
+                continue
+            if self._materialize(entry, target):
+                seeded += 1
+
+        if seeded:
+            self.logger.info(f"Seeded {seeded} package(s) from mirror into {archives_dir}")
+        return seeded
+
+    def verify(self) -> List[str]:
+        """
+        Check every object of a local mirror against its digest.
+
+        Returns:
+            Keys of missing or corrupted artifacts
+        """
+        if self.root is None:
+            raise ValueError("Only local mirrors can be verified")
+
+        entries = list(self.entries.values())
+        digests = get_hash_service().hash_files(self.root / e.object_path for e in entries)
+        return [e.key for e in entries if digests.get(str(self.root / e.object_path)) != e.sha256]
+
+
+_active_mirror: Optional[ArtifactMirror] = None
+
+
+def get_active_mirror() -> Optional[ArtifactMirror]:
+    """Get the mirror installs are currently served from, if any."""
+    return _active_mirror
+
+
+def set_active_mirror(mirror: Optional[ArtifactMirror]) -> None:
+    """
+    Serve downloads from mirror (None switches mirror mode off).
+
+    The shared download engine consults it first, so SecureDownloader and
+    module downloads need no changes to benefit.
+    """
+    global _active_mirror
+    _active_mirror = mirror
+    get_download_engine().mirror = mirror
+
+
+# ----------------------------------------------------------------------
+# Building a mirror
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class MirrorBuildReport:
+    """Outcome of a mirror build."""
+
+    stored: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    total_bytes: int = 0
+
+    @property
+    def success(self) -> bool:
+        return not self.failed
+
+
+class MirrorBuilder:
+    """
+    Fetches a profile's artifacts into a content-addressed mirror bundle.
+
+    Rebuilding into an existing bundle only fetches what is missing or whose
+    pinned checksum changed.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        engine: Optional[DownloadEngine] = None,
+        checksums: Optional[Dict[str, Any]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize MirrorBuilder.
+
+        Args:
+            output_dir: Bundle directory (created if needed)
+            engine: Download engine
+            checksums: Checksum database (as loaded from security/checksums.yaml)
+            logger: Optional logger instance
+        """
+        self.root = Path(output_dir)
+        self.engine = engine or get_download_engine()
+        self.pins = checksum_pins(checksums or {})
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, MirrorEntry] = {}
+        if (self.root / ArtifactMirror.INDEX_FILE).exists():
+            self.entries = dict(ArtifactMirror(str(self.root), engine=self.engine).entries)
+
+    def _store(self, path: Path, digest: str) -> Path:
+        """Move a fetched file into the object store."""
+        target = self.root / "objects" / digest[:2] / digest
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            path.unlink()
+        else:
+            os.replace(path, target)
+            target.chmod(0o644)
+        return target
+
+    def _is_current(self, artifact: Artifact, expected: Optional[str]) -> bool:
+        entry = self.entries.get(artifact.key)
+        if entry is None or not (self.root / entry.object_path).exists():
+            return False
+        if artifact.kind == "file" and expected and entry.sha256 != expected:
+            return False
+        if artifact.kind == "git" and artifact.ref and entry.ref != artifact.ref:
+            return False
+        return True
+
+    def _add_files(self, artifacts: List[Artifact], staging: Path, report: MirrorBuildReport):
+        tasks = []
+        for index, artifact in enumerate(artifacts):
+            expected = artifact.sha256 or self.pins.get(artifact.source, {}).get("sha256")
+            tasks.append(DownloadTask(artifact.source, staging / f"file-{index}", expected))
+
+        for artifact, result in zip(
+            artifacts, self.engine.download_many(tasks, use_mirror=False), strict=True
+        ):
+            if not result.success or not result.sha256:
+                report.failed[artifact.key] = result.error or "download failed"
+                continue
+            self._store(result.destination, result.sha256)
+            self.entries[artifact.key] = MirrorEntry(
+                kind="file", source=artifact.source, sha256=result.sha256, size=result.size
+            )
+            report.stored.append(artifact.key)
+            report.total_bytes += result.size
+
+    def _git(self, *args: str) -> subprocess.CompletedProcess:
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        return subprocess.run(["git", *args], capture_output=True, text=True, timeout=1800, env=env)
+
+    def _add_git(self, artifact: Artifact, staging: Path, report: MirrorBuildReport) -> None:
+        ref = artifact.ref or self.pins.get(artifact.source, {}).get("commit")
+        repo = staging / f"git-{hashlib.sha256(artifact.source.encode()).hexdigest()[:16]}"
+        bundle = repo.with_suffix(".bundle")
+
+        result = self._git("clone", "--mirror", "--quiet", artifact.source, str(repo))
+        if result.returncode != 0:
+            report.failed[artifact.key] = result.stderr.strip() or "git clone failed"
+            return
+
+        if ref and self._git("-C", str(repo), "cat-file", "-e", f"{ref}^{{commit}}").returncode:
+            report.failed[artifact.key] = f"pinned commit {ref} not found"
+            return
+
+        result = self._git("-C", str(repo), "bundle", "create", str(bundle), "--all")
+        if result.returncode != 0:
+            report.failed[artifact.key] = result.stderr.strip() or "git bundle failed"
+            return
+
+        digest = get_hash_service().hash_file(bundle)
+        size = bundle.stat().st_size
+        self._store(bundle, digest)
+        self.entries[artifact.key] = MirrorEntry(
+            kind="git", source=artifact.source, sha256=digest, size=size, ref=ref
+        )
+        report.stored.append(artifact.key)
+        report.total_bytes += size
+
+    def _resolve_deb_dependencies(self, packages: List[str]) -> List[str]:
+        """Expand packages with their (non-recommended) dependency closure."""
+        result = subprocess.run(
+            [
+                "apt-cache",
+                "depends",
+                "--recurse",
+                "--no-recommends",
+                "--no-suggests",
+                "--no-conflicts",
+                "--no-breaks",
+                "--no-replaces",
+                "--no-enhances",
+                *packages,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
+        if result.returncode != 0:
+            return packages
+
+        # Every package in the closure appears as an unindented line; virtual
+        # packages are shown as <name> and are satisfied by a real one
+        names = set(packages)
+        for line in result.stdout.splitlines():
+            if line and not line[0].isspace() and not line.startswith("<"):
+                names.add(line.strip())
+        return sorted(names)
+
+    def _add_debs(self, artifacts: List[Artifact], staging: Path, report: MirrorBuildReport):
+        wanted = {a.source: a for a in artifacts}
+        packages = self._resolve_deb_dependencies(sorted(wanted))
+        deb_dir = staging / "debs"
+        deb_dir.mkdir()
+
+        # One apt-get call per package so a single missing name does not sink the batch
+        for name in packages:
+            result = subprocess.run(
+                ["apt-get", "download", "-q", name],
+                cwd=deb_dir,
+                capture_output=True,
+                text=True,
+                timeout=600,
+            )
+            if result.returncode != 0 and name in wanted:
+                report.failed[wanted[name].key] = result.stderr.strip() or "apt-get download failed"
+
+        debs = sorted(deb_dir.glob("*.deb"))
+        digests = get_hash_service().hash_files(debs)
+        for deb in debs:
+            digest = digests.get(str(deb))
+            if digest is None:
+                continue
+            name = deb.name.split("_", 1)[0]
+            key = f"deb:{name}"
+            size = deb.stat().st_size
+            self._store(deb, digest)
+            self.entries[key] = MirrorEntry(
+                kind="deb", source=name, sha256=digest, size=size, filename=deb.name
+            )
+            report.stored.append(key)
+            report.total_bytes += size
+
+    def build(
+        self, artifacts: Iterable[Artifact], profile: Optional[str] = None
+    ) -> MirrorBuildReport:
+        """
+        Fetch artifacts into the bundle and write its index.
+
+        Args:
+            artifacts: What to mirror (duplicates are ignored)
+            profile: Profile name recorded in the index
+
+        Returns:
+            MirrorBuildReport
+        """
+        report = MirrorBuildReport()
+        pending: Dict[str, List[Artifact]] = {kind: [] for kind in ARTIFACT_KINDS}
+        seen = set()
+
+        for artifact in artifacts:
+            if artifact.key in seen:
+                continue
+            seen.add(artifact.key)
+            expected = artifact.sha256 or self.pins.get(artifact.source, {}).get("sha256")
+            if self._is_current(artifact, expected):
+                report.reused.append(artifact.key)
+            else:
+                pending[artifact.kind].append(artifact)
+
+        with tempfile.TemporaryDirectory(dir=self.root, prefix=".staging-") as tmp:
+            staging = Path(tmp)
+            if pending["file"]:
+                self._add_files(pending["file"], staging, report)
+            for artifact in pending["git"]:
+                self._add_git(artifact, staging, report)
+            if pending["deb"]:
+                if shutil.which("apt-get"):
+                    self._add_debs(pending["deb"], staging, report)
+                else:
+                    for artifact in pending["deb"]:
+                        report.failed[artifact.key] = "apt-get not available"
+
+        self._write_index(profile)
+        return report
+
+    def _write_index(self, profile: Optional[str]) -> None:
+        data = {
+            "version": INDEX_VERSION,
+            "created": datetime.now().isoformat(),
+            "profile": profile,
+            "artifacts": {key: entry.to_dict() for key, entry in sorted(self.entries.items())},
+        }
+        index = self.root / ArtifactMirror.INDEX_FILE
+        tmp = index.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        tmp.replace(index)
+        index.chmod(0o644)
+
+
+def resolve_profile_artifacts(
+    config: "ConfigManager", logger: Optional[logging.Logger] = None
+) -> List[Artifact]:
+    """
+    List every artifact the enabled modules of a configuration would fetch.
+
+    Args:
+        config: Loaded configuration (profile applied)
+        logger: Logger passed to the modules
+
+    Returns:
+        Artifacts in module order
+    """
+    from configurator.core.installer import get_module_classes, get_module_config
+
+    logger = logger or logging.getLogger(__name__)
+    module_classes = get_module_classes()
+    artifacts: List[Artifact] = []
+
+    for name in config.get_enabled_modules():
+        cls = module_classes.get(name)
+        if cls is None:
+            continue
+        module = cls(config=get_module_config(config, name), logger=logger)
+        artifacts.extend(module.mirror_artifacts())
+
+    return artifacts
@@ -7,14 +7,20 @@ for all network-dependent operations.
 
 import logging
 import random
+import shutil
 import subprocess
 import time
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, cast
 
+from configurator.core.git_cache import get_git_cache
+from configurator.core.mirror import get_active_mirror
 from configurator.utils.circuit_breaker import CircuitBreaker, CircuitBreakerError
+from configurator.utils.command import run_command
+from configurator.utils.network import first_success
 
 
 class NetworkOperationType(Enum):
@@ -233,14 +239,15 @@ class NetworkOperationWrapper:
         self.logger.info("Updating APT package lists (with retry protection)...")
 
         def apt_update() -> bool:
-            result = subprocess.run(
+            result = run_command(
                 ["apt-get", "update"],
-                capture_output=True,
-                text=True,
+                check=False,
                 timeout=self.retry_config.apt_timeout,
+                resource="dpkg",
+                logger=self.logger,
             )
 
-            if result.returncode != 0:
+            if result.return_code != 0:
                 raise Exception(f"APT update failed: {result.stderr}")
 
             return True
@@ -277,33 +284,32 @@ class NetworkOperationWrapper:
             # This ensures output is generated during long installations
             cmd = ["apt-get", "install", "-y", "-q", "--show-progress"] + packages
 
-            # Use Popen to stream output in real-time for better visibility
-            process = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
-            )
+            last_log_time = time.time()
 
-            # Stream output line by line to show progress
-            if process.stdout is None:
-                raise Exception("Failed to capture stdout")
+            def show_progress(stream: str, line: str) -> None:
+                nonlocal last_log_time
+                # Log every 30 seconds to show progress without spamming
+                current_time = time.time()
+                if current_time - last_log_time >= 30:
+                    # Extract progress info if available
+                    if "%" in line or "Setting up" in line or "Unpacking" in line:
+                        self.logger.info(f"Progress: {line.strip()}")
+                        last_log_time = current_time
+                    elif "Get:" in line or "Fetched" in line:
+                        # Show download progress
+                        self.logger.debug(f"Download: {line.strip()[:80]}")
+
+            # Output is streamed line by line; only its tail is kept in memory
+            result = run_command(
+                cmd,
+                check=False,
+                resource="dpkg",
+                on_line=show_progress,
+                logger=self.logger,
+            )
 
-            last_log_time = time.time()
-            for line in iter(process.stdout.readline, ""):
-                if line:
-                    # Log every 30 seconds to show progress without spamming
-                    current_time = time.time()
-                    if current_time - last_log_time >= 30:
-                        # Extract progress info if available
-                        if "%" in line or "Setting up" in line or "Unpacking" in line:
-                            self.logger.info(f"Progress: {line.strip()}")
-                            last_log_time = current_time
-                        elif "Get:" in line or "Fetched" in line:
-                            # Show download progress
-                            self.logger.debug(f"Download: {line.strip()[:80]}")
-
-            process.wait()
-
-            if process.returncode != 0:
-                raise Exception(f"Package installation failed with exit code {process.returncode}")
+            if result.return_code != 0:
+                raise Exception(f"Package installation failed with exit code {result.return_code}")
 
             return True
 
@@ -331,6 +337,11 @@ class NetworkOperationWrapper:
         dest_path = Path(dest)
         dest_path.parent.mkdir(parents=True, exist_ok=True)
 
+        mirror = get_active_mirror()
+        if mirror is not None and mirror.fetch_file(url, dest_path):
+            self.logger.info(f"Served from mirror: {url}")
+            return dest_path
+
         self.logger.info(f"Downloading: {url}")
 
         def download() -> Path:
@@ -385,7 +396,28 @@ class NetworkOperationWrapper:
 
         self.logger.info(f"Cloning: {url}")
 
+        # Other users and modules clone the same repositories; share one local copy
+        source = None
+        if branch is None:
+            cached = get_git_cache().ensure(url)
+            source = str(cached) if cached is not None else None
+
         def git_clone() -> bool:
+            if source is not None:
+                result = run_command(
+                    ["git", "clone", "--quiet", source, str(dest_path)],
+                    check=False,
+                    resource="cpu",
+                    logger=self.logger,
+                )
+                if result.success:
+                    run_command(
+                        ["git", "-C", str(dest_path), "remote", "set-url", "origin", url],
+                        check=False,
+                    )
+                    return True
+                shutil.rmtree(dest_path, ignore_errors=True)
+
             cmd = ["git", "clone"]
 
             if depth:
@@ -396,12 +428,16 @@ class NetworkOperationWrapper:
 
             cmd.extend([url, str(dest_path)])
 
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=self.retry_config.git_timeout
+            upstream = run_command(
+                cmd,
+                check=False,
+                timeout=self.retry_config.git_timeout,
+                resource="network",
+                logger=self.logger,
             )
 
-            if result.returncode != 0:
-                raise Exception(f"Git clone failed: {result.stderr}")
+            if not upstream.success:
+                raise Exception(f"Git clone failed: {upstream.stderr}")
 
             return True
 
@@ -427,20 +463,19 @@ class NetworkOperationWrapper:
         if not test_urls:
             test_urls = ["https://deb.debian.org", "https://github.com", "https://google.com"]
 
-        for url in test_urls:
-            try:
-                result = subprocess.run(
-                    ["curl", "-fsSL", "--connect-timeout", "5", "--max-time", "10", url],
-                    capture_output=True,
-                    timeout=15,
-                )
-
-                if result.returncode == 0:
-                    self.logger.debug(f"✅ Connectivity check passed: {url}")
-                    return True
+        def reachable(url: str) -> bool:
+            result = subprocess.run(
+                ["curl", "-fsSL", "--connect-timeout", "5", "--max-time", "10", url],
+                capture_output=True,
+                timeout=15,
+            )
+            return result.returncode == 0
 
-            except Exception:
-                continue
+        # All URLs are tried at once; the first that answers decides
+        winner = first_success([partial(reachable, url) for url in test_urls])
+        if winner is not None:
+            self.logger.debug(f"✅ Connectivity check passed: {test_urls[winner]}")
+            return True
 
         self.logger.warning("⚠️  Internet connectivity check failed")
         return False
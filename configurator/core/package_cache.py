@@ -4,7 +4,6 @@ Package Cache Manager for optimizing bandwidth and installation speed.
 Handles storage, indexing, retrieval, and eviction of cached packages.
 """
 
-import hashlib
 import json
 import logging
 import shutil
@@ -14,6 +13,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from configurator.utils.hashing import FileSignature, get_hash_service
+
 
 @dataclass
 class CachedPackage:
@@ -29,6 +30,8 @@ class CachedPackage:
     cached_at: datetime
     last_accessed: datetime
     access_count: int = 0
+    # Stat signature of the cached file when its hash was last verified
+    file_signature: Optional[List[int]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize to dictionary"""
@@ -43,6 +46,7 @@ class CachedPackage:
             "cached_at": self.cached_at.isoformat(),
             "last_accessed": self.last_accessed.isoformat(),
             "access_count": self.access_count,
+            "file_signature": self.file_signature,
         }
 
     @classmethod
@@ -61,6 +65,7 @@ class CachedPackage:
             cached_at=datetime.fromisoformat(data["cached_at"]),
             last_accessed=datetime.fromisoformat(data["last_accessed"]),
             access_count=data.get("access_count", 0),
+            file_signature=data.get("file_signature"),
         )
 
 
@@ -72,7 +77,7 @@ class PackageCacheManager:
     - Automatic caching of downloaded .deb files
     - Cache size management (configurable limit)
     - LRU (Least Recently Used) eviction
-    - SHA256 verification
+    - SHA256 verification (skipped for files whose stat signature is unchanged)
     - Cache statistics and reporting
     - Thread-safe operations
     """
@@ -197,13 +202,7 @@ class PackageCacheManager:
 
     def _calculate_file_hash(self, file_path: Path) -> str:
         """Calculate SHA256 hash of file"""
-        sha256 = hashlib.sha256()
-
-        with open(file_path, "rb") as f:
-            while chunk := f.read(8192):
-                sha256.update(chunk)
-
-        return sha256.hexdigest()
+        return get_hash_service().hash_file(file_path)
 
     def _get_cache_size(self) -> int:
         """Get total size of cache in bytes"""
@@ -318,7 +317,7 @@ class PackageCacheManager:
                 return None
 
             # Verify hash
-            if not self._verify_hash(pkg_path, pkg.hash_sha256):
+            if not self._verify_cached(pkg, pkg_path):
                 self.logger.error(f"Hash mismatch for {pkg.filename}, removing from cache")
                 pkg_path.unlink()
                 del self._index[key]
@@ -342,6 +341,29 @@ class PackageCacheManager:
 
             return pkg_path
 
+    def _verify_cached(self, pkg: CachedPackage, pkg_path: Path) -> bool:
+        """
+        Verify a cached package, rehashing only if it changed since last verified.
+
+        The stat signature (dev, inode, size, mtime_ns, ctime_ns) recorded after
+        a successful verification lets repeat lookups skip reading the file.
+        """
+        try:
+            current = FileSignature.of(pkg_path)
+        except OSError as e:
+            self.logger.error(f"Hash verification failed: {e}")
+            return False
+
+        if pkg.file_signature and FileSignature(*pkg.file_signature) == current:
+            return True
+
+        if not self._verify_hash(pkg_path, pkg.hash_sha256):
+            return False
+
+        stable = get_hash_service().stable_signature(pkg_path)
+        pkg.file_signature = list(stable) if stable else None
+        return True
+
     def _verify_hash(self, file_path: Path, expected_hash: str) -> bool:
         """Verify file hash matches expected"""
         try:
@@ -3,6 +3,7 @@ from configurator.core.reporter.base import ReporterInterface as ReporterInterfa
 from configurator.core.reporter.compact_reporter import CompactReporter
 from configurator.core.reporter.console import ConsoleReporter as ConsoleReporter
 from configurator.core.reporter.facts import FactsDatabase as FactsDatabase
+from configurator.core.reporter.headless_reporter import HeadlessReporter
 from configurator.core.reporter.rich_reporter import RichProgressReporter
 
 # Default reporter alias
@@ -19,6 +20,7 @@ def get_reporter(mode: str = "rich") -> ReporterInterface:
             - "compact": High-performance streaming output
             - "minimal": No colors, plain text (CI/CD friendly)
             - "console": Simple console output
+            - "headless" (or "json"): JSON-lines events only, nothing drawn
 
     Returns:
         Reporter instance implementing ReporterInterface
@@ -29,6 +31,8 @@ def get_reporter(mode: str = "rich") -> ReporterInterface:
         return CompactReporter(use_colors=False)
     elif mode == "console":
         return ConsoleReporter()
+    elif mode in ("headless", "json"):
+        return HeadlessReporter()
     else:  # "rich" or default
         return RichProgressReporter()
 
@@ -39,6 +43,7 @@ __all__ = [
     "CompactReporter",
     "ConsoleReporter",
     "FactsDatabase",
+    "HeadlessReporter",
     "RichProgressReporter",
     "ProgressReporter",
     "get_reporter",
@@ -1,10 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 
 class ReporterInterface(ABC):
     """Abstract base class for progress reporters."""
 
+    # Expected seconds per module, from the duration model
+    expected_durations: Dict[str, float] = {}
+
+    def set_expected_durations(self, durations: Mapping[str, float]) -> None:
+        """Expected run time of modules, for the ETAs reporters show (optional)."""
+        self.expected_durations = dict(durations)
+
     @abstractmethod
     def start(self, title: str = "Installation") -> None:
         """Display startup banner."""
@@ -5,11 +5,16 @@ Streaming, append-only output with minimal overhead.
 
 import sys
 from datetime import datetime
-from typing import Any, Dict, Optional, TextIO
+from typing import Any, Dict, List, Optional, TextIO, Tuple
 
 from configurator.core.reporter.base import ReporterInterface
+from configurator.core.reporter.render_loop import RenderLoop
+from configurator.core.state.durations import format_duration
 from configurator.ui.theme import Theme
 
+# (kind, module, text, success, time, module start time): kind is start, update, done or line
+_Event = Tuple[str, Optional[str], str, bool, datetime, Optional[datetime]]
+
 
 class CompactReporter(ReporterInterface):
     """
@@ -21,6 +26,8 @@ class CompactReporter(ReporterInterface):
     - Duration tracking with human-readable format
     - Status column alignment
     - Thread-safe write operations
+    - Once started, lines are queued and written by a render loop, one
+      write per frame
 
     Output format:
         14:30:22 ✓ docker           42s  containerd, buildx installed
@@ -36,6 +43,7 @@ class CompactReporter(ReporterInterface):
         stream: Optional[TextIO] = None,
         module_width: int = 15,
         duration_width: int = 6,
+        fps: float = 10.0,
     ) -> None:
         """
         Initialize compact reporter.
@@ -46,6 +54,7 @@ class CompactReporter(ReporterInterface):
             stream: Output stream (defaults to stdout)
             module_width: Character width for module name column
             duration_width: Character width for duration column
+            fps: Frames written per second once started
         """
         self.stream = stream or sys.stdout
         self.use_colors = use_colors and Theme.supports_color()
@@ -57,19 +66,22 @@ class CompactReporter(ReporterInterface):
         self.phase_start_times: Dict[str, datetime] = {}
         self._current_phase: Optional[str] = None
         self._results: Dict[str, bool] = {}
+        # Last in-progress message written per module
+        self._last_message: Dict[str, str] = {}
+        self.render_loop = RenderLoop(self._render, fps=fps, name="compact-reporter")
 
     def _write(self, text: str) -> None:
         """Write text to stream with flush."""
         self.stream.write(text + "\n")
         self.stream.flush()
 
-    def _timestamp(self) -> str:
-        """Get current timestamp string."""
-        return datetime.now().strftime("%H:%M:%S")
+    def _timestamp(self, when: Optional[datetime] = None) -> str:
+        """Get timestamp string (of now by default)."""
+        return (when or datetime.now()).strftime("%H:%M:%S")
 
-    def _format_duration(self, start_time: datetime) -> str:
-        """Format duration from start time to now."""
-        duration = datetime.now() - start_time
+    def _format_duration(self, start_time: datetime, end_time: Optional[datetime] = None) -> str:
+        """Format duration from start time to end time (now by default)."""
+        duration = (end_time or datetime.now()) - start_time
         total_seconds = duration.total_seconds()
 
         if total_seconds < 1:
@@ -113,10 +125,11 @@ class CompactReporter(ReporterInterface):
             self._write(f"\n{separator}")
             self._write(f"> {title}")
             self._write(f"{separator}\n")
+        self.render_loop.start()
 
     def stop(self) -> None:
-        """Stop the reporter (no-op for streaming)."""
-        pass  # Nothing to stop in streaming mode
+        """Stop the render loop, writing the lines still queued."""
+        self.render_loop.stop()
 
     def start_phase(self, name: str, total_steps: int = 0) -> None:
         """
@@ -128,20 +141,11 @@ class CompactReporter(ReporterInterface):
         """
         self._current_phase = name
         self.phase_start_times[name] = datetime.now()
-
-        # Output in-progress line
-        parts = []
-
-        if self.show_timestamp:
-            parts.append(self._dim(self._timestamp()))
-
-        symbol = Theme.get_symbol("RUNNING")
-        parts.append(self._colorize(symbol, "PENDING"))
-        parts.append(self._colorize(self._format_module(name), "PENDING"))
-        parts.append(" " * self.duration_width)  # No duration yet
-        parts.append("starting...")
-
-        self._write(" ".join(parts))
+        expected = self.expected_durations.get(name)
+        if expected:
+            self._post("start", name, f"starting... (usually {format_duration(expected)})")
+        else:
+            self._post("start", name, "starting...")
 
     def update(
         self,
@@ -152,7 +156,10 @@ class CompactReporter(ReporterInterface):
         """
         Update progress status.
 
-        In compact mode, updates are printed as new lines.
+        In compact mode, updates are printed as new lines. An update that a
+        later event of the same module supersedes within the same frame, or
+        that repeats the module's previous message, is not printed; failures
+        always are.
 
         Args:
             message: Status message
@@ -162,32 +169,7 @@ class CompactReporter(ReporterInterface):
         target = module or self._current_phase
         if not target:
             return
-
-        parts = []
-
-        if self.show_timestamp:
-            parts.append(self._dim(self._timestamp()))
-
-        # Determine symbol and color based on success
-        if success:
-            symbol = Theme.get_symbol("DEBUG")  # Arrow for in-progress
-            color = "DEBUG"
-        else:
-            symbol = Theme.get_symbol("CROSS")
-            color = "ERROR"
-
-        parts.append(self._colorize(symbol, color))
-        parts.append(self._colorize(self._format_module(target), color))
-
-        # Duration if available
-        if target in self.phase_start_times:
-            parts.append(self._dim(self._format_duration(self.phase_start_times[target])))
-        else:
-            parts.append(" " * self.duration_width)
-
-        parts.append(message)
-
-        self._write(" ".join(parts))
+        self._post("update", target, message, success)
 
     def update_progress(
         self,
@@ -230,37 +212,82 @@ class CompactReporter(ReporterInterface):
 
         # Record result
         self._results[target] = success
+        self._post("done", target, "done" if success else "failed", success)
+
+    def _post(self, kind: str, module: Optional[str], text: str, success: bool = True) -> None:
+        """Queue a line for the next frame, or write it now if the reporter is not started."""
+        started = self.phase_start_times.get(module) if module is not None else None
+        event = (kind, module, text, success, datetime.now(), started)
+        if self.render_loop.running:
+            self.render_loop.post(event)
+        else:
+            self._render([event])
+
+    def _render(self, batch: List[_Event]) -> None:
+        """Write a frame's lines with a single write."""
+        kept: List[Optional[_Event]] = []
+        # Module -> index in kept of its in-progress update, until something supersedes it
+        superseded: Dict[str, int] = {}
+        for event in batch:
+            kind, module, text, success, _, _ = event
+            if module is not None:
+                if kind == "update" and success and self._last_message.get(module) == text:
+                    continue
+                index = superseded.pop(module, None)
+                if index is not None:
+                    kept[index] = None
+                if kind == "update":
+                    self._last_message[module] = text
+                    if success:
+                        superseded[module] = len(kept)
+                else:
+                    self._last_message.pop(module, None)
+            kept.append(event)
 
-        parts = []
+        lines = [self._format_event(*event) for event in kept if event is not None]
+        if lines:
+            self._write("\n".join(lines))
 
-        if self.show_timestamp:
-            parts.append(self._dim(self._timestamp()))
+    def _format_event(
+        self,
+        kind: str,
+        module: Optional[str],
+        text: str,
+        success: bool,
+        when: datetime,
+        started: Optional[datetime],
+    ) -> str:
+        if kind == "line" or module is None:
+            return text
 
-        # Symbol and color based on success
-        if success:
-            symbol = Theme.get_symbol("CHECK")
-            color = "SUCCESS"
-            status = "done"
+        parts = []
+        if self.show_timestamp:
+            parts.append(self._dim(self._timestamp(when)))
+
+        if kind == "start":
+            symbol, color = Theme.get_symbol("RUNNING"), "PENDING"
+        elif not success:
+            symbol, color = Theme.get_symbol("CROSS"), "ERROR"
+        elif kind == "done":
+            symbol, color = Theme.get_symbol("CHECK"), "SUCCESS"
         else:
-            symbol = Theme.get_symbol("CROSS")
-            color = "ERROR"
-            status = "failed"
+            symbol, color = Theme.get_symbol("DEBUG"), "DEBUG"  # Arrow for in-progress
 
         parts.append(self._colorize(symbol, color))
-        parts.append(self._colorize(self._format_module(target), color))
+        parts.append(self._colorize(self._format_module(module), color))
 
-        # Duration
-        if target in self.phase_start_times:
-            parts.append(self._dim(self._format_duration(self.phase_start_times[target])))
+        # Duration if available (none yet when starting)
+        if kind != "start" and started is not None:
+            parts.append(self._dim(self._format_duration(started, when)))
         else:
             parts.append(" " * self.duration_width)
 
-        parts.append(status)
-
-        self._write(" ".join(parts))
+        parts.append(text)
+        return " ".join(parts)
 
     def show_summary(self, results: Dict[str, bool]) -> None:
         """Display installation summary."""
+        self.stop()
         # Merge with tracked results
         all_results = {**self._results, **results}
 
@@ -301,20 +328,17 @@ class CompactReporter(ReporterInterface):
     def error(self, message: str) -> None:
         """Display error message."""
         symbol = Theme.get_symbol("CROSS")
-        line = f"{self._colorize(symbol, 'ERROR')} ERROR: {message}"
-        self._write(line)
+        self._post("line", None, f"{self._colorize(symbol, 'ERROR')} ERROR: {message}")
 
     def warning(self, message: str) -> None:
         """Display warning message."""
         symbol = Theme.get_symbol("WARN")
-        line = f"{self._colorize(symbol, 'WARN')} WARNING: {message}"
-        self._write(line)
+        self._post("line", None, f"{self._colorize(symbol, 'WARN')} WARNING: {message}")
 
     def info(self, message: str) -> None:
         """Display info message."""
         symbol = Theme.get_symbol("INFO")
-        line = f"{self._colorize(symbol, 'INFO')} {message}"
-        self._write(line)
+        self._post("line", None, f"{self._colorize(symbol, 'INFO')} {message}")
 
     def show_next_steps(
         self,
@@ -323,6 +347,7 @@ class CompactReporter(ReporterInterface):
         **kwargs: Any,
     ) -> None:
         """Display next steps after installation."""
+        self.stop()
         self._write("")
         if self.use_colors:
             header = Theme.ANSI_COLORS["HEADER"]
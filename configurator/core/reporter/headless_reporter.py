@@ -0,0 +1,106 @@
+"""
+Headless reporter: structured events only, one JSON object per line.
+
+For CI and for tools that drive the installer; nothing is drawn. Events
+are written by a render loop, a frame's events with a single write.
+
+Output format:
+    {"ts": "2024-05-01T14:30:22.123456", "event": "phase_started", "module": "docker", ...}
+"""
+
+import json
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, TextIO
+
+from configurator.core.reporter.base import ReporterInterface
+from configurator.core.reporter.render_loop import RenderLoop
+
+
+class HeadlessReporter(ReporterInterface):
+    """
+    Reporter that writes JSON-lines events instead of drawing progress.
+
+    Every call is one event, nothing is coalesced; events carry the time
+    they were reported, not written.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, fps: float = 10.0) -> None:
+        """
+        Initialize headless reporter.
+
+        Args:
+            stream: Output stream (defaults to stdout)
+            fps: Frames written per second once started
+        """
+        self.stream = stream or sys.stdout
+        self._current_phase: Optional[str] = None
+        self.render_loop = RenderLoop(self._render, fps=fps, name="headless-reporter")
+
+    def _emit(self, event: str, **fields: Any) -> None:
+        record = {"ts": datetime.now().isoformat(), "event": event, **fields}
+        if self.render_loop.running:
+            self.render_loop.post(record)
+        else:
+            self._render([record])
+
+    def _render(self, batch: List[Dict[str, Any]]) -> None:
+        if batch:
+            self.stream.write("".join(json.dumps(r, default=str) + "\n" for r in batch))
+            self.stream.flush()
+
+    def start(self, title: str = "Installation") -> None:
+        self._emit("started", title=title)
+        self.render_loop.start()
+
+    def stop(self) -> None:
+        """Stop the render loop, writing the events still queued."""
+        self.render_loop.stop()
+
+    def start_phase(self, name: str, total_steps: int = 0) -> None:
+        self._current_phase = name
+        self._emit(
+            "phase_started",
+            module=name,
+            total_steps=total_steps,
+            expected_seconds=self.expected_durations.get(name),
+        )
+
+    def update(self, message: str, success: bool = True, module: Optional[str] = None) -> None:
+        self._emit("status", module=module or self._current_phase, message=message, success=success)
+
+    def update_progress(
+        self,
+        percent: int,
+        current: Optional[int] = None,
+        total: Optional[int] = None,
+        module: Optional[str] = None,
+    ) -> None:
+        self._emit(
+            "progress",
+            module=module or self._current_phase,
+            percent=percent,
+            current=current,
+            total=total,
+        )
+
+    def complete_phase(self, success: bool = True, module: Optional[str] = None) -> None:
+        self._emit("phase_completed", module=module or self._current_phase, success=success)
+
+    def show_summary(self, results: Dict[str, Any]) -> None:
+        # Results may be ExecutionResults rather than bools
+        summary = {name: bool(getattr(r, "success", r)) for name, r in results.items()}
+        self._emit("summary", results=summary, success=all(summary.values()))
+        self.stop()
+
+    def error(self, message: str) -> None:
+        self._emit("error", message=message)
+
+    def warning(self, message: str) -> None:
+        self._emit("warning", message=message)
+
+    def info(self, message: str) -> None:
+        self._emit("info", message=message)
+
+    def show_next_steps(self, reboot_required: bool = False, **kwargs: Any) -> None:
+        self._emit("next_steps", reboot_required=reboot_required, **kwargs)
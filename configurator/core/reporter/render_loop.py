@@ -0,0 +1,94 @@
+"""
+Fixed frame rate rendering for progress reporters.
+
+Reporters used to redraw on every callback, on the worker thread that made
+it: with parallel module execution each started/validating/configuring/
+verifying/completed event rebuilt the display while holding the GIL the
+workers need. RenderLoop decouples the two:
+
+- producers only append an event to a deque (append and popleft are atomic,
+  so posting takes no lock and never waits for rendering)
+- a render thread drains the deque once per frame and hands the whole batch
+  to the reporter, which coalesces it and redraws what changed
+
+Usage:
+    loop = RenderLoop(self._render, fps=10)
+    loop.start()
+    loop.post(("status", "docker", "Configuring..."))
+    loop.stop()  # renders what is still queued
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RenderLoop:
+    """Drains events posted from any thread and renders them at a fixed frame rate."""
+
+    def __init__(
+        self,
+        render: Callable[[List[Any]], None],
+        fps: float = 10.0,
+        name: str = "reporter-render",
+    ) -> None:
+        """
+        Initialize RenderLoop.
+
+        Args:
+            render: Called with the events of a frame, in posting order; the
+                list is empty on frames without events
+            fps: Frames rendered per second
+            name: Render thread name
+        """
+        self.render = render
+        self.interval = 1.0 / fps
+        self.name = name
+        self.frames = 0
+        self._events: Deque[Any] = deque()
+        self._stopping = threading.Event()
+        self._frame_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start the render thread (no-op if already running)."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the render thread, then render the events still queued."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            thread.join(timeout=5.0)
+        self.drain()
+
+    def post(self, event: Any) -> None:
+        """Queue an event for the next frame; safe from any thread."""
+        self._events.append(event)
+
+    def drain(self) -> None:
+        """Render the queued events now, on the calling thread."""
+        with self._frame_lock:
+            events = self._events
+            batch = [events.popleft() for _ in range(len(events))]
+            self.frames += 1
+            self.render(batch)
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            try:
+                self.drain()
+            except Exception as e:
+                # A broken frame must not stop later ones
+                logger.debug(f"{self.name} frame failed: {e}")
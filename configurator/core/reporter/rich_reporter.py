@@ -1,6 +1,6 @@
 import threading
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from rich.console import Console
 from rich.live import Live
@@ -9,14 +9,34 @@ from rich.progress import (
     BarColumn,
     MofNCompleteColumn,
     Progress,
+    ProgressColumn,
     SpinnerColumn,
+    Task,
     TaskID,
     TextColumn,
     TimeElapsedColumn,
 )
 from rich.table import Table
+from rich.text import Text
 
 from configurator.core.reporter.base import ReporterInterface
+from configurator.core.reporter.render_loop import RenderLoop
+from configurator.core.state.durations import format_duration
+
+_UNSET = object()
+
+
+class _EstimateColumn(ProgressColumn):
+    """Time a module has left, by its expected duration from past runs."""
+
+    def render(self, task: Task) -> Text:
+        expected = task.fields.get("expected")
+        if not expected or task.elapsed is None:
+            return Text("")
+        left = expected - task.elapsed
+        if left <= 0:
+            return Text("longer than usual", style="yellow")
+        return Text(f"~{format_duration(left)} left", style="progress.remaining")
 
 
 class RichProgressReporter(ReporterInterface):
@@ -27,10 +47,14 @@ class RichProgressReporter(ReporterInterface):
     Features:
     - Multi-line progress bars (one per module)
     - Spinner animations (configurable)
-    - Time elapsed/remaining
+    - Time elapsed, and time remaining by the module's usual duration
     - Status messages
     - Thread-safe updates
     - Dry-run mode support
+
+    While the live display runs, updates are queued and applied by a render
+    loop at refresh_per_second: each frame keeps the latest fields per
+    module and only passes fields that changed on to Rich.
     """
 
     def __init__(
@@ -66,11 +90,12 @@ class RichProgressReporter(ReporterInterface):
             MofNCompleteColumn(),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
             TimeElapsedColumn(),
+            _EstimateColumn(),
             TextColumn("[dim]{task.fields[status]}[/dim]"),
             console=self.console,
             expand=False,
-            # Disable auto-refresh in dry-run mode
-            auto_refresh=not dry_run,
+            # Refreshed by the render loop instead
+            auto_refresh=False,
         )
 
         # Thread-safe task management
@@ -79,6 +104,10 @@ class RichProgressReporter(ReporterInterface):
 
         # Live display
         self.live: Optional[Live] = None
+        self.render_loop = RenderLoop(self._render, fps=refresh_per_second, name="rich-reporter")
+        # Task fields as last passed to Rich, per module
+        self._shown: Dict[str, Dict[str, Any]] = {}
+        self._rows_added = False
 
     def start(self, title: str = "Installation") -> None:
         """Display startup banner and start live display."""
@@ -98,16 +127,53 @@ class RichProgressReporter(ReporterInterface):
         self.live = Live(
             self.progress,
             console=self.console,
-            refresh_per_second=self.refresh_per_second,
+            auto_refresh=False,
             transient=False,  # Keep the progress bars after completion
         )
         self.live.start()
+        self.render_loop.start()
 
     def stop(self) -> None:
         """Stop the live display."""
+        self.render_loop.stop()
         if self.live:
             self.live.stop()
 
+    def _post(self, module: str, **fields: Any) -> None:
+        """Queue task fields for the next frame, or apply them now without a live display."""
+        if self.render_loop.running:
+            self.render_loop.post((module, fields))
+        else:
+            self._apply([(module, fields)])
+
+    def _apply(self, batch: List[Tuple[str, Dict[str, Any]]]) -> bool:
+        """
+        Apply a frame's updates to the progress tasks.
+
+        Returns:
+            True if any task field changed
+        """
+        latest: Dict[str, Dict[str, Any]] = {}
+        for module, fields in batch:
+            latest.setdefault(module, {}).update(fields)
+
+        changed = False
+        for module, fields in latest.items():
+            shown = self._shown.setdefault(module, {})
+            diff = {k: v for k, v in fields.items() if shown.get(k, _UNSET) != v}
+            if diff:
+                self.progress.update(self.tasks[module], **diff)
+                shown.update(diff)
+                changed = True
+        return changed
+
+    def _render(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        changed = self._apply(batch) or self._rows_added
+        self._rows_added = False
+        # Spinners and elapsed times move even without updates
+        if self.live is not None and (changed or not self.dry_run):
+            self.live.refresh()
+
     def start_phase(self, name: str, total_steps: int = 100) -> None:
         """
         Start new installation phase/module.
@@ -119,17 +185,27 @@ class RichProgressReporter(ReporterInterface):
 
             if name not in self.tasks:
                 task_id = self.progress.add_task(
-                    f"[bold]{name}[/bold]", total=total_steps or 100, status="Starting..."
+                    f"[bold]{name}[/bold]",
+                    total=total_steps or 100,
+                    status="Starting...",
+                    expected=self.expected_durations.get(name),
                 )
                 self.tasks[name] = task_id
+                self._shown[name] = {
+                    "completed": 0,
+                    "total": total_steps or 100,
+                    "status": "Starting...",
+                }
+                self._rows_added = True
             else:
                 # Reset existing task if re-running
-                self.progress.update(
-                    self.tasks[name],
+                self._post(
+                    name,
                     completed=0,
                     total=total_steps or 100,
                     status="Restarting...",
                     visible=True,
+                    expected=self.expected_durations.get(name),
                 )
 
     def update(self, message: str, success: bool = True, module: Optional[str] = None) -> None:
@@ -143,16 +219,7 @@ class RichProgressReporter(ReporterInterface):
         target_module = module or self.current_phase
 
         if target_module and target_module in self.tasks:
-            task_id = self.tasks[target_module]
-            # Assumes intermediate updates don't need checkmarks unless explicit success/fail context
-            # But the interface says success=True by default.
-            # We'll just update the status text.
-
-            self.progress.update(task_id, status=message)
-
-            # If explicit failure
-            if not success:
-                self.progress.update(task_id, status=f"❌ {message}")
+            self._post(target_module, status=message if success else f"❌ {message}")
 
     def update_progress(
         self,
@@ -165,26 +232,23 @@ class RichProgressReporter(ReporterInterface):
         target_module = module or self.current_phase
 
         if target_module and target_module in self.tasks:
-            task_id = self.tasks[target_module]
             if current is not None and total is not None:
-                self.progress.update(task_id, completed=current, total=total)
+                self._post(target_module, completed=current, total=total)
             else:
-                self.progress.update(task_id, completed=percent, total=100)
+                self._post(target_module, completed=percent, total=100)
 
     def complete_phase(self, success: bool = True, module: Optional[str] = None) -> None:
         """Mark current phase as complete."""
         target_module = module or self.current_phase
 
         if target_module and target_module in self.tasks:
-            task_id = self.tasks[target_module]
             icon = "✅" if success else "❌"
             msg = "Done" if success else "Failed"
-            self.progress.update(task_id, completed=100, status=f"{icon} {msg}")
+            self._post(target_module, completed=100, status=f"{icon} {msg}", expected=None)
 
     def show_summary(self, results: Dict[str, bool]) -> None:
         """Display installation summary."""
-        if self.live:
-            self.live.stop()
+        self.stop()
 
         self.console.print()
         table = Table(title="Installation Summary")
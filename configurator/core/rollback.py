@@ -2,14 +2,31 @@
 Rollback manager for failed installations.
 
 Tracks changes made during installation and can undo them if needed.
+
+Actions are not replayed one by one. The planner turns them into steps:
+
+- "command" actions run arbitrary shell and keep their exact position;
+  they split the reversed action list into phases
+- within a phase, all services are stopped and disabled with one systemctl
+  call each, then files are restored concurrently (restores of the same
+  path stay sequential, newest first), then all packages are removed in
+  one apt transaction
+
+The action log is a JSON-lines file that is only appended to; it is
+fsynced every SYNC_EVERY actions, SYNC_INTERVAL seconds and before a
+rollback runs.
 """
 
 import json
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from configurator.utils.command import run_command
 from configurator.utils.file import restore_file
@@ -17,6 +34,14 @@ from configurator.utils.file import restore_file
 # Rollback state file
 ROLLBACK_STATE_FILE = Path("/var/lib/debian-vps-configurator/rollback-state.json")
 
+# Action log fsync batching
+SYNC_EVERY = 16
+SYNC_INTERVAL = 1.0
+
+# Within a phase, services stop before their files are restored, and
+# packages are removed last
+PHASE_ORDER = ("service_stop", "file_restore", "package_remove")
+
 
 @dataclass
 class RollbackAction:
@@ -47,6 +72,70 @@ class RollbackAction:
         )
 
 
+@dataclass
+class RollbackStep:
+    """Actions of one type executed together during rollback."""
+
+    action_type: str
+    actions: List[RollbackAction]
+
+    @property
+    def description(self) -> str:
+        if len(self.actions) == 1:
+            return self.actions[0].description
+        if self.action_type == "service_stop":
+            return f"Stop services: {', '.join(_services(self.actions))}"
+        if self.action_type == "package_remove":
+            return f"Remove packages: {', '.join(_packages(self.actions))}"
+        return f"Restore {len(self.actions)} files"
+
+
+def _services(actions: List[RollbackAction]) -> List[str]:
+    return list(dict.fromkeys(a.data["service"] for a in actions))
+
+
+def _packages(actions: List[RollbackAction]) -> List[str]:
+    return list(dict.fromkeys(p for a in actions for p in a.data["packages"]))
+
+
+def _legacy_state(text: str) -> Optional[List[Dict[str, Any]]]:
+    """Actions of a state file holding one {"actions": [...]} document."""
+    try:
+        state = json.loads(text)
+    except ValueError:
+        return None
+    return state.get("actions", []) if isinstance(state, dict) and "actions" in state else None
+
+
+def plan_rollback(actions: List[RollbackAction]) -> List[RollbackStep]:
+    """
+    Plan the rollback of actions recorded in the given order.
+
+    Args:
+        actions: Recorded actions, oldest first
+
+    Returns:
+        Steps to execute in order
+    """
+    steps: List[RollbackStep] = []
+    phase: Dict[str, List[RollbackAction]] = {}
+
+    def end_phase() -> None:
+        for action_type in PHASE_ORDER:
+            if phase.get(action_type):
+                steps.append(RollbackStep(action_type, phase[action_type]))
+        phase.clear()
+
+    for action in reversed(actions):
+        if action.action_type in PHASE_ORDER:
+            phase.setdefault(action.action_type, []).append(action)
+        else:
+            end_phase()
+            steps.append(RollbackStep(action.action_type, [action]))
+    end_phase()
+    return steps
+
+
 class RollbackManager:
     """
     Manages rollback of installation changes.
@@ -55,16 +144,24 @@ class RollbackManager:
     the ability to undo them in reverse order.
     """
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None, restore_workers: int = 8):
         """
         Initialize rollback manager.
 
         Args:
             logger: Logger instance
+            restore_workers: Files restored concurrently
         """
         self.logger = logger or logging.getLogger(__name__)
         self.actions: List[RollbackAction] = []
         self.state_file = ROLLBACK_STATE_FILE
+        self.restore_workers = restore_workers
+        self._log_lock = threading.Lock()
+        # Log file written so far, and how many actions it holds
+        self._log_path: Optional[Path] = None
+        self._logged = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
 
     def add_command(self, rollback_command: str, description: str = "") -> None:
         """
@@ -148,21 +245,21 @@ class RollbackManager:
             self.logger.info("No rollback actions to execute")
             return True
 
-        self.logger.info(f"Rolling back {len(self.actions)} actions...")
+        steps = self.plan()
+        self.logger.info(f"Rolling back {len(self.actions)} actions in {len(steps)} steps...")
+        if not dry_run:
+            self._sync_state()
 
-        errors = []
+        errors: List[Tuple[RollbackAction, Exception]] = []
 
-        # Execute in reverse order
-        for action in reversed(self.actions):
-            self.logger.info(f"  • {action.description}")
+        for step in steps:
+            self.logger.info(f"  • {step.description}")
 
             if dry_run:
                 continue
 
-            try:
-                self._execute_action(action)
-            except Exception as e:
-                self.logger.error(f"    Failed: {e}")
+            for action, e in self._execute_step(step):
+                self.logger.error(f"    Failed: {action.description}: {e}")
                 errors.append((action, e))
 
         if errors:
@@ -176,6 +273,62 @@ class RollbackManager:
         self.logger.info("Rollback completed successfully")
         return True
 
+    def plan(self) -> List[RollbackStep]:
+        """Steps that would undo the recorded actions."""
+        return plan_rollback(self.actions)
+
+    def _execute_step(self, step: RollbackStep) -> List[Tuple[RollbackAction, Exception]]:
+        """Execute a step, returning the actions that failed."""
+        if step.action_type == "file_restore" and len(step.actions) > 1:
+            return self._restore_files(step.actions)
+
+        if step.action_type == "service_stop" and len(step.actions) > 1:
+            services = " ".join(_services(step.actions))
+            stopped = run_command(f"systemctl stop {services}", check=False)
+            disabled = run_command(f"systemctl disable {services}", check=False)
+            if stopped.success and disabled.success:
+                return []
+            # One unknown unit fails the whole call; retry the others alone
+            self.logger.debug("Batched systemctl failed, stopping services one by one")
+
+        if step.action_type == "package_remove" and len(step.actions) > 1:
+            packages = " ".join(_packages(step.actions))
+            if run_command(f"apt-get remove -y {packages}", check=False).success:
+                return []
+            # One unknown package aborts the transaction; retry the others alone
+            self.logger.debug("Batched apt-get remove failed, removing packages one by one")
+
+        errors = []
+        for action in step.actions:
+            try:
+                self._execute_action(action)
+            except Exception as e:
+                errors.append((action, e))
+        return errors
+
+    def _restore_files(
+        self, actions: List[RollbackAction]
+    ) -> List[Tuple[RollbackAction, Exception]]:
+        """Restore files concurrently; restores of the same path keep their order."""
+        by_path: Dict[str, List[RollbackAction]] = {}
+        for action in actions:
+            path = os.path.abspath(action.data["original_path"])
+            by_path.setdefault(path, []).append(action)
+
+        def restore(path_actions: List[RollbackAction]) -> List[Tuple[RollbackAction, Exception]]:
+            errors = []
+            for action in path_actions:
+                try:
+                    self._execute_action(action)
+                except Exception as e:
+                    errors.append((action, e))
+            return errors
+
+        workers = max(1, min(self.restore_workers, len(by_path)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rollback") as pool:
+            results = pool.map(restore, by_path.values())
+            return [error for errors in results for error in errors]
+
     def _execute_action(self, action: RollbackAction) -> None:
         """Execute a single rollback action."""
         if action.action_type == "command":
@@ -195,29 +348,57 @@ class RollbackManager:
             run_command(f"systemctl stop {action.data['service']}", check=False)
             run_command(f"systemctl disable {action.data['service']}", check=False)
 
-    def _save_state(self) -> None:
-        """Save rollback state to file."""
-        try:
-            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+    def _save_state(self, sync: bool = False) -> None:
+        """
+        Append the actions not yet logged to the state file.
 
-            state = {
-                "actions": [a.to_dict() for a in self.actions],
-                "saved_at": datetime.now().isoformat(),
-            }
+        The file is rewritten only when this manager has not written it yet
+        (or state_file changed); it is fsynced in batches.
 
-            with open(self.state_file, "w") as f:
-                json.dump(state, f, indent=2)
+        Args:
+            sync: Fsync now instead of when the batch is full
+        """
+        with self._log_lock:
+            try:
+                fresh = self._log_path != self.state_file
+                pending = self.actions[0 if fresh else self._logged :]
+                if not pending and not sync:
+                    return
+
+                self.state_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.state_file, "w" if fresh else "a") as f:
+                    f.write("".join(json.dumps(a.to_dict()) + "\n" for a in pending))
+                    f.flush()
+                    self._log_path = self.state_file
+                    self._logged = (0 if fresh else self._logged) + len(pending)
+                    self._unsynced += len(pending)
+                    if (
+                        sync
+                        or self._unsynced >= SYNC_EVERY
+                        or time.monotonic() - self._last_sync >= SYNC_INTERVAL
+                    ):
+                        os.fsync(f.fileno())
+                        self._unsynced = 0
+                        self._last_sync = time.monotonic()
 
-        except Exception as e:
-            self.logger.debug(f"Could not save rollback state: {e}")
+            except Exception as e:
+                self.logger.debug(f"Could not save rollback state: {e}")
+
+    def _sync_state(self) -> None:
+        """Write and fsync the actions logged since the last fsync."""
+        self._save_state(sync=True)
 
     def _clear_state(self) -> None:
         """Clear saved rollback state."""
-        try:
-            if self.state_file.exists():
-                self.state_file.unlink()
-        except Exception as e:
-            self.logger.debug(f"Could not clear rollback state: {e}")
+        with self._log_lock:
+            self._log_path = None
+            self._logged = 0
+            self._unsynced = 0
+            try:
+                if self.state_file.exists():
+                    self.state_file.unlink()
+            except Exception as e:
+                self.logger.debug(f"Could not clear rollback state: {e}")
 
     def load_state(self) -> bool:
         """
@@ -231,9 +412,32 @@ class RollbackManager:
 
         try:
             with open(self.state_file, "r") as f:
-                state = json.load(f)
-
-            self.actions = [RollbackAction.from_dict(a) for a in state.get("actions", [])]
+                text = f.read()
+
+            legacy = _legacy_state(text)
+            if legacy is not None:
+                # State written by older versions: one JSON document
+                self.actions = [RollbackAction.from_dict(a) for a in legacy]
+                intact = False
+            else:
+                self.actions = []
+                intact = True
+                for line in text.splitlines():
+                    try:
+                        self.actions.append(RollbackAction.from_dict(json.loads(line)))
+                    except (ValueError, KeyError):
+                        # A torn last line from a crash mid-append
+                        self.logger.debug(f"Skipping unreadable rollback log line: {line!r}")
+                        intact = False
+
+            if intact:
+                with self._log_lock:
+                    self._log_path = self.state_file
+                    self._logged = len(self.actions)
+            else:
+                # Rewrite as a clean log before appending to it
+                self._log_path = None
+                self._save_state(sync=True)
 
             self.logger.info(f"Loaded {len(self.actions)} rollback actions from previous run")
             return True
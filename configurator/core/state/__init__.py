@@ -9,8 +9,10 @@ Exports:
     ModuleState: State of a single module
     InstallationState: Overall installation state
     StateManager: SQLite-backed state persistence
+    DurationModel: Module duration estimates from recorded runs
 """
 
+from configurator.core.state.durations import DurationModel
 from configurator.core.state.manager import StateManager
 from configurator.core.state.models import (
     InstallationState,
@@ -23,4 +25,5 @@ __all__ = [
     "ModuleState",
     "InstallationState",
     "StateManager",
+    "DurationModel",
 ]
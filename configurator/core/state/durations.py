@@ -0,0 +1,204 @@
+"""
+Module duration model built from installation history.
+
+Every module run's duration is recorded by the StateManager, tagged with
+the class of host it ran on (architecture, CPU count and memory). The
+model estimates a module's next run from those samples:
+
+- per module and host class, falling back to all host classes when this
+  one has no history yet, and to a fixed default when the module has none
+- as the median and 90th percentile of the samples, each weighted by
+  exponential decay with age, so recent runs (newer mirrors, faster
+  packages) count more than old ones
+
+Usage:
+    model = DurationModel.from_state(state_manager)
+    model.expected("docker")           # median seconds
+    model.expected("docker", p90=True) # pessimistic
+    graph.critical_path(model.expected)
+"""
+
+import math
+import os
+import platform
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds assumed for a module with no history
+DEFAULT_DURATION = 120.0
+
+
+@lru_cache(maxsize=None)
+def host_class() -> str:
+    """
+    Class of this host, e.g. "x86_64-4cpu-8gb".
+
+    Memory is rounded to a power of two, so hosts of the same size class
+    share history even if they report slightly different totals.
+    """
+    try:
+        memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        memory = 0
+    gigabytes = 2 ** round(math.log2(max(memory / 2**30, 1)))
+    return f"{platform.machine() or 'unknown'}-{os.cpu_count() or 1}cpu-{gigabytes}gb"
+
+
+def weighted_quantile(samples: Sequence[Tuple[float, float]], q: float) -> float:
+    """
+    Quantile of weighted samples.
+
+    Args:
+        samples: (value, weight) pairs, not empty
+        q: Quantile between 0 and 1
+
+    Returns:
+        Smallest value whose cumulative weight reaches q of the total
+    """
+    ordered = sorted(samples)
+    target = q * sum(weight for _, weight in ordered)
+    cumulative = 0.0
+    for value, weight in ordered:
+        cumulative += weight
+        if cumulative >= target:
+            return value
+    return ordered[-1][0]
+
+
+@dataclass
+class DurationEstimate:
+    """Expected duration of a module run, in seconds."""
+
+    median: float
+    p90: float
+    samples: int
+    # None when estimated from all host classes
+    host_class: Optional[str] = None
+
+
+class DurationModel:
+    """Per-module duration estimates from recorded runs."""
+
+    def __init__(
+        self,
+        samples: Iterable[Tuple[str, str, float, float]] = (),
+        host: Optional[str] = None,
+        half_life_days: float = 30.0,
+        default: float = DEFAULT_DURATION,
+        now: Optional[float] = None,
+    ):
+        """
+        Initialize DurationModel.
+
+        Args:
+            samples: (module name, host class, duration seconds, recorded at) runs
+            host: Host class estimates are for (defaults to this host's)
+            half_life_days: Age at which a run counts half as much as a new one
+            default: Seconds assumed for modules without history
+            now: Unix time ages are measured from (defaults to now)
+        """
+        self.host = host or host_class()
+        self.default = default
+        now = time.time() if now is None else now
+        decay = math.log(2) / (half_life_days * 86400)
+
+        # module -> host class -> [(duration, weight)]
+        runs: Dict[str, Dict[str, List[Tuple[float, float]]]] = {}
+        for module, host_cls, duration, recorded_at in samples:
+            weight = math.exp(-decay * max(now - recorded_at, 0.0))
+            runs.setdefault(module, {}).setdefault(host_cls, []).append((duration, weight))
+
+        self._estimates: Dict[str, DurationEstimate] = {}
+        for module, by_host in runs.items():
+            local = by_host.get(self.host)
+            if local:
+                self._estimates[module] = self._estimate(local, self.host)
+            else:
+                pooled = [run for host_runs in by_host.values() for run in host_runs]
+                self._estimates[module] = self._estimate(pooled, None)
+
+    @classmethod
+    def from_state(cls, state_manager: Any, per_module: int = 50, **kwargs: Any) -> "DurationModel":
+        """
+        Build the model from a StateManager's recorded runs.
+
+        Args:
+            state_manager: StateManager instance
+            per_module: Most recent runs used per module and host class
+            **kwargs: Passed to DurationModel
+        """
+        rows = state_manager.get_module_durations(per_module)
+        return cls(
+            (
+                (r["module_name"], r["host_class"], r["duration_seconds"], r["recorded_at"])
+                for r in rows
+            ),
+            **kwargs,
+        )
+
+    @staticmethod
+    def _estimate(runs: List[Tuple[float, float]], host: Optional[str]) -> DurationEstimate:
+        return DurationEstimate(
+            median=weighted_quantile(runs, 0.5),
+            p90=weighted_quantile(runs, 0.9),
+            samples=len(runs),
+            host_class=host,
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self._estimates)
+
+    def estimate(self, module: str) -> Optional[DurationEstimate]:
+        """Estimate of module, or None without history."""
+        return self._estimates.get(module)
+
+    def expected(self, module: str, p90: bool = False) -> float:
+        """
+        Expected seconds for a module run.
+
+        Args:
+            module: Module name
+            p90: Use the 90th percentile instead of the median
+
+        Returns:
+            Estimated seconds, or the default without history
+        """
+        estimate = self._estimates.get(module)
+        if estimate is None:
+            return self.default
+        return estimate.p90 if p90 else estimate.median
+
+    def expected_many(self, modules: Iterable[str], p90: bool = False) -> Dict[str, float]:
+        """Expected seconds of each module."""
+        return {module: self.expected(module, p90) for module in modules}
+
+    def batches_duration(
+        self, batches: Sequence[Sequence[str]], workers: int = 4, p90: bool = False
+    ) -> float:
+        """
+        Expected seconds to run batches one after another.
+
+        Modules of a batch run in parallel on up to workers threads, longest
+        first; a batch takes as long as its busiest worker.
+        """
+        total = 0.0
+        for batch in batches:
+            loads = [0.0] * max(1, min(workers, len(batch)))
+            for seconds in sorted((self.expected(m, p90) for m in batch), reverse=True):
+                loads[loads.index(min(loads))] += seconds
+            total += max(loads)
+        return total
+
+
+def format_duration(seconds: float) -> str:
+    """Human-readable duration, e.g. "45s", "12m 5s", "1h 3m"."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds}s" if seconds else f"{minutes}m"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m"
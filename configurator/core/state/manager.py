@@ -7,6 +7,7 @@ Manages installation state with database persistence for resume capability.
 import json
 import logging
 import sqlite3
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -115,16 +116,22 @@ class StateManager:
     def _init_db(self) -> None:
         """Initialize database schema."""
         # Handle migration file path
-        migration_file = Path(__file__).parent / "migrations" / "v1_initial.sql"
+        migrations_dir = Path(__file__).parent / "migrations"
+        migration_file = migrations_dir / "v1_initial.sql"
 
         if not migration_file.exists():
             raise FileNotFoundError(f"Migration file not found: {migration_file}")
 
+        # Every migration is idempotent (CREATE ... IF NOT EXISTS), so apply them all in order
+        migration_files = sorted(
+            migrations_dir.glob("v*.sql"), key=lambda p: int(p.stem[1:].split("_")[0])
+        )
+
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
-            sql = migration_file.read_text()
-            cursor.executescript(sql)
+            for migration in migration_files:
+                cursor.executescript(migration.read_text())
             conn.commit()
         finally:
             # Only close if it's not the persistent in-memory connection
@@ -218,6 +225,11 @@ class StateManager:
                 if module_state.started_at:
                     delta = module_state.completed_at - module_state.started_at
                     module_state.duration_seconds = delta.total_seconds()
+                    self.record_module_duration(
+                        module_name,
+                        module_state.duration_seconds,
+                        success=status == ModuleStatus.COMPLETED,
+                    )
 
         if progress is not None:
             module_state.progress_percent = min(100, max(0, progress))
@@ -474,3 +486,280 @@ class StateManager:
                 history.append(state)
 
         return history
+
+    def get_module_fingerprint(self, module_name: str) -> Optional[str]:
+        """
+        Get the desired-state fingerprint a module was last successfully applied with.
+
+        Args:
+            module_name: Module name
+
+        Returns:
+            Fingerprint, or None if the module never converged
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT fingerprint FROM module_convergence WHERE module_name = ?",
+                (module_name,),
+            )
+            row = cursor.fetchone()
+            return row["fingerprint"] if row else None
+
+    def record_module_fingerprint(self, module_name: str, fingerprint: Optional[str]) -> None:
+        """
+        Record (or, with None, forget) the fingerprint of a module's applied state.
+
+        Args:
+            module_name: Module name
+            fingerprint: Fingerprint after a successful run, None after a failed one
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if fingerprint is None:
+                cursor.execute(
+                    "DELETE FROM module_convergence WHERE module_name = ?", (module_name,)
+                )
+            else:
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO module_convergence
+                    (module_name, fingerprint, applied_at)
+                    VALUES (?, ?, ?)
+                    """,
+                    (module_name, fingerprint, datetime.now().isoformat()),
+                )
+            conn.commit()
+
+    def get_completed_steps(self, module_name: str) -> Dict[str, str]:
+        """
+        Get the steps of an unfinished module run that already completed.
+
+        Args:
+            module_name: Module name
+
+        Returns:
+            Mapping of step name to the digest of the inputs it completed with
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT step_name, input_digest FROM module_steps WHERE module_name = ?",
+                (module_name,),
+            )
+            return {row["step_name"]: row["input_digest"] for row in cursor.fetchall()}
+
+    def record_step(
+        self, module_name: str, step_name: str, input_digest: str, duration_seconds: float
+    ) -> None:
+        """
+        Checkpoint a completed module step.
+
+        Args:
+            module_name: Module name
+            step_name: Step name
+            input_digest: Digest of the inputs the step ran with
+            duration_seconds: How long the step took
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO module_steps
+                (module_name, step_name, input_digest, completed_at, duration_seconds)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    module_name,
+                    step_name,
+                    input_digest,
+                    datetime.now().isoformat(),
+                    duration_seconds,
+                ),
+            )
+            conn.commit()
+
+    def clear_steps(self, module_name: str) -> None:
+        """
+        Forget a module's step checkpoints once all its steps have completed.
+
+        Args:
+            module_name: Module name
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM module_steps WHERE module_name = ?", (module_name,))
+            conn.commit()
+
+    def get_cached_validation(self, validator_key: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """
+        Get a validator's cached result if it is recent enough.
+
+        Args:
+            validator_key: Validator identifier
+            max_age: Maximum age of the result, in seconds
+
+        Returns:
+            The cached result, or None
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT result_json FROM validation_cache "
+                "WHERE validator_key = ? AND checked_at >= ?",
+                (validator_key, time.time() - max_age),
+            )
+            row = cursor.fetchone()
+            return json.loads(row["result_json"]) if row else None
+
+    def record_validation(self, validator_key: str, result: Optional[Dict[str, Any]]) -> None:
+        """
+        Cache (or, with None, forget) a validator's result.
+
+        Args:
+            validator_key: Validator identifier
+            result: Serialized result
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if result is None:
+                cursor.execute(
+                    "DELETE FROM validation_cache WHERE validator_key = ?", (validator_key,)
+                )
+            else:
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO validation_cache
+                    (validator_key, result_json, checked_at)
+                    VALUES (?, ?, ?)
+                    """,
+                    (validator_key, json.dumps(result), time.time()),
+                )
+            conn.commit()
+
+    def record_module_duration(
+        self,
+        module_name: str,
+        duration_seconds: float,
+        success: bool = True,
+        host_class: Optional[str] = None,
+    ) -> None:
+        """
+        Record how long a module run took, for the duration model.
+
+        Args:
+            module_name: Module name
+            duration_seconds: Run time in seconds
+            success: Whether the run succeeded (only successful runs are estimated from)
+            host_class: Class of host the run was on (defaults to this host's)
+        """
+        if host_class is None:
+            from configurator.core.state.durations import host_class as current_host_class
+
+            host_class = current_host_class()
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO module_durations
+                (module_name, host_class, duration_seconds, success, recorded_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (module_name, host_class, duration_seconds, int(success), time.time()),
+            )
+            conn.commit()
+
+    def get_module_durations(self, per_module: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get the most recent successful run durations of each module on each host class.
+
+        Args:
+            per_module: Most runs returned per module and host class
+
+        Returns:
+            Rows with module_name, host_class, duration_seconds and recorded_at
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT module_name, host_class, duration_seconds, recorded_at FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY module_name, host_class ORDER BY recorded_at DESC
+                    ) AS recency
+                    FROM module_durations WHERE success = 1
+                )
+                WHERE recency <= ?
+                """,
+                (per_module,),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_duration_stats(
+        self, since: Optional[float] = None, host_class: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate module run durations in SQL.
+
+        Args:
+            since: Only runs recorded at or after this Unix time
+            host_class: Only runs on this host class
+
+        Returns:
+            Per module: runs, failures, avg/min/max duration of successful
+            runs and the time of the last run, slowest modules first
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT
+                    module_name,
+                    COUNT(*) AS runs,
+                    SUM(success = 0) AS failures,
+                    AVG(CASE WHEN success = 1 THEN duration_seconds END) AS avg_seconds,
+                    MIN(CASE WHEN success = 1 THEN duration_seconds END) AS min_seconds,
+                    MAX(CASE WHEN success = 1 THEN duration_seconds END) AS max_seconds,
+                    MAX(recorded_at) AS last_run
+                FROM module_durations
+                WHERE recorded_at >= ? AND (? IS NULL OR host_class = ?)
+                GROUP BY module_name
+                ORDER BY avg_seconds IS NULL, avg_seconds DESC
+                """,
+                (since or 0.0, host_class, host_class),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_installation_stats(self) -> Dict[str, Any]:
+        """
+        Aggregate installations in SQL.
+
+        Returns:
+            Count of installations per overall status, and the average run
+            time of completed ones in seconds
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT
+                    overall_status,
+                    COUNT(*) AS count,
+                    AVG((julianday(completed_at) - julianday(started_at)) * 86400) AS avg_seconds
+                FROM installations
+                GROUP BY overall_status
+                """
+            )
+            rows = cursor.fetchall()
+
+        completed = [r for r in rows if r["avg_seconds"] is not None]
+        total_completed = sum(r["count"] for r in completed)
+        return {
+            "by_status": {r["overall_status"]: r["count"] for r in rows},
+            "avg_seconds": (
+                sum(r["avg_seconds"] * r["count"] for r in completed) / total_completed
+                if total_completed
+                else None
+            ),
+        }
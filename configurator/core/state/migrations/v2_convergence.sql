@@ -0,0 +1,11 @@
+-- Desired-state fingerprints of modules as last successfully applied
+-- Version: 2.0
+-- Created: 2026-10-18
+
+-- Convergence table
+-- One row per module; a re-run whose fingerprint still matches can be skipped
+CREATE TABLE IF NOT EXISTS module_convergence (
+    module_name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    applied_at TEXT NOT NULL
+);
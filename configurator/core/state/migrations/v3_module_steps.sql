@@ -0,0 +1,14 @@
+-- Step checkpoints inside large modules
+-- Version: 3.0
+-- Created: 2026-10-18
+
+-- Module steps table
+-- Steps completed by a module run that has not finished yet; cleared when it does
+CREATE TABLE IF NOT EXISTS module_steps (
+    module_name TEXT NOT NULL,
+    step_name TEXT NOT NULL,
+    input_digest TEXT NOT NULL,
+    completed_at TEXT NOT NULL,
+    duration_seconds REAL,
+    PRIMARY KEY (module_name, step_name)
+);
@@ -0,0 +1,11 @@
+-- Cached preflight validation results
+-- Version: 4.0
+-- Created: 2026-10-18
+
+-- Validation cache table
+-- Last passing result of each validator; reused by runs within the cache TTL
+CREATE TABLE IF NOT EXISTS validation_cache (
+    validator_key TEXT PRIMARY KEY,
+    result_json TEXT NOT NULL,
+    checked_at REAL NOT NULL
+);
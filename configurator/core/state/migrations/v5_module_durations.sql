@@ -0,0 +1,17 @@
+-- Module run durations for the duration model
+-- Version: 5.0
+-- Created: 2026-10-19
+
+-- Module durations table
+-- One row per module run, tagged with the class of host it ran on
+CREATE TABLE IF NOT EXISTS module_durations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    module_name TEXT NOT NULL,
+    host_class TEXT NOT NULL,
+    duration_seconds REAL NOT NULL,
+    success INTEGER NOT NULL DEFAULT 1,
+    recorded_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_module_durations_module
+    ON module_durations(module_name, host_class, recorded_at DESC);
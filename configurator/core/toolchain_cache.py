@@ -0,0 +1,280 @@
+"""
+Shared cache of toolchain downloads (Go, Node.js, rustup).
+
+Language modules used to download the same release archives on every run
+and on every machine of a fleet, then delete the old installation before
+extracting the new one. The toolchain cache keeps each archive once,
+stored by SHA256 and verified against the upstream checksum list before it
+is reused, and install_tree() puts it in place with a directory swap, so an
+interrupted install never leaves a half-extracted toolchain behind.
+
+Usage:
+    cache = get_toolchain_cache()
+    sums = cache.checksums(f"{url}.sha256")
+    archive = cache.fetch(url, sums.get(os.path.basename(url)))
+    install_tree(archive, Path("/usr/local/go"))
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import stat
+import tarfile
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from configurator.utils.download import get_download_engine
+from configurator.utils.file_lock import file_lock
+from configurator.utils.hashing import get_hash_service
+
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+def parse_checksums(text: str, default_name: str = "") -> Dict[str, str]:
+    """
+    Parse a sha256sum-style checksum list.
+
+    Lines are ``<sha256>  [*]<file>``; a bare digest (as in Go's and rustup's
+    ``.sha256`` files) is stored under default_name.
+
+    Returns:
+        Mapping of file name (without directories) to lowercase digest
+    """
+    sums: Dict[str, str] = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts or not _SHA256.match(parts[0].lower()):
+            continue
+        name = os.path.basename(parts[1].lstrip("*")) if len(parts) > 1 else default_name
+        sums[name] = parts[0].lower()
+    return sums
+
+
+class ToolchainCache:
+    """
+    Checksum-verified store of toolchain archives and their checksum lists.
+
+    Archives are kept as ``<sha256>-<file name>`` and are only returned after
+    their digest matches the expected one. Checksum lists are kept by URL;
+    versioned lists never change and are reused indefinitely, moving ones
+    (``latest-v20.x``) for max_age seconds. The cache directory must belong
+    to the current user and not be writable by others, since its archives
+    are extracted into system directories; otherwise nothing is cached.
+    """
+
+    DEFAULT_CACHE_DIR = Path("/var/cache/debian-vps-configurator/toolchains")
+
+    def __init__(self, cache_dir: Optional[Path] = None, logger: Optional[logging.Logger] = None):
+        """
+        Initialize ToolchainCache.
+
+        Args:
+            cache_dir: Where archives and checksum lists are stored
+            logger: Optional logger instance
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.network_fetches = 0
+
+    @classmethod
+    def default_dir(cls) -> Path:
+        """System cache for root, the user's cache directory otherwise."""
+        if os.geteuid() == 0:
+            return cls.DEFAULT_CACHE_DIR
+        return Path.home() / ".cache" / "debian-vps-configurator" / "toolchains"
+
+    def checksums(self, url: str, max_age: Optional[float] = None) -> Dict[str, str]:
+        """
+        Get a checksum list, downloading it if it is not cached (or older than max_age).
+
+        A stale copy is used if the download fails.
+
+        Returns:
+            Mapping of file name to digest (empty if the list is unavailable)
+        """
+        name = os.path.basename(url.rstrip("/"))
+        default_name = name[: -len(".sha256")] if name.endswith(".sha256") else ""
+        path = self._private_dir("sums")
+        if path is None:
+            # Nowhere safe to keep it: read it straight into a private temporary file
+            with tempfile.TemporaryDirectory(prefix="vps-configurator-") as tmp:
+                target = Path(tmp) / name
+                if not self._download(url, target):
+                    return {}
+                return parse_checksums(target.read_text(errors="replace"), default_name)
+
+        digest = hashlib.sha256(url.encode()).hexdigest()[:16]
+        target = path / f"{digest}-{name}"
+        with self._lock, file_lock(str(target)):
+            fresh = target.exists() and (
+                max_age is None or time.time() - target.stat().st_mtime < max_age
+            )
+            if not fresh and not self._download(url, target) and target.exists():
+                self.logger.warning(f"Could not refresh {url}, using the cached copy")
+            try:
+                return parse_checksums(target.read_text(errors="replace"), default_name)
+            except OSError:
+                return {}
+
+    def fetch(self, url: str, sha256: Optional[str]) -> Optional[Path]:
+        """
+        Get a verified local copy of an archive, downloading it on a cache miss.
+
+        Args:
+            url: Archive URL
+            sha256: Expected digest (from the upstream checksum list)
+
+        Returns:
+            Path of the archive, or None if it could not be fetched or sha256 is unknown
+        """
+        if not sha256 or not _SHA256.match(sha256.lower()):
+            self.logger.warning(f"No checksum for {url}; not using it")
+            return None
+        sha256 = sha256.lower()
+
+        path = self._private_dir("archives")
+        if path is None:
+            return None
+
+        target = path / f"{sha256}-{os.path.basename(url)}"
+        with self._lock, file_lock(str(target)):
+            try:
+                if get_hash_service().hash_file(target) == sha256:
+                    self.logger.debug(f"Using cached {target.name}")
+                    return target
+            except OSError:
+                pass
+
+            self.logger.info(f"Downloading {os.path.basename(url)}...")
+            if not self._download(url, target, sha256):
+                return None
+            os.chmod(target, 0o644)
+            return target
+
+    def _download(self, url: str, target: Path, sha256: Optional[str] = None) -> bool:
+        self.network_fetches += 1
+        result = get_download_engine().download(url, target, sha256, resume=sha256 is not None)
+        if not result.success:
+            self.logger.warning(f"Could not download {url}: {result.error}")
+        return result.success
+
+    def _private_dir(self, name: str) -> Optional[Path]:
+        """Create cache_dir/name, and check nobody else can write to the cache."""
+        path = self.cache_dir / name
+        try:
+            path.mkdir(parents=True, exist_ok=True, mode=0o755)
+            for directory in (self.cache_dir, path):
+                st = os.lstat(directory)
+                if (
+                    not stat.S_ISDIR(st.st_mode)
+                    or st.st_uid != os.geteuid()
+                    or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+                ):
+                    self.logger.warning(
+                        f"Not using toolchain cache {directory}: not a directory owned by "
+                        "this user and closed to others"
+                    )
+                    return None
+        except OSError as e:
+            self.logger.debug(f"Toolchain cache unavailable: {e}")
+            return None
+        return path
+
+
+def swap_directory(new: Path, destination: Path) -> None:
+    """
+    Replace destination by new (same filesystem) with two renames.
+
+    destination is only absent for the instant between the renames, and is
+    put back if the second one fails.
+    """
+    new, destination = Path(new), Path(destination)
+    old: Optional[Path] = None
+    if destination.exists() or destination.is_symlink():
+        old = destination.with_name(f".{destination.name}.old-{os.getpid()}-{time.time_ns()}")
+        os.rename(destination, old)
+
+    try:
+        os.rename(new, destination)
+    except OSError:
+        if old is not None:
+            os.rename(old, destination)
+        raise
+
+    if old is not None:
+        if old.is_dir() and not old.is_symlink():
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            old.unlink()
+
+
+def _make_parents(directory: Path) -> List[Path]:
+    """Create directory and its missing parents; returns the directories created."""
+    missing = []
+    current = directory
+    while not current.exists():
+        missing.append(current)
+        current = current.parent
+    for path in reversed(missing):
+        path.mkdir(mode=0o755, exist_ok=True)
+    return missing
+
+
+def install_tree(archive: Path, destination: Path, owner: Optional[Tuple[int, int]] = None) -> None:
+    """
+    Extract a release archive into destination, replacing what is there.
+
+    The archive is extracted next to destination and swapped in once it is
+    complete. An archive with a single top-level directory (go/,
+    node-v20.11.0-linux-x64/) has that directory installed as destination.
+
+    Args:
+        archive: Tarball (any compression tarfile understands)
+        destination: Directory to install to
+        owner: (uid, gid) to give the installed files, and the parent
+            directories created for them, when running as root
+    """
+    destination = Path(destination)
+    created = _make_parents(destination.parent)
+    if owner is not None:
+        for directory in created:
+            os.lchown(directory, *owner)
+    staging = Path(tempfile.mkdtemp(prefix=f".{destination.name}.new-", dir=destination.parent))
+    try:
+        with tarfile.open(archive) as tar:
+            tar.extractall(staging, filter="data")
+
+        entries = list(staging.iterdir())
+        root = entries[0] if len(entries) == 1 and entries[0].is_dir() else staging
+        os.chmod(root, 0o755)
+
+        if owner is not None:
+            uid, gid = owner
+            os.lchown(root, uid, gid)
+            for dirpath, dirnames, filenames in os.walk(root):
+                for entry in dirnames + filenames:
+                    os.lchown(os.path.join(dirpath, entry), uid, gid)
+
+        swap_directory(root, destination)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+_cache: Optional[ToolchainCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_toolchain_cache(**kwargs) -> ToolchainCache:
+    """Get the process-wide toolchain cache (kwargs apply on first call only)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ToolchainCache(**kwargs)
+    return _cache
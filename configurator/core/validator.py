@@ -19,6 +19,7 @@ from configurator.utils.system import (
     is_root,
     is_systemd,
 )
+from configurator.validators.probes import ProbeSnapshot
 
 
 @dataclass
@@ -57,14 +58,20 @@ class SystemValidator:
     RECOMMENDED_DISK_GB = 40.0
     MIN_CPU_CORES = 1
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        probes: Optional[ProbeSnapshot] = None,
+    ):
         """
         Initialize validator.
 
         Args:
             logger: Logger instance
+            probes: Probe results to share with other validators of the same run
         """
         self.logger = logger or logging.getLogger(__name__)
+        self.probes = probes or ProbeSnapshot()
         self.results: List[ValidationResult] = []
 
     def validate_all(self, strict: bool = True) -> bool:
@@ -133,7 +140,7 @@ class SystemValidator:
 
     def _check_os(self) -> None:
         """Check if running on Debian 13."""
-        os_info = get_os_info()
+        os_info = self.probes.get("os_info", get_os_info)
 
         if os_info.is_debian_13:
             self.results.append(
@@ -165,7 +172,7 @@ class SystemValidator:
 
     def _check_architecture(self) -> None:
         """Check system architecture."""
-        arch = get_architecture()
+        arch = self.probes.get("architecture", get_architecture)
 
         if arch in ("x86_64", "amd64"):
             self.results.append(
@@ -197,7 +204,7 @@ class SystemValidator:
 
     def _check_systemd(self) -> None:
         """Check if systemd is the init system."""
-        if is_systemd():
+        if self.probes.get("systemd", is_systemd):
             self.results.append(
                 ValidationResult(
                     name="Init System",
@@ -218,7 +225,7 @@ class SystemValidator:
 
     def _check_root_access(self) -> None:
         """Check for root/sudo access."""
-        if is_root():
+        if self.probes.get("root", is_root):
             self.results.append(
                 ValidationResult(
                     name="Root Access",
@@ -239,7 +246,7 @@ class SystemValidator:
 
     def _check_ram(self) -> None:
         """Check available RAM."""
-        ram_gb = get_ram_gb()
+        ram_gb = self.probes.get("ram_gb", get_ram_gb)
 
         if ram_gb >= self.RECOMMENDED_RAM_GB:
             self.results.append(
@@ -271,7 +278,7 @@ class SystemValidator:
 
     def _check_disk_space(self) -> None:
         """Check available disk space."""
-        disk_gb = get_disk_free_gb("/")
+        disk_gb = self.probes.get("disk_free_gb", get_disk_free_gb, "/")
 
         if disk_gb >= self.RECOMMENDED_DISK_GB:
             self.results.append(
@@ -303,7 +310,7 @@ class SystemValidator:
 
     def _check_internet(self) -> None:
         """Check internet connectivity."""
-        if check_internet():
+        if self.probes.get("internet", check_internet):
             self.results.append(
                 ValidationResult(
                     name="Internet",
@@ -324,7 +331,7 @@ class SystemValidator:
 
     def _check_cpu(self) -> None:
         """Check CPU cores."""
-        cores = get_cpu_count()
+        cores = self.probes.get("cpu_count", get_cpu_count)
 
         if cores >= 2:
             self.results.append(
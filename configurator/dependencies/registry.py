@@ -80,21 +80,21 @@ class DependencyRegistry:
     @classmethod
     def resolve_order(cls, module_names: List[str]) -> List[str]:
         """Resolve execution order based on dependencies and priority."""
-        from configurator.core.dependency import DependencyGraph
+        from configurator.core.dag import DAG
 
-        graph = DependencyGraph()
+        selected = set(module_names)
+        graph = DAG()
         for name in module_names:
+            graph.add_node(name)
             info = cls._registry.get(name)
             if info:
-                deps = [d for d in cls._get_depends_on(info) if d in module_names]
-                graph.add_module(name, depends_on=deps)
-            else:
-                graph.add_module(name)
+                for dep in cls._get_depends_on(info):
+                    if dep in selected:
+                        graph.add_edge(dep, name)
 
-        batches = graph.get_execution_batches()
-        # Flatten batches, sort within each batch by priority
+        # Flatten layers, sort within each layer by priority
         result = []
-        for batch in batches:
+        for batch in graph.layers():
             sorted_batch = sorted(
                 batch,
                 key=lambda n: cls._get_priority(cls._registry[n]) if n in cls._registry else 50,
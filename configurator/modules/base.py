@@ -4,14 +4,25 @@ Base class for all configuration modules.
 Provides the interface that all modules must implement.
 """
 
+import hashlib
+import json
 import logging
 import os
+import pwd
+import shutil
+import tempfile
 import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence
 
 from configurator.core.dryrun import DryRunManager
+from configurator.core.git_cache import get_git_cache
+from configurator.core.mirror import Artifact, get_active_mirror
 from configurator.core.network import NetworkOperationWrapper
 from configurator.core.package_cache import PackageCacheManager
 from configurator.core.rollback import RollbackManager
@@ -21,7 +32,33 @@ from configurator.observability.structured_logging import StructuredLogger
 from configurator.utils.apt_cache import AptCacheIntegration
 from configurator.utils.circuit_breaker import CircuitBreakerError, CircuitBreakerManager
 from configurator.utils.command import CommandResult, run_command
+from configurator.utils.download import get_download_engine
+from configurator.utils.facts import get_system_facts
+from configurator.utils.hashing import get_hash_service
 from configurator.utils.retry import retry
+from configurator.utils.user_fanout import FanoutReport, UserFanout, UserFile, regular_users
+
+if TYPE_CHECKING:
+    from configurator.core.state.manager import StateManager
+
+
+@dataclass
+class ModuleStep:
+    """
+    A named, checkpointed step of a module's configure().
+
+    Attributes:
+        name: Step name, unique within the module
+        func: Runs the step; returns True on success
+        inputs: What the step's outcome depends on (JSON-serializable); a
+            checkpoint is only reused while these are unchanged
+        critical: If False, a failure is logged and the remaining steps still run
+    """
+
+    name: str
+    func: Callable[[], bool]
+    inputs: Any = None
+    critical: bool = True
 
 
 class ConfigurationModule(ABC):
@@ -38,7 +75,12 @@ class ConfigurationModule(ABC):
     priority: int = 100
     depends_on: List[str] = []
     force_sequential: bool = False  # If True, runs alone in a batch
+    large_module: bool = False  # If True, runs through the pipeline executor
+
+    # Writing below these queues a systemctl daemon-reload
+    SYSTEMD_UNIT_DIRS = ("/etc/systemd/", "/lib/systemd/", "/usr/lib/systemd/")
     mandatory: bool = False  # If True, installation stops on failure
+    version: str = "1"  # Bump when configure() changes what it applies, so hosts re-converge
 
     def __init__(
         self,
@@ -110,6 +152,15 @@ class ConfigurationModule(ABC):
         self.installed_packages: List[str] = []
         self.started_services: List[str] = []
 
+        # Step checkpoints (the executors attach the state manager)
+        self.state_manager: Optional["StateManager"] = None
+        self.step_timings: Dict[str, float] = {}
+        self.resumed_steps: List[str] = []
+
+        # Service actions deferred to the end of configure(), de-duplicated
+        self.pending_restarts: Dict[str, None] = {}
+        self.daemon_reload_pending = False
+
         # Observability
         self.metrics = get_metrics()
         self.structured_logger = StructuredLogger(self.name)
@@ -203,11 +254,16 @@ class ConfigurationModule(ABC):
                 self.dry_run_manager.record_command(command)
             return CommandResult(command=command, return_code=0, stdout="", stderr="")
 
-        # Default to shell=True to support pipes and redirects unless explicitly disabled
-        if "shell" not in kwargs:
-            kwargs["shell"] = True
+        # Pipes and redirects work as before; plain commands skip /bin/sh
+        kwargs.setdefault("shell", None)
+        kwargs.setdefault("logger", self.logger)
 
-        result = run_command(command, check=check, **kwargs)
+        try:
+            result = run_command(command, check=check, **kwargs)
+        finally:
+            if not force_execute and "systemctl" in command:
+                # Unit states may have changed; drop the cached snapshot
+                get_system_facts().invalidate("services")
 
         if rollback_command and result.success:
             self.rollback_manager.add_command(
@@ -216,6 +272,144 @@ class ConfigurationModule(ABC):
 
         return result
 
+    def run_steps(self, steps: Sequence[ModuleStep]) -> bool:
+        """
+        Run named steps in order, checkpointing each one.
+
+        Steps that completed, with the same inputs, in an earlier run that
+        did not finish are skipped. Once every step has run the checkpoints
+        are cleared, so the next run starts from the top.
+
+        Args:
+            steps: Steps to run
+
+        Returns:
+            False if a critical step failed
+        """
+        store = None if self.dry_run else self.state_manager
+        completed: Dict[str, str] = {}
+        if store is not None:
+            try:
+                completed = store.get_completed_steps(self.name)
+            except Exception as e:
+                self.logger.warning(f"Cannot read step checkpoints: {e}")
+                store = None
+
+        for step in steps:
+            digest = self._step_digest(step)
+            if completed.get(step.name) == digest:
+                self.logger.info(f"✓ {step.name} (completed by an earlier run)")
+                self.resumed_steps.append(step.name)
+                self.step_timings[step.name] = 0.0
+                continue
+
+            started = time.monotonic()
+            try:
+                success = step.func()
+            except Exception as e:
+                if step.critical:
+                    raise
+                self.logger.warning(f"{step.name} raised: {e}")
+                success = False
+            duration = time.monotonic() - started
+            self.step_timings[step.name] = duration
+            self.logger.debug(f"Step {step.name} took {duration:.1f}s")
+
+            if not success:
+                if step.critical:
+                    self.logger.error(f"{step.name} failed")
+                    return False
+                self.logger.warning(f"{step.name} failed (non-critical)")
+                continue
+
+            if store is not None:
+                try:
+                    store.record_step(self.name, step.name, digest, duration)
+                except Exception as e:
+                    self.logger.warning(f"Cannot checkpoint step {step.name}: {e}")
+
+        if store is not None:
+            try:
+                store.clear_steps(self.name)
+            except Exception as e:
+                self.logger.warning(f"Cannot clear step checkpoints: {e}")
+        return True
+
+    def _step_digest(self, step: ModuleStep) -> str:
+        """Digest of a step's identity and inputs, including the module version."""
+        canonical = json.dumps(
+            {"version": self.version, "step": step.name, "inputs": step.inputs},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def run_many(
+        self, commands: Sequence[str], check: bool = True, **kwargs: Any
+    ) -> List[CommandResult]:
+        """
+        Run independent commands concurrently.
+
+        Only for commands that do not depend on each other's effects. Each
+        goes through run() (dry-run, rollback and logging apply as usual);
+        the command engine's budgets still serialize apt/dpkg calls.
+
+        Args:
+            commands: Commands to run
+            check: Raise if any command fails (after all have finished)
+            **kwargs: Additional arguments for run()
+
+        Returns:
+            Results in the order of commands
+        """
+        if len(commands) <= 1:
+            return [self.run(command, check=check, **kwargs) for command in commands]
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(commands), 8), thread_name_prefix=f"{self.name}-run"
+        ) as pool:
+            futures = [
+                pool.submit(self.run, command, check=check, **kwargs) for command in commands
+            ]
+        return [future.result() for future in futures]
+
+    def write_user_files(
+        self,
+        files: Sequence[UserFile],
+        users: Optional[Sequence[pwd.struct_passwd]] = None,
+    ) -> FanoutReport:
+        """
+        Write the same files into many users' home directories.
+
+        Content is rendered once by the caller; users are handled from a
+        bounded thread pool (see UserFanout). Created files are removed on
+        rollback.
+
+        Args:
+            files: Files to write, relative to each home directory
+            users: Accounts to configure (default: all regular users)
+
+        Returns:
+            FanoutReport with per-user results
+        """
+        users = regular_users() if users is None else users
+
+        if self.dry_run and self.dry_run_manager:
+            for user in users:
+                for spec in files:
+                    if spec.content is not None:
+                        self.dry_run_manager.record_file_write(
+                            os.path.join(user.pw_dir, spec.path), spec.content
+                        )
+
+        report = UserFanout(dry_run=self.dry_run, logger=self.logger).write_files(users, files)
+        if self.rollback_manager:
+            for path in report.created:
+                self.rollback_manager.add_command(
+                    f"rm -f {path}", description=f"Remove created file: {path}"
+                )
+        return report
+
     def install_packages_resilient(self, packages: List[str], update_cache: bool = True) -> bool:
         """
         Install packages with network resilience.
@@ -253,6 +447,8 @@ class ConfigurationModule(ABC):
 
                 self.installed_packages.extend(packages)
 
+            # New packages bring binaries and units with them
+            get_system_facts().invalidate("packages", "commands", "services")
             return success
 
     @retry(max_retries=20, base_delay=5.0)
@@ -541,6 +737,8 @@ class ConfigurationModule(ABC):
                         except Exception as e:
                             self.logger.warning(f"Failed to update package cache: {e}")
 
+                # New packages bring binaries and units with them
+                get_system_facts().invalidate("packages", "commands", "services")
                 return result.success
 
     def enable_service(self, service: str, start: bool = True) -> bool:
@@ -612,6 +810,43 @@ class ConfigurationModule(ABC):
         result = self.run(f"systemctl restart {service}", check=False)
         return result.success
 
+    def schedule_restart(self, service: str) -> None:
+        """
+        Restart a service once, after configure(), however many changes asked for it.
+
+        Args:
+            service: Service name
+        """
+        if service not in self.pending_restarts:
+            self.logger.debug(f"Restart of {service} scheduled")
+            self.pending_restarts[service] = None
+
+    def apply_pending_service_actions(self) -> bool:
+        """
+        Run the queued daemon-reload and service restarts, each once.
+
+        Called by the executors after configure(); modules that need a service
+        up before continuing may call it earlier.
+
+        Returns:
+            True if every restart succeeded
+        """
+        success = True
+
+        if self.daemon_reload_pending:
+            self.daemon_reload_pending = False
+            if not self.dry_run:
+                self.run("systemctl daemon-reload", check=False)
+
+        services = list(self.pending_restarts)
+        self.pending_restarts.clear()
+        for service in services:
+            if not self.restart_service(service):
+                self.logger.error(f"Failed to restart {service}")
+                success = False
+
+        return success
+
     def is_service_active(self, service: str) -> bool:
         """
         Check if a systemd service is running.
@@ -622,9 +857,8 @@ class ConfigurationModule(ABC):
         Returns:
             True if service is active
         """
-        # Always run check commands (read-only)
-        result = self.run(f"systemctl is-active {service}", check=False, force_execute=True)
-        return result.stdout.strip() == "active"
+        # Read-only, so answered even in dry-run mode
+        return get_system_facts().is_service_active(service)
 
     def is_service_enabled(self, service: str) -> bool:
         """
@@ -636,9 +870,8 @@ class ConfigurationModule(ABC):
         Returns:
             True if service is enabled
         """
-        # Always run check commands (read-only)
-        result = self.run(f"systemctl is-enabled {service}", check=False, force_execute=True)
-        return result.stdout.strip() == "enabled"
+        # Read-only, so answered even in dry-run mode
+        return get_system_facts().is_service_enabled(service)
 
     def command_exists(self, command: str) -> bool:
         """
@@ -650,23 +883,195 @@ class ConfigurationModule(ABC):
         Returns:
             True if command exists
         """
-        # Always run check commands
-        result = self.run(f"which {command}", check=False, force_execute=True)
+        # Read-only, so answered even in dry-run mode
+        return get_system_facts().command_exists(command)
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        """
+        List the files, git repositories and .deb packages this module fetches.
+
+        Used by ``mirror build`` to bundle everything a profile needs. Modules
+        that download anything should override this.
+        """
+        return []
+
+    def managed_files(self) -> List[str]:
+        """
+        List the files this module writes whose contents are part of its applied state.
+
+        Their digests go into the desired-state fingerprint, so hand edits or
+        deletions make the module run again.
+        """
+        return []
+
+    def desired_state(self) -> Dict[str, Any]:
+        """
+        Describe what configure() applies: config slice, module version, packages, files.
+        """
+        hash_service = get_hash_service()
+        files: Dict[str, Optional[str]] = {}
+        for path in self.managed_files():
+            try:
+                files[path] = hash_service.hash_file(path)
+            except OSError:
+                files[path] = None
+
+        return {
+            "module": type(self).__name__,
+            "version": self.version,
+            "config": self.config,
+            "packages": sorted(self._declared_packages()),
+            "files": files,
+        }
+
+    def state_fingerprint(self) -> str:
+        """SHA256 of desired_state(), stable across runs."""
+        canonical = json.dumps(self.desired_state(), sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def probe_converged(self) -> bool:
+        """
+        Cheaply check the live system still has what the fingerprint describes.
+
+        Modules that declare neither packages nor managed files have nothing
+        to check against and are never considered converged.
+        """
+        packages = self._declared_packages()
+        if not packages and not self.managed_files():
+            return False
+
+        facts = get_system_facts()
+        return all(facts.is_package_installed(package) for package in packages)
+
+    def _declared_packages(self) -> List[str]:
+        """Packages among this module's mirror artifacts."""
+        return [a.source for a in self.mirror_artifacts() if a.kind == "deb"]
+
+    @contextmanager
+    def staging_dir(self) -> Iterator[str]:
+        """
+        Private directory for downloaded installers, removed afterwards.
+
+        Installers must never be staged at fixed names in /tmp, where another
+        local user can pre-create them. The directory is readable (not
+        writable) by others so installers can run as the target user.
+        """
+        path = tempfile.mkdtemp(prefix="vps-configurator-")
+        try:
+            os.chmod(path, 0o755)
+            yield path
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def fetch_artifact(
+        self, url: str, destination: str, sha256: Optional[str] = None, resume: bool = True
+    ) -> bool:
+        """
+        Download a file (from the active mirror when it has it).
+
+        Args:
+            url: Source URL
+            destination: Local path
+            sha256: Expected SHA256 hex digest
+            resume: Continue a partial download left by an earlier run
+
+        Returns:
+            True if the file is in place
+        """
+        if self.dry_run:
+            self.logger.info(f"MOCKED RUN: Download {url} -> {destination}")
+            return True
+
+        result = get_download_engine().download(url, Path(destination), sha256, resume=resume)
+        if not result.success:
+            self.logger.error(f"Download failed: {url}: {result.error}")
         return result.success
 
+    def git_source(self, url: str) -> Optional[str]:
+        """
+        Local repository to clone url from: the active mirror's bundle, else the shared git cache.
+
+        Returns:
+            Local path, or None to clone from upstream
+        """
+        if self.dry_run:
+            return None
+
+        mirror = get_active_mirror()
+        bundle = mirror.git_bundle(url) if mirror else None
+        if bundle is not None:
+            return str(bundle)
+
+        cached = get_git_cache().ensure(url, run=self.run)
+        return str(cached) if cached is not None else None
+
+    def git_clone_command(self, url: str, dest: str, depth: int = 1) -> str:
+        """
+        Build a git clone command, cloning from a local copy of the repo when there is one.
+
+        A clone from a mirror bundle or the git cache gets its origin pointed
+        back at url so later updates go upstream. The local copy belongs to
+        root while clones usually run as a regular user, so it is marked as a
+        safe directory; if the local clone still fails, url is cloned instead.
+        """
+        upstream = f"GIT_TERMINAL_PROMPT=0 git clone --depth={depth} {url} {dest}"
+        source = self.git_source(url)
+        if source is None:
+            return upstream
+        return (
+            f"git -c safe.directory={source} clone --quiet "
+            f"--upload-pack={self.git_upload_pack(source)} {source} {dest} "
+            f"&& git -C {dest} remote set-url origin {url} || {upstream}"
+        )
+
+    @staticmethod
+    def git_upload_pack(source: str) -> str:
+        """
+        upload-pack command that serves source to a user who does not own it.
+
+        Git 2.35.2+ refuses repositories owned by someone else, and clears
+        the environment (so -c options) of the upload-pack it spawns for a
+        local clone or fetch; safe.directory has to be passed to it directly.
+        Spaces are backslash-escaped so the command can be nested in
+        su -c quoting.
+        """
+        return f"git\\ -c\\ safe.directory={source}\\ upload-pack"
+
     def write_file(
-        self, path: str, content: str, mode: int = 0o644, backup: bool = False, **kwargs
-    ) -> None:
+        self,
+        path: str,
+        content: str,
+        mode: int = 0o644,
+        backup: bool = False,
+        restart: Optional[str] = None,
+        **kwargs,
+    ) -> bool:
         """
         Write content to file (with dry-run support).
+
+        Identical content is left alone. Changed systemd unit files queue a
+        daemon-reload; restart names a service to restart (once, at the end
+        of configure()) if the file changed.
+
+        Returns:
+            True if the file was created or its content changed
         """
         if self.dry_run:
             if self.dry_run_manager:
                 self.dry_run_manager.record_file_write(path, content)
-            return
+            if restart:
+                self.schedule_restart(restart)
+            return True
 
+        from configurator.utils.file import file_has_content
         from configurator.utils.file import write_file as utils_write_file
 
+        if file_has_content(path, content):
+            # Still enforce mode and ownership
+            utils_write_file(path, content, mode=mode, backup=False, **kwargs)
+            self.logger.debug(f"{path} already up to date")
+            return False
+
         path_obj = Path(path)
         file_existed = path_obj.exists()
 
@@ -704,6 +1109,12 @@ class ConfigurationModule(ABC):
             # Current Best Effort:
             self.logger.debug(f"Modified existing file {path}. Backup should be available.")
 
+        if path.startswith(self.SYSTEMD_UNIT_DIRS):
+            self.daemon_reload_pending = True
+        if restart:
+            self.schedule_restart(restart)
+        return True
+
     def get_config(self, key: str, default: Any = None) -> Any:
         """
         Get a configuration value.
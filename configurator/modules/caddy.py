@@ -8,7 +8,9 @@ Handles:
 """
 
 from pathlib import Path
+from typing import List
 
+from configurator.core.mirror import Artifact
 from configurator.modules.base import ConfigurationModule
 
 
@@ -26,6 +28,13 @@ class CaddyModule(ConfigurationModule):
     priority = 71
     mandatory = False
 
+    REPOSITORY_PACKAGES = ["debian-keyring", "debian-archive-keyring", "apt-transport-https"]
+    PACKAGES = ["caddy"]
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        """Repository prerequisites and Caddy (from the Cloudsmith repository)."""
+        return [Artifact("deb", name) for name in self.REPOSITORY_PACKAGES + self.PACKAGES]
+
     def validate(self) -> bool:
         """Validate Caddy prerequisites."""
         # Check if Caddy is already installed
@@ -85,7 +94,7 @@ class CaddyModule(ConfigurationModule):
         self.logger.info("Adding Caddy repository...")
 
         # Install dependencies
-        self.install_packages(["debian-keyring", "debian-archive-keyring", "apt-transport-https"])
+        self.install_packages(self.REPOSITORY_PACKAGES)
 
         # Add GPG key
         self.run(
@@ -109,7 +118,7 @@ class CaddyModule(ConfigurationModule):
     def _install_caddy(self):
         """Install Caddy package."""
         self.logger.info("Installing Caddy...")
-        self.install_packages(["caddy"], update_cache=True)
+        self.install_packages(self.PACKAGES, update_cache=True)
 
     def _create_config(self):
         """Create default Caddyfile."""
@@ -239,9 +248,7 @@ class CaddyModule(ConfigurationModule):
             # Check if active
             is_active = self.is_service_active(service)
 
-            # Check if enabled manually since base class doesn't have is_service_enabled
-            result_enabled = self.run(f"systemctl is-enabled {service}", check=False)
-            is_enabled = result_enabled.success or result_enabled.stdout.strip() == "enabled"
+            is_enabled = self.is_service_enabled(service)
 
             if is_active or is_enabled:
                 self.logger.info(f"Found conflicting service: {service}")
@@ -4,15 +4,20 @@ Cursor IDE module for AI-powered code editor.
 Handles:
 - Cursor .deb package download (v2.3+)
 - Installation via apt-get
+- Extension installation (optional)
 - Configuration and Verification
 """
 
 import os
 from pathlib import Path
+from typing import List
 
+from configurator.core.extensions import ExtensionInstaller
+from configurator.core.mirror import Artifact
 from configurator.exceptions import ModuleExecutionError
 from configurator.modules.base import ConfigurationModule
 from configurator.utils.command import command_exists
+from configurator.utils.facts import get_system_facts
 
 
 class CursorModule(ConfigurationModule):
@@ -28,6 +33,14 @@ class CursorModule(ConfigurationModule):
     priority = 61
     mandatory = False
 
+    # New URL for .deb package (v2.3)
+    # Using the specific version endpoint as requested by user
+    CURSOR_DEB_URL = "https://api2.cursor.sh/updates/download/golden/linux-x64-deb/cursor/2.3"
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        """The Cursor .deb package."""
+        return [Artifact("file", self.CURSOR_DEB_URL)]
+
     def validate(self) -> bool:
         """Validate Cursor prerequisites."""
         # Check if Cursor is already installed
@@ -40,6 +53,7 @@ class CursorModule(ConfigurationModule):
         """Install and Configure Cursor IDE."""
         self._install_cursor()
         self._configure()
+        self._install_extensions()
         self._verify_installation()
         return True
 
@@ -61,8 +75,7 @@ class CursorModule(ConfigurationModule):
             )
 
         # Check if it was installed via package manager
-        result = self.run("dpkg -s cursor", check=False)
-        if not result.success:
+        if not get_system_facts().is_package_installed("cursor"):
             self.logger.warning("Cursor installed but not found in dpkg (manual install?)")
 
         self.logger.info("✓ Cursor IDE installed")
@@ -77,75 +90,98 @@ class CursorModule(ConfigurationModule):
         if self.target_user != os.environ.get("USER"):
             self.run(f"chown -R {self.target_user}:{self.target_user} {config_dir}", check=False)
 
+    def _install_extensions(self) -> None:
+        """Install configured extensions (all missing ones in a single CLI call)."""
+        extensions = self.get_config("extensions", [])
+        if not extensions:
+            return
+
+        self.logger.info(f"Installing {len(extensions)} Cursor extensions...")
+        cmd_prefix = ""
+        if self.target_user != "root" and os.environ.get("USER") == "root":
+            cmd_prefix = f"sudo -u {self.target_user}"
+
+        installer = ExtensionInstaller(
+            "cursor",
+            Path(self.target_home) / ".cursor" / "extensions",
+            run=self.run,
+            cli_prefix=cmd_prefix,
+            cli_args=(
+                "--user-data-dir /root/.config/Cursor --no-sandbox"
+                if self.target_user == "root"
+                else ""
+            ),
+            dry_run=self.dry_run,
+            logger=self.logger,
+        )
+        report = installer.install(extensions)
+        for ext in report.failed:
+            self.logger.warning(f"  ⚠ Failed to install {ext}")
+
     def _install_cursor(self) -> None:
         """Install Cursor IDE via .deb package."""
         self.logger.info("Installing Cursor IDE...")
 
-        # New URL for .deb package (v2.3)
-        # Using the specific version endpoint as requested by user
-        cursor_url = "https://api2.cursor.sh/updates/download/golden/linux-x64-deb/cursor/2.3"
-        temp_deb = str(Path(self.target_home) / "cursor.deb")
-
-        self.logger.info("Downloading Cursor .deb package...")
-        try:
-            # Download with retry logic
-            self.run(
-                f"curl -L --retry 3 --retry-delay 5 -o {temp_deb} '{cursor_url}'",
-                check=True,
-                description="Download Cursor .deb",
-            )
-
-            self.logger.info("Installing Cursor package...")
-            # Use dpkg directly for .deb files to allow downgrades
-            result = self.run(
-                f"dpkg --force-confnew --force-confdef --force-overwrite -i {temp_deb}",
-                check=False,
-                description="Install Cursor .deb",
-            )
-
-            if result.return_code != 0:
-                self.logger.warning("dpkg install had errors, fixing dependencies...")
-
-            # Fix any broken dependencies after dpkg install
-            # Retry with exponential backoff for lock contention
-            max_retries = 5
-            for attempt in range(max_retries):
-                fix_result = self.run(
-                    "apt-get install -f -y --allow-downgrades",
+        with self.staging_dir() as staging:
+            temp_deb = os.path.join(staging, "cursor.deb")
+            self.logger.info("Downloading Cursor .deb package...")
+            try:
+                # Downloads retry on their own and come from the mirror when one is active
+                if not self.fetch_artifact(self.CURSOR_DEB_URL, temp_deb, resume=False):
+                    raise RuntimeError(f"Download failed: {self.CURSOR_DEB_URL}")
+
+                self.logger.info("Installing Cursor package...")
+                # Use dpkg directly for .deb files to allow downgrades
+                result = self.run(
+                    f"dpkg --force-confnew --force-confdef --force-overwrite -i {temp_deb}",
                     check=False,
-                    description="Fix Cursor dependencies",
+                    description="Install Cursor .deb",
                 )
 
-                if fix_result.return_code == 0:
-                    self.logger.info("✓ Dependencies fixed successfully")
-                    break
-                elif "Could not get lock" in fix_result.stderr or "is held by" in fix_result.stderr:
-                    if attempt < max_retries - 1:
-                        wait_time = 2**attempt  # Exponential backoff: 1, 2, 4, 8, 16s
-                        self.logger.info(f"APT lock detected, waiting {wait_time}s before retry...")
-                        import time
+                if result.return_code != 0:
+                    self.logger.warning("dpkg install had errors, fixing dependencies...")
+
+                # Fix any broken dependencies after dpkg install
+                # Retry with exponential backoff for lock contention
+                max_retries = 5
+                for attempt in range(max_retries):
+                    fix_result = self.run(
+                        "apt-get install -f -y --allow-downgrades",
+                        check=False,
+                        description="Fix Cursor dependencies",
+                    )
 
-                        time.sleep(wait_time)
+                    if fix_result.return_code == 0:
+                        self.logger.info("✓ Dependencies fixed successfully")
+                        break
+                    elif (
+                        "Could not get lock" in fix_result.stderr
+                        or "is held by" in fix_result.stderr
+                    ):
+                        if attempt < max_retries - 1:
+                            wait_time = 2**attempt  # Exponential backoff: 1, 2, 4, 8, 16s
+                            self.logger.info(
+                                f"APT lock detected, waiting {wait_time}s before retry..."
+                            )
+                            import time
+
+                            time.sleep(wait_time)
+                        else:
+                            raise ModuleExecutionError(
+                                what="Failed to fix Cursor dependencies",
+                                why="APT lock timeout - another process is using package manager",
+                                how="Wait for other installations to complete, then retry manually: sudo apt-get install -f",
+                            )
                     else:
                         raise ModuleExecutionError(
                             what="Failed to fix Cursor dependencies",
-                            why="APT lock timeout - another process is using package manager",
-                            how="Wait for other installations to complete, then retry manually: sudo apt-get install -f",
+                            why=fix_result.stderr,
+                            how="Check the error above and fix manually",
                         )
-                else:
-                    raise ModuleExecutionError(
-                        what="Failed to fix Cursor dependencies",
-                        why=fix_result.stderr,
-                        how="Check the error above and fix manually",
-                    )
 
-        except Exception as e:
-            raise ModuleExecutionError(
-                what="Failed to install Cursor",
-                why=str(e),
-                how="Check network connection and URL",
-            )
-        finally:
-            # Cleanup
-            if os.path.exists(temp_deb):
-                os.remove(temp_deb)
+            except Exception as e:
+                raise ModuleExecutionError(
+                    what="Failed to install Cursor",
+                    why=str(e),
+                    how="Check network connection and URL",
+                )
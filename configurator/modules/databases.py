@@ -8,6 +8,9 @@ Handles:
 - MongoDB tools
 """
 
+from typing import List
+
+from configurator.core.mirror import Artifact
 from configurator.modules.base import ConfigurationModule
 
 
@@ -25,6 +28,37 @@ class DatabasesModule(ConfigurationModule):
     priority = 52
     mandatory = False
 
+    # Client packages per database, with the default of each config switch
+    CLIENT_PACKAGES = {
+        "postgresql": [
+            "postgresql-client",
+            "libpq-dev",  # For Python psycopg2
+        ],
+        "mysql": [
+            "default-mysql-client",
+            "libmysqlclient-dev",  # For Python mysqlclient
+        ],
+        "redis": ["redis-tools"],
+        "mongodb": ["mongodb-mongosh", "mongodb-database-tools"],
+        "sqlite": ["sqlite3", "libsqlite3-dev"],
+    }
+    ENABLED_BY_DEFAULT = {
+        "postgresql": True,
+        "mysql": True,
+        "redis": True,
+        "mongodb": False,
+        "sqlite": True,
+    }
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        """Client packages for the enabled databases (MongoDB's come from its own repository)."""
+        return [
+            Artifact("deb", name)
+            for database, packages in self.CLIENT_PACKAGES.items()
+            if self.get_config(database, self.ENABLED_BY_DEFAULT[database])
+            for name in packages
+        ]
+
     def validate(self) -> bool:
         """Validate prerequisites."""
         return True
@@ -93,29 +127,19 @@ class DatabasesModule(ConfigurationModule):
     def _install_postgresql_client(self):
         """Install PostgreSQL client."""
         self.logger.info("Installing PostgreSQL client...")
-        self.install_packages(
-            [
-                "postgresql-client",
-                "libpq-dev",  # For Python psycopg2
-            ]
-        )
+        self.install_packages(self.CLIENT_PACKAGES["postgresql"])
         self.logger.info("✓ PostgreSQL client installed")
 
     def _install_mysql_client(self):
         """Install MySQL/MariaDB client."""
         self.logger.info("Installing MySQL client...")
-        self.install_packages(
-            [
-                "default-mysql-client",
-                "libmysqlclient-dev",  # For Python mysqlclient
-            ]
-        )
+        self.install_packages(self.CLIENT_PACKAGES["mysql"])
         self.logger.info("✓ MySQL client installed")
 
     def _install_redis_cli(self):
         """Install Redis CLI."""
         self.logger.info("Installing Redis CLI...")
-        self.install_packages(["redis-tools"])
+        self.install_packages(self.CLIENT_PACKAGES["redis"])
         self.logger.info("✓ Redis CLI installed")
 
     def _install_mongodb_tools(self):
@@ -137,12 +161,12 @@ class DatabasesModule(ConfigurationModule):
         )
 
         self.run("apt-get update", check=False)
-        self.install_packages(["mongodb-mongosh", "mongodb-database-tools"], update_cache=False)
+        self.install_packages(self.CLIENT_PACKAGES["mongodb"], update_cache=False)
 
         self.logger.info("✓ MongoDB tools installed")
 
     def _install_sqlite(self):
         """Install SQLite."""
         self.logger.info("Installing SQLite...")
-        self.install_packages(["sqlite3", "libsqlite3-dev"])
+        self.install_packages(self.CLIENT_PACKAGES["sqlite"])
         self.logger.info("✓ SQLite installed")
@@ -4,10 +4,13 @@ import shutil
 import tempfile
 import time
 from pathlib import Path
+from typing import Dict, List
 
-from configurator.modules.base import ConfigurationModule
+from configurator.core.mirror import Artifact
+from configurator.modules.base import ConfigurationModule, ModuleStep
 from configurator.security.supply_chain import SecureDownloader, SecurityError, SupplyChainValidator
-from configurator.utils.file import backup_file
+from configurator.utils.file import backup_file, file_has_content
+from configurator.utils.user_fanout import UserFanout, UserFile, regular_users
 
 
 class DesktopModule(ConfigurationModule):
@@ -28,10 +31,117 @@ class DesktopModule(ConfigurationModule):
     depends_on = ["system", "security"]  # Requires system setup and firewall rules
     priority = 30
     mandatory = False
+    large_module = True  # Many sequential steps; runs through the pipeline executor
+
+    OH_MY_ZSH_INSTALLER_URL = (
+        "https://raw.githubusercontent.com/ohmyzsh/ohmyzsh/master/tools/install.sh"
+    )
+    OH_MY_ZSH_REPO = "https://github.com/ohmyzsh/ohmyzsh.git"
+    POWERLEVEL10K_REPO = "https://github.com/romkatv/powerlevel10k.git"
+    ZSH_AUTOSUGGESTIONS_REPO = "https://github.com/zsh-users/zsh-autosuggestions"
+    ZSH_SYNTAX_HIGHLIGHTING_REPO = "https://github.com/zsh-users/zsh-syntax-highlighting.git"
+    THEME_REPOS = {
+        "nordic": "https://github.com/EliverLara/Nordic.git",
+        "whitesur": "https://github.com/vinceliuice/WhiteSur-gtk-theme.git",
+        "dracula": "https://github.com/dracula/gtk.git",
+    }
+    ICON_REPOS = {"tela": "https://github.com/vinceliuice/Tela-icon-theme.git"}
+    XRDP_PACKAGES = [
+        "xrdp",
+        "xorgxrdp",  # X.org drivers for XRDP
+        "xfce4",  # Desktop environment
+        "xfce4-goodies",  # Additional XFCE utilities
+        "dbus-x11",  # D-Bus X11 support
+    ]
+    THEME_DEPENDENCIES = [
+        "gtk2-engines-murrine",  # GTK2 engine for themes
+        "gtk2-engines-pixbuf",  # GTK2 pixbuf engine
+        "gnome-themes-extra",  # Additional GTK themes
+        "sassc",  # Sass compiler for theme building
+        "git",  # For cloning theme repos
+        "inkscape",  # SVG rendering (for some themes)
+        "optipng",  # PNG optimization
+    ]
+    # Themes and icon sets shipped as Debian packages
+    THEME_PACKAGES = {"arc": ["arc-theme"]}
+    ICON_PACKAGES = {
+        "papirus": ["papirus-icon-theme"],
+        # numix-icon-theme-circle might be in main or contrib/non-free
+        "numix": ["numix-icon-theme", "numix-icon-theme-circle"],
+    }
+    ZSH_PACKAGES = ["zsh", "zsh-common", "zsh-doc"]
+    TERMINAL_TOOL_PACKAGES = {
+        "bat": ["bat"],
+        "eza": ["eza"],
+        "zoxide": ["zoxide"],
+        "fzf": ["fzf"],
+        "ripgrep": ["ripgrep"],
+    }
+    # Minimal Powerlevel10k configuration
+    P10K_CONFIG = """# Powerlevel10k configuration
+if [[ -r "${XDG_CACHE_HOME:-$HOME/.cache}/p10k-instant-prompt-${(%):-%n}.zsh" ]]; then
+  source "${XDG_CACHE_HOME:-$HOME/.cache}/p10k-instant-prompt-${(%):-%n}.zsh"
+fi
+"""
+    MESLO_FONT_BASE_URL = "https://github.com/romkatv/powerlevel10k-media/raw/master"
+    MESLO_FONT_FILES = [
+        "MesloLGS NF Regular.ttf",
+        "MesloLGS NF Bold.ttf",
+        "MesloLGS NF Italic.ttf",
+        "MesloLGS NF Bold Italic.ttf",
+    ]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    def mirror_artifacts(self) -> List[Artifact]:
+        """
+        APT packages, theme/icon repositories and the Zsh installer, plugins
+        and fonts.
+        """
+        packages = list(self.XRDP_PACKAGES)
+        artifacts = []
+
+        themes = self.get_config("desktop.themes.install", ["nordic"]) or []
+        if themes:
+            packages.extend(self.THEME_DEPENDENCIES)
+        for theme in themes:
+            packages.extend(self.THEME_PACKAGES.get(theme.lower(), []))
+            if theme.lower() in self.THEME_REPOS:
+                artifacts.append(Artifact("git", self.THEME_REPOS[theme.lower()]))
+        for icons in self.get_config("desktop.icons.install", ["papirus"]) or []:
+            packages.extend(self.ICON_PACKAGES.get(icons.lower(), []))
+            if icons.lower() in self.ICON_REPOS:
+                artifacts.append(Artifact("git", self.ICON_REPOS[icons.lower()]))
+
+        for tool, tool_packages in self.TERMINAL_TOOL_PACKAGES.items():
+            if self.get_config(f"terminal_tools.{tool}.enabled", True):
+                packages.extend(tool_packages)
+
+        if self.get_config("desktop.zsh.enabled", True):
+            packages.extend(self.ZSH_PACKAGES)
+            if self.get_config("desktop.zsh.oh_my_zsh.enabled", True):
+                artifacts.append(Artifact("file", self.OH_MY_ZSH_INSTALLER_URL))
+                artifacts.append(Artifact("git", self.OH_MY_ZSH_REPO))
+            if self.get_config("desktop.zsh.oh_my_zsh.theme", "powerlevel10k") == "powerlevel10k":
+                artifacts.append(Artifact("git", self.POWERLEVEL10K_REPO))
+            artifacts.append(Artifact("git", self.ZSH_AUTOSUGGESTIONS_REPO))
+            artifacts.append(Artifact("git", self.ZSH_SYNTAX_HIGHLIGHTING_REPO))
+            artifacts.extend(Artifact("file", url) for url in self._meslo_font_urls().values())
+
+        artifacts.extend(Artifact("deb", name) for name in dict.fromkeys(packages))
+        return artifacts
+
+    def managed_files(self) -> List[str]:
+        """XRDP server and session manager configuration."""
+        return ["/etc/xrdp/xrdp.ini", "/etc/xrdp/sesman.ini"]
+
+    def _meslo_font_urls(self) -> Dict[str, str]:
+        return {
+            name: f"{self.MESLO_FONT_BASE_URL}/{name.replace(' ', '%20')}"
+            for name in self.MESLO_FONT_FILES
+        }
+
     def validate(self) -> bool:
         """Validate prerequisites."""
         return True
@@ -45,49 +155,72 @@ class DesktopModule(ConfigurationModule):
         self.logger.info("Configuring desktop environment...")
 
         try:
-            # Phase 1: XRDP Optimization
-            if not self._optimize_xrdp_performance():
-                self.logger.error("XRDP optimization failed")
-                return False
-
-            # Phase 2: Compositor Configuration
-            if not self._optimize_xfce_compositor():
-                self.logger.error("Compositor configuration failed")
-                return False
-
-            # Phase 2: Polkit Rules
-            if not self._configure_polkit_rules():
-                self.logger.warning("Polkit configuration failed (non-critical)")
-
-            # Phase 3: Themes, Icons, Fonts
-            if not self._install_themes():
-                self.logger.warning("Theme installation failed (non-critical)")
-
-            if not self._install_icons():
-                self.logger.warning("Icon installation failed (non-critical)")
-
-            if not self._configure_fonts():
-                self.logger.warning("Font configuration failed (non-critical)")
-
-            # Phase 4: Zsh Environment
-            if not self._configure_zsh():
-                self.logger.warning("Zsh configuration failed (non-critical)")
-
-            # Phase 5: Terminal Tools
-            # Check if any tool is enabled
             tools_enabled = any(
-                [
-                    self.get_config("terminal_tools.bat.enabled", True),
-                    self.get_config("terminal_tools.exa.enabled", True),
-                    self.get_config("terminal_tools.zoxide.enabled", True),
-                    self.get_config("terminal_tools.fzf.enabled", True),
-                    self.get_config("terminal_tools.ripgrep.enabled", True),
-                ]
+                self.get_config(f"terminal_tools.{tool}.enabled", True)
+                for tool in ("bat", "exa", "zoxide", "fzf", "ripgrep")
             )
 
+            steps = [
+                # Phase 1: XRDP Optimization
+                ModuleStep(
+                    "XRDP optimization",
+                    self._optimize_xrdp_performance,
+                    inputs=self.get_config("xrdp"),
+                ),
+                # Phase 2: Compositor Configuration + Polkit Rules
+                ModuleStep(
+                    "Compositor configuration",
+                    self._optimize_xfce_compositor,
+                    inputs=self.get_config("compositor"),
+                ),
+                ModuleStep(
+                    "Polkit configuration",
+                    self._configure_polkit_rules,
+                    inputs=self.get_config("polkit"),
+                    critical=False,
+                ),
+                # Phase 3: Themes, Icons, Fonts
+                ModuleStep(
+                    "Theme installation",
+                    self._install_themes,
+                    inputs=[self.get_config("desktop.themes"), self.get_config("desktop.theme")],
+                    critical=False,
+                ),
+                ModuleStep(
+                    "Icon installation",
+                    self._install_icons,
+                    inputs=self.get_config("desktop.icons"),
+                    critical=False,
+                ),
+                ModuleStep(
+                    "Font configuration",
+                    self._configure_fonts,
+                    inputs=self.get_config("desktop.fonts"),
+                    critical=False,
+                ),
+                # Phase 4: Zsh Environment
+                ModuleStep(
+                    "Zsh configuration",
+                    self._configure_zsh,
+                    inputs=[self.get_config("desktop.zsh"), self.get_config("desktop.terminal")],
+                    critical=False,
+                ),
+            ]
+
+            # Phase 5: Terminal Tools
             if tools_enabled:
-                if not self._configure_terminal_tools():
-                    self.logger.warning("Terminal tools configuration failed (non-critical)")
+                steps.append(
+                    ModuleStep(
+                        "Terminal tools configuration",
+                        self._configure_terminal_tools,
+                        inputs=self.get_config("terminal_tools"),
+                        critical=False,
+                    )
+                )
+
+            # A retry after a failure resumes after the last completed step
+            if not self.run_steps(steps):
+                return False
 
             self.logger.info("✓ Desktop environment configured successfully")
             return True
@@ -109,8 +242,7 @@ class DesktopModule(ConfigurationModule):
         issues = []
 
         # Verify XRDP service
-        result = self.run("systemctl is-active xrdp", check=False)
-        if not result.success or "active" not in result.stdout:
+        if not self.is_service_active("xrdp"):
             issues.append("XRDP service not running")
         else:
             self.logger.info("✓ XRDP service is running")
@@ -162,41 +294,34 @@ class DesktopModule(ConfigurationModule):
         try:
             # Step 1: Install XRDP and dependencies
             self.logger.info("Installing XRDP and dependencies...")
-            packages = [
-                "xrdp",
-                "xorgxrdp",  # X.org drivers for XRDP
-                "xfce4",  # Desktop environment
-                "xfce4-goodies",  # Additional XFCE utilities
-                "dbus-x11",  # D-Bus X11 support
-            ]
-
-            if not self.install_packages_resilient(packages):
+            if not self.install_packages_resilient(self.XRDP_PACKAGES):
                 self.logger.error("Failed to install XRDP packages")
                 return False
 
-            # Step 2: Backup existing configurations
-            self.logger.info("Backing up XRDP configurations...")
-
-            config_files = [
-                "/etc/xrdp/xrdp.ini",
-                "/etc/xrdp/sesman.ini",
-            ]
-
-            for config_file in config_files:
-                if os.path.exists(config_file):
-                    if not self.dry_run:
-                        try:
-                            backup_file(config_file)
-                            self.logger.debug(f"Backed up {config_file}")
-                        except Exception as e:
-                            self.logger.warning(f"Failed to backup {config_file}: {e}")
+            # Step 2: Generate optimized xrdp.ini and sesman.ini
+            self.logger.info("Generating optimized XRDP configuration...")
+            xrdp_configs = {
+                "/etc/xrdp/xrdp.ini": self._generate_xrdp_ini(),
+                "/etc/xrdp/sesman.ini": self._generate_sesman_ini(),
+            }
 
-            # Step 3: Generate and apply optimized xrdp.ini
-            self.logger.info("Generating optimized xrdp.ini...")
-            xrdp_ini_content = self._generate_xrdp_ini()
+            # Step 3: Back up and apply the files that change; xrdp restarts once for all of them
+            for config_file, content in xrdp_configs.items():
+                if (
+                    os.path.exists(config_file)
+                    and not self.dry_run
+                    and not file_has_content(config_file, content)
+                ):
+                    try:
+                        backup_file(config_file)
+                        self.logger.debug(f"Backed up {config_file}")
+                    except Exception as e:
+                        self.logger.warning(f"Failed to backup {config_file}: {e}")
 
-            self.write_file("/etc/xrdp/xrdp.ini", xrdp_ini_content, mode=0o644)
-            self.logger.info("Applied optimized xrdp.ini")
+                if self.write_file(config_file, content, mode=0o644, restart="xrdp"):
+                    self.logger.info(f"Applied optimized {os.path.basename(config_file)}")
+                else:
+                    self.logger.info(f"{os.path.basename(config_file)} already up to date")
 
             # Register rollback
             self.rollback_manager.add_command(
@@ -204,13 +329,6 @@ class DesktopModule(ConfigurationModule):
                 "Restore original XRDP configuration",
             )
 
-            # Step 4: Generate and apply optimized sesman.ini
-            self.logger.info("Generating optimized sesman.ini...")
-            sesman_ini_content = self._generate_sesman_ini()
-
-            self.write_file("/etc/xrdp/sesman.ini", sesman_ini_content, mode=0o644)
-            self.logger.info("Applied optimized sesman.ini")
-
             # Step 5: Configure user session scripts
             self.logger.info("Configuring user session scripts...")
             if not self._configure_user_session():
@@ -1034,11 +1152,13 @@ echo "Configuration complete. Please restart your session for changes to take fu
             if not result.success:
                 self.logger.warning("Failed to enable xrdp-sesman service")
 
-            # Restart XRDP service
-            self.logger.info("Restarting XRDP service...")
-            result = self.run("systemctl restart xrdp", check=False)
-            if not result.success:
-                self.logger.error(f"Failed to restart XRDP: {result.stderr}")
+            # Restart XRDP if its configuration changed (or it is not running), once
+            if not self.is_service_active("xrdp"):
+                self.schedule_restart("xrdp")
+            if "xrdp" in self.pending_restarts:
+                self.logger.info("Restarting XRDP service...")
+            if not self.apply_pending_service_actions():
+                self.logger.error("Failed to restart XRDP")
                 return False
 
             # Wait a moment for service to start
@@ -1046,8 +1166,7 @@ echo "Configuration complete. Please restart your session for changes to take fu
 
             # Verify service is running
             if self.dry_run_manager and not self.dry_run_manager.is_enabled:
-                result = self.run("systemctl is-active xrdp", check=False)
-                if result.success and "active" in result.stdout.lower():
+                if self.is_service_active("xrdp"):
                     self.logger.info("✓ XRDP service is running")
                     return True
                 else:
@@ -1273,7 +1392,7 @@ ResultActive=yes
 
                 colord_file = os.path.join(polkit_dir, "45-allow-colord.pkla")
 
-                self.write_file(colord_file, colord_rule, mode=0o644)
+                self.write_file(colord_file, colord_rule, mode=0o644, restart="polkit")
 
                 self.logger.info("✓ Configured Polkit rule for colord")
                 rules_configured += 1
@@ -1295,7 +1414,7 @@ ResultActive=yes
 
                 pk_file = os.path.join(polkit_dir, "45-allow-packagekit.pkla")
 
-                self.write_file(pk_file, pk_rule, mode=0o644)
+                self.write_file(pk_file, pk_rule, mode=0o644, restart="polkit")
 
                 self.logger.info("✓ Configured Polkit rule for PackageKit")
                 rules_configured += 1
@@ -1306,10 +1425,8 @@ ResultActive=yes
                 )
 
             if rules_configured > 0:
+                # Polkit restarts after configure(), only if a rule changed
                 self.logger.info(f"✓ Configured {rules_configured} Polkit rules")
-
-                # Restart Polkit service to apply changes immediately
-                self.restart_service("polkit")
             else:
                 self.logger.info("No Polkit rules configured (all disabled in config)")
 
@@ -1435,19 +1552,8 @@ ResultActive=yes
 
     def _install_theme_dependencies(self) -> bool:
         """Install dependencies required for theme compilation and installation."""
-
-        dependencies = [
-            "gtk2-engines-murrine",  # GTK2 engine for themes
-            "gtk2-engines-pixbuf",  # GTK2 pixbuf engine
-            "gnome-themes-extra",  # Additional GTK themes
-            "sassc",  # Sass compiler for theme building
-            "git",  # For cloning theme repos
-            "inkscape",  # SVG rendering (for some themes)
-            "optipng",  # PNG optimization
-        ]
-
         self.logger.info("Installing theme dependencies...")
-        if not self.install_packages_resilient(dependencies):
+        if not self.install_packages_resilient(self.THEME_DEPENDENCIES):
             return False
 
         self.logger.info("✓ Theme dependencies installed")
@@ -1466,10 +1572,7 @@ ResultActive=yes
 
             # Clone repository
             self.logger.debug("Cloning Nordic theme repository...")
-            clone_cmd = (
-                "GIT_TERMINAL_PROMPT=0 git clone --depth=1 "
-                f"https://github.com/EliverLara/Nordic.git {theme_dir}"
-            )
+            clone_cmd = self.git_clone_command(self.THEME_REPOS["nordic"], theme_dir)
             result = self.run(clone_cmd, check=False, timeout=300)
 
             if not result.success:
@@ -1520,9 +1623,7 @@ ResultActive=yes
         """
         try:
             # Arc theme is available in Debian repos
-            packages = [
-                "arc-theme",  # Main Arc theme package
-            ]
+            packages = self.THEME_PACKAGES["arc"]
 
             if not self.install_packages(packages):
                 return False
@@ -1548,10 +1649,7 @@ ResultActive=yes
             theme_dir = os.path.join(tempfile.gettempdir(), "whitesur-theme")
 
             # Clone repository
-            clone_cmd = (
-                "GIT_TERMINAL_PROMPT=0 git clone --depth=1 "
-                f"https://github.com/vinceliuice/WhiteSur-gtk-theme.git {theme_dir}"
-            )
+            clone_cmd = self.git_clone_command(self.THEME_REPOS["whitesur"], theme_dir)
             result = self.run(clone_cmd, check=False, timeout=300)
 
             if not result.success:
@@ -1588,10 +1686,7 @@ ResultActive=yes
             install_dir = "/usr/share/themes/Dracula"
 
             # Clone repository
-            clone_cmd = (
-                "GIT_TERMINAL_PROMPT=0 git clone --depth=1 "
-                f"https://github.com/dracula/gtk.git {theme_dir}"
-            )
+            clone_cmd = self.git_clone_command(self.THEME_REPOS["dracula"], theme_dir)
             result = self.run(clone_cmd, check=False, timeout=300)
 
             if not result.success:
@@ -1674,7 +1769,7 @@ ResultActive=yes
         """
         try:
             # Install via package
-            packages = ["papirus-icon-theme"]
+            packages = self.ICON_PACKAGES["papirus"]
 
             if not self.install_packages(packages):
                 return False
@@ -1695,10 +1790,7 @@ ResultActive=yes
             theme_dir = os.path.join(tempfile.gettempdir(), "tela-icons")
 
             # Clone repository
-            clone_cmd = (
-                "GIT_TERMINAL_PROMPT=0 git clone --depth=1 "
-                f"https://github.com/vinceliuice/Tela-icon-theme.git {theme_dir}"
-            )
+            clone_cmd = self.git_clone_command(self.ICON_REPOS["tela"], theme_dir)
             result = self.run(clone_cmd, check=False, timeout=300)
 
             if not result.success:
@@ -1727,8 +1819,7 @@ ResultActive=yes
         """Install Numix icon theme."""
         try:
             # Install Numix packages
-            # numix-icon-theme-circle might be in main or contrib/non-free
-            packages = ["numix-icon-theme", "numix-icon-theme-circle"]
+            packages = self.ICON_PACKAGES["numix"]
 
             # Check availability first (briefly)
             # Or just try install, apt will fail gracefully
@@ -1828,23 +1919,10 @@ ResultActive=yes
         """Apply theme to all users via XFCE settings."""
 
         try:
-            users = [u for u in pwd.getpwall() if 1000 <= u.pw_uid < 60000]
+            # Note: We should ideally read existing to preserve other settings, but simple override is OK for now
+            icon_theme = self.get_config("desktop.icons.active", "Papirus-Dark")
 
-            applied_count = 0
-
-            for user in users:
-                config_dir = os.path.join(user.pw_dir, ".config/xfce4/xfconf/xfce-perchannel-xml")
-                config_file = os.path.join(config_dir, "xsettings.xml")
-
-                try:
-                    if not self.dry_run:
-                        os.makedirs(config_dir, mode=0o755, exist_ok=True)
-
-                    # Generate xsettings.xml with theme
-                    # Note: We should ideally read existing to preserve other settings, but simple override is OK for now
-                    icon_theme = self.get_config("desktop.icons.active", "Papirus-Dark")
-
-                    xsettings_xml = f'''<?xml version="1.0" encoding="UTF-8"?>
+            xsettings_xml = f'''<?xml version="1.0" encoding="UTF-8"?>
 <channel name="xsettings" version="1.0">
   <property name="Net" type="empty">
     <property name="ThemeName" type="string" value="{theme_name}"/>
@@ -1867,21 +1945,11 @@ ResultActive=yes
   </property>
 </channel>
 '''
+            report = self.write_user_files(
+                [UserFile(".config/xfce4/xfconf/xfce-perchannel-xml/xsettings.xml", xsettings_xml)]
+            )
 
-                    self.write_file(config_file, xsettings_xml, mode=0o644)
-
-                    # Set ownership (recursive for .config)
-                    if not self.dry_run:
-                        # Just set config dir and file
-                        shutil.chown(config_dir, user=user.pw_name, group=user.pw_name)
-                        shutil.chown(config_file, user=user.pw_name, group=user.pw_name)
-
-                    applied_count += 1
-
-                except Exception as e:
-                    self.logger.warning(f"Failed to apply theme for {user.pw_name}: {e}")
-
-            self.logger.info(f"✓ Applied theme to {applied_count} users")
+            self.logger.info(f"✓ Applied theme to {len(report.succeeded)} users")
             return True
 
         except Exception as e:
@@ -1989,8 +2057,7 @@ ResultActive=yes
     def _install_zsh_package(self) -> bool:
         """Install Zsh shell package."""
         self.logger.info("Installing Zsh shell...")
-        packages = ["zsh", "zsh-common", "zsh-doc"]
-        if not self.install_packages(packages):
+        if not self.install_packages(self.ZSH_PACKAGES):
             return False
 
         # Verify installation
@@ -2019,10 +2086,7 @@ ResultActive=yes
             checksums = validator.checksums.get("oh_my_zsh", {})
             install_script = checksums.get("install_script", {})
 
-            installer_url = (
-                install_script.get("url")
-                or "https://raw.githubusercontent.com/ohmyzsh/ohmyzsh/master/tools/install.sh"
-            )
+            installer_url = install_script.get("url") or self.OH_MY_ZSH_INSTALLER_URL
             expected_checksum = install_script.get("sha256")
 
             if not expected_checksum:
@@ -2058,6 +2122,12 @@ ResultActive=yes
                 if not installer_path.exists():
                     self.run(f"touch {installer_path}", check=False)
 
+            # The installer clones Oh My Zsh itself; point it at a local copy if there is one
+            needs_install = any(
+                not os.path.exists(os.path.join(user.pw_dir, ".oh-my-zsh")) for user in users
+            )
+            omz_source = self.git_source(self.OH_MY_ZSH_REPO) if needs_install else None
+
             installed_count = 0
             for user in users:
                 username = user.pw_name
@@ -2073,8 +2143,30 @@ ResultActive=yes
                     # Use provided env vars for unattended install
                     env_vars = {"RUNZSH": "no", "CHSH": "no", "KEEP_ZSHRC": "yes"}
                     env_string = " ".join([f"{k}={v}" for k, v in env_vars.items()])
-                    install_cmd = f"su - {username} -c '{env_string} sh {installer_path}'"
+                    upstream_cmd = f"su - {username} -c '{env_string} sh {installer_path}'"
+                    install_cmd = upstream_cmd
+                    if omz_source:
+                        # The installer fetches into a fresh repo from remote "origin"
+                        local_vars = {
+                            "REMOTE": omz_source,
+                            "GIT_CONFIG_COUNT": "1",
+                            "GIT_CONFIG_KEY_0": "remote.origin.uploadpack",
+                            "GIT_CONFIG_VALUE_0": self.git_upload_pack(omz_source),
+                        }
+                        local_string = " ".join(f"{k}={v}" for k, v in local_vars.items())
+                        install_cmd = (
+                            f"su - {username} -c '{env_string} {local_string} "
+                            f"sh {installer_path}' && su - {username} -c 'git -C "
+                            f"{oh_my_zsh_dir} remote set-url origin {self.OH_MY_ZSH_REPO}'"
+                        )
                     result = self.run(install_cmd, check=False, timeout=300)
+                    if omz_source and not result.success and not self.dry_run:
+                        self.logger.debug(
+                            f"Installing Oh My Zsh from the local copy failed for {username}, "
+                            "installing from upstream"
+                        )
+                        self.run(f"rm -rf {oh_my_zsh_dir}", check=False)
+                        result = self.run(upstream_cmd, check=False, timeout=300)
 
                     if result.success or self.dry_run:
                         self.logger.debug(f"✓ Oh My Zsh installed for {username}")
@@ -2116,7 +2208,7 @@ ResultActive=yes
             # Get pinned commit from database
             p10k_data = validator.checksums.get("powerlevel10k", {}).get("git_commit", {})
 
-            p10k_repo = p10k_data.get("url") or "https://github.com/romkatv/powerlevel10k.git"
+            p10k_repo = p10k_data.get("url") or self.POWERLEVEL10K_REPO
             pinned_commit = p10k_data.get("commit")
 
             if not pinned_commit:
@@ -2142,14 +2234,17 @@ ResultActive=yes
                     try:
                         # Use secure git clone with commit verification
                         # Note: Need to run as user
+                        clone = self.git_clone_command(p10k_repo, p10k_dir)
                         if pinned_commit:
+                            # A mirrored clone already has the pinned commit
                             clone_cmd = (
-                                f"su - {user.pw_name} -c 'GIT_TERMINAL_PROMPT=0 git clone --depth=1 {p10k_repo} {p10k_dir} "
-                                f"&& cd {p10k_dir} && git fetch --depth=1 origin {pinned_commit} "
+                                f"su - {user.pw_name} -c '{clone} "
+                                f"&& cd {p10k_dir} && (git cat-file -e {pinned_commit}^{{commit}} "
+                                f"|| git fetch --depth=1 origin {pinned_commit}) "
                                 f"&& git checkout {pinned_commit}'"
                             )
                         else:
-                            clone_cmd = f"su - {user.pw_name} -c 'GIT_TERMINAL_PROMPT=0 git clone --depth=1 {p10k_repo} {p10k_dir}'"
+                            clone_cmd = f"su - {user.pw_name} -c '{clone}'"
 
                         result = self.run(clone_cmd, check=False, timeout=300)
 
@@ -2196,68 +2291,51 @@ ResultActive=yes
         """Install essential Zsh plugins."""
         self.logger.info("Installing Zsh plugins...")
         try:
-            if self._install_zsh_autosuggestions():
-                pass
-            if self._install_zsh_syntax_highlighting():
-                pass
+            self._clone_zsh_plugins(
+                {
+                    "zsh-autosuggestions": self.ZSH_AUTOSUGGESTIONS_REPO,
+                    "zsh-syntax-highlighting": self.ZSH_SYNTAX_HIGHLIGHTING_REPO,
+                }
+            )
             return True
         except Exception as e:
             self.logger.error(f"Zsh plugins installation failed: {e}", exc_info=True)
             return False
 
-    def _install_zsh_autosuggestions(self) -> bool:
-        """Install zsh-autosuggestions plugin."""
-        try:
-            import pwd
-
-            users = [u for u in pwd.getpwall() if 1000 <= u.pw_uid < 60000]
-            plugin_repo = "https://github.com/zsh-users/zsh-autosuggestions"
-            installed_count = 0
-
-            for user in users:
-                oh_my_zsh_dir = os.path.join(user.pw_dir, ".oh-my-zsh")
-                if not os.path.exists(oh_my_zsh_dir) and not self.dry_run:
-                    continue
-
-                plugin_dir = os.path.join(oh_my_zsh_dir, "custom/plugins/zsh-autosuggestions")
-                if os.path.exists(plugin_dir):
-                    installed_count += 1
-                    continue
+    def _clone_zsh_plugins(self, plugins: Dict[str, str]) -> int:
+        """
+        Clone oh-my-zsh plugins for every regular user that lacks them.
 
-                clone_cmd = f"su - {user.pw_name} -c 'GIT_TERMINAL_PROMPT=0 git clone --depth=1 {plugin_repo} {plugin_dir}'"
-                self.run(clone_cmd, check=False, timeout=300)
-                installed_count += 1
+        The clones are independent, so they run concurrently.
 
-            return installed_count > 0
-        except Exception:
-            return False
+        Args:
+            plugins: Plugin directory name -> repository URL
 
-    def _install_zsh_syntax_highlighting(self) -> bool:
-        """Install zsh-syntax-highlighting plugin."""
-        try:
-            import pwd
+        Returns:
+            Number of (user, plugin) pairs now in place
+        """
+        import pwd
 
-            users = [u for u in pwd.getpwall() if 1000 <= u.pw_uid < 60000]
-            plugin_repo = "https://github.com/zsh-users/zsh-syntax-highlighting.git"
-            installed_count = 0
+        users = [u for u in pwd.getpwall() if 1000 <= u.pw_uid < 60000]
+        clone_cmds = []
+        present = 0
 
-            for user in users:
-                oh_my_zsh_dir = os.path.join(user.pw_dir, ".oh-my-zsh")
-                if not os.path.exists(oh_my_zsh_dir) and not self.dry_run:
-                    continue
+        for user in users:
+            oh_my_zsh_dir = os.path.join(user.pw_dir, ".oh-my-zsh")
+            if not os.path.exists(oh_my_zsh_dir) and not self.dry_run:
+                continue
 
-                plugin_dir = os.path.join(oh_my_zsh_dir, "custom/plugins/zsh-syntax-highlighting")
+            for name, repo in plugins.items():
+                plugin_dir = os.path.join(oh_my_zsh_dir, "custom/plugins", name)
                 if os.path.exists(plugin_dir):
-                    installed_count += 1
+                    present += 1
                     continue
+                clone_cmds.append(
+                    f"su - {user.pw_name} -c '{self.git_clone_command(repo, plugin_dir)}'"
+                )
 
-                clone_cmd = f"su - {user.pw_name} -c 'GIT_TERMINAL_PROMPT=0 git clone --depth=1 {plugin_repo} {plugin_dir}'"
-                self.run(clone_cmd, check=False, timeout=300)
-                installed_count += 1
-
-            return installed_count > 0
-        except Exception:
-            return False
+        results = self.run_many(clone_cmds, check=False, timeout=300)
+        return present + sum(1 for result in results if result.success)
 
     def _install_meslo_nerd_font(self) -> bool:
         """Install Meslo Nerd Font for Powerlevel10k icons."""
@@ -2269,28 +2347,17 @@ ResultActive=yes
             else:
                 self.logger.info(f"MOCKED RUN: os.makedirs({font_dir})")
 
-            font_base_url = "https://github.com/romkatv/powerlevel10k-media/raw/master"
-            font_files = [
-                "MesloLGS NF Regular.ttf",
-                "MesloLGS NF Bold.ttf",
-                "MesloLGS NF Italic.ttf",
-                "MesloLGS NF Bold Italic.ttf",
-            ]
+            font_urls = self._meslo_font_urls()
 
             downloaded = 0
-            for font_file in font_files:
+            for font_file, font_url in font_urls.items():
                 font_path = os.path.join(font_dir, font_file)
                 if os.path.exists(font_path):
                     downloaded += 1
                     continue
 
-                font_url = f"{font_base_url}/{font_file.replace(' ', '%20')}"
                 if not self.dry_run:
-                    cmd = (
-                        "curl -fsSL --connect-timeout 20 --max-time 120 "
-                        f"'{font_url}' -o '{font_path}'"
-                    )
-                    if self.run(cmd, check=False, timeout=150).success:
+                    if self.fetch_artifact(font_url, font_path):
                         downloaded += 1
                 else:
                     self.logger.info(f"MOCKED RUN: Download {font_file}")
@@ -2363,68 +2430,37 @@ setopt HIST_IGNORE_ALL_DUPS
     def _apply_zsh_to_all_users(self) -> bool:
         """Apply Zsh configuration to all regular users."""
         try:
-            import pwd
-
-            users = [u for u in pwd.getpwall() if 1000 <= u.pw_uid < 60000]
+            users = regular_users()
             if not users:
                 return True
 
-            zshrc_content = self._generate_zshrc_config()
-            configured_count = 0
-
-            for user in users:
-                username = user.pw_name
-                home_dir = user.pw_dir
-                zshrc_file = os.path.join(home_dir, ".zshrc")
-
-                # Write .zshrc
-                self.write_file(zshrc_file, zshrc_content, mode=0o644)
-                if not self.dry_run:
-                    shutil.chown(zshrc_file, user=username, group=username)
-
-                # Configure P10k
-                self._configure_p10k_for_user(username, home_dir)
-                configured_count += 1
+            report = self.write_user_files(
+                [
+                    UserFile(".zshrc", self._generate_zshrc_config()),
+                    UserFile(".p10k.zsh", self.P10K_CONFIG),
+                ],
+                users,
+            )
 
-            self.logger.info(f"✓ Zsh configured for {configured_count} user(s)")
+            self.logger.info(f"✓ Zsh configured for {len(report.succeeded)} user(s)")
             return True
         except Exception as e:
             self.logger.error(f"Zsh config application failed: {e}")
             return False
 
-    def _configure_p10k_for_user(self, username: str, home_dir: str) -> bool:
-        """Configure Powerlevel10k for a specific user."""
-        p10k_file = os.path.join(home_dir, ".p10k.zsh")
-        # Minimal P10k config
-        p10k_config = """# Powerlevel10k configuration
-if [[ -r "${XDG_CACHE_HOME:-$HOME/.cache}/p10k-instant-prompt-${(%):-%n}.zsh" ]]; then
-  source "${XDG_CACHE_HOME:-$HOME/.cache}/p10k-instant-prompt-${(%):-%n}.zsh"
-fi
-"""
-        try:
-            self.write_file(p10k_file, p10k_config, mode=0o644)
-            if not self.dry_run:
-                shutil.chown(p10k_file, user=username, group=username)
-            return True
-        except Exception:
-            return False
-
     def _set_zsh_as_default_shell(self) -> bool:
         """Set Zsh as default shell for all regular users."""
         self.logger.info("Setting Zsh as default shell...")
         try:
-            import pwd
-
             zsh_path = "/usr/bin/zsh"
             if not os.path.exists(zsh_path):
                 return False
 
-            users = [u for u in pwd.getpwall() if 1000 <= u.pw_uid < 60000]
-            changed = 0
-            for user in users:
-                if user.pw_shell != zsh_path:
-                    self.run(f"chsh -s {zsh_path} {user.pw_name}", check=False)
-                    changed += 1
+            report = UserFanout(logger=self.logger).set_login_shell(
+                regular_users(), zsh_path, self.run
+            )
+            for username in report.failed:
+                self.logger.warning(f"Could not set Zsh as login shell for {username}")
             return True
         except Exception:
             return False
@@ -2527,7 +2563,7 @@ fi
 
         try:
             # bat is available in Debian 13 repos as 'bat'
-            packages = ["bat"]
+            packages = self.TERMINAL_TOOL_PACKAGES["bat"]
 
             if not self.install_packages(packages):
                 return False
@@ -2678,7 +2714,7 @@ fi
                 )
                 self.run("apt-get update", check=False, timeout=300)
 
-            packages = ["eza"]
+            packages = self.TERMINAL_TOOL_PACKAGES["eza"]
 
             if not self.install_packages(packages):
                 return False
@@ -2755,7 +2791,7 @@ alias l='eza -lah {opts} {"--git" if git else ""}'
 
             if result.success:
                 # Available in repos
-                packages = ["zoxide"]
+                packages = self.TERMINAL_TOOL_PACKAGES["zoxide"]
                 if not self.install_packages(packages):
                     return False
             else:
@@ -2851,7 +2887,7 @@ alias cdi='zi'
 
         try:
             # fzf is available in Debian repos
-            packages = ["fzf"]
+            packages = self.TERMINAL_TOOL_PACKAGES["fzf"]
 
             if not self.install_packages(packages):
                 return False
@@ -2948,7 +2984,7 @@ alias cdi='zi'
 
         try:
             # ripgrep is available as 'ripgrep' in Debian repos
-            packages = ["ripgrep"]
+            packages = self.TERMINAL_TOOL_PACKAGES["ripgrep"]
 
             if not self.install_packages(packages):
                 return False
@@ -3300,9 +3336,7 @@ function extract() {
         self.logger.info("Applying terminal tools to users...")
 
         try:
-            import pwd
-
-            users = [u for u in pwd.getpwall() if 1000 <= u.pw_uid < 60000]
+            users = regular_users()
 
             if not users:
                 self.logger.info("No regular users found for terminal tools configuration")
@@ -3313,47 +3347,32 @@ function extract() {
             # Generate aliases and configs for Bash
             tool_config_bash = self._setup_tool_aliases(shell="bash")  # nosec B604
 
-            configured_count = 0
-
-            for user in users:
-                username = user.pw_name
-                home_dir = user.pw_dir
-
-                # Update .zshrc if it exists
-                zshrc_file = os.path.join(home_dir, ".zshrc")
-                if os.path.exists(zshrc_file):
-                    try:
-                        # Read existing content
-                        with open(zshrc_file, "r") as f:
-                            content = f.read()
+            def append(tool_config: str):
+                def update(content: str):
+                    # Check if already configured
+                    if "Terminal Tools Configuration" in content:
+                        return None
+                    return content + "\n\n" + tool_config
 
-                        # Check if already configured
-                        if "Terminal Tools Configuration" not in content:
-                            # Append configuration
-                            new_content = content + "\n\n" + tool_config_zsh
-                            self.write_file(zshrc_file, new_content, mode=0o644)
+                return update
 
-                            self.logger.debug(f"✓ Updated .zshrc for {username}")
-                            configured_count += 1
-
-                    except Exception as e:
-                        self.logger.warning(f"Failed to update .zshrc for {username}: {e}")
-
-                # Update .bashrc if it exists
-                bashrc_file = os.path.join(home_dir, ".bashrc")
-                if os.path.exists(bashrc_file):
-                    try:
-                        with open(bashrc_file, "r") as f:
-                            content = f.read()
-
-                        if "Terminal Tools Configuration" not in content:
-                            new_content = content + "\n\n" + tool_config_bash
-                            self.write_file(bashrc_file, new_content, mode=0o644)
-
-                            self.logger.debug(f"✓ Updated .bashrc for {username}")
+            # Only existing .zshrc and .bashrc files are updated
+            report = self.write_user_files(
+                [
+                    UserFile(".zshrc", update=append(tool_config_zsh)),
+                    UserFile(".bashrc", update=append(tool_config_bash)),
+                ],
+                users,
+            )
 
-                    except Exception as e:
-                        self.logger.warning(f"Failed to update .bashrc for {username}: {e}")
+            if self.dry_run:
+                configured_count = len(report.succeeded)
+            else:
+                configured_count = sum(
+                    1
+                    for paths in report.changed.values()
+                    if any(path.endswith("/.zshrc") for path in paths)
+                )
 
             if configured_count == 0:
                 self.logger.warning("No user shell configs updated")
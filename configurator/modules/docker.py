@@ -10,7 +10,9 @@ Handles:
 
 import json
 import os
+from typing import List
 
+from configurator.core.mirror import Artifact
 from configurator.modules.base import ConfigurationModule
 from configurator.security.supply_chain import SecurityError, SupplyChainValidator
 from configurator.utils.file import write_file
@@ -30,6 +32,22 @@ class DockerModule(ConfigurationModule):
     priority = 50
     mandatory = False
 
+    PACKAGES = [
+        "docker-ce",
+        "docker-ce-cli",
+        "containerd.io",
+        "docker-buildx-plugin",
+        "docker-compose-plugin",
+    ]
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        """Docker Engine packages (from the Docker APT repository)."""
+        return [Artifact("deb", name) for name in self.PACKAGES]
+
+    def managed_files(self) -> List[str]:
+        """APT source and daemon configuration."""
+        return ["/etc/apt/sources.list.d/docker.sources", "/etc/docker/daemon.json"]
+
     def validate(self) -> bool:
         """Validate Docker prerequisites."""
         # Check if Docker is already installed
@@ -204,15 +222,7 @@ class DockerModule(ConfigurationModule):
         """Install Docker packages."""
         self.logger.info("Installing Docker packages...")
 
-        packages = [
-            "docker-ce",
-            "docker-ce-cli",
-            "containerd.io",
-            "docker-buildx-plugin",
-            "docker-compose-plugin",
-        ]
-
-        self.install_packages_resilient(packages, update_cache=True)
+        self.install_packages_resilient(self.PACKAGES, update_cache=True)
 
     def _configure_daemon(self):
         """Configure Docker daemon."""
@@ -6,6 +6,9 @@ Handles:
 - GitHub CLI installation
 """
 
+from typing import List
+
+from configurator.core.mirror import Artifact
 from configurator.modules.base import ConfigurationModule
 from configurator.utils.file import write_file
 
@@ -21,6 +24,23 @@ class GitModule(ConfigurationModule):
     priority = 51
     mandatory = False
 
+    PACKAGES = ["git", "git-lfs"]
+    GITHUB_CLI_PACKAGES = ["gh"]
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        """Git packages, plus gh from the GitHub CLI repository when enabled."""
+        packages = list(self.PACKAGES)
+        if self.get_config("github_cli", True):
+            packages.extend(self.GITHUB_CLI_PACKAGES)
+        return [Artifact("deb", name) for name in packages]
+
+    def managed_files(self) -> List[str]:
+        """System-wide gitignore, plus the GitHub CLI APT source when enabled."""
+        files = ["/etc/gitignore"]
+        if self.get_config("github_cli", True):
+            files.append("/etc/apt/sources.list.d/github-cli.list")
+        return files
+
     def validate(self) -> bool:
         """Validate Git prerequisites."""
         if self.command_exists("git"):
@@ -74,7 +94,7 @@ class GitModule(ConfigurationModule):
     def _install_git(self):
         """Install Git."""
         self.logger.info("Installing Git...")
-        self.install_packages(["git", "git-lfs"])
+        self.install_packages(self.PACKAGES)
 
         # Initialize git-lfs
         self.run("git lfs install", check=False)
@@ -106,7 +126,7 @@ class GitModule(ConfigurationModule):
 
         # Install
         self.run("apt-get update", check=False)
-        self.install_packages(["gh"], update_cache=False)
+        self.install_packages(self.GITHUB_CLI_PACKAGES, update_cache=False)
 
         self.logger.info("✓ GitHub CLI installed")
 
@@ -2,13 +2,19 @@
 Go (Golang) module for Go development environment.
 
 Handles:
-- Go installation from official source
+- Go installation from official source (cached, checksum-verified)
 - GOPATH configuration
 - Common Go tools
 """
 
 import os
+import platform
+from pathlib import Path
+from typing import List
 
+from configurator.core.mirror import Artifact
+from configurator.core.toolchain_cache import get_toolchain_cache, install_tree
+from configurator.exceptions import ModuleExecutionError
 from configurator.modules.base import ConfigurationModule
 
 
@@ -29,6 +35,8 @@ class GolangModule(ConfigurationModule):
     # Default Go version
     DEFAULT_VERSION = "1.22.0"
 
+    GOROOT = "/usr/local/go"
+
     # Go tools to install
     GO_TOOLS = [
         "golang.org/x/tools/gopls@latest",
@@ -83,39 +91,57 @@ class GolangModule(ConfigurationModule):
 
         return checks_passed
 
+    def mirror_artifacts(self) -> List[Artifact]:
+        """Go release tarball for this machine's architecture."""
+        go_url = self._go_url(self._go_arch(platform.machine()))
+        return [Artifact("file", go_url), Artifact("file", f"{go_url}.sha256")]
+
+    @staticmethod
+    def _go_arch(machine: str) -> str:
+        return "arm64" if machine in ("aarch64", "arm64") else "amd64"
+
+    def _go_url(self, go_arch: str) -> str:
+        version = self.get_config("version", self.DEFAULT_VERSION)
+        return f"https://go.dev/dl/go{version}.linux-{go_arch}.tar.gz"
+
     def _install_go(self):
-        """Download and install Go."""
+        """Install Go from the toolchain cache, swapping it in place of the old GOROOT."""
         version = self.get_config("version", self.DEFAULT_VERSION)
 
+        if self._installed_version() == f"go{version}":
+            self.logger.info(f"✓ Go {version} already installed")
+            return
+
         # Determine architecture
         result = self.run("uname -m", check=True)
-        arch = result.stdout.strip()
+        go_arch = self._go_arch(result.stdout.strip())
+        go_url = self._go_url(go_arch)
 
-        if arch == "x86_64":
-            go_arch = "amd64"
-        elif arch in ("aarch64", "arm64"):
-            go_arch = "arm64"
-        else:
-            go_arch = "amd64"
-
-        # Download Go
-        go_url = f"https://go.dev/dl/go{version}.linux-{go_arch}.tar.gz"
-        go_tarball = f"/tmp/go{version}.linux-{go_arch}.tar.gz"
-
-        self.logger.info(f"Downloading Go {version}...")
-
-        self.run(f"curl -fsSL {go_url} -o {go_tarball}", check=True)
+        if self.dry_run:
+            self.logger.info(f"[DRY RUN] Would install {go_url} to {self.GOROOT}")
+            return
 
-        # Remove old installation
-        self.run("rm -rf /usr/local/go", check=False)
+        cache = get_toolchain_cache()
+        sums = cache.checksums(f"{go_url}.sha256")
+        tarball = cache.fetch(go_url, sums.get(os.path.basename(go_url)))
+        if tarball is None:
+            raise ModuleExecutionError(
+                what=f"Failed to download Go {version}",
+                why=f"Could not fetch a checksum-verified {go_url}",
+                how="Check network connectivity (or the --mirror bundle) and retry",
+            )
 
-        # Extract
-        self.run(f"tar -C /usr/local -xzf {go_tarball}", check=True)
+        install_tree(tarball, Path(self.GOROOT))
 
-        # Cleanup
-        self.run(f"rm {go_tarball}", check=False)
+        self.logger.info(f"✓ Go {version} installed to {self.GOROOT}")
 
-        self.logger.info(f"✓ Go {version} installed to /usr/local/go")
+    def _installed_version(self) -> str:
+        """Version in GOROOT/VERSION (e.g. go1.22.0), or "" if Go is not installed there."""
+        try:
+            with open(os.path.join(self.GOROOT, "VERSION")) as f:
+                return f.readline().strip()
+        except OSError:
+            return ""
 
     def _configure_environment(self):
         """Configure Go environment variables."""
@@ -8,7 +8,10 @@ Handles:
 """
 
 import os
+from typing import List
 
+from configurator.core.mirror import Artifact
+from configurator.exceptions import ModuleExecutionError
 from configurator.modules.base import ConfigurationModule
 
 
@@ -25,6 +28,16 @@ class JavaModule(ConfigurationModule):
     priority = 44
     mandatory = False
 
+    def mirror_artifacts(self) -> List[Artifact]:
+        """JDK and Maven packages, plus the Gradle distribution when enabled."""
+        packages = self._jdk_packages()
+        if self.get_config("maven", True):
+            packages.append("maven")
+        artifacts = [Artifact("deb", name) for name in packages]
+        if self.get_config("gradle", False):
+            artifacts.append(Artifact("file", self._gradle_url()))
+        return artifacts
+
     def validate(self) -> bool:
         """Validate Java prerequisites."""
         # Check if Java is already installed
@@ -69,25 +82,27 @@ class JavaModule(ConfigurationModule):
 
         return checks_passed
 
+    def _jdk_packages(self) -> List[str]:
+        """JDK and headless JDK packages for the configured version."""
+        jdk_version = self.get_config("version", "default")
+        if jdk_version == "default":
+            return ["default-jdk", "default-jdk-headless"]
+        return [f"openjdk-{jdk_version}-jdk", f"openjdk-{jdk_version}-jdk-headless"]
+
+    def _gradle_url(self) -> str:
+        gradle_version = self.get_config("gradle_version", "8.5")
+        return f"https://services.gradle.org/distributions/gradle-{gradle_version}-bin.zip"
+
     def _install_jdk(self):
         """Install OpenJDK."""
         jdk_version = self.get_config("version", "default")
 
         if jdk_version == "default":
-            jdk_package = "default-jdk"
-            headless_package = "default-jdk-headless"
             self.logger.info("Installing default JDK...")
         else:
-            jdk_package = f"openjdk-{jdk_version}-jdk"
-            headless_package = f"openjdk-{jdk_version}-jdk-headless"
             self.logger.info(f"Installing OpenJDK {jdk_version}...")
 
-        self.install_packages(
-            [
-                jdk_package,
-                headless_package,
-            ]
-        )
+        self.install_packages(self._jdk_packages())
 
         self.logger.info(f"✓ OpenJDK {jdk_version} installed")
 
@@ -110,15 +125,20 @@ class JavaModule(ConfigurationModule):
         """Install Gradle from official source."""
         gradle_version = self.get_config("gradle_version", "8.5")
 
-        # Download Gradle
-        gradle_url = f"https://services.gradle.org/distributions/gradle-{gradle_version}-bin.zip"
+        gradle_url = self._gradle_url()
 
         self.run("apt-get install -y unzip", check=False)
-        self.run(f"curl -fsSL {gradle_url} -o /tmp/gradle.zip", check=True)
-        self.run("unzip -d /opt /tmp/gradle.zip", check=True)
+        with self.staging_dir() as staging:
+            gradle_zip = os.path.join(staging, "gradle.zip")
+            if not self.fetch_artifact(gradle_url, gradle_zip, resume=False):
+                raise ModuleExecutionError(
+                    what=f"Failed to download Gradle {gradle_version}",
+                    why=f"Could not fetch {gradle_url}",
+                    how="Check network connectivity or set java.gradle_version to a released version",
+                )
+            self.run(f"unzip -d /opt {gradle_zip}", check=True)
         self.run(f"ln -sf /opt/gradle-{gradle_version} /opt/gradle", check=True)
         self.run("ln -sf /opt/gradle/bin/gradle /usr/local/bin/gradle", check=True)
-        self.run("rm /tmp/gradle.zip", check=False)
 
         self.logger.info(f"✓ Gradle {gradle_version} installed")
 
@@ -3,13 +3,21 @@ Node.js module for JavaScript/TypeScript development.
 
 Handles:
 - nvm (Node Version Manager)
-- Node.js LTS installation
+- Node.js LTS installation (release tarballs from the toolchain cache)
 - npm, yarn, pnpm package managers
 - Global development tools
 """
 
+import json
 import os
-
+import platform
+import pwd
+import re
+from pathlib import Path
+from typing import List, Optional
+
+from configurator.core.mirror import Artifact, get_active_mirror
+from configurator.core.toolchain_cache import get_toolchain_cache, install_tree
 from configurator.modules.base import ConfigurationModule
 
 
@@ -29,6 +37,11 @@ class NodeJSModule(ConfigurationModule):
 
     # nvm version to install
     NVM_VERSION = "0.40.1"
+    NVM_REPO = "https://github.com/nvm-sh/nvm.git"
+
+    NODE_DIST = "https://nodejs.org/dist"
+    # How long the checksum list of a release line (latest-v20.x) is trusted
+    RELEASE_LINE_TTL = 24 * 3600
 
     # Global packages to install
     GLOBAL_PACKAGES = [
@@ -63,11 +76,8 @@ class NodeJSModule(ConfigurationModule):
         # 2. Install Node.js LTS
         self._install_nodejs()
 
-        # 3. Install package managers
-        self._install_package_managers()
-
-        # 4. Install global tools
-        self._install_global_tools()
+        # 3. Install package managers and global tools
+        self._install_global_packages()
 
         self.logger.info("✓ Node.js development environment ready")
         return True
@@ -105,6 +115,31 @@ class NodeJSModule(ConfigurationModule):
 
         return checks_passed
 
+    def _nvm_install_url(self) -> str:
+        return f"https://raw.githubusercontent.com/nvm-sh/nvm/v{self.NVM_VERSION}/install.sh"
+
+    def _node_sums_url(self, version: str) -> str:
+        if re.fullmatch(r"\d+\.\d+\.\d+", version):
+            return f"{self.NODE_DIST}/v{version}/SHASUMS256.txt"
+        return f"{self.NODE_DIST}/latest-v{version.split('.')[0]}.x/SHASUMS256.txt"
+
+    @staticmethod
+    def _node_arch(machine: str) -> str:
+        return "arm64" if machine in ("aarch64", "arm64") else "x64"
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        """nvm installer and repository, and Node.js checksums (plus the tarball when pinned)."""
+        version = str(self.get_config("version", "20"))
+        artifacts = [
+            Artifact("file", self._nvm_install_url()),
+            Artifact("git", self.NVM_REPO),
+            Artifact("file", self._node_sums_url(version)),
+        ]
+        if re.fullmatch(r"\d+\.\d+\.\d+", version):
+            name = f"node-v{version}-linux-{self._node_arch(platform.machine())}.tar.xz"
+            artifacts.append(Artifact("file", f"{self.NODE_DIST}/v{version}/{name}"))
+        return artifacts
+
     def _install_nvm(self):
         """Install Node Version Manager."""
         nvm_dir = f"{self.target_home}/.nvm"
@@ -114,31 +149,43 @@ class NodeJSModule(ConfigurationModule):
 
         self.logger.info(f"Installing nvm v{self.NVM_VERSION}...")
 
-        # Download and run nvm install script
-        nvm_url = f"https://raw.githubusercontent.com/nvm-sh/nvm/v{self.NVM_VERSION}/install.sh"
-
-        # Explicitly set NVM_DIR and install as target user if applicable
-        # If running as root but targeting user, we must switch user OR fix permissions later.
-        # nvm install script uses $HOME.
+        # Download nvm install script (served from the mirror in mirror mode)
+        nvm_url = self._nvm_install_url()
+        with self.staging_dir() as staging:
+            installer = os.path.join(staging, "nvm-install.sh")
+            if not self.fetch_artifact(nvm_url, installer, resume=False):
+                self.logger.warning("nvm installer could not be downloaded")
+                return
+            if not self.dry_run:
+                os.chmod(installer, 0o755)
+
+            # The installer clones nvm itself; point it at the mirrored bundle if there is one
+            mirror = get_active_mirror()
+            bundle = mirror.git_bundle(self.NVM_REPO) if mirror and not self.dry_run else None
+            nvm_source = f"NVM_SOURCE={bundle} " if bundle else ""
+
+            # Explicitly set NVM_DIR and install as target user if applicable
+            # If running as root but targeting user, we must switch user OR fix permissions later.
+            # nvm install script uses $HOME.
+
+            # Strategy: Run as target user if possible
+            cmd = f"{nvm_source}bash {installer}"
+            env = os.environ.copy()
 
-        # Strategy: Run as target user if possible
-        cmd = f"curl -o- {nvm_url} | bash"
-        env = os.environ.copy()
-
-        if self.target_user != "root" and os.environ.get("USER") == "root":
-            # We are root, targeting a user.
-            # Use su/sudo to run as user
-            # Since 'run' uses subprocess/shell, we can wrap the command
-            # But we also need to set HOME
-            cmd = f"sudo -u {self.target_user} bash -c 'export HOME={self.target_home} && curl -o- {nvm_url} | NVM_DIR={nvm_dir} bash'"
-        else:
-            env["NVM_DIR"] = nvm_dir
+            if self.target_user != "root" and os.environ.get("USER") == "root":
+                # We are root, targeting a user.
+                # Use su/sudo to run as user
+                # Since 'run' uses subprocess/shell, we can wrap the command
+                # But we also need to set HOME
+                cmd = f"sudo -u {self.target_user} bash -c 'export HOME={self.target_home} && {nvm_source}NVM_DIR={nvm_dir} bash {installer}'"
+            else:
+                env["NVM_DIR"] = nvm_dir
 
-        result = self.run(
-            cmd,
-            check=False,
-            # env=env # Env not needed if using sudo wrapper with export
-        )
+            result = self.run(
+                cmd,
+                check=False,
+                # env=env # Env not needed if using sudo wrapper with export
+            )
 
         if not result.success:
             self.logger.warning("nvm installation may have had issues")
@@ -181,17 +228,26 @@ export NVM_DIR="$HOME/.nvm"
         self.logger.info("✓ nvm installed")
 
     def _install_nodejs(self):
-        """Install Node.js using nvm."""
-        node_version = self.get_config("version", "20")  # Default to LTS
+        """Install Node.js into nvm's versions directory, falling back to nvm install."""
+        node_version = str(self.get_config("version", "20"))  # Default to LTS
         nvm_dir = f"{self.target_home}/.nvm"
 
         self.logger.info(f"Installing Node.js v{node_version} (LTS)...")
 
+        # A release tarball from the toolchain cache, placed where nvm looks for installs
+        installed = None if self.dry_run else self._install_cached_node(node_version, nvm_dir)
+
         # Install and use specified version
         nvm_source = (
             f'export NVM_DIR="{nvm_dir}" && [ -s "$NVM_DIR/nvm.sh" ] && . "$NVM_DIR/nvm.sh"'
         )
-        nvm_commands = f"""
+        if installed:
+            nvm_commands = f"""
+{nvm_source}
+nvm alias default {installed}
+"""
+        else:
+            nvm_commands = f"""
 {nvm_source}
 nvm install {node_version}
 nvm use {node_version}
@@ -204,70 +260,94 @@ nvm alias default {node_version}
         result = self.run(cmd, check=False)
 
         if result.success:
-            self.logger.info(f"✓ Node.js v{node_version} installed")
+            self.logger.info(f"✓ Node.js v{installed or node_version} installed")
         else:
             self.logger.warning(f"Node.js installation may have had issues: {result.stderr}")
 
-    def _install_package_managers(self):
-        """Install yarn and pnpm package managers."""
-        package_managers = self.get_config("package_managers", ["npm", "yarn", "pnpm"])
+    def _install_cached_node(self, node_version: str, nvm_dir: str) -> Optional[str]:
+        """
+        Install the Node.js release for node_version from the toolchain cache.
 
-        nvm_dir = f"{self.target_home}/.nvm"
-        nvm_source = (
-            f'export NVM_DIR="{nvm_dir}" && [ -s "$NVM_DIR/nvm.sh" ] && . "$NVM_DIR/nvm.sh" && '
+        Returns:
+            The exact version installed (e.g. v20.11.1), or None to let nvm install it
+        """
+        arch = self._node_arch(self.run("uname -m", check=False).stdout.strip())
+        sums = get_toolchain_cache().checksums(
+            self._node_sums_url(node_version), max_age=self.RELEASE_LINE_TTL
         )
-
-        for pm in package_managers:
-            if pm == "npm":
-                continue  # npm comes with Node.js
-
-            self.logger.info(f"Installing {pm}...")
-
-            cmd_prefix = ""
-            if self.target_user != "root" and os.environ.get("USER") == "root":
-                cmd_prefix = f"sudo -u {self.target_user} "
-
-            if pm == "yarn":
-                result = self.run(
-                    f"{cmd_prefix}bash -c '{nvm_source}npm install -g yarn'",
-                    check=False,
-                )
-            elif pm == "pnpm":
-                result = self.run(
-                    f"{cmd_prefix}bash -c '{nvm_source}npm install -g pnpm'",
-                    check=False,
-                )
-
-            if result.success:
-                self.logger.info(f"  ✓ {pm} installed")
-            else:
-                self.logger.warning(f"  ⚠ Failed to install {pm}")
-
-    def _install_global_tools(self):
-        """Install global development tools."""
+        pattern = re.compile(rf"^node-(v\d+\.\d+\.\d+)-linux-{arch}\.tar\.xz$")
+        releases = [(m.group(1), name) for name in sums if (m := pattern.match(name))]
+        if not releases:
+            self.logger.debug(f"No Node.js {node_version} release found for linux-{arch}")
+            return None
+        version, name = releases[0]
+
+        destination = Path(nvm_dir) / "versions" / "node" / version
+        if (destination / "bin" / "node").exists():
+            self.logger.info(f"  Node.js {version} already installed")
+            return version
+
+        tarball = get_toolchain_cache().fetch(f"{self.NODE_DIST}/{version}/{name}", sums[name])
+        if tarball is None:
+            return None
+
+        owner = None
+        if os.geteuid() == 0 and self.target_user != "root":
+            user = pwd.getpwnam(self.target_user)
+            owner = (user.pw_uid, user.pw_gid)
+        try:
+            install_tree(tarball, destination, owner=owner)
+        except (OSError, KeyError) as e:
+            self.logger.warning(f"Could not install Node.js {version} from cache: {e}")
+            return None
+        return version
+
+    def _install_global_packages(self):
+        """Install package managers and global tools with a single npm call."""
+        package_managers = self.get_config("package_managers", ["npm", "yarn", "pnpm"])
         global_packages = self.get_config("global_packages", self.GLOBAL_PACKAGES)
 
-        if not global_packages:
+        # npm comes with Node.js
+        wanted = [pm for pm in package_managers if pm in ("yarn", "pnpm")]
+        wanted += [pkg for pkg in global_packages if pkg not in wanted]
+        if not wanted:
             return
 
-        self.logger.info("Installing global packages...")
-
         nvm_dir = f"{self.target_home}/.nvm"
         nvm_source = (
             f'export NVM_DIR="{nvm_dir}" && [ -s "$NVM_DIR/nvm.sh" ] && . "$NVM_DIR/nvm.sh" && '
         )
-        packages_str = " ".join(global_packages)
 
         cmd_prefix = ""
         if self.target_user != "root" and os.environ.get("USER") == "root":
             cmd_prefix = f"sudo -u {self.target_user} "
 
+        present = self._global_npm_packages(
+            f"{cmd_prefix}bash -c '{nvm_source}npm ls -g --depth=0 --json'"
+        )
+        missing = [pkg for pkg in wanted if pkg not in present]
+        if not missing:
+            self.logger.info("✓ Global npm packages already installed")
+            return
+
+        self.logger.info(f"Installing global packages: {', '.join(missing)}...")
+
         result = self.run(
-            f"{cmd_prefix}bash -c '{nvm_source}npm install -g {packages_str}'",
+            f"{cmd_prefix}bash -c '{nvm_source}npm install -g {' '.join(missing)}'",
             check=False,
         )
 
         if result.success:
-            self.logger.info(f"  ✓ Installed: {', '.join(global_packages)}")
+            self.logger.info(f"  ✓ Installed: {', '.join(missing)}")
         else:
             self.logger.warning("  ⚠ Some packages may not have installed correctly")
+
+    def _global_npm_packages(self, cmd: str) -> List[str]:
+        """Names of the globally installed npm packages."""
+        if self.dry_run:
+            return []
+        result = self.run(cmd, check=False)
+        try:
+            return list(json.loads(result.stdout or "{}").get("dependencies", {}))
+        except (ValueError, AttributeError):
+            return []
@@ -8,7 +8,9 @@ Handles:
 """
 
 import os
+from typing import List, Set
 
+from configurator.core.mirror import Artifact
 from configurator.modules.base import ConfigurationModule
 
 
@@ -61,6 +63,10 @@ class PythonModule(ConfigurationModule):
         "httpie": "httpie",
     }
 
+    def mirror_artifacts(self) -> List[Artifact]:
+        """System Python APT packages."""
+        return [Artifact("deb", name) for name in self.SYSTEM_PACKAGES]
+
     def validate(self) -> bool:
         """Validate Python prerequisites."""
         # Python3 should already be on Debian 13
@@ -173,22 +179,38 @@ class PythonModule(ConfigurationModule):
             if self.target_user != "root" and os.environ.get("USER") == "root":
                 cmd_prefix = f"sudo -u {self.target_user} "
 
-            for tool in pipx_tools:
-                self.logger.info(f"Installing {tool} via pipx...")
-
-                # Use --global only if explicitly wanted, but usually standard install is better for user
-                # But pipx install <tool> installs to ~/.local/bin
-                # Ensure ~/.local/bin is in PATH (pipx usually handles ensurepath)
-
-                # First ensure pipx is set up for the user
-                self.run(f"{cmd_prefix}pipx ensurepath", check=False)
+            # Ensure ~/.local/bin is in PATH (once, not per tool)
+            self.run(f"{cmd_prefix}pipx ensurepath", check=False)
 
-                result = self.run(f"{cmd_prefix}pipx install {tool} --force", check=False)
-
-                if result.success:
-                    self.logger.info(f"  ✓ Installed {tool} (pipx)")
-                else:
-                    self.logger.warning(f"  ⚠ Failed to install {tool} via pipx: {result.stderr}")
+            # Tools that are already installed are left alone (no --force reinstall),
+            # the rest go into one pipx call; pip's wheel cache serves repeat downloads
+            present = self._pipx_installed(cmd_prefix)
+            missing = [tool for tool in pipx_tools if tool not in present]
+            for tool in pipx_tools:
+                if tool in present:
+                    self.logger.info(f"  ✓ {tool} already installed (pipx)")
+
+            if missing:
+                self.logger.info(f"Installing {', '.join(missing)} via pipx...")
+                result = self.run(f"{cmd_prefix}pipx install {' '.join(missing)}", check=False)
+
+                installed = self._pipx_installed(cmd_prefix) if not self.dry_run else set(missing)
+                for tool in missing:
+                    if tool in installed:
+                        self.logger.info(f"  ✓ Installed {tool} (pipx)")
+                    else:
+                        self.logger.warning(
+                            f"  ⚠ Failed to install {tool} via pipx: {result.stderr}"
+                        )
+
+    def _pipx_installed(self, cmd_prefix: str) -> Set[str]:
+        """Names of the tools pipx has installed for the target user."""
+        if self.dry_run:
+            return set()
+        result = self.run(f"{cmd_prefix}pipx list --short", check=False)
+        if not result.success:
+            return set()
+        return {line.split()[0] for line in result.stdout.splitlines() if line.strip()}
 
     def _create_example_venv(self):
         """Create an example virtual environment."""
@@ -2,13 +2,20 @@
 Rust module for Rust development environment.
 
 Handles:
-- rustup installation
+- rustup installation (rustup-init from the toolchain cache)
 - Stable toolchain
 - Common Rust tools
 """
 
 import os
-
+import platform
+import re
+import shutil
+from typing import List
+
+from configurator.core.mirror import Artifact
+from configurator.core.toolchain_cache import get_toolchain_cache
+from configurator.exceptions import ModuleExecutionError
 from configurator.modules.base import ConfigurationModule
 
 
@@ -25,6 +32,10 @@ class RustModule(ConfigurationModule):
     priority = 43
     mandatory = False
 
+    RUSTUP_INIT_URL = "https://static.rust-lang.org/rustup/dist/{triple}/rustup-init"
+
+    COMPONENTS = ["rustfmt", "clippy", "rust-analyzer"]
+
     # Rust tools to install
     RUST_TOOLS = [
         "cargo-watch",
@@ -85,17 +96,30 @@ class RustModule(ConfigurationModule):
 
         return checks_passed
 
+    def mirror_artifacts(self) -> List[Artifact]:
+        """rustup-init and its checksum (toolchains come from rustup's own servers)."""
+        url = self._rustup_init_url(platform.machine())
+        return [Artifact("file", url), Artifact("file", f"{url}.sha256")]
+
+    def _rustup_init_url(self, machine: str) -> str:
+        arch = "aarch64" if machine in ("aarch64", "arm64") else "x86_64"
+        return self.RUSTUP_INIT_URL.format(triple=f"{arch}-unknown-linux-gnu")
+
+    def _cmd_prefix(self) -> str:
+        if self.target_user != "root" and os.environ.get("USER") == "root":
+            return f"sudo -u {self.target_user} "
+        return ""
+
     def _install_rustup(self):
         """Install rustup."""
         self.logger.info("Installing rustup...")
 
-        # Download and run rustup installer
-        # Use sudo -u if needed to install for target user
-        cmd = "curl --proto '=https' --tlsv1.2 -sSf https://sh.rustup.rs | sh -s -- -y --default-toolchain stable"
-        if self.target_user != "root" and os.environ.get("USER") == "root":
-            cmd = f"sudo -u {self.target_user} bash -c 'curl --proto \"=https\" --tlsv1.2 -sSf https://sh.rustup.rs | sh -s -- -y --default-toolchain stable'"
-
-        self.run(cmd, check=True)
+        if os.path.exists(f"{self.target_home}/.cargo/bin/rustup"):
+            self.logger.info("  rustup already installed")
+        elif self.dry_run:
+            self.logger.info("[DRY RUN] Would run rustup-init -y --default-toolchain stable")
+        else:
+            self._run_rustup_init()
 
         # Explicitly configure shell files as redundancy
         cargo_env_source = '\n. "$HOME/.cargo/env"\n'
@@ -121,6 +145,28 @@ class RustModule(ConfigurationModule):
 
         self.logger.info("✓ rustup installed")
 
+    def _run_rustup_init(self):
+        """Run rustup-init, taken from the toolchain cache (served from the mirror in mirror mode)."""
+        result = self.run("uname -m", check=True)
+        url = self._rustup_init_url(result.stdout.strip())
+
+        cache = get_toolchain_cache()
+        sums = cache.checksums(f"{url}.sha256")
+        cached = cache.fetch(url, sums.get("rustup-init"))
+        if cached is None:
+            raise ModuleExecutionError(
+                what="Failed to download rustup-init",
+                why=f"Could not fetch a checksum-verified {url}",
+                how="Check network connectivity (or the --mirror bundle) and retry",
+            )
+
+        # The cached copy is not executable; run a private copy as the target user
+        with self.staging_dir() as staging:
+            installer = os.path.join(staging, "rustup-init")
+            shutil.copyfile(cached, installer)
+            os.chmod(installer, 0o755)
+            self.run(f"{self._cmd_prefix()}{installer} -y --default-toolchain stable", check=True)
+
     def _install_toolchain(self):
         """Install Rust toolchain."""
         cargo_env = f"{self.target_home}/.cargo/env"
@@ -130,29 +176,30 @@ class RustModule(ConfigurationModule):
 
         self.logger.info(f"Installing {toolchain} toolchain...")
 
-        cmd_prefix = ""
-        if self.target_user != "root" and os.environ.get("USER") == "root":
-            cmd_prefix = f"sudo -u {self.target_user} "
-
         self.run(
-            f"{cmd_prefix}bash -c '{source_cmd}rustup default {toolchain}'",
+            f"{self._cmd_prefix()}bash -c '{source_cmd}rustup default {toolchain}'",
             check=True,
         )
 
     def _install_components(self):
-        """Install Rust components."""
-        cargo_env = f"{self.target_home}/.cargo/env"
-        source_cmd = f"source {cargo_env} && "
-
-        components = ["rustfmt", "clippy", "rust-analyzer"]
+        """Install Rust components (all in one rustup call)."""
+        source_cmd = f"source {self.target_home}/.cargo/env && "
+        cmd_prefix = self._cmd_prefix()
 
         self.logger.info("Installing Rust components...")
 
-        cmd_prefix = ""
-        if self.target_user != "root" and os.environ.get("USER") == "root":
-            cmd_prefix = f"sudo -u {self.target_user} "
+        components = " ".join(self.COMPONENTS)
+        result = self.run(
+            f"{cmd_prefix}bash -c '{source_cmd}rustup component add {components}'",
+            check=False,
+        )
+        if result.success:
+            for component in self.COMPONENTS:
+                self.logger.info(f"  ✓ {component}")
+            return
 
-        for component in components:
+        # One unavailable component fails the whole batch; find out which
+        for component in self.COMPONENTS:
             result = self.run(
                 f"{cmd_prefix}bash -c '{source_cmd}rustup component add {component}'",
                 check=False,
@@ -164,28 +211,28 @@ class RustModule(ConfigurationModule):
                 self.logger.warning(f"  ⚠ Failed to install {component}")
 
     def _install_cargo_tools(self):
-        """Install cargo tools."""
+        """Install cargo tools (all in one cargo install call)."""
         tools = self.get_config("tools", self.RUST_TOOLS)
 
         if not tools:
             return
 
-        cargo_env = f"{self.target_home}/.cargo/env"
-        source_cmd = f"source {cargo_env} && "
+        source_cmd = f"source {self.target_home}/.cargo/env && "
+        cmd_prefix = self._cmd_prefix()
 
         self.logger.info("Installing cargo tools...")
 
-        cmd_prefix = ""
-        if self.target_user != "root" and os.environ.get("USER") == "root":
-            cmd_prefix = f"sudo -u {self.target_user} "
+        # cargo skips crates that are already installed at the latest version
+        # and carries on past failures, so one call covers every tool
+        self.run(
+            f"{cmd_prefix}bash -c '{source_cmd}cargo install {' '.join(tools)}'",
+            check=False,
+        )
 
+        result = self.run(f"{cmd_prefix}bash -c '{source_cmd}cargo install --list'", check=False)
+        installed = set(re.findall(r"^(\S+) v", result.stdout or "", re.MULTILINE))
         for tool in tools:
-            result = self.run(
-                f"{cmd_prefix}bash -c '{source_cmd}cargo install {tool}'",
-                check=False,
-            )
-
-            if result.success:
+            if tool in installed or self.dry_run:
                 self.logger.info(f"  ✓ {tool}")
             else:
                 self.logger.warning(f"  ⚠ Failed to install {tool}")
@@ -12,10 +12,12 @@ Handles:
 """
 
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
+from configurator.core.mirror import Artifact
 from configurator.exceptions import ModuleExecutionError
 from configurator.modules.base import ConfigurationModule
+from configurator.utils.command import CommandResult
 from configurator.utils.file import backup_file, write_file
 
 
@@ -33,6 +35,22 @@ class SecurityModule(ConfigurationModule):
     priority = 20
     mandatory = True
 
+    FIREWALL_PACKAGES = ["ufw"]
+    FAIL2BAN_PACKAGES = ["fail2ban"]
+    PRESEED_PACKAGES = ["debconf-utils"]
+    AUTO_UPDATE_PACKAGES = ["unattended-upgrades", "apt-listchanges"]
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        """Firewall, Fail2ban and automatic update packages."""
+        packages = self.FIREWALL_PACKAGES + self.FAIL2BAN_PACKAGES
+        if self.get_config("auto_updates", True):
+            packages = packages + self.PRESEED_PACKAGES + self.AUTO_UPDATE_PACKAGES
+        return [Artifact("deb", name) for name in packages]
+
+    def managed_files(self) -> List[str]:
+        """Fail2ban jail configuration."""
+        return ["/etc/fail2ban/jail.local"]
+
     def validate(self) -> bool:
         """Validate security prerequisites."""
         self.logger.info("Checking security prerequisites...")
@@ -127,7 +145,7 @@ Phase 2 Advanced Security:
                 self.logger.info(f"  Detected SSH connection on port {current_ssh_port}")
 
         # Install UFW
-        self.install_packages(["ufw"])
+        self.install_packages(self.FIREWALL_PACKAGES)
 
         # Reset to clean state
         self.run("ufw --force reset", check=True)
@@ -209,7 +227,7 @@ Phase 2 Advanced Security:
         self.logger.info("Setting up fail2ban...")
 
         # Install fail2ban
-        self.install_packages(["fail2ban"])
+        self.install_packages(self.FAIL2BAN_PACKAGES)
 
         # Configure fail2ban
         max_retry = self.get_config("fail2ban.ssh_max_retry", 5)
@@ -407,7 +425,7 @@ PasswordAuthentication yes
         self.logger.info("Enabling automatic security updates...")
 
         # Install debconf-utils for preseeding
-        self.install_packages(["debconf-utils"])
+        self.install_packages(self.PRESEED_PACKAGES)
 
         # Preseed unattended-upgrades to enable auto updates without prompt
         self.run(
@@ -416,7 +434,7 @@ PasswordAuthentication yes
         )
 
         # Install unattended-upgrades
-        self.install_packages(["unattended-upgrades", "apt-listchanges"])
+        self.install_packages(self.AUTO_UPDATE_PACKAGES)
 
         # Configure unattended-upgrades
         auto_upgrades_config = """APT::Periodic::Update-Package-Lists "1";
@@ -636,12 +654,15 @@ APT::Periodic::AutocleanInterval "7";
         """
         from datetime import datetime
 
+        # The two probes are independent; run them side by side
+        ufw_status, sshd_config = self.run_many(["ufw status", "sshd -T"], check=False)
+
         report: Dict[str, Any] = {
             "timestamp": datetime.now().isoformat(),
             "basic_security": {
-                "firewall": self._check_firewall_status(),
+                "firewall": self._check_firewall_status(ufw_status),
                 "fail2ban": self._check_fail2ban_status(),
-                "ssh_hardening": self._check_ssh_hardening(),
+                "ssh_hardening": self._check_ssh_hardening(sshd_config),
                 "auto_updates": self._check_auto_updates_status(),
             },
             "advanced_security": {},
@@ -694,9 +715,9 @@ APT::Periodic::AutocleanInterval "7";
 
         return report
 
-    def _check_firewall_status(self) -> str:
-        """Check firewall status."""
-        result = self.run("ufw status", check=False)
+    def _check_firewall_status(self, result: Optional[CommandResult] = None) -> str:
+        """Check firewall status (from a ``ufw status`` result, if already run)."""
+        result = result or self.run("ufw status", check=False)
         if "Status: active" in result.stdout:
             return "active"
         return "inactive"
@@ -707,9 +728,9 @@ APT::Periodic::AutocleanInterval "7";
             return "active"
         return "inactive"
 
-    def _check_ssh_hardening(self) -> str:
-        """Check SSH hardening status."""
-        result = self.run("sshd -T", check=False)
+    def _check_ssh_hardening(self, result: Optional[CommandResult] = None) -> str:
+        """Check SSH hardening status (from an ``sshd -T`` result, if already run)."""
+        result = result or self.run("sshd -T", check=False)
         if result.success and "permitemptypasswords no" in result.stdout.lower():
             return "hardened"
         return "standard"
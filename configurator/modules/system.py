@@ -12,7 +12,9 @@ Handles:
 
 import os
 import re
+from typing import List
 
+from configurator.core.mirror import Artifact
 from configurator.exceptions import ModuleExecutionError, PrerequisiteError
 from configurator.modules.base import ConfigurationModule
 from configurator.utils.file import backup_file, write_file
@@ -57,6 +59,14 @@ class SystemModule(ConfigurationModule):
         "pkg-config",  # Required for Rust crates
     ]
 
+    def mirror_artifacts(self) -> List[Artifact]:
+        """Essential APT packages."""
+        return [Artifact("deb", name) for name in self.ESSENTIAL_PACKAGES]
+
+    def managed_files(self) -> List[str]:
+        """Hosts file."""
+        return ["/etc/hosts"]
+
     def validate(self) -> bool:
         """Validate system prerequisites."""
         os_info = get_os_info()
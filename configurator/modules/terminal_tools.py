@@ -296,29 +296,21 @@ class TerminalToolsModule(ConfigurationModule):
         plugins_dir = ohmyzsh_dir / "custom" / "plugins"
         plugins_dir.mkdir(parents=True, exist_ok=True)
 
-        # zsh-autosuggestions
-        autosuggestions_dir = plugins_dir / "zsh-autosuggestions"
-        if not autosuggestions_dir.exists():
-            self.logger.info("  Installing zsh-autosuggestions...")
-            clone_cmd = (
-                f"git clone --depth=1 https://github.com/zsh-users/zsh-autosuggestions.git "
-                f"{autosuggestions_dir}"
+        clone_cmds = []
+        for plugin in ("zsh-autosuggestions", "zsh-syntax-highlighting"):
+            plugin_dir = plugins_dir / plugin
+            if plugin_dir.exists():
+                continue
+            self.logger.info(f"  Installing {plugin}...")
+            clone_cmd = self.git_clone_command(
+                f"https://github.com/zsh-users/{plugin}.git", str(plugin_dir)
             )
             if user != "root":
                 clone_cmd = f'su - {user} -c "{clone_cmd}"'
-            self.run(clone_cmd, check=False, timeout=120)
-
-        # zsh-syntax-highlighting
-        highlighting_dir = plugins_dir / "zsh-syntax-highlighting"
-        if not highlighting_dir.exists():
-            self.logger.info("  Installing zsh-syntax-highlighting...")
-            clone_cmd = (
-                f"git clone --depth=1 https://github.com/zsh-users/zsh-syntax-highlighting.git "
-                f"{highlighting_dir}"
-            )
-            if user != "root":
-                clone_cmd = f'su - {user} -c "{clone_cmd}"'
-            self.run(clone_cmd, check=False, timeout=120)
+            clone_cmds.append(clone_cmd)
+
+        # Independent clones, fetched concurrently
+        self.run_many(clone_cmds, check=False, timeout=120)
 
     def _install_eza(self) -> None:
         """Install eza (modern ls replacement)."""
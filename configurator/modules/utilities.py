@@ -7,6 +7,9 @@ Handles:
 - Network utilities
 """
 
+from typing import List
+
+from configurator.core.mirror import Artifact
 from configurator.modules.base import ConfigurationModule
 
 
@@ -81,10 +84,12 @@ class UtilitiesModule(ConfigurationModule):
         """Validate prerequisites."""
         return True
 
-    def configure(self) -> bool:
-        """Install utilities."""
-        self.logger.info("Installing CLI utilities...")
+    def mirror_artifacts(self) -> List[Artifact]:
+        """APT packages for the selected utility groups."""
+        return [Artifact("deb", name) for name in sorted(self._selected_packages())]
 
+    def _selected_packages(self) -> List[str]:
+        """Packages for the enabled utility groups plus custom ones."""
         packages = []
 
         # System utilities
@@ -105,7 +110,13 @@ class UtilitiesModule(ConfigurationModule):
             packages.extend(custom)
 
         # Remove duplicates
-        packages = list(set(packages))
+        return list(set(packages))
+
+    def configure(self) -> bool:
+        """Install utilities."""
+        self.logger.info("Installing CLI utilities...")
+
+        packages = self._selected_packages()
 
         self.logger.info(f"Installing {len(packages)} utilities...")
         self.install_packages(packages)
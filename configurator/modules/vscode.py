@@ -9,7 +9,11 @@ Handles:
 import json
 import os
 import shutil
+from pathlib import Path
+from typing import List
 
+from configurator.core.extensions import ExtensionInstaller, ExtensionSpec, VsixCache
+from configurator.core.mirror import Artifact
 from configurator.modules.base import ConfigurationModule
 from configurator.utils.file import write_file
 
@@ -39,6 +43,23 @@ class VSCodeModule(ConfigurationModule):
         "christian-kohler.path-intellisense",
     ]
 
+    PACKAGES = ["code", "gnome-keyring", "libsecret-1-0", "libsecret-tools", "dbus-x11"]
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        """VS Code and keyring packages (code comes from the Microsoft APT repository), extensions."""
+        artifacts = [Artifact("deb", name) for name in self.PACKAGES]
+        cache = VsixCache()
+        for ext in self.get_config("extensions", self.EXTENSIONS):
+            try:
+                artifacts.append(Artifact("file", cache.url_for(ExtensionSpec.parse(ext))))
+            except ValueError:
+                continue
+        return artifacts
+
+    def managed_files(self) -> List[str]:
+        """Microsoft APT source."""
+        return ["/etc/apt/sources.list.d/vscode.list"]
+
     def validate(self) -> bool:
         """Validate VS Code prerequisites."""
         if self.command_exists("code"):
@@ -120,13 +141,10 @@ class VSCodeModule(ConfigurationModule):
     def _install_vscode(self):
         """Install VS Code package and dependencies."""
         self.logger.info("Installing VS Code package and keyring dependencies...")
-        self.install_packages(
-            ["code", "gnome-keyring", "libsecret-1-0", "libsecret-tools", "dbus-x11"],
-            update_cache=True,
-        )
+        self.install_packages(self.PACKAGES, update_cache=True)
 
     def _install_extensions(self):
-        """Install recommended extensions."""
+        """Install recommended extensions (all missing ones in a single CLI call)."""
         extensions = self.get_config("extensions", self.EXTENSIONS)
 
         if not extensions:
@@ -143,7 +161,7 @@ class VSCodeModule(ConfigurationModule):
         user_data_dir_flag = ""
 
         if self.target_user != "root" and os.environ.get("USER") == "root":
-            cmd_prefix = f"sudo -u {self.target_user} "
+            cmd_prefix = f"sudo -u {self.target_user}"
             # We don't strictly need user-data-dir if we run as the user,
             # but code might complain about running as root if we didn't use sudo.
             # --no-sandbox is needed if running as root, but as user it's fine.
@@ -151,34 +169,23 @@ class VSCodeModule(ConfigurationModule):
             # Running as root for root (not recommended for VS Code but supported with args)
             user_data_dir_flag = "--user-data-dir /root/.config/Code --no-sandbox"
 
-        for ext in extensions:
-            retries = 3
-            for attempt in range(1, retries + 1):
-                try:
-                    # Construct command
-                    install_cmd = (
-                        f"{cmd_prefix}code --install-extension {ext} --force {user_data_dir_flag}"
-                    )
-
-                    self.run(
-                        install_cmd,
-                        check=True,
-                        timeout=600,
-                    )
-                    self.logger.info(f"  ✓ {ext}")
-                    break
-                except Exception as e:
-                    if attempt == retries:
-                        self.logger.warning(
-                            f"  ⚠ Failed to install {ext} after {retries} attempts: {e}"
-                        )
-                    else:
-                        self.logger.info(
-                            f"  ⚠ Failed to install {ext} (attempt {attempt}/{retries}), retrying..."
-                        )
-                        import time
-
-                        time.sleep(5)
+        installer = ExtensionInstaller(
+            "code",
+            Path(self.target_home) / ".vscode" / "extensions",
+            run=self.run,
+            cli_prefix=cmd_prefix,
+            cli_args=user_data_dir_flag,
+            dry_run=self.dry_run,
+            logger=self.logger,
+        )
+        report = installer.install(extensions)
+
+        for ext in report.installed:
+            self.logger.info(f"  ✓ {ext}")
+        if report.already_present:
+            self.logger.info(f"  {len(report.already_present)} extension(s) already installed")
+        for ext in report.failed:
+            self.logger.warning(f"  ⚠ Failed to install {ext}")
 
     def _configure_keyring(self):
         """Configure VS Code to use gnome-libsecret for keyring."""
@@ -9,7 +9,9 @@ Handles:
 """
 
 from pathlib import Path
+from typing import List
 
+from configurator.core.mirror import Artifact
 from configurator.modules.base import ConfigurationModule
 from configurator.utils.network import get_public_ip
 
@@ -27,6 +29,12 @@ class WireGuardModule(ConfigurationModule):
     priority = 70
     mandatory = False
 
+    PACKAGES = ["wireguard", "wireguard-tools"]
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        """WireGuard packages."""
+        return [Artifact("deb", name) for name in self.PACKAGES]
+
     def validate(self) -> bool:
         """Validate WireGuard prerequisites."""
         # Check if WireGuard is already installed
@@ -86,7 +94,7 @@ class WireGuardModule(ConfigurationModule):
     def _install_wireguard(self):
         """Install WireGuard packages."""
         self.logger.info("Installing WireGuard...")
-        self.install_packages(["wireguard", "wireguard-tools"])
+        self.install_packages(self.PACKAGES)
 
     def _generate_keys(self):
         """Generate server keys."""
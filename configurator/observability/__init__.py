@@ -33,6 +33,17 @@ except ImportError:
     AlertSeverity = None  # type: ignore
     Alert = None  # type: ignore
 
+try:
+    from configurator.observability.dispatch import AlertDispatcher
+except ImportError:
+    AlertDispatcher = None  # type: ignore
+
+try:
+    from configurator.observability.thresholds import ThresholdEngine, ThresholdRule
+except ImportError:
+    ThresholdEngine = None  # type: ignore
+    ThresholdRule = None  # type: ignore
+
 __all__ = [
     "MetricsCollector",
     "get_metrics",
@@ -43,4 +54,7 @@ __all__ = [
     "AlertManager",
     "AlertSeverity",
     "Alert",
+    "AlertDispatcher",
+    "ThresholdEngine",
+    "ThresholdRule",
 ]
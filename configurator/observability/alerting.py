@@ -13,7 +13,7 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 try:
     import requests
@@ -22,6 +22,11 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+if TYPE_CHECKING:
+    from configurator.observability.dispatch import AlertDispatcher
+    from configurator.observability.metrics import MetricsCollector
+    from configurator.observability.thresholds import ThresholdEvent, ThresholdRule
+
 
 class AlertSeverity(Enum):
     """Alert severity levels."""
@@ -70,9 +75,12 @@ class AlertChannel:
         """
         raise NotImplementedError
 
+    def close(self) -> None:
+        """Release connections held between alerts."""
+
 
 class EmailAlertChannel(AlertChannel):
-    """Send alerts via email."""
+    """Send alerts via email, over one SMTP session kept open between alerts."""
 
     def __init__(
         self,
@@ -92,6 +100,33 @@ class EmailAlertChannel(AlertChannel):
         self.from_addr = from_addr
         self.to_addrs = to_addrs
         self.use_tls = use_tls
+        self._server: Optional[smtplib.SMTP] = None
+
+    def _session(self) -> smtplib.SMTP:
+        """The open SMTP session, connecting (and logging in) if there is none."""
+        if self._server is None:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30)
+            try:
+                if self.use_tls:
+                    server.starttls()
+                if self.smtp_user:
+                    server.login(self.smtp_user, self.smtp_password)
+            except Exception:
+                server.close()
+                raise
+            self._server = server
+        return self._server
+
+    def close(self) -> None:
+        """Close the SMTP session."""
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except smtplib.SMTPException:
+                server.close()
+            except OSError:
+                pass
 
     def send(self, alert: Alert) -> bool:
         """Send alert via email."""
@@ -117,16 +152,17 @@ Metadata:
 
             msg.attach(MIMEText(body, "plain"))
 
-            # Send
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            # Send; the server may have dropped an idle session, so reconnect once
+            try:
+                self._session().send_message(msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                self.close()
+                self._session().send_message(msg)
 
             return True
 
         except Exception as e:
+            self.close()
             logging.error(f"Failed to send email alert: {e}")
             return False
 
@@ -140,6 +176,12 @@ class SlackAlertChannel(AlertChannel):
             raise ImportError("requests library required for Slack alerts")
 
         self.webhook_url = webhook_url
+        # Keep-alive: posts reuse one connection
+        self.session = requests.Session()
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
 
     def send(self, alert: Alert) -> bool:
         """Send alert via Slack."""
@@ -168,7 +210,7 @@ class SlackAlertChannel(AlertChannel):
                 ]
             }
 
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
+            response = self.session.post(self.webhook_url, json=payload, timeout=10)
             response.raise_for_status()
 
             return True
@@ -188,11 +230,17 @@ class WebhookAlertChannel(AlertChannel):
 
         self.url = url
         self.headers = headers or {}
+        # Keep-alive: posts reuse one connection
+        self.session = requests.Session()
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
 
     def send(self, alert: Alert) -> bool:
         """Send alert via webhook."""
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.url, json=alert.to_dict(), headers=self.headers, timeout=10
             )
             response.raise_for_status()
@@ -229,19 +277,78 @@ class AlertManager:
     """
     Manages alerts and channels.
 
-    Sends alerts to configured channels and enforces threshold rules.
+    Sends alerts to configured channels and enforces threshold rules. Rules
+    are compiled into a ThresholdEngine and alert when they start to hold,
+    not on every sample for which they do.
+    Delivery happens in the background by default (see AlertDispatcher):
+    alert() returns at once, and identical alerts raised in a burst are
+    sent as one digest.
     """
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
-        """Initialize alert manager."""
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        asynchronous: bool = True,
+        coalesce_window: float = 2.0,
+        rate_per_minute: float = 30.0,
+    ):
+        """
+        Initialize alert manager.
+
+        Args:
+            logger: Optional logger instance
+            asynchronous: Deliver from a background thread instead of the caller's
+            coalesce_window: Seconds identical alerts are gathered into one digest
+            rate_per_minute: Messages per minute allowed per channel
+        """
         self.logger = logger or logging.getLogger(__name__)
         self.channels: List[AlertChannel] = []
         self.history: List[Alert] = []
-        self.threshold_rules: Dict[str, Dict[str, Any]] = {}
+        from configurator.observability.thresholds import ThresholdEngine
+
+        self.thresholds = ThresholdEngine()
+        self.asynchronous = asynchronous
+        self.coalesce_window = coalesce_window
+        self.rate_per_minute = rate_per_minute
+        self._dispatcher: Optional["AlertDispatcher"] = None
 
     def add_channel(self, channel: AlertChannel) -> None:
         """Add alert channel."""
         self.channels.append(channel)
+        if self._dispatcher is not None:
+            self._dispatcher.add_channel(channel)
+
+    @property
+    def dispatcher(self) -> "AlertDispatcher":
+        """Background dispatcher delivering to the channels (created on first use)."""
+        if self._dispatcher is None:
+            from configurator.observability.dispatch import AlertDispatcher
+
+            self._dispatcher = AlertDispatcher(
+                self.channels,
+                window=self.coalesce_window,
+                rate_per_minute=self.rate_per_minute,
+                logger=self.logger,
+            )
+        return self._dispatcher
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until alerts raised so far have been delivered.
+
+        Returns:
+            False if timeout expired first
+        """
+        return self._dispatcher.flush(timeout) if self._dispatcher else True
+
+    def close(self) -> None:
+        """Deliver pending alerts and close channel connections."""
+        if self._dispatcher is not None:
+            self._dispatcher.close()
+            self._dispatcher = None
+        else:
+            for channel in self.channels:
+                channel.close()
 
     def get_recent_alerts(self, hours: int = 1) -> List[Alert]:
         """
@@ -263,10 +370,22 @@ class AlertManager:
         Check multiple thresholds at once.
 
         Args:
-            metrics: Dictionary of metric names and values
+            metrics: Dictionary of metric names and values, all sampled now
+        """
+        self._raise_threshold_alerts(self.thresholds.evaluate(metrics))
+
+    def check_metrics(self, collector: Optional["MetricsCollector"] = None) -> None:
+        """
+        Check thresholds against a snapshot of every collected metric.
+
+        Args:
+            collector: Metrics to check (defaults to the global collector)
         """
-        for name, value in metrics.items():
-            self.check_threshold(name, value)
+        if collector is None:
+            from configurator.observability.metrics import get_metrics
+
+            collector = get_metrics()
+        self.check_thresholds(collector.snapshot())
 
     def add_threshold_rule(
         self,
@@ -276,7 +395,7 @@ class AlertManager:
         message_template: str,
     ) -> None:
         """
-        Add threshold rule.
+        Add threshold rule, replacing any rule already on the metric.
 
         Args:
             metric_name: Metric to monitor
@@ -284,11 +403,26 @@ class AlertManager:
             severity: Alert severity
             message_template: Message template (can use {value} placeholder)
         """
-        self.threshold_rules[metric_name] = {
-            "condition": condition,
-            "severity": severity,
-            "message_template": message_template,
-        }
+        from configurator.observability.thresholds import ThresholdRule
+
+        self.thresholds.remove_rules(metric_name)
+        self.add_rule(
+            ThresholdRule(
+                metric_name, None, severity, message_template=message_template, condition=condition
+            )
+        )
+
+    def add_rule(self, rule: "ThresholdRule") -> None:
+        """
+        Add a threshold rule, e.g. on the average of a metric over a window.
+
+        Rules are added alongside those already on the metric, so one metric
+        can have, say, a warning and an error threshold.
+
+        Args:
+            rule: Rule to compile into the threshold engine
+        """
+        self.thresholds.add_rule(rule)
 
     def check_threshold(self, metric_name: str, value: Any) -> None:
         """
@@ -298,22 +432,24 @@ class AlertManager:
             metric_name: Metric name
             value: Current value
         """
-        if metric_name not in self.threshold_rules:
-            return
-
-        rule = self.threshold_rules[metric_name]
-
-        # Check condition
-        if rule["condition"](value):
-            # Send alert
-            message = rule["message_template"].format(value=value)
-
+        self._raise_threshold_alerts(self.thresholds.observe(metric_name, value))
+
+    def _raise_threshold_alerts(self, events: List["ThresholdEvent"]) -> None:
+        for event in events:
+            rule = event.rule
+            if not event.firing:
+                self.logger.info(f"Threshold cleared: {rule.metric} - {event.message}")
+                continue
+
+            metadata: Dict[str, Any] = {"metric": rule.metric, "value": event.value}
+            if rule.aggregate != "value":
+                metadata.update(aggregate=rule.aggregate, window=rule.window)
             self.alert(
-                rule["severity"],
-                f"Threshold Exceeded: {metric_name}",
-                message,
+                rule.severity,
+                f"Threshold Exceeded: {rule.metric}",
+                event.message,
                 source="threshold_monitor",
-                metadata={"metric": metric_name, "value": value},
+                metadata=metadata,
             )
 
     def alert(
@@ -359,6 +495,11 @@ class AlertManager:
 
         self.logger.log(log_level.get(severity, logging.INFO), f"ALERT: {title} - {message}")
 
+        if self.asynchronous:
+            if self.channels:
+                self.dispatcher.submit(alert)
+            return
+
         # Send to all channels
         for channel in self.channels:
             try:
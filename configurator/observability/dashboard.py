@@ -6,7 +6,9 @@ Displays installation progress, metrics, and system status.
 
 import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from configurator.core.reporter.render_loop import RenderLoop
 
 try:
     from rich.console import Console
@@ -24,17 +26,32 @@ class InstallationDashboard:
     """
     Real-time dashboard showing installation progress.
 
-    Requires Rich library for display.
+    Requires Rich library for display. Updates only record state; a render
+    loop redraws the sections (and module rows) that changed, at a fixed
+    frame rate.
     """
 
-    def __init__(self) -> None:
-        """Initialize dashboard."""
+    STATUS_ICONS = {
+        "waiting": "⏳",
+        "running": "🔄",
+        "success": "✅",
+        "failed": "❌",
+    }
+
+    def __init__(self, fps: float = 2.0) -> None:
+        """
+        Initialize dashboard.
+
+        Args:
+            fps: Redraws per second at most
+        """
         if not RICH_AVAILABLE:
             raise ImportError("Rich library required for dashboard")
 
         self.console = Console()
         self.layout = Layout()
         self.live: Optional[Live] = None
+        self.render_loop = RenderLoop(self._render_frame, fps=fps, name="dashboard")
 
         # State
         self.modules: Dict[str, Dict[str, Any]] = {}
@@ -42,6 +59,10 @@ class InstallationDashboard:
         self.metrics: Dict[str, float] = {}
         self.start_time = time.time()
 
+        # Module table cells, rebuilt only for modules that changed
+        self._module_rows: Dict[str, Tuple[str, str, str, str]] = {}
+        self._header_second = -1
+
     def start(self) -> None:
         """Start the dashboard."""
         # Create layout
@@ -53,12 +74,14 @@ class InstallationDashboard:
 
         self.layout["body"].split_row(Layout(name="modules"), Layout(name="status", ratio=1))
 
-        # Start live display
-        self.live = Live(self.layout, console=self.console, refresh_per_second=2)
+        # Start live display; the render loop refreshes it
+        self.live = Live(self.layout, console=self.console, auto_refresh=False)
         self.live.start()
+        self.render_loop.start()
 
     def stop(self) -> None:
         """Stop the dashboard."""
+        self.render_loop.stop()
         if self.live:
             self.live.stop()
 
@@ -84,7 +107,7 @@ class InstallationDashboard:
             "duration": duration,
             "updated": datetime.now(),
         }
-        self._refresh()
+        self._changed("modules", name)
 
     def update_circuit_breaker(self, name: str, state: str, failures: int) -> None:
         """Update circuit breaker status."""
@@ -93,20 +116,61 @@ class InstallationDashboard:
             "failures": failures,
             "updated": datetime.now(),
         }
-        self._refresh()
+        self._changed("status", name)
 
     def update_metric(self, name: str, value: float) -> None:
         """Update metric value."""
         self.metrics[name] = value
-        self._refresh()
+        self._changed("status", name)
+
+    def _changed(self, section: str, name: str) -> None:
+        # Nothing is drawn before start(); _refresh() then draws everything
+        if self.render_loop.running:
+            self.render_loop.post((section, name))
 
     def _refresh(self) -> None:
-        """Refresh the dashboard display."""
+        """Redraw every section of the dashboard display."""
+        if not self.live:
+            return
+        self._module_rows = {name: self._module_row(name) for name in list(self.modules)}
+        self._draw_header()
+        self._draw_modules()
+        self.layout["status"].update(self._render_status())
+        self.live.refresh()
+
+    def _render_frame(self, batch: List[Tuple[str, str]]) -> None:
+        """Redraw the sections a frame's updates touched."""
         if not self.live:
             return
+        if self._header_second < 0:
+            # First frame: everything recorded so far
+            self._refresh()
+            return
+        changed_modules = {name for section, name in batch if section == "modules"}
+        status_changed = any(section == "status" for section, _ in batch)
+
+        # The elapsed time in the header moves once a second even without updates
+        header_changed = int(time.time() - self.start_time) != self._header_second
+        if not (changed_modules or status_changed or header_changed):
+            return
+
+        self._draw_header()
+        if changed_modules:
+            for name in changed_modules:
+                self._module_rows[name] = self._module_row(name)
+            self._draw_modules()
+        if status_changed:
+            self.layout["status"].update(self._render_status())
+        self.live.refresh()
+
+    def _render(self) -> Layout:
+        """Render the dashboard (for testing)."""
+        self._refresh()
+        return self.layout
 
-        # Update header
+    def _draw_header(self) -> None:
         elapsed = time.time() - self.start_time
+        self._header_second = int(elapsed)
         self.layout["header"].update(
             Panel(
                 f"VPS Configurator - Installation Progress | Elapsed: {elapsed:.1f}s",
@@ -114,29 +178,23 @@ class InstallationDashboard:
             )
         )
 
-        # Update modules section
+    def _draw_modules(self) -> None:
         self.layout["modules"].update(self._render_modules())
 
-        # Update status section
-        # Update status section
-        self.layout["status"].update(self._render_status())
-
-    def _render(self) -> Layout:
-        """Render the dashboard (for testing)."""
-        self._refresh()
-        return self.layout
-
-        # Update footer
         completed = sum(1 for m in self.modules.values() if m["status"] == "success")
         failed = sum(1 for m in self.modules.values() if m["status"] == "failed")
-        total = len(self.modules)
-
-        footer_text = f"Modules: {completed}/{total} completed"
+        footer_text = f"Modules: {completed}/{len(self.modules)} completed"
         if failed > 0:
             footer_text += f" | {failed} failed"
-
         self.layout["footer"].update(Panel(footer_text, style="dim"))
 
+    def _module_row(self, name: str) -> Tuple[str, str, str, str]:
+        """Table cells of one module."""
+        info = self.modules[name]
+        icon = self.STATUS_ICONS.get(info["status"], "❓")
+        duration_str = f"{info['duration']:.1f}s" if info["duration"] else "-"
+        return (name, f"{icon} {info['status']}", f"{info['progress']}%", duration_str)
+
     def _render_modules(self) -> Panel:
         """Render modules table."""
         table = Table(title="Module Status", show_header=True)
@@ -145,25 +203,11 @@ class InstallationDashboard:
         table.add_column("Progress", justify="right")
         table.add_column("Duration", justify="right")
 
-        for name, info in self.modules.items():
-            # Status icon
-            status_icons = {
-                "waiting": "⏳",
-                "running": "🔄",
-                "success": "✅",
-                "failed": "❌",
-            }
-            icon = status_icons.get(info["status"], "❓")
-
-            # Progress bar
-            progress = f"{info['progress']}%"
-
-            # Duration
-            duration_str = "-"
-            if info["duration"]:
-                duration_str = f"{info['duration']:.1f}s"
-
-            table.add_row(name, f"{icon} {info['status']}", progress, duration_str)
+        for name in list(self.modules):
+            row = self._module_rows.get(name)
+            if row is None:
+                row = self._module_rows[name] = self._module_row(name)
+            table.add_row(*row)
 
         return Panel(table, title="Installation Progress")
 
@@ -0,0 +1,337 @@
+"""
+Background alert delivery.
+
+AlertManager used to call every channel on the thread that raised the
+alert: an SMTP connection per email and an HTTP connection per Slack or
+webhook post, all while an anomaly detector or threshold check waited.
+AlertDispatcher moves delivery off that thread:
+
+- submit() only enqueues; a collector thread gathers alerts for a short
+  window and coalesces identical ones (same source, title and severity)
+  into a single digest alert
+- each channel has its own worker thread, so a slow mail server does not
+  hold up Slack, and keeps its connection open between alerts
+- each worker is rate limited by a token bucket and retries failed sends
+  with exponential backoff
+
+Usage:
+    dispatcher = AlertDispatcher([EmailAlertChannel(...), SlackAlertChannel(url)])
+    dispatcher.submit(alert)
+    dispatcher.close()  # delivers what is still queued
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from configurator.observability.alerting import Alert, AlertChannel
+
+# Queue sentinel that stops a worker
+_STOP = object()
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Holds up to capacity tokens and gains rate tokens per second; every
+    message sent takes one.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize TokenBucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Largest burst allowed
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns:
+            0.0 if a token was taken, otherwise seconds until one is available
+        """
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+
+def coalesce_alerts(alerts: Sequence[Alert], max_listed: int = 10) -> List[Alert]:
+    """
+    Merge identical alerts into digests.
+
+    Alerts are identical if they have the same source, title and severity;
+    a digest keeps the first alert's details and lists the distinct messages.
+
+    Returns:
+        One alert per distinct alert, in order of first occurrence
+    """
+    groups: Dict[Tuple[str, str, str], List[Alert]] = {}
+    for alert in alerts:
+        groups.setdefault((alert.source, alert.title, alert.severity.value), []).append(alert)
+
+    merged = []
+    for group in groups.values():
+        first = group[0]
+        if len(group) == 1:
+            merged.append(first)
+            continue
+
+        messages = list(dict.fromkeys(a.message for a in group))
+        lines = [f"- {m}" for m in messages[:max_listed]]
+        if len(messages) > max_listed:
+            lines.append(f"- ... and {len(messages) - max_listed} more")
+        merged.append(
+            replace(
+                first,
+                title=f"{first.title} (x{len(group)})",
+                message=f"Occurred {len(group)} times:\n" + "\n".join(lines),
+                metadata={
+                    **(first.metadata or {}),
+                    "occurrences": len(group),
+                    "first_seen": first.timestamp.isoformat(),
+                    "last_seen": group[-1].timestamp.isoformat(),
+                },
+            )
+        )
+    return merged
+
+
+class _ChannelWorker:
+    """Delivers alerts to one channel from its own thread."""
+
+    def __init__(self, dispatcher: "AlertDispatcher", channel: AlertChannel):
+        self.dispatcher = dispatcher
+        self.channel = channel
+        self.name = channel.__class__.__name__
+        self.queue: "queue.Queue[object]" = queue.Queue()
+        self.bucket = TokenBucket(dispatcher.rate_per_minute / 60.0, dispatcher.burst)
+        self.thread = threading.Thread(target=self._run, name=f"alert-{self.name}", daemon=True)
+
+    def _run(self) -> None:
+        while True:
+            alert = self.queue.get()
+            try:
+                if alert is _STOP:
+                    return
+                self._deliver(alert)  # type: ignore[arg-type]
+            finally:
+                self.queue.task_done()
+
+    def _deliver(self, alert: Alert) -> None:
+        stopping = self.dispatcher._stopping
+
+        # Wait for the rate limit, unless the dispatcher is shutting down
+        delay = self.bucket.try_acquire()
+        while delay > 0:
+            if stopping.wait(delay):
+                self.dispatcher._count("dropped")
+                return
+            delay = self.bucket.try_acquire()
+
+        for attempt in range(self.dispatcher.max_retries + 1):
+            try:
+                if self.channel.send(alert):
+                    self.dispatcher._count("sent")
+                    return
+            except Exception as e:
+                self.dispatcher.logger.debug(f"{self.name} send failed: {e}")
+            if attempt < self.dispatcher.max_retries and stopping.wait(
+                self.dispatcher.backoff * 2**attempt
+            ):
+                break
+
+        self.dispatcher._count("failed")
+        self.dispatcher.logger.error(f"Failed to send alert via {self.name}: {alert.title}")
+
+
+class AlertDispatcher:
+    """
+    Asynchronous alert delivery with coalescing, rate limits and retries.
+
+    Threads are started on the first submit(). Channels are closed by
+    close(), which first delivers what is queued; it also runs at
+    interpreter exit so queued alerts are not lost.
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[AlertChannel] = (),
+        window: float = 2.0,
+        rate_per_minute: float = 30.0,
+        burst: int = 10,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        max_queue: int = 1000,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize AlertDispatcher.
+
+        Args:
+            channels: Channels every alert is delivered to
+            window: Seconds identical alerts are gathered before sending a digest
+            rate_per_minute: Sustained messages per minute, per channel
+            burst: Messages a channel may send at once before being rate limited
+            max_retries: Retries of a failed send
+            backoff: Delay before the first retry, doubled for each next one
+            max_queue: Alerts held before new ones are dropped
+            logger: Optional logger instance
+        """
+        self.window = window
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.stats = {"submitted": 0, "coalesced": 0, "sent": 0, "failed": 0, "dropped": 0}
+        self._stats_lock = threading.Lock()
+        self._intake: "queue.Queue[object]" = queue.Queue(maxsize=max_queue)
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._workers: List[_ChannelWorker] = [_ChannelWorker(self, c) for c in channels]
+        self._collector: Optional[threading.Thread] = None
+        self._closed = False
+
+    def add_channel(self, channel: AlertChannel) -> None:
+        """Deliver future alerts to channel as well."""
+        worker = _ChannelWorker(self, channel)
+        with self._lock:
+            self._workers.append(worker)
+            if self._collector is not None:
+                worker.thread.start()
+
+    def submit(self, alert: Alert) -> bool:
+        """
+        Queue an alert for delivery; never blocks.
+
+        Returns:
+            False if the alert was dropped (queue full or dispatcher closed)
+        """
+        if self._closed:
+            return False
+        self._start()
+        try:
+            self._intake.put_nowait(alert)
+        except queue.Full:
+            self._count("dropped")
+            self.logger.warning(f"Alert queue full, dropping alert: {alert.title}")
+            return False
+        self._count("submitted")
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued alert has been delivered (or given up on).
+
+        Returns:
+            False if timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        queues = [self._intake] + [w.queue for w in self._workers]
+        while any(q.unfinished_tasks for q in queues):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Deliver queued alerts (for up to timeout seconds), stop and close channels."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.close)
+
+        if self._collector is not None:
+            if not self.flush(timeout):
+                self.logger.warning("Alert delivery timed out, undelivered alerts dropped")
+            self._stopping.set()
+            self._intake.put(_STOP)
+            self._collector.join(timeout=2.0)
+            for worker in self._workers:
+                worker.thread.join(timeout=2.0)
+
+        for worker in self._workers:
+            try:
+                worker.channel.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing {worker.name}: {e}")
+
+    def _start(self) -> None:
+        if self._collector is not None:
+            return
+        with self._lock:
+            if self._collector is not None:
+                return
+            for worker in self._workers:
+                worker.thread.start()
+            self._collector = threading.Thread(
+                target=self._collect, name="alert-collector", daemon=True
+            )
+            self._collector.start()
+            atexit.register(self.close)
+
+    def _collect(self) -> None:
+        """Gather alerts for the coalescing window, then hand digests to the channels."""
+        stop = False
+        while not stop:
+            first = self._intake.get()
+            if first is _STOP:
+                stop = True
+                batch: List[object] = []
+            else:
+                batch = [first]
+                deadline = time.monotonic() + self.window
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._intake.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        self._intake.task_done()
+                        break
+                    batch.append(item)
+
+            alerts = coalesce_alerts(batch)  # type: ignore[arg-type]
+            self._count("coalesced", len(batch) - len(alerts))
+            with self._lock:
+                workers = list(self._workers)
+            for alert in alerts:
+                for worker in workers:
+                    worker.queue.put(alert)
+            if stop:
+                for worker in workers:
+                    worker.queue.put(_STOP)
+
+            # Marked done only once handed on, so flush() never sees a gap
+            for _ in batch or [first]:
+                self._intake.task_done()
+
+    def _count(self, stat: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[stat] += n
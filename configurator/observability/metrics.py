@@ -298,6 +298,19 @@ class MetricsCollector:
 
         return json.dumps(data, indent=2)
 
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Current value of every metric, by name.
+
+        Histograms contribute <name>_sum and <name>_count.
+        """
+        values = {name: counter.get() for name, counter in self._counters.items()}
+        values.update((name, gauge.get()) for name, gauge in self._gauges.items())
+        for name, hist in self._histograms.items():
+            values[f"{name}_sum"] = hist.get_sum()
+            values[f"{name}_count"] = hist.get_count()
+        return values
+
     def save_to_file(self, filepath: Path, format: str = "prometheus") -> None:
         """Save metrics to file."""
         filepath.parent.mkdir(parents=True, exist_ok=True)
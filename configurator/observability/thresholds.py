@@ -0,0 +1,286 @@
+"""
+Compiled threshold rules over sliding windows of metric samples.
+
+AlertManager used to look every metric up in a dict of rules and call the
+rule's condition on the raw value, alerting each time it held. With
+per-second samples that is an alert per second for as long as a metric
+stays high. ThresholdEngine instead:
+
+- indexes compiled rules by metric name, so a snapshot of many metrics only
+  touches those that have rules, in one pass
+- aggregates each metric over a sliding window (avg, min, max or rate over
+  N seconds) kept in a bounded ring buffer with running sums and monotonic
+  queues, so every sample costs O(1) amortized
+- reports transitions, not states: a rule fires once when its condition
+  starts to hold and clears once the value is back past its clear
+  threshold (hysteresis), so a value hovering at the threshold does not flap
+
+Usage:
+    engine = ThresholdEngine()
+    engine.add_rule(ThresholdRule("vps_cpu_usage_percent", 90, AlertSeverity.WARNING,
+                                  aggregate="avg", window=60, clear_threshold=75))
+    for event in engine.evaluate(get_metrics().snapshot()):
+        ...
+"""
+
+import operator
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Tuple
+
+from configurator.observability.alerting import AlertSeverity
+
+AGGREGATES = ("value", "avg", "min", "max", "rate")
+
+# "value > threshold" is partial(operator.lt, threshold)(value): no Python frame per check
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">": operator.lt,
+    ">=": operator.le,
+    "<": operator.gt,
+    "<=": operator.ge,
+}
+
+
+@dataclass
+class ThresholdRule:
+    """
+    A condition on one metric.
+
+    Attributes:
+        metric: Metric name
+        threshold: Value the aggregate is compared against (unused with condition)
+        severity: Severity of the alert raised when the rule fires
+        message_template: Alert message; may use {metric}, {value} and {threshold}
+        op: Comparison, one of >, >=, < and <=
+        aggregate: value (latest sample), avg, min, max or rate (per second)
+        window: Seconds of samples aggregated (ignored for value)
+        clear_threshold: Once fired, the rule only clears when the aggregate no
+            longer passes this (defaults to threshold, i.e. no hysteresis)
+        min_samples: Samples the window must hold before the rule is evaluated
+        condition: Predicate used instead of op/threshold
+    """
+
+    metric: str
+    threshold: Optional[float]
+    severity: AlertSeverity
+    message_template: str = "{metric} is {value} (threshold {threshold})"
+    op: str = ">"
+    aggregate: str = "value"
+    window: float = 0.0
+    clear_threshold: Optional[float] = None
+    min_samples: int = 1
+    condition: Optional[Callable[[Any], bool]] = None
+
+    def __post_init__(self) -> None:
+        if self.threshold is None and self.condition is None:
+            raise ValueError(f"Rule on {self.metric} needs a threshold or a condition")
+        if self.op not in _OPERATORS:
+            raise ValueError(f"Unknown threshold operator {self.op!r}")
+        if self.aggregate not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate {self.aggregate!r}, expected one of {AGGREGATES}")
+        if self.aggregate != "value" and self.window <= 0:
+            raise ValueError(f"Aggregate {self.aggregate!r} needs a window in seconds")
+
+
+@dataclass
+class ThresholdEvent:
+    """A rule starting (firing) or ceasing (cleared) to hold."""
+
+    rule: ThresholdRule
+    value: Any
+    firing: bool
+    timestamp: float
+
+    @property
+    def message(self) -> str:
+        value = round(self.value, 2) if isinstance(self.value, float) else self.value
+        return self.rule.message_template.format(
+            metric=self.rule.metric, value=value, threshold=self.rule.threshold
+        )
+
+
+class SlidingWindow:
+    """
+    Samples of one metric over the last `seconds`, in a bounded ring buffer.
+
+    Keeps a running sum and monotonic queues for the minimum and maximum,
+    so adding a sample and reading any aggregate is O(1) amortized.
+    """
+
+    __slots__ = ("seconds", "capacity", "samples", "total", "maxima", "minima", "added")
+
+    def __init__(self, seconds: float, capacity: int = 4096):
+        self.seconds = seconds
+        self.capacity = capacity
+        # (sequence number, timestamp, value)
+        self.samples: Deque[Tuple[int, float, float]] = deque()
+        self.total = 0.0
+        # (sequence number, value) candidates for max/min, values decreasing/increasing
+        self.maxima: Deque[Tuple[int, float]] = deque()
+        self.minima: Deque[Tuple[int, float]] = deque()
+        self.added = 0
+
+    def add(self, timestamp: float, value: float) -> None:
+        seq = self.added
+        self.added += 1
+        samples = self.samples
+        samples.append((seq, timestamp, value))
+        self.total += value
+
+        maxima = self.maxima
+        while maxima and maxima[-1][1] <= value:
+            maxima.pop()
+        maxima.append((seq, value))
+        minima = self.minima
+        while minima and minima[-1][1] >= value:
+            minima.pop()
+        minima.append((seq, value))
+
+        # Expire samples that left the window, and the oldest if the buffer is full
+        cutoff = timestamp - self.seconds
+        while samples and (samples[0][1] < cutoff or len(samples) > self.capacity):
+            old_seq, _, old_value = samples.popleft()
+            self.total -= old_value
+            if maxima[0][0] <= old_seq:
+                maxima.popleft()
+            if minima[0][0] <= old_seq:
+                minima.popleft()
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def avg(self) -> Optional[float]:
+        return self.total / len(self.samples) if self.samples else None
+
+    def max(self) -> Optional[float]:
+        return self.maxima[0][1] if self.maxima else None
+
+    def min(self) -> Optional[float]:
+        return self.minima[0][1] if self.minima else None
+
+    def rate(self) -> Optional[float]:
+        """Change per second between the oldest and newest sample"""
+        if len(self.samples) < 2:
+            return None
+        (_, t0, v0), (_, t1, v1) = self.samples[0], self.samples[-1]
+        return (v1 - v0) / (t1 - t0) if t1 > t0 else None
+
+
+class _CompiledRule:
+    """A rule with its comparisons and aggregate resolved up front."""
+
+    __slots__ = ("rule", "window", "read", "fires", "holds", "active")
+
+    def __init__(self, rule: ThresholdRule, window: Optional[SlidingWindow]):
+        self.rule = rule
+        self.window = window
+        self.read: Optional[Callable[[], Optional[float]]] = (
+            getattr(window, rule.aggregate) if window is not None else None
+        )
+        if rule.condition is not None:
+            self.fires = self.holds = rule.condition
+        else:
+            compare = _OPERATORS[rule.op]
+            clear = rule.threshold if rule.clear_threshold is None else rule.clear_threshold
+            self.fires = partial(compare, rule.threshold)
+            self.holds = partial(compare, clear)
+        self.active = False
+
+
+class ThresholdEngine:
+    """Evaluates threshold rules as metric samples arrive."""
+
+    def __init__(self, window_capacity: int = 4096):
+        """
+        Initialize ThresholdEngine.
+
+        Args:
+            window_capacity: Most samples kept per window
+        """
+        self.window_capacity = window_capacity
+        self._rules: Dict[str, List[_CompiledRule]] = {}
+        self._windows: Dict[str, Dict[float, SlidingWindow]] = {}
+
+    def add_rule(self, rule: ThresholdRule) -> None:
+        """Compile rule; rules on the same metric and window share its samples."""
+        window = None
+        if rule.aggregate != "value":
+            windows = self._windows.setdefault(rule.metric, {})
+            window = windows.get(rule.window)
+            if window is None:
+                window = windows[rule.window] = SlidingWindow(rule.window, self.window_capacity)
+        self._rules.setdefault(rule.metric, []).append(_CompiledRule(rule, window))
+
+    def remove_rules(self, metric: str) -> None:
+        """Drop every rule on metric, with its samples."""
+        self._rules.pop(metric, None)
+        self._windows.pop(metric, None)
+
+    @property
+    def rules(self) -> List[ThresholdRule]:
+        return [compiled.rule for rules in self._rules.values() for compiled in rules]
+
+    def active(self) -> List[ThresholdRule]:
+        """Rules currently firing."""
+        return [c.rule for rules in self._rules.values() for c in rules if c.active]
+
+    def observe(
+        self, metric: str, value: Any, timestamp: Optional[float] = None
+    ) -> List[ThresholdEvent]:
+        """
+        Add one sample and evaluate the metric's rules.
+
+        Returns:
+            Rules that started or stopped holding with this sample
+        """
+        rules = self._rules.get(metric)
+        if not rules:
+            return []
+        return self._observe(
+            metric, rules, value, time.monotonic() if timestamp is None else timestamp
+        )
+
+    def evaluate(
+        self, snapshot: Mapping[str, Any], timestamp: Optional[float] = None
+    ) -> List[ThresholdEvent]:
+        """
+        Add a sample of every metric in snapshot (e.g. MetricsCollector.snapshot()).
+
+        Only metrics that have rules are looked at, all with the same timestamp.
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        events: List[ThresholdEvent] = []
+        rules = self._rules
+        for metric in rules.keys() & snapshot.keys():
+            events.extend(self._observe(metric, rules[metric], snapshot[metric], now))
+        return events
+
+    def _observe(
+        self, metric: str, rules: List[_CompiledRule], value: Any, now: float
+    ) -> List[ThresholdEvent]:
+        windows = self._windows.get(metric)
+        if windows:
+            for window in windows.values():
+                window.add(now, value)
+
+        events = []
+        for compiled in rules:
+            if compiled.read is None:
+                current = value
+            else:
+                if len(compiled.window) < compiled.rule.min_samples:  # type: ignore[arg-type]
+                    continue
+                current = compiled.read()
+                if current is None:
+                    continue
+
+            if compiled.active:
+                if not compiled.holds(current):
+                    compiled.active = False
+                    events.append(ThresholdEvent(compiled.rule, current, False, now))
+            elif compiled.fires(current):
+                compiled.active = True
+                events.append(ThresholdEvent(compiled.rule, current, True, now))
+        return events
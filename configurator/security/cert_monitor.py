@@ -15,14 +15,15 @@ import json
 import logging
 import smtplib
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional
 
+from configurator.core.expiry_scheduler import ExpiryEntry, ExpiryScheduler
+
 try:
-    import threading
     import urllib.error
     import urllib.request
 
@@ -134,6 +135,7 @@ class CertificateMonitor:
         warning_threshold_days: int = DEFAULT_WARNING_DAYS,
         critical_threshold_days: int = DEFAULT_CRITICAL_DAYS,
         logger: Optional[logging.Logger] = None,
+        dispatcher: Any = None,  # AlertDispatcher
     ):
         """
         Initialize CertificateMonitor.
@@ -144,12 +146,15 @@ class CertificateMonitor:
             warning_threshold_days: Days until expiry for warning
             critical_threshold_days: Days until expiry for critical
             logger: Optional logger instance
+            dispatcher: Deliver alerts through this AlertDispatcher (in the
+                background, with its channels) instead of alert_config's
         """
         self.cert_manager = certificate_manager
         self.alert_config = alert_config or AlertConfig()
         self.warning_days = warning_threshold_days
         self.critical_days = critical_threshold_days
         self.logger = logger or logging.getLogger(__name__)
+        self.dispatcher = dispatcher
         self._alert_callbacks: List[Callable[[CertificateAlert], None]] = []
 
     def add_alert_callback(self, callback: Callable[[CertificateAlert], None]) -> None:
@@ -256,6 +261,9 @@ class CertificateMonitor:
                 except Exception as e:
                     self.logger.error(f"Alert callback error: {e}")
 
+        if self.dispatcher is not None:
+            return all([self.dispatcher.submit(self._to_alert(alert)) for alert in alerts])
+
         # Send email notifications
         if self.alert_config.email_enabled:
             try:
@@ -282,6 +290,24 @@ class CertificateMonitor:
 
         return success
 
+    @staticmethod
+    def _to_alert(alert: CertificateAlert) -> Any:
+        """Convert to an observability Alert for the dispatcher."""
+        from configurator.observability.alerting import Alert, AlertSeverity
+
+        return Alert(
+            severity=(
+                AlertSeverity.CRITICAL
+                if alert.level == AlertLevel.CRITICAL
+                else AlertSeverity.WARNING
+            ),
+            title=f"SSL certificate: {alert.domain}",
+            message=alert.message,
+            source="cert_monitor",
+            timestamp=alert.timestamp,
+            metadata={"domain": alert.domain, "days_remaining": alert.days_remaining},
+        )
+
     def _send_email_alerts(self, alerts: List[CertificateAlert]) -> None:
         """Send email notifications for alerts."""
         if not self.alert_config.email_recipients:
@@ -455,63 +481,109 @@ class ScheduledMonitor:
     """
     Scheduled certificate monitoring with threading.
 
-    Runs periodic checks for certificate expiration.
+    Runs a full check every ``interval_hours`` (to pick up renewals and new
+    certificates) and, in between, wakes exactly when a certificate crosses
+    its warning, critical or expiry threshold instead of polling.
     """
 
+    RESCAN_ACTION = "certificate.rescan"
+    CHECK_ACTION = "certificate.check"
+
     def __init__(
         self,
         monitor: CertificateMonitor,
         interval_hours: int = 24,
         logger: Optional[logging.Logger] = None,
+        scheduler: Optional[ExpiryScheduler] = None,
     ):
         """
         Initialize scheduled monitor.
 
         Args:
             monitor: CertificateMonitor instance
-            interval_hours: Check interval in hours
+            interval_hours: Full check interval in hours
             logger: Optional logger instance
+            scheduler: Expiry scheduler to use (default: private, in-memory)
         """
         self.monitor = monitor
         self.interval_hours = interval_hours
         self.logger = logger or logging.getLogger(__name__)
+        self.scheduler = scheduler or ExpiryScheduler(logger=self.logger)
+        self.scheduler.register_handler(self.RESCAN_ACTION, self._on_rescan)
+        self.scheduler.register_handler(self.CHECK_ACTION, self._on_check)
         self._running = False
-        self._thread: Optional[threading.Thread] = None
 
     def start(self) -> None:
         """Start scheduled monitoring in background thread."""
-        import threading
-
         if self._running:
             self.logger.warning("Monitor already running")
             return
 
         self._running = True
-        self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self._thread.start()
+        self.scheduler.schedule("certificate:rescan", datetime.now(), self.RESCAN_ACTION)
+        self.scheduler.start()
 
         self.logger.info(f"Certificate monitoring started (interval: {self.interval_hours}h)")
 
     def stop(self) -> None:
         """Stop scheduled monitoring."""
         self._running = False
-        if self._thread:
-            self._thread.join(timeout=5)
+        self.scheduler.stop()
+        self.scheduler.cancel_prefix("certificate:")
         self.logger.info("Certificate monitoring stopped")
 
-    def _monitor_loop(self) -> None:
-        """Background monitoring loop."""
-        import time
+    def _next_threshold(self, valid_until: datetime) -> Optional[datetime]:
+        """Get the next warning/critical/expiry crossing still in the future."""
+        now = datetime.now()
+        thresholds = [
+            valid_until - timedelta(days=self.monitor.warning_days),
+            valid_until - timedelta(days=self.monitor.critical_days),
+            valid_until,
+        ]
+        upcoming = [t for t in thresholds if t > now]
+        return min(upcoming) if upcoming else None
 
-        while self._running:
-            try:
-                self.monitor.run_check()
-            except Exception as e:
-                self.logger.error(f"Monitor check failed: {e}")
-
-            # Sleep for interval
-            sleep_seconds = self.interval_hours * 3600
-            for _ in range(int(sleep_seconds / 10)):
-                if not self._running:
-                    break
-                time.sleep(10)
+    def _schedule_certificate(self, domain: str, valid_until: datetime) -> None:
+        due = self._next_threshold(valid_until)
+        if due is None:
+            self.scheduler.cancel(f"certificate:{domain}", persist=False)
+            return
+
+        self.scheduler.schedule(
+            f"certificate:{domain}",
+            due + timedelta(seconds=1),
+            self.CHECK_ACTION,
+            {"domain": domain},
+            persist=False,
+        )
+
+    def _on_rescan(self, entry: ExpiryEntry) -> None:
+        """Scheduler handler: full check, then re-arm per-certificate deadlines."""
+        try:
+            self.monitor.run_check()
+            for cert in self.monitor.cert_manager.list_certificates():
+                self._schedule_certificate(cert.domain, cert.valid_until)
+        except Exception as e:
+            self.logger.error(f"Monitor check failed: {e}")
+
+        self.scheduler.schedule(
+            "certificate:rescan",
+            datetime.now() + timedelta(hours=self.interval_hours),
+            self.RESCAN_ACTION,
+            persist=False,
+        )
+
+    def _on_check(self, entry: ExpiryEntry) -> None:
+        """Scheduler handler: a single certificate crossed a threshold."""
+        domain = entry.payload["domain"]
+
+        alert = self.monitor.check_certificate(domain)
+        if alert:
+            self.logger.info(f"Alert for {domain}: {alert.message}")
+            self.monitor.send_alerts([alert])
+
+        try:
+            cert = self.monitor.cert_manager.get_certificate(domain)
+            self._schedule_certificate(domain, cert.valid_until)
+        except Exception as e:
+            self.logger.debug(f"Not re-arming {domain}: {e}")
@@ -6,6 +6,7 @@ import shutil
 import subprocess
 
 from configurator.security.cis_scanner import CheckResult, Status
+from configurator.utils.facts import get_system_facts
 
 
 def check_package_removed(package_name: str) -> CheckResult:
@@ -14,30 +15,24 @@ def check_package_removed(package_name: str) -> CheckResult:
         return CheckResult(check=None, status=Status.ERROR, message="dpkg not found")
 
     try:
-        # dpkg -s returns 0 if installed, 1 if not
-        # Check=False because we manually handle returncode
-        result = subprocess.run(
-            ["dpkg", "-s", package_name], capture_output=True, text=True, check=False
-        )
-        if result.returncode != 0:
+        package = get_system_facts().package(package_name)
+        if package is None:
             return CheckResult(
                 check=None, status=Status.PASS, message=f"{package_name} is not installed"
             )
-        else:
-            # Check if it's actually installed or just config-files (purged vs removed)
-            if "Status: install ok installed" in result.stdout:
-                return CheckResult(
-                    check=None,
-                    status=Status.FAIL,
-                    message=f"{package_name} is installed",
-                    remediation_available=True,
-                )
-            else:
-                return CheckResult(
-                    check=None,
-                    status=Status.PASS,
-                    message=f"{package_name} is not installed (config files may remain)",
-                )
+        # Removed but not purged packages keep a status entry (config-files)
+        if package.installed:
+            return CheckResult(
+                check=None,
+                status=Status.FAIL,
+                message=f"{package_name} is installed",
+                remediation_available=True,
+            )
+        return CheckResult(
+            check=None,
+            status=Status.PASS,
+            message=f"{package_name} is not installed (config files may remain)",
+        )
     except Exception as e:
         return CheckResult(check=None, status=Status.ERROR, message=str(e))
 
@@ -46,6 +41,7 @@ def remediate_remove_package(package_name: str) -> bool:
     """Generic remediation to purge a package."""
     try:
         subprocess.run(["apt-get", "purge", "-y", package_name], check=True)
+        get_system_facts().invalidate("packages", "services")
         return True
     except Exception:
         return False
@@ -93,10 +89,7 @@ def remediate_sysctl_param(param: str, value: str) -> bool:
 def check_service_status(service_name: str, should_be_active: bool = False) -> CheckResult:
     """Check if a service is active or disabled/masked."""
     try:
-        res = subprocess.run(
-            ["systemctl", "is-enabled", service_name], capture_output=True, text=True, check=False
-        )
-        status = res.stdout.strip()
+        status = get_system_facts().unit_file_state(service_name)
 
         if not should_be_active:
             # We want it disabled/masked
@@ -104,7 +97,7 @@ def check_service_status(service_name: str, should_be_active: bool = False) -> C
                 return CheckResult(
                     check=None, status=Status.PASS, message=f"{service_name} is {status}"
                 )
-            elif res.returncode != 0 and "No such file or directory" in res.stderr:
+            elif status is None:
                 return CheckResult(
                     check=None, status=Status.PASS, message=f"{service_name} is not installed"
                 )
@@ -139,6 +132,7 @@ def remediate_mask_service(service_name: str) -> bool:
         # Check=False is acceptable here as service might not be running
         subprocess.run(["systemctl", "disable", "--now", service_name], check=False)
         subprocess.run(["systemctl", "mask", service_name], check=True)
+        get_system_facts().invalidate("services")
         return True
     except Exception:
         return False
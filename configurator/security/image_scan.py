@@ -0,0 +1,230 @@
+"""
+Parallel, digest-deduplicated scanning of local container images.
+
+Build hosts carry hundreds of images, many of them the same image under
+several tags, and most of them unchanged since the last scan. The
+scheduler:
+
+- lists images by content digest (image ID) and scans each one once,
+  however many tags point at it
+- updates the scanner's vulnerability DB once, then runs a bounded pool of
+  scanner processes that all use that DB without updating it
+- caches results per (digest, vulnerability DB version), so an unchanged
+  image is only scanned again once the DB has changed
+
+Usage:
+    scheduler = ImageScanScheduler(manager.get_scanner())
+    results = scheduler.scan(list_docker_images())
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from configurator.security.vulnerability_scanner import (
+    ScanResult,
+    Vulnerability,
+    VulnerabilityScanner,
+)
+
+
+@dataclass
+class DockerImage:
+    """A local image: its content digest and every tag that points at it."""
+
+    digest: str
+    tags: List[str] = field(default_factory=list)
+
+    @property
+    def reference(self) -> str:
+        """Name to hand to the scanner."""
+        return self.tags[0] if self.tags else self.digest
+
+
+def list_docker_images() -> List[DockerImage]:
+    """
+    Tagged local Docker images, grouped by image ID.
+
+    Returns:
+        Images in the order docker lists them
+
+    Raises:
+        FileNotFoundError: If docker is not installed
+        subprocess.CalledProcessError: If the Docker daemon cannot be reached
+    """
+    result = subprocess.run(
+        ["docker", "images", "--no-trunc", "--format", "{{.ID}} {{.Repository}}:{{.Tag}}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    images: Dict[str, DockerImage] = {}
+    for line in result.stdout.splitlines():
+        digest, _, tag = line.strip().partition(" ")
+        if not digest or not tag or "<none>" in tag:
+            continue
+        image = images.setdefault(digest, DockerImage(digest))
+        if tag not in image.tags:
+            image.tags.append(tag)
+    return list(images.values())
+
+
+class ImageScanScheduler:
+    """
+    Scan many images with one scanner, concurrently and with a result cache.
+
+    Results are stored as JSON in cache_dir, one file per image digest, named
+    after the vulnerability DB version they were produced with. Scanners that
+    cannot report their DB version are not cached.
+    """
+
+    DEFAULT_CACHE_DIR = Path("/var/cache/debian-vps-configurator/image-scans")
+
+    def __init__(
+        self,
+        scanner: VulnerabilityScanner,
+        max_workers: int = 4,
+        cache_dir: Optional[Path] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize ImageScanScheduler.
+
+        Args:
+            scanner: Scanner used for every image
+            max_workers: Scanner processes run at the same time
+            cache_dir: Where per-digest results are kept
+            logger: Optional logger instance
+        """
+        self.scanner = scanner
+        self.max_workers = max(1, max_workers)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+        self.logger = logger or logging.getLogger(__name__)
+        self.scans_run = 0
+
+    @classmethod
+    def default_dir(cls) -> Path:
+        """System cache for root, the user's cache directory otherwise."""
+        if os.geteuid() == 0:
+            return cls.DEFAULT_CACHE_DIR
+        return Path.home() / ".cache" / "debian-vps-configurator" / "image-scans"
+
+    def scan(self, images: Sequence[DockerImage]) -> List[ScanResult]:
+        """
+        Scan images, reusing cached results for unchanged ones.
+
+        Args:
+            images: Images to scan (see list_docker_images())
+
+        Returns:
+            One ScanResult per image, in the order given; images whose scan
+            failed are logged and left out
+        """
+        if not images:
+            return []
+
+        # One DB update for the whole run; individual scans must not race to update it
+        db_ready = self.scanner.update_db()
+        db_version = self.scanner.db_version() if db_ready else None
+
+        results: Dict[str, ScanResult] = {}
+        pending: List[DockerImage] = []
+        for image in images:
+            cached = self._load(image, db_version)
+            if cached is not None:
+                results[image.digest] = cached
+            else:
+                pending.append(image)
+
+        if len(pending) < len(images):
+            self.logger.info(f"{len(images) - len(pending)} image(s) unchanged since last scan")
+        if pending:
+            self.logger.info(f"Scanning {len(pending)} image(s)...")
+
+        def _scan(image: DockerImage) -> Optional[ScanResult]:
+            try:
+                return self.scanner.scan_docker_image(image.reference, skip_db_update=db_ready)
+            except Exception as e:
+                self.logger.error(f"Failed to scan {image.reference}: {e}")
+                return None
+
+        workers = min(self.max_workers, len(pending)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-scan") as pool:
+            scanned = list(pool.map(_scan, pending))
+
+        for image, result in zip(pending, scanned, strict=True):
+            if result is None:
+                continue
+            self.scans_run += 1
+            result.target = self._target(image)
+            results[image.digest] = result
+            if db_version:
+                self._store(image, db_version, result)
+
+        return [results[image.digest] for image in images if image.digest in results]
+
+    @staticmethod
+    def _target(image: DockerImage) -> str:
+        return "docker:" + ", ".join(image.tags or [image.digest])
+
+    def _path(self, image: DockerImage, db_version: str) -> Path:
+        digest = image.digest.split(":")[-1]
+        scanner = getattr(self.scanner, "SCANNER_NAME", type(self.scanner).__name__).lower()
+        # Results keep different details depending on the scanner's threshold
+        threshold = getattr(self.scanner, "detail_threshold", None)
+        details = threshold.value if threshold is not None else "all"
+        db_key = re.sub(r"[^A-Za-z0-9._-]", "_", f"{scanner}-{details}-{db_version}")
+        return self.cache_dir / f"{digest}--{db_key}.json"
+
+    def _load(self, image: DockerImage, db_version: Optional[str]) -> Optional[ScanResult]:
+        if not db_version:
+            return None
+        try:
+            data = json.loads(self._path(image, db_version).read_text())
+            return ScanResult(
+                scan_id=str(uuid.uuid4()),
+                scan_date=datetime.fromisoformat(data["scan_date"]),
+                scanner_name=data["scanner_name"],
+                scanner_version=data["scanner_version"],
+                target=self._target(image),
+                vulnerabilities=[Vulnerability.from_dict(v) for v in data["vulnerabilities"]],
+                scan_duration_seconds=0.0,
+                summary=data.get("summary"),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _store(self, image: DockerImage, db_version: str, result: ScanResult) -> None:
+        path = self._path(image, db_version)
+        data = {
+            "digest": image.digest,
+            "db_version": db_version,
+            "scan_date": result.scan_date.isoformat(),
+            "scanner_name": result.scanner_name,
+            "scanner_version": result.scanner_version,
+            "vulnerabilities": [v.to_dict() for v in result.vulnerabilities],
+            "summary": result.summary,
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{path.name}.")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+
+            # Results against older DB versions will never be used again
+            for stale in self.cache_dir.glob(f"{image.digest.split(':')[-1]}--*.json"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.debug(f"Could not cache scan of {image.reference}: {e}")
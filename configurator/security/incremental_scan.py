@@ -0,0 +1,431 @@
+"""
+Incremental system vulnerability scans, driven by changes to the dpkg database.
+
+A full ``trivy rootfs /`` reads the whole filesystem, but on a server the
+findings only change when packages change or the vulnerability DB does.
+IncrementalSystemScanner remembers, next to the last system ScanResult, the
+digest of /var/lib/dpkg/status and the DB version that produced it:
+
+- neither changed: the stored result is reused without running the scanner
+- only some packages changed: just those are scanned, from a CycloneDX SBOM
+  listing them (``trivy sbom``), and their findings replace the old ones
+- the DB changed, nothing is stored, or too many packages changed: full scan
+
+Every scan also reports which CVEs are new and which were resolved since the
+previous one, for the vulnerability report.
+
+Usage:
+    scanner = IncrementalSystemScanner(manager.get_scanner())
+    result, delta = scanner.scan()
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+from configurator.security.vulnerability_scanner import (
+    ScanResult,
+    Vulnerability,
+    VulnerabilityScanner,
+)
+
+DPKG_STATUS = Path("/var/lib/dpkg/status")
+OS_RELEASE = Path("/etc/os-release")
+
+
+@dataclass
+class InstalledPackage:
+    """A package dpkg reports as installed."""
+
+    name: str
+    version: str
+    arch: str
+    source: str
+    source_version: str
+
+    @property
+    def key(self) -> str:
+        """Unique per installed package (Multi-Arch packages can be installed once per arch)"""
+        return f"{self.name}:{self.arch}"
+
+    def purl(self, distro: str) -> str:
+        """Package URL, as scanners match Debian packages by it"""
+        return (
+            f"pkg:deb/debian/{quote(self.name)}@{quote(self.version)}"
+            f"?arch={self.arch}&distro={distro}"
+        )
+
+
+def parse_dpkg_status(text: str) -> Dict[str, InstalledPackage]:
+    """
+    Installed packages listed in the text of a dpkg status file.
+
+    Returns:
+        Packages by InstalledPackage.key
+    """
+    packages: Dict[str, InstalledPackage] = {}
+    for stanza in text.split("\n\n"):
+        fields: Dict[str, str] = {}
+        for line in stanza.splitlines():
+            if line[:1] in (" ", "\t") or ":" not in line:
+                continue  # continuation lines of multi-line fields
+            name, _, value = line.partition(":")
+            fields[name] = value.strip()
+
+        if not fields.get("Status", "").endswith(" installed"):
+            continue
+        if "Package" not in fields or "Version" not in fields:
+            continue
+
+        # "Source: glibc" or "Source: glibc (2.36-9)" when the versions differ
+        source, _, source_version = fields.get("Source", fields["Package"]).partition(" (")
+        package = InstalledPackage(
+            name=fields["Package"],
+            version=fields["Version"],
+            arch=fields.get("Architecture", "all"),
+            source=source,
+            source_version=source_version.rstrip(")") or fields["Version"],
+        )
+        packages[package.key] = package
+    return packages
+
+
+def read_os_release(path: Path = OS_RELEASE) -> Tuple[str, str]:
+    """Distribution ID and version, e.g. ("debian", "12")"""
+    fields: Dict[str, str] = {}
+    try:
+        for line in path.read_text().splitlines():
+            name, _, value = line.partition("=")
+            fields[name.strip()] = value.strip().strip('"')
+    except OSError:
+        pass
+    return fields.get("ID", "debian"), fields.get("VERSION_ID", "")
+
+
+def build_sbom(packages: Iterable[InstalledPackage], os_release: Tuple[str, str]) -> Dict[str, Any]:
+    """
+    CycloneDX SBOM of packages, installed on the given OS.
+
+    The operating-system component and the source package properties are
+    what lets scanners match the packages against the distribution's own
+    advisories rather than upstream version ranges.
+    """
+    os_id, os_version = os_release
+    distro = f"{os_id}-{os_version}"
+    components: List[Dict[str, Any]] = [
+        {"bom-ref": "os", "type": "operating-system", "name": os_id, "version": os_version}
+    ]
+    refs = []
+    for package in packages:
+        purl = package.purl(distro)
+        refs.append(purl)
+        components.append(
+            {
+                "bom-ref": purl,
+                "type": "library",
+                "name": package.name,
+                "version": package.version,
+                "purl": purl,
+                "properties": [
+                    {"name": "aquasecurity:trivy:PkgType", "value": os_id},
+                    {"name": "aquasecurity:trivy:SrcName", "value": package.source},
+                    {"name": "aquasecurity:trivy:SrcVersion", "value": package.source_version},
+                ],
+            }
+        )
+
+    return {
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.5",
+        "serialNumber": f"urn:uuid:{uuid.uuid4()}",
+        "version": 1,
+        "metadata": {
+            "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
+            "component": {"bom-ref": "host", "type": "operating-system", "name": "/"},
+        },
+        "components": components,
+        "dependencies": [
+            {"ref": "host", "dependsOn": ["os"]},
+            {"ref": "os", "dependsOn": refs},
+        ],
+    }
+
+
+@dataclass
+class ScanDelta:
+    """What changed between two scans of the same target."""
+
+    target: str
+    mode: str  # "reused", "incremental" or "full"
+    new: List[Vulnerability] = field(default_factory=list)
+    resolved: List[Vulnerability] = field(default_factory=list)
+    changed_packages: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to dictionary"""
+        return {
+            "target": self.target,
+            "mode": self.mode,
+            "changed_packages": self.changed_packages,
+            "new": [v.to_dict() for v in self.new],
+            "resolved": [v.to_dict() for v in self.resolved],
+        }
+
+
+def diff_vulnerabilities(
+    previous: List[Vulnerability], current: List[Vulnerability]
+) -> Tuple[List[Vulnerability], List[Vulnerability]]:
+    """
+    Findings only in current (new) and only in previous (resolved).
+
+    Findings are the same if they are the same CVE in the same package.
+    """
+
+    def _key(vuln: Vulnerability) -> Tuple[str, str]:
+        return vuln.cve_id, vuln.package_name
+
+    before = {_key(v) for v in previous}
+    after = {_key(v) for v in current}
+    return (
+        [v for v in current if _key(v) not in before],
+        [v for v in previous if _key(v) not in after],
+    )
+
+
+class IncrementalSystemScanner:
+    """
+    System scans that only rescan the packages changed since the last one.
+
+    State (the last result, the package list and the dpkg/DB versions it
+    reflects) is kept as JSON in cache_dir. Without a known DB version every
+    scan is a full one and nothing is stored.
+    """
+
+    DEFAULT_CACHE_DIR = Path("/var/cache/debian-vps-configurator/system-scans")
+    STATE_FILE = "system-scan.json"
+
+    def __init__(
+        self,
+        scanner: VulnerabilityScanner,
+        cache_dir: Optional[Path] = None,
+        dpkg_status: Path = DPKG_STATUS,
+        max_changed_packages: int = 500,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize IncrementalSystemScanner.
+
+        Args:
+            scanner: Scanner used for full and incremental scans
+            cache_dir: Where the last result is kept
+            dpkg_status: dpkg status file the package list is read from
+            max_changed_packages: Above this many changed packages, scan in full
+            logger: Optional logger instance
+        """
+        self.scanner = scanner
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+        self.dpkg_status = Path(dpkg_status)
+        self.max_changed_packages = max_changed_packages
+        self.logger = logger or logging.getLogger(__name__)
+
+    @classmethod
+    def default_dir(cls) -> Path:
+        """System cache for root, the user's cache directory otherwise."""
+        if os.geteuid() == 0:
+            return cls.DEFAULT_CACHE_DIR
+        return Path.home() / ".cache" / "debian-vps-configurator" / "system-scans"
+
+    @property
+    def state_path(self) -> Path:
+        return self.cache_dir / self.STATE_FILE
+
+    def scan(self) -> Tuple[ScanResult, ScanDelta]:
+        """
+        Scan the system, reusing as much of the last scan as is still valid.
+
+        Returns:
+            (result, changes since the previous scan)
+        """
+        status = self.dpkg_status.read_bytes()
+        dpkg_digest = hashlib.sha256(status).hexdigest()
+        packages = parse_dpkg_status(status.decode("utf-8", errors="replace"))
+
+        db_ready = self.scanner.update_db()
+        db_version = self.scanner.db_version()
+        state = self._load_state()
+        previous = self._result_from_state(state) if state else None
+
+        result: Optional[ScanResult] = None
+        mode = "full"
+        changed: List[str] = []
+
+        if (
+            state is not None
+            and previous is not None
+            and db_version
+            and state["db_version"] == db_version
+        ):
+            if state["dpkg_digest"] == dpkg_digest:
+                self.logger.info("No package or vulnerability DB changes since the last scan")
+                result, mode = previous, "reused"
+            else:
+                changed = self._changed_names(state["packages"], packages)
+                result = self._rescan_changed(previous, changed, packages, db_ready)
+                if result is not None:
+                    mode = "incremental"
+        elif previous is not None:
+            self.logger.info("Vulnerability DB changed since the last scan, rescanning fully")
+
+        if result is None:
+            result = self.scanner.scan_system()
+
+        new, resolved = diff_vulnerabilities(
+            previous.vulnerabilities if previous else [], result.vulnerabilities
+        )
+        delta = ScanDelta(
+            target=result.target,
+            mode=mode,
+            new=new,
+            resolved=resolved,
+            changed_packages=changed if mode == "incremental" else [],
+        )
+        if previous is not None and (new or resolved):
+            self.logger.info(
+                f"{len(new)} new and {len(resolved)} resolved vulnerabilities since the last scan"
+            )
+
+        if db_version and mode != "reused":
+            self._save_state(dpkg_digest, db_version, packages, result)
+        return result, delta
+
+    @staticmethod
+    def _changed_names(
+        before: Dict[str, Dict[str, str]], after: Dict[str, InstalledPackage]
+    ) -> List[str]:
+        """Names of packages installed, removed or upgraded between two package lists"""
+        names: Set[str] = set()
+        for key in before.keys() | after.keys():
+            old, new = before.get(key), after.get(key)
+            if old is None or new is None or old["version"] != new.version:
+                names.add(key.split(":")[0])
+        return sorted(names)
+
+    def _rescan_changed(
+        self,
+        previous: ScanResult,
+        changed: List[str],
+        packages: Dict[str, InstalledPackage],
+        db_ready: bool,
+    ) -> Optional[ScanResult]:
+        """The previous result with the changed packages' findings replaced; None to scan fully"""
+        if previous.summary is not None:
+            # Findings below the detail threshold were only counted, not kept per package
+            return None
+        if len(changed) > self.max_changed_packages:
+            self.logger.info(f"{len(changed)} packages changed, rescanning fully")
+            return None
+
+        names = set(changed)
+        scan_start = time.time()
+        kept = [v for v in previous.vulnerabilities if v.package_name not in names]
+        found: List[Vulnerability] = []
+
+        installed = [p for p in packages.values() if p.name in names]
+        if installed:
+            sbom = build_sbom(installed, read_os_release())
+            fd, sbom_path = tempfile.mkstemp(prefix="system-delta-", suffix=".cdx.json")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(sbom, f)
+                found = self.scanner.scan_sbom(sbom_path, skip_db_update=db_ready).vulnerabilities
+            except NotImplementedError:
+                return None
+            except Exception as e:
+                self.logger.warning(f"Incremental scan failed, rescanning fully: {e}")
+                return None
+            finally:
+                os.unlink(sbom_path)
+
+        self.logger.info(
+            f"Rescanned {len(changed)} changed package(s) in {time.time() - scan_start:.2f}s"
+        )
+        return ScanResult(
+            scan_id=str(uuid.uuid4()),
+            scan_date=datetime.now(),
+            scanner_name=previous.scanner_name,
+            scanner_version=self.scanner.get_version(),
+            target=previous.target,
+            vulnerabilities=kept + found,
+            scan_duration_seconds=time.time() - scan_start,
+        )
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return None
+        # Results from another scanner, or with other details kept, are not comparable
+        threshold = getattr(self.scanner, "detail_threshold", None)
+        if state.get("scanner") != getattr(self.scanner, "SCANNER_NAME", None) or state.get(
+            "details"
+        ) != (threshold.value if threshold is not None else "all"):
+            return None
+        return state
+
+    def _result_from_state(self, state: Dict[str, Any]) -> Optional[ScanResult]:
+        try:
+            data = state["result"]
+            return ScanResult(
+                scan_id=data["scan_id"],
+                scan_date=datetime.fromisoformat(data["scan_date"]),
+                scanner_name=data["scanner_name"],
+                scanner_version=data["scanner_version"],
+                target=data["target"],
+                vulnerabilities=[Vulnerability.from_dict(v) for v in data["vulnerabilities"]],
+                scan_duration_seconds=0.0,
+                summary=data.get("summary"),
+            )
+        except (KeyError, ValueError, TypeError):
+            return None
+
+    def _save_state(
+        self,
+        dpkg_digest: str,
+        db_version: str,
+        packages: Dict[str, InstalledPackage],
+        result: ScanResult,
+    ) -> None:
+        threshold = getattr(self.scanner, "detail_threshold", None)
+        state = {
+            "scanner": getattr(self.scanner, "SCANNER_NAME", None),
+            "details": threshold.value if threshold is not None else "all",
+            "dpkg_digest": dpkg_digest,
+            "db_version": db_version,
+            "packages": {key: {"version": p.version} for key, p in packages.items()},
+            "result": {
+                "scan_id": result.scan_id,
+                "scan_date": result.scan_date.isoformat(),
+                "scanner_name": result.scanner_name,
+                "scanner_version": result.scanner_version,
+                "target": result.target,
+                "vulnerabilities": [v.to_dict() for v in result.vulnerabilities],
+                "summary": result.summary,
+            },
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{self.STATE_FILE}.")
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_path)
+        except OSError as e:
+            self.logger.debug(f"Could not store system scan state: {e}")
@@ -0,0 +1,244 @@
+"""
+Incremental extraction of array items from large JSON documents.
+
+Vulnerability scanners print one JSON document per scan, and a ``trivy
+rootfs /`` of a large host produces hundreds of megabytes of it. Instead of
+reading all of it into one string and decoding it whole, iter_json_items()
+reads the document in chunks, follows its structure with a small tokenizer
+and decodes only the items of the arrays at a given path, one at a time.
+Memory stays bounded by the chunk size plus the largest single item.
+
+Usage:
+    for vuln in iter_json_items(stream, ("Results", "*", "Vulnerabilities")):
+        ...
+
+    for match in stream_command_json(["grype", "dir:/", "-o", "json"], ("matches",)):
+        ...
+"""
+
+import json
+import re
+import subprocess
+import tempfile
+import threading
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CHUNK_SIZE = 1 << 16
+
+# A string, a structural character, or a scalar followed by a delimiter (so a
+# number cut off at the end of a chunk is not mistaken for a complete one)
+_TOKEN = re.compile(
+    r'\s*(?:("(?:[^"\\]|\\.)*")|([{}\[\]:,])|(-?[0-9][0-9.eE+-]*|true|false|null)(?=[\s,\]}]|\Z))'
+)
+_SPACE = re.compile(r"\s*")
+_DELIMITER = re.compile(r"[\s,\]}]")
+_DECODER = json.JSONDecoder()
+
+
+def _skip_space(text: str, pos: int) -> int:
+    """Position of the first non-whitespace character at or after pos."""
+    match = _SPACE.match(text, pos)
+    assert match is not None  # \s* matches everywhere
+    return match.end()
+
+
+class _Reader:
+    """A chunked view of a text stream, with a read position."""
+
+    def __init__(self, stream: IO[str], chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self) -> bool:
+        """Read the next chunk, dropping what has been consumed."""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def token(self) -> Optional[Tuple[str, str]]:
+        """Next token as (kind, text), kind being string/char/scalar; None at the end."""
+        while True:
+            match = _TOKEN.match(self.buf, self.pos)
+            incomplete = match is None or (
+                match.group(3) is not None and match.end() == len(self.buf) and not self.eof
+            )
+            if incomplete and self.more():
+                continue
+            if match is None:
+                if _skip_space(self.buf, self.pos) == len(self.buf):
+                    return None
+                raise ValueError(f"Invalid JSON near {self.buf[self.pos : self.pos + 40]!r}")
+
+            self.pos = match.end()
+            if match.group(1) is not None:
+                return "string", match.group(1)
+            if match.group(2) is not None:
+                return "char", match.group(2)
+            return "scalar", match.group(3)
+
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it."""
+        while True:
+            self.pos = _skip_space(self.buf, self.pos)
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                raise ValueError("Truncated JSON document")
+
+    def value(self) -> Any:
+        """Decode one complete value at the read position."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+                # Like _TOKEN, a scalar needs a delimiter after it: "-2500." at
+                # the end of a chunk decodes as -2500 but may continue with "0"
+                complete = end < len(self.buf) and (
+                    isinstance(value, (dict, list, str)) or _DELIMITER.match(self.buf, end)
+                )
+                if complete or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # The value may continue in the next chunk
+            if not self.more():
+                value, self.pos = _DECODER.raw_decode(self.buf, self.pos)
+                return value
+
+    def array_items(self) -> Iterator[Any]:
+        """Decode the items of an array whose "[" has just been consumed."""
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+
+
+def iter_json_items(
+    stream: IO[str], path: Sequence[str], chunk_size: int = CHUNK_SIZE
+) -> Iterator[Any]:
+    """
+    Yield the decoded items of every array found at path, in document order.
+
+    Args:
+        stream: Text stream holding one JSON document
+        path: Object keys leading to the arrays, "*" standing for any array
+            index, e.g. ("Results", "*", "Vulnerabilities")
+        chunk_size: Characters read at a time
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    target = tuple(path)
+    reader = _Reader(stream, chunk_size)
+    # Open containers as [kind, key]: the member being read for an object, "*" for an array
+    stack: List[List[Optional[str]]] = []
+    expect_key = False
+
+    while True:
+        token = reader.token()
+        if token is None:
+            break
+        kind, text = token
+
+        if kind == "string":
+            if expect_key:
+                stack[-1][1] = json.loads(text)
+                expect_key = False
+        elif kind == "scalar":
+            continue
+        elif text == "{":
+            stack.append(["{", None])
+            expect_key = True
+        elif text == "[":
+            if tuple(frame[1] for frame in stack) == target:
+                yield from reader.array_items()
+            else:
+                stack.append(["[", "*"])
+        elif text in "}]":
+            if not stack:
+                raise ValueError("Unbalanced JSON document")
+            stack.pop()
+            expect_key = False
+        elif text == ",":
+            expect_key = bool(stack) and stack[-1][0] == "{"
+
+    if stack:
+        raise ValueError("Truncated JSON document")
+
+
+def stream_command_json(
+    cmd: Sequence[str],
+    path: Sequence[str],
+    timeout: float = 600,
+    env: Optional[Dict[str, str]] = None,
+) -> Iterator[Any]:
+    """
+    Run a command and yield the items at path of the JSON it prints, as it prints them.
+
+    The output is never held in memory as a whole; stderr goes to a temporary
+    file so a chatty scanner cannot block on a full pipe.
+
+    Args:
+        cmd: Command and arguments
+        path: See iter_json_items()
+        timeout: Seconds before the command is killed
+        env: Environment for the command
+
+    Raises:
+        subprocess.TimeoutExpired: If the command ran longer than timeout
+        subprocess.CalledProcessError: If it exited non-zero (stderr attached)
+        ValueError: If it succeeded but its output is not valid JSON
+    """
+    with tempfile.TemporaryFile(mode="w+") as errors:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errors, text=True, env=env)
+        stdout = proc.stdout
+        assert stdout is not None  # stdout=PIPE
+        timed_out = threading.Event()
+
+        def _kill() -> None:
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, _kill)
+        timer.daemon = True
+        timer.start()
+        try:
+            try:
+                yield from iter_json_items(stdout, path)
+            except ValueError:
+                # Output cut short by a failure: report the failure, not the parse error
+                if proc.wait() == 0 and not timed_out.is_set():
+                    raise
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            stdout.close()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(list(cmd), timeout)
+        if returncode != 0:
+            errors.seek(0)
+            raise subprocess.CalledProcessError(
+                returncode, list(cmd), stderr=errors.read(64 * 1024)
+            )
@@ -10,6 +10,7 @@ Features:
 - Automatic key rotation with grace period
 - Key inventory and monitoring
 - Stale key detection
+- Deadline-driven rotation/expiry via ExpiryScheduler
 - Audit logging integration
 """
 
@@ -19,11 +20,15 @@ import os
 import pwd
 import re
 import subprocess
+from contextlib import ExitStack
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from configurator.core.expiry_scheduler import ExpiryEntry, ExpiryScheduler
+from configurator.utils.file_lock import file_lock
 
 
 class KeyType(Enum):
@@ -245,19 +250,46 @@ class SSHKeyManager:
     DEFAULT_ROTATION_DAYS = 90
     GRACE_PERIOD_DAYS = 7
     STALE_THRESHOLD_DAYS = 180
+    ROTATION_REMINDER_DAYS = 14
+
+    ROTATE_ACTION = "ssh_key.rotate"
+    EXPIRE_ACTION = "ssh_key.expire"
+    GRACE_END_ACTION = "ssh_key.grace_end"
+    STALE_ACTION = "ssh_key.stale"
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        scheduler: Optional[ExpiryScheduler] = None,
+        auto_rotate: bool = False,
+    ):
         """
         Initialize SSHKeyManager.
 
         Args:
             logger: Optional logger instance
+            scheduler: Shared expiry scheduler (default: persisted next to the registry)
+            auto_rotate: Rotate keys automatically when their rotation deadline is due
         """
         self.logger = logger or logging.getLogger(__name__)
         self._registry: Dict[str, Dict[str, Any]] = {}
+        self.auto_rotate = auto_rotate
+        self._notify_callbacks: List[Callable[[str, SSHKey], None]] = []
         self._ensure_registry_dir()
         self._load_key_registry()
 
+        self.scheduler = scheduler or ExpiryScheduler(
+            state_file=self.KEY_REGISTRY_FILE.with_name("ssh-keys-schedule.json"),
+            logger=self.logger,
+        )
+        self.scheduler.register_handler(self.ROTATE_ACTION, self._on_rotation_due)
+        self.scheduler.register_handler(self.EXPIRE_ACTION, self._on_key_expired)
+        self.scheduler.register_handler(self.GRACE_END_ACTION, self._on_grace_period_end)
+        self.scheduler.register_handler(self.STALE_ACTION, self._on_key_stale)
+
+        if not self.scheduler.restored:
+            self._schedule_all_keys()
+
     def _ensure_registry_dir(self) -> None:
         """Ensure key registry directory exists."""
         try:
@@ -283,6 +315,11 @@ class SSHKeyManager:
         else:
             self._registry = {}
 
+    def _refresh_registry(self) -> None:
+        """Re-read the registry if it is on disk (keeps in-memory-only registries)."""
+        if self.KEY_REGISTRY_FILE.exists():
+            self._load_key_registry()
+
     def _save_key_registry(self) -> bool:
         """
         Save key registry to disk.
@@ -291,9 +328,11 @@ class SSHKeyManager:
             True if save was successful
         """
         try:
-            with open(self.KEY_REGISTRY_FILE, "w") as f:
+            tmp_file = self.KEY_REGISTRY_FILE.with_suffix(".json.tmp")
+            with open(tmp_file, "w") as f:
                 json.dump(self._registry, f, indent=2)
-            self.KEY_REGISTRY_FILE.chmod(0o600)  # Restrict permissions
+            tmp_file.chmod(0o600)  # Restrict permissions
+            tmp_file.replace(self.KEY_REGISTRY_FILE)
             return True
         except (PermissionError, OSError) as e:
             self.logger.error(f"Failed to save key registry: {e}")
@@ -525,14 +564,169 @@ class SSHKeyManager:
         """
         key_data = key.to_dict()
 
-        if key.user not in self._registry:
-            self._registry[key.user] = {}
+        # Update a fresh copy so keys registered by other processes survive
+        with ExitStack() as stack:
+            try:
+                stack.enter_context(file_lock(str(self.KEY_REGISTRY_FILE)))
+            except OSError as e:
+                self.logger.debug(f"Cannot lock key registry: {e}")
+
+            self._refresh_registry()
+            if key.user not in self._registry:
+                self._registry[key.user] = {}
+
+            self._registry[key.user][key.key_id] = key_data
+            self._save_key_registry()
 
-        self._registry[key.user][key.key_id] = key_data
-        self._save_key_registry()
+        self._schedule_key_events(key)
 
         self.logger.debug(f"Registered key {key.key_id} for user {key.user}")
 
+    # ------------------------------------------------------------------
+    # Expiry scheduling
+    # ------------------------------------------------------------------
+
+    def add_notify_callback(self, callback: Callable[[str, SSHKey], None]) -> None:
+        """
+        Add a callback for scheduled key notifications.
+
+        Args:
+            callback: Function called with (event, key); event is one of
+                "rotation_due" or "stale"
+        """
+        self._notify_callbacks.append(callback)
+
+    def _notify(self, event: str, key: SSHKey) -> None:
+        for callback in self._notify_callbacks:
+            try:
+                callback(event, key)
+            except Exception as e:
+                self.logger.error(f"Key notification callback error: {e}")
+
+    def _schedule_key_events(self, key: SSHKey, persist: bool = True) -> None:
+        """Push rotation, expiry, grace-period and staleness deadlines for a key."""
+        prefix = f"ssh-key:{key.user}:{key.key_id}:"
+        self.scheduler.cancel_prefix(prefix, persist=False)
+
+        payload = {"user": key.user, "key_id": key.key_id}
+
+        if key.status == KeyStatus.ACTIVE:
+            if key.expires_at:
+                self.scheduler.schedule(
+                    prefix + "rotate",
+                    key.expires_at - timedelta(days=self.ROTATION_REMINDER_DAYS),
+                    self.ROTATE_ACTION,
+                    payload,
+                    persist=False,
+                )
+                self.scheduler.schedule(
+                    prefix + "expire", key.expires_at, self.EXPIRE_ACTION, payload, persist=False
+                )
+
+            last_seen = key.last_used or key.created_at
+            self.scheduler.schedule(
+                prefix + "stale",
+                last_seen + timedelta(days=self.STALE_THRESHOLD_DAYS + 1),
+                self.STALE_ACTION,
+                payload,
+                persist=False,
+            )
+
+        elif key.status == KeyStatus.ROTATING:
+            grace_until = key.metadata.get("grace_period_until")
+            if grace_until:
+                self.scheduler.schedule(
+                    prefix + "grace_end",
+                    datetime.fromisoformat(grace_until),
+                    self.GRACE_END_ACTION,
+                    payload,
+                    persist=False,
+                )
+
+        if persist:
+            self.scheduler.save()
+
+    def _schedule_all_keys(self) -> None:
+        """Rebuild the schedule from the registry (first run or lost schedule file)."""
+        keys = self.list_keys()
+        for key in keys:
+            self._schedule_key_events(key, persist=False)
+        if keys:
+            self.scheduler.save()
+
+    def _scheduled_key(self, entry: ExpiryEntry, *statuses: KeyStatus) -> Optional[SSHKey]:
+        # The watcher is long-running; judge keys by the registry on disk
+        self._refresh_registry()
+        key = self.get_key(entry.payload.get("user", ""), entry.payload.get("key_id", ""))
+        if not key or key.status not in statuses:
+            return None
+        return key
+
+    def _on_rotation_due(self, entry: ExpiryEntry) -> None:
+        """Scheduler handler: rotate (or announce rotation of) a key nearing expiry."""
+        key = self._scheduled_key(entry, KeyStatus.ACTIVE)
+        if not key or not key.needs_rotation(self.ROTATION_REMINDER_DAYS):
+            return
+
+        if self.auto_rotate:
+            self.rotate_key(key.user, key.key_id)
+        else:
+            self.logger.warning(
+                f"SSH key {key.key_id} for {key.user} expires in {key.days_until_expiry()} days"
+            )
+            self._notify("rotation_due", key)
+
+    def _on_key_expired(self, entry: ExpiryEntry) -> None:
+        """Scheduler handler: remove an expired key from authorized_keys."""
+        key = self._scheduled_key(entry, KeyStatus.ACTIVE)
+        if not key or not key.is_expired():
+            return
+
+        self.logger.info(f"SSH key {key.key_id} for {key.user} expired, revoking")
+        # A failure propagates so the scheduler retries the revocation
+        self.revoke_key(key.user, key.key_id)
+
+        key = self.get_key(key.user, key.key_id) or key
+        key.status = KeyStatus.EXPIRED
+        self._register_key(key)
+
+    def _on_grace_period_end(self, entry: ExpiryEntry) -> None:
+        """Scheduler handler: revoke a rotated key once its grace period ends."""
+        key = self._scheduled_key(entry, KeyStatus.ROTATING)
+        if not key:
+            return
+
+        self.logger.info(f"Grace period expired for {key.key_id}, revoking")
+        self.revoke_key(key.user, key.key_id)
+
+    def _on_key_stale(self, entry: ExpiryEntry) -> None:
+        """Scheduler handler: report a key that has not been used for too long."""
+        key = self._scheduled_key(entry, KeyStatus.ACTIVE)
+        if not key:
+            return
+
+        if key.is_stale(self.STALE_THRESHOLD_DAYS):
+            self.logger.warning(f"SSH key {key.key_id} for {key.user} is stale")
+            self._notify("stale", key)
+        else:
+            # Used since it was scheduled; push the deadline out
+            self._schedule_key_events(key)
+
+    def process_due(self, now: Optional[datetime] = None) -> List[ExpiryEntry]:
+        """
+        Run key actions whose deadline has passed.
+
+        ``vps-configurator ssh watch`` runs this continuously; failed
+        revocations are retried by the scheduler with backoff.
+
+        Args:
+            now: Reference time (defaults to datetime.now())
+
+        Returns:
+            Entries that were dispatched
+        """
+        return self.scheduler.dispatch_due(now)
+
     def deploy_key(self, key: SSHKey) -> bool:
         """
         Deploy public key to user's authorized_keys.
@@ -10,7 +10,6 @@ Mitigates supply chain attack vectors by:
 Addresses security audit findings around Oh My Zsh and theme installations.
 """
 
-import hashlib
 import json
 import logging
 import re
@@ -20,10 +19,13 @@ import urllib.parse
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+from configurator.utils.download import DownloadEngine, DownloadTask, get_download_engine
+from configurator.utils.hashing import get_hash_service
+
 
 @dataclass
 class TrustedSource:
@@ -282,19 +284,19 @@ class SupplyChainValidator:
         Returns:
             str: Hex digest of SHA256 hash
         """
-        sha256 = hashlib.sha256()
-        with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        return get_hash_service().hash_file(filepath)
 
-    def verify_checksum(self, filepath: Path, expected_checksum: str) -> bool:
+    def verify_checksum(
+        self, filepath: Path, expected_checksum: str, actual_checksum: Optional[str] = None
+    ) -> bool:
         """
         Verify file checksum.
 
         Args:
             filepath: Path to file
             expected_checksum: Expected SHA256 hex digest
+            actual_checksum: SHA256 already computed for the file (e.g. while
+                downloading); skips rehashing it
 
         Returns:
             bool: True if checksum matches
@@ -307,7 +309,7 @@ class SupplyChainValidator:
             return True
 
         try:
-            actual = self.compute_checksum(filepath)
+            actual = actual_checksum or self.compute_checksum(filepath)
             matches = actual.lower() == expected_checksum.lower()
 
             if not matches:
@@ -529,6 +531,7 @@ class SupplyChainValidator:
         filepath: Path,
         expected_checksum: Optional[str] = None,
         signature_path: Optional[Path] = None,
+        actual_checksum: Optional[str] = None,
     ) -> bool:
         """
         Validate downloaded file.
@@ -538,6 +541,7 @@ class SupplyChainValidator:
             filepath: Downloaded file path
             expected_checksum: Expected SHA256 (optional, will lookup in DB)
             signature_path: Path to GPG signature (optional)
+            actual_checksum: SHA256 computed while downloading (skips a rehash)
 
         Returns:
             bool: True if validation passed
@@ -550,17 +554,18 @@ class SupplyChainValidator:
             return False
 
         # Compute checksum
-        actual_checksum = self.compute_checksum(filepath)
+        if actual_checksum is None:
+            actual_checksum = self.compute_checksum(filepath)
 
         # Verify checksum
         if expected_checksum:
-            if not self.verify_checksum(filepath, expected_checksum):
+            if not self.verify_checksum(filepath, expected_checksum, actual_checksum):
                 return False
         else:
             # Try lookup
             stored_checksum = self.lookup_checksum(url)
             if stored_checksum:
-                if not self.verify_checksum(filepath, stored_checksum):
+                if not self.verify_checksum(filepath, stored_checksum, actual_checksum):
                     return False
             else:
                 # First download, store checksum
@@ -625,16 +630,27 @@ class SecureDownloader:
     Wraps download operations with automatic validation.
     """
 
-    def __init__(self, validator: SupplyChainValidator, logger: logging.Logger):
+    def __init__(
+        self,
+        validator: SupplyChainValidator,
+        logger: logging.Logger,
+        engine: Optional[DownloadEngine] = None,
+    ):
         """
         Initialize secure downloader.
 
         Args:
             validator: Supply chain validator
             logger: Logger instance
+            engine: Download engine (default: the shared pooled engine)
         """
         self.validator = validator
         self.logger = logger
+        self.engine = engine or get_download_engine()
+
+    @staticmethod
+    def _signature_path(destination: Path) -> Path:
+        return destination.with_suffix(destination.suffix + ".asc")
 
     def download_file(
         self,
@@ -655,60 +671,69 @@ class SecureDownloader:
         Returns:
             bool: True if download and validation successful
         """
-        # Pre-validate URL
-        if not self.validator.validate_url(url):
-            self.logger.error(f"Secure download: URL validation failed: {url}")
-            return False
+        return self.download_files([(url, destination, expected_checksum)], verify_signature)[0]
 
-        # Download using curl/wget
-        try:
-            subprocess.run(
-                ["curl", "-L", "-o", str(destination), url],
-                check=True,
-                capture_output=True,
-                timeout=300,
-            )
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"Secure download: Download failed: {e}")
-            return False
-        except FileNotFoundError:
-            # Fallback to wget
-            try:
-                subprocess.run(
-                    ["wget", "-O", str(destination), url],
-                    check=True,
-                    capture_output=True,
-                    timeout=300,
-                )
-            except Exception as e:
-                self.logger.error(f"Secure download: Download failed (wget): {e}")
-                return False
+    def download_files(
+        self,
+        downloads: List[Tuple[str, Path, Optional[str]]],
+        verify_signature: bool = False,
+    ) -> List[bool]:
+        """
+        Download several files concurrently, then validate each one.
 
-        # Download signature if requested
-        signature_path = None
-        if verify_signature:
-            signature_url = f"{url}.asc"
-            signature_path = destination.with_suffix(destination.suffix + ".asc")
-            try:
-                subprocess.run(
-                    ["curl", "-L", "-o", str(signature_path), signature_url],
-                    check=True,
-                    capture_output=True,
-                    timeout=60,
-                )
-            except Exception:
-                self.logger.warning(f"Secure download: Signature not available: {signature_url}")
-                signature_path = None
+        Signatures (``<url>.asc``) are fetched in the same batch as the files.
 
-        # Validate
-        if self.validator.validate_download(url, destination, expected_checksum, signature_path):
-            self.logger.info(f"Secure download: Successfully downloaded and validated {url}")
-            return True
-        else:
-            # Validation failed, remove downloaded file
-            self.logger.error(f"Secure download: Validation failed, removing {destination}")
-            destination.unlink(missing_ok=True)
-            return False
+        Args:
+            downloads: (url, destination, expected_checksum) tuples
+            verify_signature: Whether to verify GPG signatures
+
+        Returns:
+            List of per-file success flags, in input order
+        """
+        outcomes = [False] * len(downloads)
+        tasks: List[DownloadTask] = []
+        accepted: List[int] = []
+
+        # Pre-validate URLs
+        for index, (url, destination, _) in enumerate(downloads):
+            if not self.validator.validate_url(url):
+                self.logger.error(f"Secure download: URL validation failed: {url}")
+                continue
+            accepted.append(index)
+            tasks.append(DownloadTask(url, destination))
+            if verify_signature:
+                tasks.append(DownloadTask(f"{url}.asc", self._signature_path(destination)))
+
+        results = iter(self.engine.download_many(tasks))
+
+        for index in accepted:
+            url, destination, expected_checksum = downloads[index]
+            result = next(results)
+
+            signature_path = None
+            if verify_signature:
+                signature = next(results)
+                if signature.success:
+                    signature_path = signature.destination
+                else:
+                    self.logger.warning(f"Secure download: Signature not available: {url}.asc")
+
+            if not result.success:
+                self.logger.error(f"Secure download: Download failed: {url}: {result.error}")
+                continue
+
+            # Validate, reusing the digest computed while downloading
+            if self.validator.validate_download(
+                url, destination, expected_checksum, signature_path, result.sha256
+            ):
+                self.logger.info(f"Secure download: Successfully downloaded and validated {url}")
+                outcomes[index] = True
+            else:
+                # Validation failed, remove downloaded file
+                self.logger.error(f"Secure download: Validation failed, removing {destination}")
+                destination.unlink(missing_ok=True)
+
+        return outcomes
 
     def download_script(
         self, url: str, destination: Path, expected_checksum: Optional[str] = None
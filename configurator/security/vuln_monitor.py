@@ -10,6 +10,7 @@ try:
 except ImportError:
     HAS_SCHEDULE = False
 
+from configurator.security.incremental_scan import IncrementalSystemScanner
 from configurator.security.vuln_report import VulnReportGenerator
 from configurator.security.vulnerability_scanner import VulnerabilityManager
 
@@ -24,10 +25,12 @@ class VulnerabilityMonitor:
         interval_hours: int = 24,  # Daily default
         auto_remediate: bool = False,
         logger: Optional[logging.Logger] = None,
+        incremental: bool = True,  # Only rescan packages changed since the last scan
     ):
         self.logger = logger or logging.getLogger(__name__)
         self.interval_hours = interval_hours
         self.auto_remediate = auto_remediate
+        self.incremental = incremental
         self.is_running = False
         self._thread: Optional[threading.Thread] = None
 
@@ -73,10 +76,18 @@ class VulnerabilityMonitor:
         self.logger.info("🕒 Starting scheduled vulnerability scan...")
 
         results = []
+        changes = []
 
         # 1. Scan System
         try:
-            sys_result = self.scanner_manager.scan_system()
+            if self.incremental:
+                scanner = IncrementalSystemScanner(
+                    self.scanner_manager.get_scanner(), logger=self.logger
+                )
+                sys_result, delta = scanner.scan()
+                changes.append(delta)
+            else:
+                sys_result = self.scanner_manager.scan_system()
             results.append(sys_result)
         except Exception as e:
             self.logger.error(f"Scheduled system scan failed: {e}")
@@ -92,7 +103,7 @@ class VulnerabilityMonitor:
         if results:
             try:
                 # Generate JSON & HTML
-                self.reporter.generate_json(results)
+                self.reporter.generate_json(results, changes=changes)
                 html_path = self.reporter.generate_html(results)
                 self.logger.info(f"Scheduled scan reports: {html_path}")
             except Exception as e:
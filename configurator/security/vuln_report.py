@@ -2,8 +2,9 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from configurator.security.incremental_scan import ScanDelta
 from configurator.security.vulnerability_scanner import (
     ScanResult,
     VulnerabilitySeverity,
@@ -26,9 +27,12 @@ class VulnReportGenerator:
             self.output_dir.mkdir(parents=True, exist_ok=True)
             self.logger.debug(f"Created report directory: {self.output_dir}")
 
-    def generate_json(self, results: List[ScanResult]) -> str:
+    def generate_json(
+        self, results: List[ScanResult], changes: Optional[List[ScanDelta]] = None
+    ) -> str:
         """
         Generate JSON report for one or more scan results.
+        changes: new and resolved vulnerabilities since the previous scans, if known.
         Returns the path to the generated file.
         """
         report_data: Dict[str, Any] = {
@@ -36,6 +40,8 @@ class VulnReportGenerator:
             "total_scans": len(results),
             "scans": [],
         }
+        if changes:
+            report_data["changes"] = [delta.to_dict() for delta in changes]
 
         for result in results:
             scan_data = {
@@ -15,6 +15,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from configurator.security.json_stream import stream_command_json
+
 
 @dataclass
 class SimpleVulnerability:
@@ -259,21 +261,18 @@ apt-get -o Dpkg::Lock::Timeout=300 install -y trivy
                 "/",
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
-
-            if result.returncode != 0:
+            # Parse the JSON report as it streams in, one vulnerability at a time
+            try:
+                for vuln in stream_command_json(
+                    cmd, ("Results", "*", "Vulnerabilities"), timeout=600
+                ):
+                    self._add_trivy_vulnerability(vuln)
+            except subprocess.CalledProcessError as e:
                 # Log only a summary, not the full error details to avoid triggering circuit breaker
-                error_summary = (
-                    result.stderr.split("\n")[0][:100] if result.stderr else "Unknown error"
-                )
+                error_summary = e.stderr.split("\n")[0][:100] if e.stderr else "Unknown error"
                 self.logger.warning(f"Trivy scan failed (non-blocking): {error_summary}")
                 return False
-
-            # Parse JSON output
-            try:
-                data = json.loads(result.stdout)
-                self._parse_trivy_results(data)
-            except json.JSONDecodeError as e:
+            except ValueError as e:
                 self.logger.error(f"Failed to parse Trivy output: {e}")
                 return False
 
@@ -291,36 +290,35 @@ apt-get -o Dpkg::Lock::Timeout=300 install -y trivy
 
         try:
             # Trivy output structure
-            results = data.get("Results", [])
-
-            for result in results:
-                target = result.get("Target", "unknown")
-                vulnerabilities = result.get("Vulnerabilities", [])
-
-                for vuln in vulnerabilities:
-                    vulnerability = SimpleVulnerability(
-                        id=vuln.get("VulnerabilityID", "UNKNOWN"),
-                        title=vuln.get("Title", "No title"),
-                        severity=vuln.get("Severity", "UNKNOWN"),
-                        package=vuln.get("PkgName", "unknown"),
-                        installed_version=vuln.get("InstalledVersion", "unknown"),
-                        fixed_version=vuln.get("FixedVersion"),
-                        description=vuln.get("Description", "")[:200],  # Truncate
-                        references=vuln.get("References", []),
-                    )
-
-                    self.vulnerabilities.append(vulnerability)
-
-                    # Log high/critical vulnerabilities
-                    if vulnerability.severity in ["HIGH", "CRITICAL"]:
-                        self.logger.warning(
-                            f"  {vulnerability.severity}: {vulnerability.id} in "
-                            f"{vulnerability.package} {vulnerability.installed_version}"
-                        )
+            for result in data.get("Results", []):
+                for vuln in result.get("Vulnerabilities", []):
+                    self._add_trivy_vulnerability(vuln)
 
         except Exception as e:
             self.logger.error(f"Error parsing Trivy results: {e}", exc_info=True)
 
+    def _add_trivy_vulnerability(self, vuln: Dict[str, Any]) -> None:
+        """Record one entry of a Trivy result's Vulnerabilities list."""
+        vulnerability = SimpleVulnerability(
+            id=vuln.get("VulnerabilityID", "UNKNOWN"),
+            title=vuln.get("Title", "No title"),
+            severity=vuln.get("Severity", "UNKNOWN"),
+            package=vuln.get("PkgName", "unknown"),
+            installed_version=vuln.get("InstalledVersion", "unknown"),
+            fixed_version=vuln.get("FixedVersion"),
+            description=vuln.get("Description", "")[:200],  # Truncate
+            references=vuln.get("References", []),
+        )
+
+        self.vulnerabilities.append(vulnerability)
+
+        # Log high/critical vulnerabilities
+        if vulnerability.severity in ["HIGH", "CRITICAL"]:
+            self.logger.warning(
+                f"  {vulnerability.severity}: {vulnerability.id} in "
+                f"{vulnerability.package} {vulnerability.installed_version}"
+            )
+
     def _run_lynis_scan(self) -> bool:
         """Run Lynis security audit."""
         self.logger.info("Running Lynis security audit...")
@@ -1,5 +1,6 @@
 import json
 import logging
+import os
 import shutil
 import subprocess
 import time
@@ -8,7 +9,9 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from configurator.security.json_stream import stream_command_json
 
 # --- Data Models ---
 
@@ -23,6 +26,22 @@ class VulnerabilitySeverity(Enum):
     UNKNOWN = "unknown"  # No CVSS score
 
 
+SEVERITY_ORDER = [
+    VulnerabilitySeverity.LOW,
+    VulnerabilitySeverity.MEDIUM,
+    VulnerabilitySeverity.HIGH,
+    VulnerabilitySeverity.CRITICAL,
+]
+
+
+def meets_threshold(severity: VulnerabilitySeverity, threshold: VulnerabilitySeverity) -> bool:
+    """Check if severity is at least threshold (UNKNOWN never is)"""
+    try:
+        return SEVERITY_ORDER.index(severity) >= SEVERITY_ORDER.index(threshold)
+    except ValueError:
+        return False
+
+
 @dataclass
 class Vulnerability:
     """
@@ -57,6 +76,49 @@ class Vulnerability:
             "target_type": self.target_type,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Vulnerability":
+        """Deserialize from dictionary"""
+        published = data.get("published_date")
+        return cls(
+            cve_id=data["cve_id"],
+            package_name=data["package_name"],
+            installed_version=data["installed_version"],
+            fixed_version=data.get("fixed_version"),
+            severity=VulnerabilitySeverity(data["severity"]),
+            cvss_score=data.get("cvss_score"),
+            description=data.get("description", ""),
+            published_date=datetime.fromisoformat(published) if published else None,
+            exploit_available=data.get("exploit_available", False),
+            references=data.get("references", []),
+            target_type=data.get("target_type", "package"),
+        )
+
+
+class SummaryTally:
+    """Running summary statistics, fed one vulnerability at a time"""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.fixable = 0
+        self.by_severity = {severity: 0 for severity in VulnerabilitySeverity}
+        self.by_type: Dict[str, int] = {}
+
+    def add(self, vuln: Vulnerability) -> None:
+        self.total += 1
+        self.by_severity[vuln.severity] += 1
+        if vuln.fixed_version:
+            self.fixable += 1
+        self.by_type[vuln.target_type] = self.by_type.get(vuln.target_type, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "by_severity": {k.value: v for k, v in self.by_severity.items()},
+            "fixable": self.fixable,
+            "by_type": dict(self.by_type),
+        }
+
 
 @dataclass
 class ScanResult:
@@ -69,43 +131,58 @@ class ScanResult:
     target: str  # What was scanned
     vulnerabilities: List[Vulnerability]
     scan_duration_seconds: float
+    # Totals over every finding, when vulnerabilities only holds those at or
+    # above the scanner's detail_threshold
+    summary: Optional[Dict[str, Any]] = None
 
     def get_summary(self) -> Dict[str, Any]:
         """Get summary statistics"""
-        by_severity = {
-            VulnerabilitySeverity.CRITICAL: 0,
-            VulnerabilitySeverity.HIGH: 0,
-            VulnerabilitySeverity.MEDIUM: 0,
-            VulnerabilitySeverity.LOW: 0,
-            VulnerabilitySeverity.UNKNOWN: 0,
-        }
+        if self.summary is not None:
+            return self.summary
 
+        tally = SummaryTally()
         for vuln in self.vulnerabilities:
-            by_severity[vuln.severity] += 1
-
-        # Count vulnerabilities with fixes available
-        fixable = len([v for v in self.vulnerabilities if v.fixed_version])
-
-        # Count by target type
-        by_type: Dict[str, int] = {}
-        for vuln in self.vulnerabilities:
-            by_type[vuln.target_type] = by_type.get(vuln.target_type, 0) + 1
-
-        return {
-            "total": len(self.vulnerabilities),
-            "by_severity": {k.value: v for k, v in by_severity.items()},
-            "fixable": fixable,
-            "by_type": by_type,
-        }
+            tally.add(vuln)
+        return tally.to_dict()
 
 
 class VulnerabilityScanner(ABC):
     """
     Abstract base class for vulnerability scanners.
+
+    Scanner output is parsed as it streams in. With a detail_threshold, only
+    vulnerabilities of that severity or above are kept in full; the others
+    are only counted in the result's summary, which keeps scans of large
+    hosts within a small VPS's memory.
     """
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        detail_threshold: Optional[VulnerabilitySeverity] = None,
+    ):
         self.logger = logger or logging.getLogger(__name__)
+        self.detail_threshold = detail_threshold
+
+    def _collect(
+        self, items: Iterable[Dict[str, Any]], convert: Callable[[Dict[str, Any]], Vulnerability]
+    ) -> Tuple[List[Vulnerability], Optional[Dict[str, Any]]]:
+        """
+        Convert streamed scanner findings, keeping details per detail_threshold.
+
+        Returns:
+            (kept vulnerabilities, summary over all of them if some were dropped)
+        """
+        kept = []
+        tally = SummaryTally()
+        for item in items:
+            vuln = convert(item)
+            tally.add(vuln)
+            if self.detail_threshold is None or meets_threshold(
+                vuln.severity, self.detail_threshold
+            ):
+                kept.append(vuln)
+        return kept, tally.to_dict() if self.detail_threshold is not None else None
 
     @abstractmethod
     def is_available(self) -> bool:
@@ -116,13 +193,25 @@ class VulnerabilityScanner(ABC):
         """Scan system packages for vulnerabilities"""
 
     @abstractmethod
-    def scan_docker_image(self, image: str) -> ScanResult:
-        """Scan Docker image for vulnerabilities"""
+    def scan_docker_image(self, image: str, skip_db_update: bool = False) -> ScanResult:
+        """Scan Docker image for vulnerabilities (skip_db_update: DB already updated)"""
 
     @abstractmethod
     def get_version(self) -> str:
         """Get scanner version"""
 
+    def scan_sbom(self, sbom_path: str, skip_db_update: bool = False) -> ScanResult:
+        """Scan the packages listed in a CycloneDX SBOM (NotImplementedError if unsupported)"""
+        raise NotImplementedError(f"{type(self).__name__} cannot scan SBOMs")
+
+    def update_db(self) -> bool:
+        """Update the vulnerability DB ahead of a batch of scans; False if not supported"""
+        return False
+
+    def db_version(self) -> Optional[str]:
+        """Version (build time) of the local vulnerability DB, if known"""
+        return None
+
 
 # --- Trivy Implementation ---
 
@@ -133,9 +222,16 @@ class TrivyScanner(VulnerabilityScanner):
     """
 
     SCANNER_NAME = "Trivy"
+    # Where the findings are in Trivy's JSON report
+    FINDINGS_PATH = ("Results", "*", "Vulnerabilities")
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
-        super().__init__(logger)
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        detail_threshold: Optional[VulnerabilitySeverity] = None,
+    ):
+        super().__init__(logger, detail_threshold)
+        self._version: Optional[str] = None
         # We don't call _check_installation in init to avoid log spam on import or simple check,
         # but let's stick closer to the pattern:
         # self._check_installation()
@@ -146,6 +242,11 @@ class TrivyScanner(VulnerabilityScanner):
 
     def get_version(self) -> str:
         """Get Trivy version"""
+        if self._version is None:
+            self._version = self._read_version()
+        return self._version
+
+    def _read_version(self) -> str:
         try:
             result = subprocess.run(
                 ["trivy", "--version"], capture_output=True, text=True, check=True
@@ -172,7 +273,7 @@ class TrivyScanner(VulnerabilityScanner):
 
         # Run Trivy in filesystem mode
         try:
-            result = subprocess.run(
+            findings = stream_command_json(
                 [
                     "trivy",
                     "rootfs",
@@ -185,23 +286,18 @@ class TrivyScanner(VulnerabilityScanner):
                     "--scanners",
                     "vuln",  # Explicitly only vuln scanning, skip misconfig/secret for now as requested
                 ],
-                capture_output=True,
-                text=True,
-                check=True,
+                self.FINDINGS_PATH,
                 timeout=600,  # 10 minute timeout
             )
 
-            scan_duration = time.time() - scan_start
-
-            # Parse JSON output
-            trivy_data = json.loads(result.stdout)
+            # Convert to our Vulnerability format as the report streams in
+            vulnerabilities, summary = self._collect(findings, self._trivy_vulnerability)
 
-            # Convert to our Vulnerability format
-            vulnerabilities = self._parse_trivy_output(trivy_data)
+            scan_duration = time.time() - scan_start
 
+            total = summary["total"] if summary else len(vulnerabilities)
             self.logger.info(
-                f"Trivy scan complete: {len(vulnerabilities)} vulnerabilities found "
-                f"in {scan_duration:.2f}s"
+                f"Trivy scan complete: {total} vulnerabilities found in {scan_duration:.2f}s"
             )
 
             return ScanResult(
@@ -212,6 +308,7 @@ class TrivyScanner(VulnerabilityScanner):
                 target="system",
                 vulnerabilities=vulnerabilities,
                 scan_duration_seconds=scan_duration,
+                summary=summary,
             )
 
         except subprocess.TimeoutExpired:
@@ -220,11 +317,40 @@ class TrivyScanner(VulnerabilityScanner):
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Trivy scan failed: {e.stderr}")
             raise
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             self.logger.error(f"Failed to parse Trivy output: {e}")
             raise
 
-    def scan_docker_image(self, image: str) -> ScanResult:
+    def update_db(self) -> bool:
+        """Download the vulnerability DB once, for scans run with skip_db_update"""
+        try:
+            subprocess.run(
+                ["trivy", "image", "--download-db-only", "--no-progress"],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=600,
+            )
+            return True
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.warning(f"Trivy DB update failed, each scan will update it: {e}")
+            return False
+
+    def db_version(self) -> Optional[str]:
+        """Build time of the local Trivy DB"""
+        try:
+            result = subprocess.run(
+                ["trivy", "version", "--format", "json"],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=60,
+            )
+            return json.loads(result.stdout)["VulnerabilityDB"]["UpdatedAt"]
+        except (OSError, subprocess.SubprocessError, ValueError, KeyError, TypeError):
+            return None
+
+    def scan_docker_image(self, image: str, skip_db_update: bool = False) -> ScanResult:
         """
         Scan Docker image using Trivy.
         """
@@ -233,34 +359,36 @@ class TrivyScanner(VulnerabilityScanner):
         if not self.is_available():
             raise RuntimeError("Trivy is not installed")
 
+        cmd = [
+            "trivy",
+            "image",
+            image,
+            "--format",
+            "json",
+            "--severity",
+            "UNKNOWN,LOW,MEDIUM,HIGH,CRITICAL",
+            "--no-progress",
+            "--scanners",
+            "vuln",
+        ]
+        if skip_db_update:
+            # Batch scans run in parallel against a DB updated beforehand. The
+            # filesystem layer cache is a single exclusively locked database, so
+            # concurrent scans keep their layer cache in memory instead.
+            cmd += ["--skip-db-update", "--cache-backend", "memory"]
+
         scan_start = time.time()
 
         try:
-            result = subprocess.run(
-                [
-                    "trivy",
-                    "image",
-                    image,
-                    "--format",
-                    "json",
-                    "--severity",
-                    "UNKNOWN,LOW,MEDIUM,HIGH,CRITICAL",
-                    "--no-progress",
-                    "--scanners",
-                    "vuln",
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=600,
+            findings = stream_command_json(cmd, self.FINDINGS_PATH, timeout=600)
+            vulnerabilities, summary = self._collect(
+                findings, lambda item: self._trivy_vulnerability(item, target_type="container")
             )
 
             scan_duration = time.time() - scan_start
 
-            trivy_data = json.loads(result.stdout)
-            vulnerabilities = self._parse_trivy_output(trivy_data, target_type="container")
-
-            self.logger.info(f"Docker image scan complete: {len(vulnerabilities)} vulnerabilities")
+            total = summary["total"] if summary else len(vulnerabilities)
+            self.logger.info(f"Docker image scan complete: {total} vulnerabilities")
 
             return ScanResult(
                 scan_id=str(uuid.uuid4()),
@@ -270,76 +398,120 @@ class TrivyScanner(VulnerabilityScanner):
                 target=f"docker:{image}",
                 vulnerabilities=vulnerabilities,
                 scan_duration_seconds=scan_duration,
+                summary=summary,
             )
 
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Docker image scan failed: {e.stderr}")
             raise
 
+    def scan_sbom(self, sbom_path: str, skip_db_update: bool = False) -> ScanResult:
+        """
+        Scan the packages listed in a CycloneDX SBOM using Trivy.
+        """
+        if not self.is_available():
+            raise RuntimeError("Trivy is not installed")
+
+        cmd = [
+            "trivy",
+            "sbom",
+            sbom_path,
+            "--format",
+            "json",
+            "--severity",
+            "UNKNOWN,LOW,MEDIUM,HIGH,CRITICAL",
+            "--no-progress",
+            "--scanners",
+            "vuln",
+        ]
+        if skip_db_update:
+            cmd.append("--skip-db-update")
+
+        scan_start = time.time()
+
+        try:
+            findings = stream_command_json(cmd, self.FINDINGS_PATH, timeout=600)
+            vulnerabilities, summary = self._collect(findings, self._trivy_vulnerability)
+
+            return ScanResult(
+                scan_id=str(uuid.uuid4()),
+                scan_date=datetime.now(),
+                scanner_name=self.SCANNER_NAME,
+                scanner_version=self.get_version(),
+                target=f"sbom:{sbom_path}",
+                vulnerabilities=vulnerabilities,
+                scan_duration_seconds=time.time() - scan_start,
+                summary=summary,
+            )
+
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"Trivy SBOM scan failed: {e.stderr}")
+            raise
+
     def _parse_trivy_output(
         self, trivy_data: Dict[str, Any], target_type: str = "package"
     ) -> List[Vulnerability]:
         """
         Parse Trivy JSON output into Vulnerability objects.
         """
-        vulnerabilities = []
-
-        results = trivy_data.get("Results", [])
-
-        for result in results:
-            vulns = result.get("Vulnerabilities", [])
-
-            for vuln_data in vulns:
-                # Parse severity
-                severity_str = vuln_data.get("Severity", "UNKNOWN").lower()
-                severity_map = {
-                    "critical": VulnerabilitySeverity.CRITICAL,
-                    "high": VulnerabilitySeverity.HIGH,
-                    "medium": VulnerabilitySeverity.MEDIUM,
-                    "low": VulnerabilitySeverity.LOW,
-                    "unknown": VulnerabilitySeverity.UNKNOWN,
-                }
-                severity = severity_map.get(severity_str, VulnerabilitySeverity.UNKNOWN)
-
-                # Parse CVSS score
-                cvss_score = None
-                cvss_data = vuln_data.get("CVSS", {})
-                if cvss_data:
-                    # Try to get score from any CVSS version
-                    for version in ["nvd", "redhat", "vendor"]:
-                        if version in cvss_data:
-                            score_data = cvss_data[version]
-                            if isinstance(score_data, dict):
-                                cvss_score = score_data.get("V3Score") or score_data.get("V2Score")
-                            break
-
-                # Parse dates
-                published_date = None
-                if vuln_data.get("PublishedDate"):
-                    try:
-                        published_date = datetime.fromisoformat(
-                            vuln_data["PublishedDate"].replace("Z", "+00:00")
-                        )
-                    except Exception:
-                        pass
-
-                vulnerability = Vulnerability(
-                    cve_id=vuln_data.get("VulnerabilityID", "UNKNOWN"),
-                    package_name=vuln_data.get("PkgName", "unknown"),
-                    installed_version=vuln_data.get("InstalledVersion", "unknown"),
-                    fixed_version=vuln_data.get("FixedVersion"),
-                    severity=severity,
-                    cvss_score=cvss_score,
-                    description=vuln_data.get("Description", "No description available"),
-                    published_date=published_date,
-                    exploit_available=False,
-                    references=vuln_data.get("References", []),
-                    target_type=target_type,
-                )
-
-                vulnerabilities.append(vulnerability)
+        return [
+            self._trivy_vulnerability(vuln_data, target_type)
+            for result in trivy_data.get("Results", [])
+            for vuln_data in result.get("Vulnerabilities", [])
+        ]
 
-        return vulnerabilities
+    def _trivy_vulnerability(
+        self, vuln_data: Dict[str, Any], target_type: str = "package"
+    ) -> Vulnerability:
+        """
+        Convert one entry of a Trivy result's Vulnerabilities list.
+        """
+        # Parse severity
+        severity_str = vuln_data.get("Severity", "UNKNOWN").lower()
+        severity_map = {
+            "critical": VulnerabilitySeverity.CRITICAL,
+            "high": VulnerabilitySeverity.HIGH,
+            "medium": VulnerabilitySeverity.MEDIUM,
+            "low": VulnerabilitySeverity.LOW,
+            "unknown": VulnerabilitySeverity.UNKNOWN,
+        }
+        severity = severity_map.get(severity_str, VulnerabilitySeverity.UNKNOWN)
+
+        # Parse CVSS score
+        cvss_score = None
+        cvss_data = vuln_data.get("CVSS", {})
+        if cvss_data:
+            # Try to get score from any CVSS version
+            for version in ["nvd", "redhat", "vendor"]:
+                if version in cvss_data:
+                    score_data = cvss_data[version]
+                    if isinstance(score_data, dict):
+                        cvss_score = score_data.get("V3Score") or score_data.get("V2Score")
+                    break
+
+        # Parse dates
+        published_date = None
+        if vuln_data.get("PublishedDate"):
+            try:
+                published_date = datetime.fromisoformat(
+                    vuln_data["PublishedDate"].replace("Z", "+00:00")
+                )
+            except Exception:
+                pass
+
+        return Vulnerability(
+            cve_id=vuln_data.get("VulnerabilityID", "UNKNOWN"),
+            package_name=vuln_data.get("PkgName", "unknown"),
+            installed_version=vuln_data.get("InstalledVersion", "unknown"),
+            fixed_version=vuln_data.get("FixedVersion"),
+            severity=severity,
+            cvss_score=cvss_score,
+            description=vuln_data.get("Description", "No description available"),
+            published_date=published_date,
+            exploit_available=False,
+            references=vuln_data.get("References", []),
+            target_type=target_type,
+        )
 
 
 # --- Grype Implementation ---
@@ -351,6 +523,16 @@ class GrypeScanner(VulnerabilityScanner):
     """
 
     SCANNER_NAME = "Grype"
+    # Where the findings are in Grype's JSON report
+    FINDINGS_PATH = ("matches",)
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        detail_threshold: Optional[VulnerabilitySeverity] = None,
+    ):
+        super().__init__(logger, detail_threshold)
+        self._version: Optional[str] = None
 
     def is_available(self) -> bool:
         """Check if Grype is installed"""
@@ -358,6 +540,11 @@ class GrypeScanner(VulnerabilityScanner):
 
     def get_version(self) -> str:
         """Get Grype version"""
+        if self._version is None:
+            self._version = self._read_version()
+        return self._version
+
+    def _read_version(self) -> str:
         try:
             result = subprocess.run(
                 ["grype", "version"], capture_output=True, text=True, check=True
@@ -380,19 +567,15 @@ class GrypeScanner(VulnerabilityScanner):
         scan_start = time.time()
 
         try:
-            result = subprocess.run(
+            findings = stream_command_json(
                 ["grype", "dir:/", "--output", "json", "--scope", "all-layers"],
-                capture_output=True,
-                text=True,
-                check=True,
+                self.FINDINGS_PATH,
                 timeout=600,
             )
+            vulnerabilities, summary = self._collect(findings, self._grype_vulnerability)
 
             scan_duration = time.time() - scan_start
 
-            grype_data = json.loads(result.stdout)
-            vulnerabilities = self._parse_grype_output(grype_data)
-
             return ScanResult(
                 scan_id=str(uuid.uuid4()),
                 scan_date=datetime.now(),
@@ -401,30 +584,56 @@ class GrypeScanner(VulnerabilityScanner):
                 target="system",
                 vulnerabilities=vulnerabilities,
                 scan_duration_seconds=scan_duration,
+                summary=summary,
             )
 
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Grype scan failed: {e.stderr}")
             raise
 
-    def scan_docker_image(self, image: str) -> ScanResult:
+    def update_db(self) -> bool:
+        """Update the vulnerability DB once, for scans run with skip_db_update"""
+        try:
+            subprocess.run(
+                ["grype", "db", "update"], capture_output=True, text=True, check=True, timeout=600
+            )
+            return True
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.warning(f"Grype DB update failed, each scan will update it: {e}")
+            return False
+
+    def db_version(self) -> Optional[str]:
+        """Build time of the local Grype DB"""
+        try:
+            result = subprocess.run(
+                ["grype", "db", "status"], capture_output=True, text=True, check=True, timeout=60
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        for line in result.stdout.split("\n"):
+            if line.strip().lower().startswith("built:"):
+                return line.split(":", 1)[1].strip()
+        return None
+
+    def scan_docker_image(self, image: str, skip_db_update: bool = False) -> ScanResult:
         """Scan Docker image with Grype"""
         self.logger.info(f"Scanning Docker image with Grype: {image}")
 
+        env = None
+        if skip_db_update:
+            env = {**os.environ, "GRYPE_DB_AUTO_UPDATE": "false"}
+
         scan_start = time.time()
 
         try:
-            result = subprocess.run(
-                ["grype", image, "--output", "json"],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=600,
+            findings = stream_command_json(
+                ["grype", image, "--output", "json"], self.FINDINGS_PATH, timeout=600, env=env
+            )
+            vulnerabilities, summary = self._collect(
+                findings, lambda match: self._grype_vulnerability(match, target_type="container")
             )
 
             scan_duration = time.time() - scan_start
-            grype_data = json.loads(result.stdout)
-            vulnerabilities = self._parse_grype_output(grype_data, target_type="container")
 
             return ScanResult(
                 scan_id=str(uuid.uuid4()),
@@ -434,57 +643,89 @@ class GrypeScanner(VulnerabilityScanner):
                 target=f"docker:{image}",
                 vulnerabilities=vulnerabilities,
                 scan_duration_seconds=scan_duration,
+                summary=summary,
             )
 
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Grype Docker scan failed: {e.stderr}")
             raise
 
+    def scan_sbom(self, sbom_path: str, skip_db_update: bool = False) -> ScanResult:
+        """Scan the packages listed in a CycloneDX SBOM with Grype"""
+        env = None
+        if skip_db_update:
+            env = {**os.environ, "GRYPE_DB_AUTO_UPDATE": "false"}
+
+        scan_start = time.time()
+
+        try:
+            findings = stream_command_json(
+                ["grype", f"sbom:{sbom_path}", "--output", "json"],
+                self.FINDINGS_PATH,
+                timeout=600,
+                env=env,
+            )
+            vulnerabilities, summary = self._collect(findings, self._grype_vulnerability)
+
+            return ScanResult(
+                scan_id=str(uuid.uuid4()),
+                scan_date=datetime.now(),
+                scanner_name=self.SCANNER_NAME,
+                scanner_version=self.get_version(),
+                target=f"sbom:{sbom_path}",
+                vulnerabilities=vulnerabilities,
+                scan_duration_seconds=time.time() - scan_start,
+                summary=summary,
+            )
+
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"Grype SBOM scan failed: {e.stderr}")
+            raise
+
     def _parse_grype_output(
         self, grype_data: Dict[str, Any], target_type: str = "package"
     ) -> List[Vulnerability]:
         """Parse Grype JSON output"""
-        vulnerabilities = []
-
-        matches = grype_data.get("matches", [])
-
-        for match in matches:
-            vuln_data = match.get("vulnerability", {})
-            artifact = match.get("artifact", {})
-
-            # Parse severity
-            severity_str = vuln_data.get("severity", "Unknown").lower()
-            severity_map = {
-                "critical": VulnerabilitySeverity.CRITICAL,
-                "high": VulnerabilitySeverity.HIGH,
-                "medium": VulnerabilitySeverity.MEDIUM,
-                "low": VulnerabilitySeverity.LOW,
-                "negligible": VulnerabilitySeverity.LOW,
-                "unknown": VulnerabilitySeverity.UNKNOWN,
-            }
-            severity = severity_map.get(severity_str, VulnerabilitySeverity.UNKNOWN)
-
-            # Get fix version
-            fix_version = None
-            fix_data = vuln_data.get("fix", {})
-            if fix_data:
-                fix_version = fix_data.get("versions", [None])[0]
-
-            vulnerability = Vulnerability(
-                cve_id=vuln_data.get("id", "UNKNOWN"),
-                package_name=artifact.get("name", "unknown"),
-                installed_version=artifact.get("version", "unknown"),
-                fixed_version=fix_version,
-                severity=severity,
-                cvss_score=None,  # Grype doesn't always provide CVSS in basic output
-                description=vuln_data.get("description", "No description"),
-                references=vuln_data.get("urls", []),
-                target_type=target_type,
-            )
-
-            vulnerabilities.append(vulnerability)
+        return [
+            self._grype_vulnerability(match, target_type) for match in grype_data.get("matches", [])
+        ]
 
-        return vulnerabilities
+    def _grype_vulnerability(
+        self, match: Dict[str, Any], target_type: str = "package"
+    ) -> Vulnerability:
+        """Convert one entry of Grype's matches list"""
+        vuln_data = match.get("vulnerability", {})
+        artifact = match.get("artifact", {})
+
+        # Parse severity
+        severity_str = vuln_data.get("severity", "Unknown").lower()
+        severity_map = {
+            "critical": VulnerabilitySeverity.CRITICAL,
+            "high": VulnerabilitySeverity.HIGH,
+            "medium": VulnerabilitySeverity.MEDIUM,
+            "low": VulnerabilitySeverity.LOW,
+            "negligible": VulnerabilitySeverity.LOW,
+            "unknown": VulnerabilitySeverity.UNKNOWN,
+        }
+        severity = severity_map.get(severity_str, VulnerabilitySeverity.UNKNOWN)
+
+        # Get fix version
+        fix_version = None
+        fix_data = vuln_data.get("fix", {})
+        if fix_data:
+            fix_version = fix_data.get("versions", [None])[0]
+
+        return Vulnerability(
+            cve_id=vuln_data.get("id", "UNKNOWN"),
+            package_name=artifact.get("name", "unknown"),
+            installed_version=artifact.get("version", "unknown"),
+            fixed_version=fix_version,
+            severity=severity,
+            cvss_score=None,  # Grype doesn't always provide CVSS in basic output
+            description=vuln_data.get("description", "No description"),
+            references=vuln_data.get("urls", []),
+            target_type=target_type,
+        )
 
 
 # --- Vulnerability Manager ---
@@ -495,14 +736,21 @@ class VulnerabilityManager:
     High-level vulnerability management.
     """
 
-    def __init__(self, preferred_scanner: str = "trivy", logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        preferred_scanner: str = "trivy",
+        logger: Optional[logging.Logger] = None,
+        max_parallel_scans: int = 4,
+        detail_threshold: Optional[VulnerabilitySeverity] = None,
+    ):
         self.logger = logger or logging.getLogger(__name__)
         self.preferred_scanner = preferred_scanner
+        self.max_parallel_scans = max_parallel_scans
 
-        # Initialize scanners
+        # Initialize scanners (detail_threshold: keep only findings this severe in full)
         self.scanners = {
-            "trivy": TrivyScanner(logger),
-            "grype": GrypeScanner(logger),
+            "trivy": TrivyScanner(logger, detail_threshold),
+            "grype": GrypeScanner(logger, detail_threshold),
         }
 
         # Detect available scanners
@@ -531,34 +779,19 @@ class VulnerabilityManager:
         return scanner.scan_system()
 
     def scan_docker_images(self) -> List[ScanResult]:
-        """Scan all Docker images on system"""
+        """
+        Scan all Docker images on system.
+
+        Each image is scanned once however many tags it has, several at a
+        time, and unchanged images reuse their result until the DB changes.
+        """
+        from configurator.security.image_scan import ImageScanScheduler, list_docker_images
+
         scanner = self.get_scanner()
 
         # Get list of Docker images
         try:
-            result = subprocess.run(
-                ["docker", "images", "--format", "{{.Repository}}:{{.Tag}}"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            images = result.stdout.strip().split("\n")
-            images = [img for img in images if img and "<none>" not in img]
-
-            self.logger.info(f"Found {len(images)} Docker images to scan")
-
-            scan_results = []
-            for image in images:
-                try:
-                    self.logger.info(f"Scanning image: {image}")
-                    scan_result = scanner.scan_docker_image(image)
-                    scan_results.append(scan_result)
-                except Exception as e:
-                    self.logger.error(f"Failed to scan {image}: {e}")
-
-            return scan_results
-
+            images = list_docker_images()
         except subprocess.CalledProcessError:
             self.logger.info("Docker not available or no images found")
             return []
@@ -566,6 +799,14 @@ class VulnerabilityManager:
             self.logger.info("Docker command not found")
             return []
 
+        tags = sum(len(image.tags) for image in images)
+        self.logger.info(f"Found {len(images)} Docker images ({tags} tags) to scan")
+
+        scheduler = ImageScanScheduler(
+            scanner, max_workers=self.max_parallel_scans, logger=self.logger
+        )
+        return scheduler.scan(images)
+
     def get_critical_vulnerabilities(self, scan_result: ScanResult) -> List[Vulnerability]:
         """Get critical and high severity vulnerabilities"""
         return [
@@ -638,14 +879,4 @@ class VulnerabilityManager:
         self, severity: VulnerabilitySeverity, threshold: VulnerabilitySeverity
     ) -> bool:
         """Check if severity meets threshold"""
-        severity_order = [
-            VulnerabilitySeverity.LOW,
-            VulnerabilitySeverity.MEDIUM,
-            VulnerabilitySeverity.HIGH,
-            VulnerabilitySeverity.CRITICAL,
-        ]
-
-        try:
-            return severity_order.index(severity) >= severity_order.index(threshold)
-        except ValueError:
-            return False
+        return meets_threshold(severity, threshold)
@@ -1,6 +1,8 @@
-from typing import List
+from typing import List, Optional
 
+from configurator.core.dag import DAG
 from configurator.core.dependency import DependencyGraph
+from configurator.core.state.durations import DurationModel, format_duration
 from configurator.dependencies.registry import DependencyRegistry
 
 
@@ -9,66 +11,42 @@ class DependencyGraphVisualizer:
     Visualize module dependencies as ASCII tree.
     """
 
-    def __init__(self, modules: List[str]) -> None:
+    def __init__(
+        self, modules: List[str], durations: Optional[DurationModel] = None, workers: int = 4
+    ) -> None:
+        """
+        Args:
+            modules: Modules to visualize
+            durations: Duration model from past runs; without one, times are rough guesses
+            workers: Parallel workers assumed for time estimates
+        """
         self.modules = modules
+        self.durations = durations
+        self.workers = workers
 
     def detect_cycles(self) -> List[List[str]]:
         """
         Detect dependency cycles in the registry.
-        """
-        # Build full graph from registry
-        graph = (
-            DependencyRegistry._registry
-        )  # This is internal, but for visualization ok or use DependencyGraph
 
-        # We can reuse DependencyGraph's detection if it exists, but it throws error on add_module loop.
-        # So we can try to build a graph and catch it, or implement simple DFS here.
+        Follows dependencies transitively, including modules not selected.
+        """
+        graph = DAG()
+        queue = list(self.modules)
+        seen = set()
 
-        # Simple DFS for cycle detection used by the test expectation
-        logger = None
-        dep_graph = DependencyGraph(logger=logger)
+        for module_name in queue:
+            if module_name in seen:
+                continue
+            seen.add(module_name)
+            graph.add_node(module_name)
 
-        for module_name in self.modules:
             dependency = DependencyRegistry.get(module_name)
             if dependency:
-                try:
-                    dep_graph.add_module(module_name, depends_on=dependency.depends_on)
-                except ValueError as e:
-                    if "Dependency cycle detected" in str(e):
-                        # Parsing cycle from error message is ugly but simple for now
-                        # Or we expose the cycle detection from DependencyGraph
-                        return [["cycle detected"]]
-
-        # If we want to return the exact cycle, we might need to query the graph internals or catch the specific error
-        # Let's inspect DependencyGraph.add_module implementation in core/dependency
-        # Actually, let's just implement a standalone cycle detector here since we have the registry.
-
-        cycles = []
-        visited = set()
-        path: List[str] = []
-
-        def visit(node: str) -> None:
-            if node in path:
-                cycle = path[path.index(node) :] + [node]
-                cycles.append(cycle)
-                return
-            if node in visited:
-                return
-
-            visited.add(node)
-            path.append(node)
-
-            dep = DependencyRegistry.get(node)
-            if dep:
-                for neighbor in dep.depends_on:
-                    visit(neighbor)
-
-            path.pop()
-
-        for module in self.modules:
-            visit(module)
+                for dep in dependency.depends_on:
+                    graph.add_edge(dep, module_name)
+                    queue.append(dep)
 
-        return cycles
+        return graph.find_cycles()
 
     def render_tree(self) -> str:
         """
@@ -130,6 +108,16 @@ class DependencyGraphVisualizer:
         estimated_time = self._estimate_time(batches)
         lines.append(f"Estimated installation time: {estimated_time}")
 
+        # The longest dependency chain bounds the run time however many workers run
+        if self.durations:
+            seconds, chain = graph.critical_path(self.durations.expected)
+            if chain:
+                lines.append(f"Critical path ({format_duration(seconds)}): {' → '.join(chain)}")
+        else:
+            _, chain = graph.critical_path()
+            if len(chain) > 1:
+                lines.append(f"Critical path: {' → '.join(chain)}")
+
         return "\n".join(lines)
 
     def render_flat(self) -> str:
@@ -161,6 +149,11 @@ class DependencyGraphVisualizer:
 
     def _estimate_time(self, batches: List[List[str]]) -> str:
         """Estimate installation time based on batches."""
+        if self.durations:
+            estimate = self.durations.batches_duration(batches, self.workers)
+            worst = self.durations.batches_duration(batches, self.workers, p90=True)
+            return f"{format_duration(estimate)} (p90 {format_duration(worst)}, from past runs)"
+
         # Rough estimate: 3 min per batch overhead + 2 min per module
         # If parallel, batch time is overhead + max(module_time) roughly, but simplified here
         minutes = len(batches) * 3 + sum(len(batch) for batch in batches) * 2
@@ -151,8 +151,10 @@ class ActivityMonitor:
         db_file: Optional[Path] = None,
         audit_log: Optional[Path] = None,
         logger: Optional[logging.Logger] = None,
+        alert_manager: Any = None,  # AlertManager, to notify channels of anomalies
     ):
         self.logger = logger or logging.getLogger(__name__)
+        self.alert_manager = alert_manager
         self.DB_FILE = db_file or self.DB_FILE
         self.AUDIT_LOG = audit_log or self.AUDIT_LOG
 
@@ -611,6 +613,17 @@ class ActivityMonitor:
             f"🚨 ANOMALY DETECTED: {anomaly.anomaly_type.value} "
             f"for user {anomaly.user} (risk: {anomaly.risk_score}/100)"
         )
+        if self.alert_manager is not None:
+            from configurator.observability.alerting import AlertSeverity
+
+            # Queued for background delivery; bursts of the same anomaly become one digest
+            self.alert_manager.alert(
+                AlertSeverity.CRITICAL,
+                f"Anomaly detected: {anomaly.anomaly_type.value}",
+                f"User {anomaly.user}, risk {anomaly.risk_score}/100",
+                source="activity_monitor",
+                metadata={"user": anomaly.user, "anomaly_id": anomaly.anomaly_id},
+            )
 
     def get_anomalies(
         self,
@@ -4,11 +4,15 @@ import json
 import logging
 import subprocess
 import uuid
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+
+from configurator.core.expiry_scheduler import ExpiryEntry, ExpiryScheduler
+from configurator.utils.file_lock import file_lock
 
 
 class AccessType(Enum):
@@ -141,6 +145,7 @@ class TempAccessManager:
     - Grant temporary access with auto-expiration
     - Schedule automatic revocation
     - Send expiration reminders
+    - Deadline-driven expiry via ExpiryScheduler (no registry rescans)
     - Handle extension requests
     - Emergency break-glass access
     - Complete audit trail
@@ -149,6 +154,10 @@ class TempAccessManager:
     ACCESS_REGISTRY = Path("/var/lib/debian-vps-configurator/temp-access/registry.json")
     EXTENSIONS_FILE = Path("/var/lib/debian-vps-configurator/temp-access/extensions.json")
     AUDIT_LOG = Path("/var/log/temp-access-audit.log")
+    SCHEDULE_FILE_NAME = "expiry-schedule.json"
+
+    EXPIRE_ACTION = "temp_access.expire"
+    REMIND_ACTION = "temp_access.remind"
 
     def __init__(
         self,
@@ -156,6 +165,7 @@ class TempAccessManager:
         extensions_file: Optional[Path] = None,
         audit_log: Optional[Path] = None,
         logger: Optional[logging.Logger] = None,
+        scheduler: Optional[ExpiryScheduler] = None,
     ):
         self.logger = logger or logging.getLogger(__name__)
 
@@ -168,6 +178,17 @@ class TempAccessManager:
         self._load_access_registry()
         self._load_extensions()
 
+        # Expiry deadlines are persisted next to the registry
+        self.scheduler = scheduler or ExpiryScheduler(
+            state_file=self.ACCESS_REGISTRY.parent / self.SCHEDULE_FILE_NAME,
+            logger=self.logger,
+        )
+        self.scheduler.register_handler(self.EXPIRE_ACTION, self._on_access_expired)
+        self.scheduler.register_handler(self.REMIND_ACTION, self._on_access_reminder)
+
+        if not self.scheduler.restored:
+            self._schedule_all()
+
     def _ensure_directories(self) -> None:
         """Ensure required directories exist."""
         try:
@@ -177,9 +198,9 @@ class TempAccessManager:
         except PermissionError:
             self.logger.debug("No permission to create directories")
 
-    def _load_access_registry(self) -> None:
-        """Load access registry."""
-        self.access_grants: Dict[str, TempAccess] = {}
+    def _read_access_registry(self) -> Dict[str, TempAccess]:
+        """Read the access registry from disk."""
+        grants: Dict[str, TempAccess] = {}
 
         if self.ACCESS_REGISTRY.exists():
             try:
@@ -187,12 +208,52 @@ class TempAccessManager:
                     data = json.load(f)
 
                 for username, access_data in data.items():
-                    self.access_grants[username] = self._access_from_dict(access_data)
-
-                self.logger.info(f"Loaded {len(self.access_grants)} temporary access grants")
+                    grants[username] = self._access_from_dict(access_data)
             except Exception as e:
                 self.logger.error(f"Failed to load access registry: {e}")
 
+        return grants
+
+    def _load_access_registry(self) -> None:
+        """Load access registry."""
+        self.access_grants: Dict[str, TempAccess] = self._read_access_registry()
+        if self.access_grants:
+            self.logger.info(f"Loaded {len(self.access_grants)} temporary access grants")
+
+    def _refresh_registry(self) -> None:
+        """
+        Replace in-memory grants with the registry on disk.
+
+        Grant objects already handed out are updated in place, so callers
+        holding a TempAccess keep seeing its current state.
+        """
+        fresh = self._read_access_registry()
+        for username, access in fresh.items():
+            current = self.access_grants.get(username)
+            if current is not None and current.access_id == access.access_id:
+                vars(current).update(vars(access))
+                fresh[username] = current
+        self.access_grants = fresh
+
+    @contextmanager
+    def _registry_update(self) -> Iterator[None]:
+        """
+        Re-read the registry under a file lock, apply changes, then save it.
+
+        The expiry watcher and CLI invocations run as separate processes, so
+        the copy loaded at startup may be stale; mutating a fresh copy keeps
+        grants and extensions written by others.
+        """
+        with ExitStack() as stack:
+            try:
+                stack.enter_context(file_lock(str(self.ACCESS_REGISTRY)))
+            except OSError as e:
+                self.logger.debug(f"Cannot lock access registry: {e}")
+
+            self._refresh_registry()
+            yield
+            self._save_access_registry()
+
     def _load_extensions(self) -> None:
         """Load extension requests."""
         self.extensions: Dict[str, ExtensionRequest] = {}
@@ -214,13 +275,15 @@ class TempAccessManager:
         try:
             data = {username: access.to_dict() for username, access in self.access_grants.items()}
 
-            with open(self.ACCESS_REGISTRY, "w") as f:
+            tmp_file = self.ACCESS_REGISTRY.with_suffix(self.ACCESS_REGISTRY.suffix + ".tmp")
+            with open(tmp_file, "w") as f:
                 json.dump(data, f, indent=2)
 
             try:
-                self.ACCESS_REGISTRY.chmod(0o600)
+                tmp_file.chmod(0o600)
             except PermissionError:
                 pass
+            tmp_file.replace(self.ACCESS_REGISTRY)
         except Exception as e:
             self.logger.error(f"Failed to save access registry: {e}")
 
@@ -276,6 +339,121 @@ class TempAccessManager:
             ),
         )
 
+    # ------------------------------------------------------------------
+    # Expiry scheduling
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _schedule_key(username: str, kind: str) -> str:
+        return f"temp-access:{username}:{kind}"
+
+    def _schedule_access(self, access: TempAccess, persist: bool = True) -> None:
+        """Push expiry and reminder deadlines for an active grant."""
+        self._unschedule_access(access.username, persist=False)
+
+        if access.status != AccessStatus.ACTIVE:
+            if persist:
+                self.scheduler.save()
+            return
+
+        payload = {"username": access.username, "access_id": access.access_id}
+        self.scheduler.schedule(
+            self._schedule_key(access.username, "expire"),
+            access.expires_at,
+            self.EXPIRE_ACTION,
+            payload,
+            persist=False,
+        )
+
+        remind_at = access.expires_at - timedelta(days=access.notify_before_days)
+        if remind_at > datetime.now():
+            self.scheduler.schedule(
+                self._schedule_key(access.username, "remind"),
+                remind_at,
+                self.REMIND_ACTION,
+                payload,
+                persist=False,
+            )
+
+        if persist:
+            self.scheduler.save()
+
+    def _unschedule_access(self, username: str, persist: bool = True) -> None:
+        """Drop pending deadlines for a user."""
+        self.scheduler.cancel_prefix(f"temp-access:{username}:", persist=persist)
+
+    def _schedule_all(self) -> None:
+        """Rebuild the schedule from the registry (first run or lost schedule file)."""
+        for access in self.access_grants.values():
+            self._schedule_access(access, persist=False)
+        self.scheduler.save()
+
+    def _scheduled_access(self, entry: ExpiryEntry) -> Optional[TempAccess]:
+        """Resolve a due entry to its grant, ignoring entries that no longer apply."""
+        access = self.access_grants.get(entry.payload.get("username", ""))
+        if not access or access.access_id != entry.payload.get("access_id"):
+            return None
+        if access.status != AccessStatus.ACTIVE:
+            return None
+        return access
+
+    def _on_access_expired(self, entry: ExpiryEntry) -> None:
+        """Scheduler handler: expire and lock an account at its deadline."""
+        # Judge the grant by the registry on disk: it may have been extended
+        # or revoked by another process since this one loaded it
+        with self._registry_update():
+            access = self._scheduled_access(entry)
+            if not access:
+                return
+
+            if not access.is_expired():
+                # Deadline moved later without a reschedule; re-arm it
+                self._schedule_access(access)
+                return
+
+            self.logger.info(f"Access expired for {access.username}")
+
+            self._disable_account(access.username)
+            access.status = AccessStatus.EXPIRED
+
+        self._audit_log(
+            action="expire_access",
+            username=access.username,
+            expired_at=access.expires_at.isoformat(),
+        )
+
+    def _on_access_reminder(self, entry: ExpiryEntry) -> None:
+        """Scheduler handler: record an expiration reminder."""
+        self._refresh_registry()
+        access = self._scheduled_access(entry)
+        if not access or not access.needs_reminder():
+            return
+
+        self.logger.warning(
+            f"Temporary access for {access.username} expires in {access.days_remaining()} days"
+        )
+        self._audit_log(
+            action="expiry_reminder",
+            username=access.username,
+            days_remaining=access.days_remaining(),
+            expires_at=access.expires_at.isoformat(),
+        )
+
+    def process_due(self, now: Optional[datetime] = None) -> List[ExpiryEntry]:
+        """
+        Run expiry and reminder actions whose deadline has passed.
+
+        Only due heap entries are touched, so this is cheap enough to call
+        from a daemon tick; ``scheduler.start()`` does it automatically.
+
+        Args:
+            now: Reference time (defaults to datetime.now())
+
+        Returns:
+            Entries that were dispatched
+        """
+        return self.scheduler.dispatch_due(now)
+
     def grant_temp_access(
         self,
         username: str,
@@ -333,8 +511,9 @@ class TempAccessManager:
         )
 
         # Save access
-        self.access_grants[username] = access
-        self._save_access_registry()
+        with self._registry_update():
+            self.access_grants[username] = access
+        self._schedule_access(access)
 
         # Audit log
         self._audit_log(
@@ -364,19 +543,26 @@ class TempAccessManager:
             self.logger.debug("chage command not available (testing mode)")
 
     def check_expired_access(self) -> List[TempAccess]:
-        """Check for expired access and mark as expired."""
+        """
+        Check for expired access and mark as expired.
+
+        This is a full reconciliation scan for manual use; routine expiry is
+        handled by the scheduler (see process_due).
+        """
         expired = []
 
-        for access in self.access_grants.values():
-            if access.status == AccessStatus.ACTIVE and access.is_expired():
-                self.logger.info(f"Access expired for {access.username}")
+        with self._registry_update():
+            for access in self.access_grants.values():
+                if access.status == AccessStatus.ACTIVE and access.is_expired():
+                    self.logger.info(f"Access expired for {access.username}")
 
-                # Mark as expired
-                access.status = AccessStatus.EXPIRED
-                expired.append(access)
+                    # Mark as expired
+                    access.status = AccessStatus.EXPIRED
+                    expired.append(access)
+                    self._unschedule_access(access.username, persist=False)
 
         if expired:
-            self._save_access_registry()
+            self.scheduler.save()
 
         return expired
 
@@ -399,24 +585,25 @@ class TempAccessManager:
         Returns:
             True if successful
         """
-        access = self.access_grants.get(username)
+        with self._registry_update():
+            access = self.access_grants.get(username)
 
-        if not access:
-            self.logger.warning(f"No temporary access found for {username}")
-            return False
+            if not access:
+                self.logger.warning(f"No temporary access found for {username}")
+                return False
 
-        self.logger.info(f"Revoking temporary access for {username}")
+            self.logger.info(f"Revoking temporary access for {username}")
 
-        # Disable account (if not testing)
-        if not skip_system:
-            self._disable_account(username)
+            # Disable account (if not testing)
+            if not skip_system:
+                self._disable_account(username)
 
-        # Update access record
-        access.status = AccessStatus.REVOKED
-        access.revoked_at = datetime.now()
-        access.revoked_by = revoked_by
+            # Update access record
+            access.status = AccessStatus.REVOKED
+            access.revoked_at = datetime.now()
+            access.revoked_by = revoked_by
 
-        self._save_access_registry()
+        self._unschedule_access(username)
 
         # Audit log
         self._audit_log(
@@ -516,22 +703,23 @@ class TempAccessManager:
         if not extension:
             raise ValueError(f"Extension request not found: {request_id}")
 
-        access = self.access_grants.get(extension.username)
+        with self._registry_update():
+            access = self.access_grants.get(extension.username)
 
-        if not access:
-            raise ValueError(f"No temporary access found for {extension.username}")
+            if not access:
+                raise ValueError(f"No temporary access found for {extension.username}")
 
-        # Update extension
-        extension.status = ExtensionStatus.APPROVED
-        extension.approved_by = approved_by
-        extension.approved_at = datetime.now()
+            # Update extension
+            extension.status = ExtensionStatus.APPROVED
+            extension.approved_by = approved_by
+            extension.approved_at = datetime.now()
 
-        # Extend access
-        access.expires_at += timedelta(days=extension.additional_days)
-        access.extended_count += 1
+            # Extend access
+            access.expires_at += timedelta(days=extension.additional_days)
+            access.extended_count += 1
 
         self._save_extensions()
-        self._save_access_registry()
+        self._schedule_access(access)
 
         # Audit log
         self._audit_log(
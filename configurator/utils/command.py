@@ -2,68 +2,46 @@
 Command execution utilities with error handling.
 """
 
-import shlex
-import subprocess
-from dataclasses import dataclass
+import logging
 from typing import Dict, List, Optional, Union
 
-from configurator.exceptions import ModuleExecutionError
-
-
-@dataclass
-class CommandResult:
-    """Result of a command execution."""
-
-    command: str
-    return_code: int
-    stdout: str
-    stderr: str
-
-    @property
-    def success(self) -> bool:
-        """Check if command was successful."""
-        return self.return_code == 0
-
-    @property
-    def output(self) -> str:
-        """Get combined stdout and stderr."""
-        return f"{self.stdout}\n{self.stderr}".strip()
-
-    def check_returncode(self) -> None:
-        """
-        Raise exception if return code is non-zero.
-        Mimics subprocess.CompletedProcess.check_returncode().
-        """
-        if self.return_code != 0:
-            raise ModuleExecutionError(
-                what=f"Command failed: {self.command}",
-                why=f"Exit code: {self.return_code}\n{self.output}",
-                how="Check command output for details",
-            )
+from configurator.utils.facts import get_system_facts
+from configurator.utils.process import CommandResult as CommandResult
+from configurator.utils.process import LineCallback, get_command_engine
 
 
 def run_command(
     command: Union[str, List[str]],
     check: bool = True,
     capture_output: bool = True,
-    shell: bool = False,
+    shell: Optional[bool] = False,
     cwd: Optional[str] = None,
     env: Optional[Dict[str, str]] = None,
     timeout: Optional[int] = None,
     input_text: Optional[str] = None,
+    resource: Optional[str] = None,
+    on_line: Optional[LineCallback] = None,
+    logger: Optional[logging.Logger] = None,
 ) -> CommandResult:
     """
     Run a shell command and return the result.
 
+    Commands run on the shared CommandEngine: output is streamed to the log
+    line by line, timeouts kill the whole process group, and apt/dpkg,
+    network and other commands each queue for their own concurrency budget.
+
     Args:
         command: Command to run (string or list of arguments)
         check: Raise exception on non-zero exit code
         capture_output: Capture stdout and stderr
-        shell: Run command in shell
+        shell: Run command in shell (None: only if the string needs one)
         cwd: Working directory
         env: Environment variables
         timeout: Timeout in seconds
         input_text: Input to send to stdin
+        resource: Concurrency budget ("dpkg", "network", "cpu"; default: inferred)
+        on_line: Called with (stream, line) for every output line
+        logger: Logger that receives streamed output at DEBUG level
 
     Returns:
         CommandResult with return code, stdout, and stderr
@@ -71,62 +49,19 @@ def run_command(
     Raises:
         ModuleExecutionError if check=True and command fails
     """
-    # Convert string to list if not using shell
-    cmd_list: Union[List[str], str]
-    if isinstance(command, str) and not shell:
-        cmd_list = shlex.split(command)
-    else:
-        cmd_list = command if isinstance(command, list) else command
-
-    # Build command string for logging
-    cmd_str = command if isinstance(command, str) else " ".join(command)
-
-    try:
-        result = subprocess.run(
-            cmd_list,
-            shell=shell,
-            cwd=cwd,
-            env=env,
-            timeout=timeout,
-            input=input_text,
-            capture_output=capture_output,
-            text=True,
-        )
-
-        cmd_result = CommandResult(
-            command=cmd_str,
-            return_code=result.returncode,
-            stdout=result.stdout if capture_output else "",
-            stderr=result.stderr if capture_output else "",
-        )
-
-        if check and result.returncode != 0:
-            raise ModuleExecutionError(
-                what=f"Command failed: {cmd_str}",
-                why=f"Exit code: {result.returncode}\n{result.stderr.strip()}",
-                how="Check the command output above for details. You may need to:\n"
-                "1. Check if required packages are installed\n"
-                "2. Verify you have the necessary permissions\n"
-                "3. Check your internet connection",
-            )
-
-        return cmd_result
-
-    except subprocess.TimeoutExpired:
-        raise ModuleExecutionError(
-            what=f"Command timed out: {cmd_str}",
-            why=f"Command did not complete within {timeout} seconds",
-            how="This might indicate a hung process or network issue. Try:\n"
-            "1. Check your internet connection\n"
-            "2. Increase the timeout if this is expected\n"
-            "3. Run the command manually to debug",
-        )
-    except FileNotFoundError:
-        raise ModuleExecutionError(
-            what=f"Command not found: {cmd_str.split()[0]}",
-            why="The command or program is not installed",
-            how=f"Install the required package:\n  sudo apt-get install {cmd_str.split()[0]}",
-        )
+    return get_command_engine().run(
+        command,
+        check=check,
+        shell=shell,
+        cwd=cwd,
+        env=env,
+        timeout=timeout,
+        input_text=input_text,
+        capture_output=capture_output,
+        resource=resource,
+        on_line=on_line,
+        log=logger,
+    )
 
 
 def run_command_with_output(
@@ -163,8 +98,7 @@ def command_exists(command: str) -> bool:
     Returns:
         True if command exists
     """
-    result = run_command(f"which {command}", check=False)
-    return result.success
+    return get_system_facts().command_exists(command)
 
 
 def get_package_version(package: str) -> Optional[str]:
@@ -177,12 +111,7 @@ def get_package_version(package: str) -> Optional[str]:
     Returns:
         Version string or None if not installed
     """
-    result = run_command(
-        f"dpkg-query -W -f='${{Version}}' {package}",
-        check=False,
-        shell=True,
-    )
-    return result.stdout.strip() if result.success else None
+    return get_system_facts().package_version(package)
 
 
 def is_service_active(service: str) -> bool:
@@ -195,8 +124,7 @@ def is_service_active(service: str) -> bool:
     Returns:
         True if service is active
     """
-    result = run_command(f"systemctl is-active {service}", check=False)
-    return result.stdout.strip() == "active"
+    return get_system_facts().is_service_active(service)
 
 
 def is_service_enabled(service: str) -> bool:
@@ -209,5 +137,4 @@ def is_service_enabled(service: str) -> bool:
     Returns:
         True if service is enabled
     """
-    result = run_command(f"systemctl is-enabled {service}", check=False)
-    return result.stdout.strip() == "enabled"
+    return get_system_facts().is_service_enabled(service)
@@ -0,0 +1,454 @@
+"""
+Pooled, resumable HTTP download engine.
+
+Supply-chain verified files, editor packages and toolchain archives all go
+through one engine instead of forking curl per file:
+
+- A shared requests.Session with a sized connection pool (keep-alive reuse)
+- Resumable Range requests into ``<destination>.part`` files
+- Hash-while-downloading, so verification needs no second read of the file
+- Per-host concurrency limits and parallel multi-file batches
+- An optional mirror that is consulted before the network (see core.mirror)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import stat
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from configurator.exceptions import NetworkError
+from configurator.utils.hashing import get_hash_service
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, float]]
+
+# Errors after which a transfer is resumed from the bytes already on disk
+RESUMABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class MirrorSource(Protocol):
+    """Anything that can satisfy a download locally (e.g. core.mirror.ArtifactMirror)."""
+
+    def fetch_file(self, url: str, destination: Path) -> Optional[str]:
+        """Place url's content at destination and return its SHA256, or None."""
+        ...
+
+
+@dataclass
+class DownloadTask:
+    """
+    A single file to fetch.
+
+    Attributes:
+        url: Source URL
+        destination: Final path (data is staged in ``<destination>.part``)
+        expected_sha256: Reject the file unless its SHA256 matches
+    """
+
+    url: str
+    destination: Path
+    expected_sha256: Optional[str] = None
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of a download."""
+
+    url: str
+    destination: Path
+    success: bool
+    sha256: Optional[str] = None
+    size: int = 0
+    resumed: bool = False
+    error: Optional[str] = None
+
+
+class _PartialFile:
+    """Bytes staged so far for one download, hashed as they are written."""
+
+    def __init__(self, destination: Path):
+        self.path = destination.with_name(destination.name + ".part")
+        self.meta_path = destination.with_name(destination.name + ".part.meta")
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.validator: Optional[str] = None
+
+    def restore(self, url: str) -> bool:
+        """
+        Pick up a .part file left by an earlier run.
+
+        The partial is only trusted if it was fetched from the same URL and
+        the server gave an ETag/Last-Modified to revalidate it with If-Range,
+        and if both files are regular files owned by us that nobody else can
+        write. Otherwise another local user could plant a prefix in a shared
+        directory and have it completed by a 206 response.
+
+        Returns:
+            True if there are bytes to resume from
+        """
+        try:
+            if not (self._is_private(self.path) and self._is_private(self.meta_path)):
+                logger.warning(f"Not resuming {self.path}: not a private file owned by us")
+                self.reset()
+                return False
+            meta = json.loads(self.meta_path.read_text())
+            size = self.path.stat().st_size
+        except (OSError, ValueError):
+            self.reset()
+            return False
+
+        if meta.get("url") != url or not meta.get("validator") or size == 0:
+            self.reset()
+            return False
+
+        with open(self.path, "rb") as f:
+            while True:
+                block = f.read(1024 * 1024)
+                if not block:
+                    break
+                self.hasher.update(block)
+        self.size = size
+        self.validator = meta["validator"]
+        return True
+
+    @staticmethod
+    def _is_private(path: Path) -> bool:
+        st = os.lstat(path)
+        return (
+            stat.S_ISREG(st.st_mode)
+            and st.st_uid == os.geteuid()
+            and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+        )
+
+    def reset(self) -> None:
+        """Discard staged bytes and start from zero."""
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.validator = None
+        self.path.unlink(missing_ok=True)
+        self.meta_path.unlink(missing_ok=True)
+
+    def save_meta(self, url: str) -> None:
+        if not self.validator:
+            return
+        try:
+            self.meta_path.write_text(json.dumps({"url": url, "validator": self.validator}))
+        except OSError:
+            pass
+
+
+def _content_range_total(header: Optional[str]) -> Optional[int]:
+    """Parse the total length out of a Content-Range header ("bytes */123")."""
+    if not header or "/" not in header:
+        return None
+    total = header.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+class DownloadEngine:
+    """
+    Resumable HTTP downloader with a pooled session.
+
+    Usage:
+        engine = get_download_engine()
+        result = engine.download(url, Path("/tmp/go.tar.gz"), expected_sha256=digest)
+
+        results = engine.download_many([
+            DownloadTask(code_url, Path("/tmp/code.deb")),
+            DownloadTask(cursor_url, Path("/tmp/cursor.deb")),
+        ])
+    """
+
+    # Bytes of a chunk in flight are lost when a connection drops, so keep
+    # chunks moderate rather than huge
+    CHUNK_SIZE = 64 * 1024
+    USER_AGENT = "vps-configurator"
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        per_host_limit: int = 2,
+        timeout: Timeout = (10.0, 60.0),
+        max_retries: int = 5,
+        retry_delay: float = 1.0,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Initialize DownloadEngine.
+
+        Args:
+            max_workers: Parallel downloads in a batch
+            per_host_limit: Concurrent connections to any single host
+            timeout: (connect, read) timeout; the read timeout applies per
+                chunk, so large files are not cut off by a total-time cap
+            max_retries: Resume attempts after a dropped connection
+            retry_delay: Initial backoff between attempts (doubles, max 30s)
+            session: Session to use (default: a new pooled session)
+        """
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.session = session or self._create_session()
+        self.mirror: Optional[MirrorSource] = None
+
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16, pool_maxsize=max(self.max_workers, self.per_host_limit)
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["User-Agent"] = self.USER_AGENT
+        return session
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urllib.parse.urlparse(url).netloc.lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slot
+            return slot
+
+    # ------------------------------------------------------------------
+    # Transfer
+    # ------------------------------------------------------------------
+
+    def _transfer(self, url: str, partial: _PartialFile, timeout: Timeout) -> bool:
+        """
+        Run one request, appending to the partial file.
+
+        Returns:
+            True once the whole body has been received
+        """
+        headers = {}
+        if partial.size:
+            headers["Range"] = f"bytes={partial.size}-"
+            if partial.validator:
+                headers["If-Range"] = partial.validator
+
+        with self.session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+            if response.status_code == 416 and partial.size:
+                # Nothing left to fetch if the partial already holds every byte
+                if _content_range_total(response.headers.get("Content-Range")) == partial.size:
+                    return True
+                partial.reset()
+                return False
+
+            response.raise_for_status()
+
+            if partial.size and response.status_code != 206:
+                # Range ignored or resource changed (If-Range mismatch): restart
+                partial.reset()
+
+            validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+            if not partial.size and validator and not validator.startswith("W/"):
+                partial.validator = validator
+                partial.save_meta(url)
+
+            expected_length = response.headers.get("Content-Length")
+            received = 0
+            with open(partial.path, "ab" if partial.size else "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    partial.hasher.update(chunk)
+                    partial.size += len(chunk)
+                    received += len(chunk)
+
+            if expected_length and expected_length.isdigit() and received < int(expected_length):
+                raise requests.exceptions.ChunkedEncodingError(
+                    f"Connection closed after {received} of {expected_length} bytes"
+                )
+
+        return True
+
+    def fetch(
+        self,
+        url: str,
+        destination: Path,
+        expected_sha256: Optional[str] = None,
+        resume: bool = True,
+        timeout: Optional[Timeout] = None,
+        use_mirror: bool = True,
+    ) -> DownloadResult:
+        """
+        Download a file, resuming after dropped connections.
+
+        The file only appears at destination once it is complete (and, if
+        expected_sha256 is given, verified). If a mirror is attached and has
+        the URL, the network is not touched.
+
+        Args:
+            url: Source URL
+            destination: Final path
+            expected_sha256: Required SHA256 hex digest
+            resume: Continue a .part file left by an earlier run
+            timeout: Override the engine's (connect, read) timeout
+            use_mirror: Consult the attached mirror first
+
+        Returns:
+            DownloadResult with the SHA256 of the received bytes
+
+        Raises:
+            requests.RequestException: If the transfer fails after all retries
+            NetworkError: If the received file does not match expected_sha256
+        """
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+        if use_mirror and self.mirror is not None:
+            result = self._fetch_from_mirror(self.mirror, url, destination, expected_sha256)
+            if result is not None:
+                return result
+
+        partial = _PartialFile(destination)
+        resumed = partial.restore(url) if resume else False
+        if not resume:
+            partial.reset()
+
+        attempt = 0
+        with self._host_slot(url):
+            while True:
+                try:
+                    if self._transfer(url, partial, timeout or self.timeout):
+                        break
+                except RESUMABLE_ERRORS as e:
+                    attempt += 1
+                    if attempt > self.max_retries:
+                        raise
+                    delay = min(self.retry_delay * (2 ** (attempt - 1)), 30.0)
+                    logger.warning(
+                        f"Download interrupted at {partial.size} bytes ({e}); "
+                        f"resuming in {delay:.1f}s ({attempt}/{self.max_retries}): {url}"
+                    )
+                    time.sleep(delay)
+                    resumed = resumed or partial.size > 0
+                except requests.RequestException:
+                    partial.reset()
+                    raise
+
+        digest = partial.hasher.hexdigest()
+        if expected_sha256 and digest != expected_sha256.strip().lower():
+            partial.reset()
+            raise NetworkError(
+                what=f"Checksum mismatch for {destination.name}",
+                why=f"Expected: {expected_sha256}\nActual: {digest}",
+                how="The download may be corrupted or tampered with; do not use it.",
+            )
+
+        os.replace(partial.path, destination)
+        partial.meta_path.unlink(missing_ok=True)
+        get_hash_service().remember(destination, digest)
+
+        return DownloadResult(
+            url=url,
+            destination=destination,
+            success=True,
+            sha256=digest,
+            size=partial.size,
+            resumed=resumed,
+        )
+
+    @staticmethod
+    def _fetch_from_mirror(
+        mirror: MirrorSource, url: str, destination: Path, expected_sha256: Optional[str]
+    ) -> Optional[DownloadResult]:
+        digest = mirror.fetch_file(url, destination)
+        if digest is None:
+            return None
+        if expected_sha256 and digest != expected_sha256.strip().lower():
+            # The mirror was built against a different pin; fetch upstream instead
+            logger.warning(f"Mirror copy of {url} does not match the expected checksum")
+            destination.unlink(missing_ok=True)
+            return None
+        return DownloadResult(
+            url=url,
+            destination=destination,
+            success=True,
+            sha256=digest,
+            size=destination.stat().st_size,
+        )
+
+    def download(
+        self,
+        url: str,
+        destination: Path,
+        expected_sha256: Optional[str] = None,
+        resume: bool = True,
+        use_mirror: bool = True,
+    ) -> DownloadResult:
+        """Like fetch(), but failures are reported in the result instead of raised."""
+        try:
+            return self.fetch(url, destination, expected_sha256, resume, use_mirror=use_mirror)
+        except (requests.RequestException, NetworkError, OSError) as e:
+            logger.debug(f"Download failed: {url}: {e}")
+            return DownloadResult(
+                url=url, destination=Path(destination), success=False, error=str(e)
+            )
+
+    def download_many(
+        self, tasks: Iterable[DownloadTask], use_mirror: bool = True
+    ) -> List[DownloadResult]:
+        """
+        Download several files concurrently.
+
+        Per-host limits still apply, so a batch against one mirror does not
+        open more than per_host_limit connections to it.
+
+        Returns:
+            Results in the same order as tasks
+        """
+        tasks = list(tasks)
+
+        def _one(task: DownloadTask) -> DownloadResult:
+            return self.download(
+                task.url, task.destination, task.expected_sha256, use_mirror=use_mirror
+            )
+
+        if len(tasks) <= 1 or self.max_workers <= 1:
+            return [_one(task) for task in tasks]
+
+        workers = min(self.max_workers, len(tasks))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="download") as pool:
+            return list(pool.map(_one, tasks))
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+
+_engine: Optional[DownloadEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_download_engine(**kwargs: Any) -> DownloadEngine:
+    """Get the process-wide download engine (kwargs apply on first call only)."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = DownloadEngine(**kwargs)
+    return _engine
@@ -0,0 +1,351 @@
+"""
+Cached system facts: installed packages, systemd unit states, executables.
+
+Verify phases and validators ask the same questions over and over ("is git
+installed?", "is xrdp active?"), and each answer used to cost a fork of
+which, dpkg-query or systemctl. SystemFacts answers them from bulk data:
+
+- Packages: /var/lib/dpkg/status parsed directly, reloaded when the file
+  changes
+- Services: one ``systemctl list-unit-files`` and one ``systemctl
+  list-units`` call, reused until invalidated
+- Executables: a listing of every PATH directory, rescanned per directory
+  when its mtime changes
+
+Call ``invalidate()`` after anything that installs packages or changes
+services; ConfigurationModule does this for its own helpers.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ("packages", "services", "commands")
+
+_UNIT_SUFFIXES = (
+    ".service",
+    ".socket",
+    ".timer",
+    ".target",
+    ".mount",
+    ".path",
+    ".slice",
+    ".scope",
+    ".device",
+    ".swap",
+    ".automount",
+)
+
+
+@dataclass(frozen=True)
+class PackageFact:
+    """A package entry from the dpkg status database."""
+
+    name: str
+    version: str
+    architecture: str
+    status: str  # e.g. "install ok installed"
+
+    @property
+    def installed(self) -> bool:
+        return self.status.split()[-1:] == ["installed"]
+
+
+def parse_dpkg_status(text: str) -> Dict[str, PackageFact]:
+    """
+    Parse the dpkg status database.
+
+    Returns:
+        Mapping of package name (and name:arch for multi-arch entries) to its
+        entry; an installed entry wins over a removed one of the same name
+    """
+    packages: Dict[str, PackageFact] = {}
+
+    for stanza in text.split("\n\n"):
+        fields: Dict[str, str] = {}
+        for line in stanza.splitlines():
+            if not line or line[0] in " \t":
+                continue  # continuation lines (descriptions, conffiles)
+            key, sep, value = line.partition(":")
+            if sep and key in ("Package", "Status", "Version", "Architecture"):
+                fields[key] = value.strip()
+
+        name = fields.get("Package")
+        if not name:
+            continue
+
+        fact = PackageFact(
+            name=name,
+            version=fields.get("Version", ""),
+            architecture=fields.get("Architecture", ""),
+            status=fields.get("Status", ""),
+        )
+        for key in (name, f"{name}:{fact.architecture}"):
+            existing = packages.get(key)
+            if existing is None or (fact.installed and not existing.installed):
+                packages[key] = fact
+
+    return packages
+
+
+def _unit_name(service: str) -> str:
+    return service if service.endswith(_UNIT_SUFFIXES) else f"{service}.service"
+
+
+class SystemFacts:
+    """
+    Memoized answers to common system probes.
+
+    Thread-safe; modules running in parallel share one instance through
+    get_system_facts().
+
+    Usage:
+        facts = get_system_facts()
+        facts.is_package_installed("git")
+        facts.is_service_active("xrdp")
+        facts.command_exists("docker")
+        facts.invalidate("packages")   # after installing something
+    """
+
+    DPKG_STATUS = Path("/var/lib/dpkg/status")
+
+    def __init__(self, dpkg_status: Optional[Path] = None, search_path: Optional[str] = None):
+        """
+        Initialize SystemFacts.
+
+        Args:
+            dpkg_status: dpkg status database (default: /var/lib/dpkg/status)
+            search_path: PATH to resolve commands against (default: $PATH at query time)
+        """
+        self.dpkg_status = dpkg_status or self.DPKG_STATUS
+        self.search_path = search_path
+        self._lock = threading.RLock()
+
+        self._packages: Optional[Dict[str, PackageFact]] = None
+        self._packages_sig: Optional[Tuple[int, int, int]] = None
+
+        self._unit_files: Optional[Dict[str, str]] = None
+        self._active: Optional[Dict[str, str]] = None
+        self._unit_queries: Dict[Tuple[str, str], str] = {}
+
+        self._dir_listings: Dict[str, Tuple[int, FrozenSet[str]]] = {}
+
+        # Number of subprocesses spawned, for diagnostics
+        self.probes = 0
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, *scopes: str) -> None:
+        """
+        Forget cached facts.
+
+        Args:
+            scopes: Any of "packages", "services", "commands" (default: all)
+        """
+        unknown = set(scopes) - set(SCOPES)
+        if unknown:
+            raise ValueError(f"Unknown fact scope(s): {', '.join(sorted(unknown))}")
+
+        with self._lock:
+            if not scopes or "packages" in scopes:
+                self._packages = None
+                self._packages_sig = None
+            if not scopes or "services" in scopes:
+                self._unit_files = None
+                self._active = None
+                self._unit_queries.clear()
+            if not scopes or "commands" in scopes:
+                self._dir_listings.clear()
+
+    # ------------------------------------------------------------------
+    # Packages
+    # ------------------------------------------------------------------
+
+    def packages(self) -> Dict[str, PackageFact]:
+        """All entries of the dpkg status database (empty if there is none)."""
+        with self._lock:
+            try:
+                st = os.stat(self.dpkg_status)
+            except OSError:
+                self._packages, self._packages_sig = {}, None
+                return self._packages
+
+            sig = (st.st_ino, st.st_size, st.st_mtime_ns)
+            if self._packages is None or sig != self._packages_sig:
+                try:
+                    text = self.dpkg_status.read_text(encoding="utf-8", errors="replace")
+                except OSError as e:
+                    logger.debug(f"Cannot read {self.dpkg_status}: {e}")
+                    text = ""
+                self._packages = parse_dpkg_status(text)
+                self._packages_sig = sig
+            return self._packages
+
+    def package(self, name: str) -> Optional[PackageFact]:
+        """Look up a package (``name`` or ``name:arch``)."""
+        return self.packages().get(name)
+
+    def is_package_installed(self, name: str) -> bool:
+        fact = self.package(name)
+        return fact is not None and fact.installed
+
+    def package_version(self, name: str) -> Optional[str]:
+        """Installed version of a package, or None if it is not installed."""
+        fact = self.package(name)
+        return fact.version if fact is not None and fact.installed else None
+
+    # ------------------------------------------------------------------
+    # Services
+    # ------------------------------------------------------------------
+
+    def _systemctl(self, *args: str) -> Optional[subprocess.CompletedProcess]:
+        if shutil.which("systemctl") is None:
+            return None
+        self.probes += 1
+        try:
+            return subprocess.run(
+                ["systemctl", *args], capture_output=True, text=True, timeout=30, check=False
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"systemctl {' '.join(args)} failed: {e}")
+            return None
+
+    def _load_units(self) -> None:
+        unit_files: Dict[str, str] = {}
+        result = self._systemctl("list-unit-files", "--no-legend", "--no-pager", "--full")
+        if result is not None and result.returncode == 0:
+            for line in result.stdout.splitlines():
+                parts = line.split()
+                if len(parts) >= 2:
+                    unit_files[parts[0]] = parts[1]
+
+        active: Dict[str, str] = {}
+        result = self._systemctl(
+            "list-units", "--all", "--no-legend", "--no-pager", "--plain", "--full"
+        )
+        if result is not None and result.returncode == 0:
+            for line in result.stdout.splitlines():
+                parts = line.split()
+                if len(parts) >= 3:
+                    active[parts[0]] = parts[2]
+
+        self._unit_files = unit_files
+        self._active = active
+
+    def _query_unit(self, verb: str, unit: str) -> str:
+        """Ask systemctl about one unit (aliases and templates) and remember the answer."""
+        key = (verb, unit)
+        if key not in self._unit_queries:
+            result = self._systemctl(verb, unit)
+            self._unit_queries[key] = result.stdout.strip() if result is not None else ""
+        return self._unit_queries[key]
+
+    def unit_file_state(self, service: str) -> Optional[str]:
+        """
+        State of a unit file ("enabled", "disabled", "masked", "static", ...).
+
+        Returns:
+            The state, or None if systemd does not know the unit
+        """
+        unit = _unit_name(service)
+        with self._lock:
+            if self._unit_files is None:
+                self._load_units()
+            assert self._unit_files is not None
+            state = self._unit_files.get(unit)
+            if state is None or state == "alias":
+                # Aliases (sshd -> ssh) and instances are resolved by systemctl itself
+                state = self._query_unit("is-enabled", unit)
+            return state if state and state != "not-found" else None
+
+    def active_state(self, service: str) -> str:
+        """Active state of a unit ("active", "inactive", "failed", ...)."""
+        unit = _unit_name(service)
+        with self._lock:
+            if self._active is None:
+                self._load_units()
+            assert self._active is not None
+            state = self._active.get(unit)
+            if state is None:
+                state = self._query_unit("is-active", unit) or "inactive"
+            return state
+
+    def is_service_enabled(self, service: str) -> bool:
+        return self.unit_file_state(service) == "enabled"
+
+    def is_service_active(self, service: str) -> bool:
+        return self.active_state(service) == "active"
+
+    # ------------------------------------------------------------------
+    # Executables
+    # ------------------------------------------------------------------
+
+    def _listing(self, directory: str) -> FrozenSet[str]:
+        """Entries of a PATH directory, rescanned only when its mtime changes."""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return frozenset()
+
+        cached = self._dir_listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with os.scandir(directory) as entries:
+                names = frozenset(entry.name for entry in entries)
+        except OSError:
+            names = frozenset()
+        self._dir_listings[directory] = (mtime, names)
+        return names
+
+    def which(self, command: str) -> Optional[str]:
+        """
+        Resolve a command like ``which`` does, without forking.
+
+        Returns:
+            Full path of the executable, or None
+        """
+        if not command:
+            return None
+        if os.sep in command:
+            return command if os.path.isfile(command) and os.access(command, os.X_OK) else None
+
+        search_path = self.search_path
+        if search_path is None:
+            search_path = os.environ.get("PATH", os.defpath)
+
+        with self._lock:
+            for directory in search_path.split(os.pathsep):
+                if not directory or command not in self._listing(directory):
+                    continue
+                candidate = os.path.join(directory, command)
+                if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                    return candidate
+        return None
+
+    def command_exists(self, command: str) -> bool:
+        return self.which(command) is not None
+
+
+_facts: Optional[SystemFacts] = None
+_facts_lock = threading.Lock()
+
+
+def get_system_facts() -> SystemFacts:
+    """Get the process-wide facts cache."""
+    global _facts
+    if _facts is None:
+        with _facts_lock:
+            if _facts is None:
+                _facts = SystemFacts()
+    return _facts
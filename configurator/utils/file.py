@@ -2,8 +2,10 @@
 File operation utilities with backup support.
 """
 
+import hashlib
 import os
 import shutil
+import stat
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Union
@@ -113,6 +115,7 @@ from pathlib import Path
 from typing import Optional, Union
 
 from configurator.utils.file_lock import file_lock
+from configurator.utils.hashing import get_hash_service
 
 # Default backup directory
 
@@ -121,6 +124,23 @@ BACKUP_DIR = Path("/var/backups/debian-vps-configurator")
 # ... ensure_dir, backup_file, restore_file unchanged ...
 
 
+def file_has_content(path: Union[str, Path], content: str) -> bool:
+    """
+    Check whether a regular file already holds exactly this content.
+
+    Compares sizes first, then SHA256 digests (cached per stat signature,
+    so repeated checks of an unchanged file do not re-read it).
+    """
+    data = content.encode("utf-8")
+    try:
+        st = os.stat(path)
+        if not stat.S_ISREG(st.st_mode) or st.st_size != len(data):
+            return False
+        return get_hash_service().hash_file(path) == hashlib.sha256(data).hexdigest()
+    except OSError:
+        return False
+
+
 def write_file(
     path: Union[str, Path],
     content: str,
@@ -132,6 +152,9 @@ def write_file(
     """
     Write content to a file with optional backup (Thread-Safe).
 
+    Identical content is not rewritten (or backed up); only mode and
+    ownership are applied.
+
     Args:
         path: File path
         content: Content to write
@@ -149,13 +172,16 @@ def write_file(
     ensure_dir(path.parent)
 
     with file_lock(str(path)):
+        unchanged = file_has_content(path, content)
+
         # Backup existing file
-        if backup and path.exists():
+        if backup and not unchanged and path.exists():
             backup_file(path)
 
         # Write content
         try:
-            path.write_text(content, encoding="utf-8")
+            if not unchanged:
+                path.write_text(content, encoding="utf-8")
             os.chmod(path, mode)
 
             # Set ownership if specified
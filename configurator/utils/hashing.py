@@ -0,0 +1,287 @@
+"""
+Shared file hashing service.
+
+Supply chain verification, the package cache and file integrity monitoring
+all hash the same files. This module gives them one implementation with:
+
+- Large-buffer reads, and mmap for big files (one update call, GIL released)
+- A shared thread pool for hashing many files at once
+- An in-process digest cache keyed by the file's stat signature, so an
+  unchanged file is never rehashed within a run
+- Digests computed while writing a file (downloads, mirror copies) are
+  held back until the file leaves the racy window, then reused if its
+  signature is still the same
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class FileSignature(NamedTuple):
+    """Stat fields that change whenever a file's bytes can have changed."""
+
+    dev: int
+    inode: int
+    size: int
+    mtime_ns: int
+    ctime_ns: int
+
+    @classmethod
+    def from_stat(cls, st: os.stat_result) -> "FileSignature":
+        return cls(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+    @classmethod
+    def of(cls, path: PathLike) -> "FileSignature":
+        return cls.from_stat(os.stat(path))
+
+
+class HashService:
+    """
+    Hashes files with a stat-keyed digest cache and a shared worker pool.
+
+    Usage:
+        hasher = get_hash_service()
+        digest = hasher.hash_file("/tmp/go.tar.gz")
+        ok = hasher.verify_file("/tmp/go.tar.gz", expected_sha256)
+        digests = hasher.hash_files(paths)
+    """
+
+    BUFFER_SIZE = 1024 * 1024
+    MMAP_THRESHOLD = 8 * 1024 * 1024
+    # Files touched this recently may be rewritten within the same timestamp
+    # tick without any stat field changing, so their digests are not cached.
+    RACY_WINDOW_NS = 2_000_000_000
+
+    def __init__(self, max_workers: Optional[int] = None, cache_size: int = 4096):
+        """
+        Initialize HashService.
+
+        Args:
+            max_workers: Thread pool size (default: min(8, cpu_count))
+            cache_size: Maximum number of cached digests
+        """
+        self.max_workers = max_workers or min(8, os.cpu_count() or 2)
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[tuple, str]" = OrderedDict()
+        # Digests remembered for files still inside the racy window
+        self._pending: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Hashing
+    # ------------------------------------------------------------------
+
+    def _digest_file(self, path: PathLike, algorithm: str, size: int) -> str:
+        hasher = hashlib.new(algorithm)
+
+        with open(path, "rb") as f:
+            if size >= self.MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher.update(mapped)
+            else:
+                buffer = bytearray(min(self.BUFFER_SIZE, max(size, 1)))
+                view = memoryview(buffer)
+                while True:
+                    n = f.readinto(buffer)
+                    if not n:
+                        break
+                    hasher.update(view[:n])
+
+        return hasher.hexdigest()
+
+    def _is_racy(self, sig: FileSignature) -> bool:
+        return max(sig.mtime_ns, sig.ctime_ns) + self.RACY_WINDOW_NS >= time.time_ns()
+
+    def _lookup(self, key: tuple) -> Optional[str]:
+        with self._lock:
+            digest = self._cache.get(key)
+            if digest is None and key in self._pending and not self._is_racy(key[0]):
+                # The signature recorded when the digest was computed has
+                # outlived the racy window unchanged: promote it
+                digest = self._pending.pop(key)
+                self._cache[key] = digest
+            if digest is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return digest
+
+    def _store(self, key: tuple, digest: str) -> None:
+        with self._lock:
+            self._cache[key] = digest
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def hash_file(self, path: PathLike, algorithm: str = "sha256", use_cache: bool = True) -> str:
+        """
+        Hash a file.
+
+        Args:
+            path: File to hash
+            algorithm: hashlib algorithm name
+            use_cache: Reuse a digest computed for the same stat signature
+
+        Returns:
+            Hex digest
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        sig = FileSignature.of(path)
+        key = (sig, algorithm)
+
+        if use_cache:
+            cached = self._lookup(key)
+            if cached is not None:
+                return cached
+
+        digest = self._digest_file(path, algorithm, sig.size)
+
+        # Only cache if the file did not move underneath us and is not racy
+        if use_cache and not self._is_racy(sig):
+            try:
+                if FileSignature.of(path) == sig:
+                    self._store(key, digest)
+            except OSError:
+                pass
+
+        return digest
+
+    def verify_file(self, path: PathLike, expected: str, algorithm: str = "sha256") -> bool:
+        """Check a file's digest against an expected hex digest (case-insensitive)."""
+        return self.hash_file(path, algorithm).lower() == expected.strip().lower()
+
+    def stable_signature(self, path: PathLike) -> Optional[FileSignature]:
+        """
+        Get a file's stat signature if it is safe to persist.
+
+        Returns None for files modified within the racy window, whose
+        signature could survive a same-tick rewrite.
+        """
+        sig = FileSignature.of(path)
+        return None if self._is_racy(sig) else sig
+
+    def remember(self, path: PathLike, digest: str, algorithm: str = "sha256") -> None:
+        """
+        Seed the cache with a digest computed elsewhere (e.g. while downloading).
+
+        The digest is bound to the file's current stat signature. A file that
+        was just written is still racy, so its digest is parked and only used
+        once a later lookup finds the same signature after the window.
+        """
+        sig = FileSignature.of(path)
+        key = (sig, algorithm)
+        if not self._is_racy(sig):
+            self._store(key, digest)
+            return
+
+        with self._lock:
+            self._pending[key] = digest
+            self._pending.move_to_end(key)
+            while len(self._pending) > self.cache_size:
+                self._pending.popitem(last=False)
+
+    def invalidate(self, path: Optional[PathLike] = None) -> None:
+        """Drop cached digests for one file, or everything."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+                self._pending.clear()
+                return
+            try:
+                sig = FileSignature.of(path)
+            except OSError:
+                return
+            for cache in (self._cache, self._pending):
+                for key in [k for k in cache if k[0] == sig]:
+                    del cache[key]
+
+    # ------------------------------------------------------------------
+    # Parallel helpers
+    # ------------------------------------------------------------------
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="hash"
+                )
+            return self._executor
+
+    def map(self, func: Callable[[T], R], items: Iterable[T], min_parallel: int = 2) -> Iterator[R]:
+        """
+        Run func over items on the shared pool, preserving order.
+
+        Small batches run inline to avoid thread hand-off overhead.
+        """
+        items = list(items)
+        if len(items) < min_parallel or self.max_workers <= 1:
+            return iter([func(item) for item in items])
+        return self._pool().map(func, items)
+
+    def hash_files(
+        self, paths: Iterable[PathLike], algorithm: str = "sha256", use_cache: bool = True
+    ) -> Dict[str, Optional[str]]:
+        """
+        Hash many files concurrently.
+
+        Returns:
+            Mapping of path to hex digest (None for unreadable files)
+        """
+        paths_list: List[PathLike] = list(paths)
+
+        def _one(path: PathLike) -> Optional[str]:
+            try:
+                return self.hash_file(path, algorithm, use_cache)
+            except OSError as e:
+                logger.debug(f"Cannot hash {path}: {e}")
+                return None
+
+        return {str(p): d for p, d in zip(paths_list, self.map(_one, paths_list), strict=True)}
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (it is recreated on demand)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
+
+
+_service: Optional[HashService] = None
+_service_lock = threading.Lock()
+
+
+def get_hash_service() -> HashService:
+    """Get the process-wide hash service."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = HashService()
+    return _service
+
+
+def hash_file(path: PathLike, algorithm: str = "sha256") -> str:
+    """Hash a file with the shared service."""
+    return get_hash_service().hash_file(path, algorithm)
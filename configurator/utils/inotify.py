@@ -0,0 +1,164 @@
+"""
+Minimal inotify bindings via ctypes.
+
+Linux-only; ``is_available()`` returns False elsewhere (or when libc does not
+export inotify), so callers can fall back to periodic checks.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from typing import Dict, List, NamedTuple, Optional
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# Everything that can change a file's content, metadata or presence
+WATCH_CHANGES = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+_libc: Optional[ctypes.CDLL] = None
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    global _libc
+    if _libc is None:
+        name = ctypes.util.find_library("c")
+        if not name:
+            return None
+        try:
+            libc = ctypes.CDLL(name, use_errno=True)
+        except OSError:
+            return None
+        if not hasattr(libc, "inotify_init1"):
+            return None
+        _libc = libc
+    return _libc
+
+
+def is_available() -> bool:
+    """Check whether inotify can be used on this system."""
+    return _load_libc() is not None
+
+
+class InotifyEvent(NamedTuple):
+    """A decoded inotify event."""
+
+    path: str
+    mask: int
+
+    @property
+    def overflowed(self) -> bool:
+        return bool(self.mask & IN_Q_OVERFLOW)
+
+
+class Inotify:
+    """
+    Thin wrapper around an inotify file descriptor.
+
+    Usage:
+        with Inotify() as watcher:
+            watcher.add_watch("/etc")
+            for event in watcher.read_events(timeout=1.0):
+                print(event.path, event.mask)
+    """
+
+    def __init__(self) -> None:
+        libc = _load_libc()
+        if libc is None:
+            raise OSError("inotify is not available on this system")
+
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self._watches: Dict[int, str] = {}
+
+    def __enter__(self) -> "Inotify":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def add_watch(self, path: str, mask: int = WATCH_CHANGES) -> int:
+        """
+        Watch a file or directory.
+
+        Returns:
+            Watch descriptor
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+
+        self._watches[wd] = path
+        return wd
+
+    def read_events(self, timeout: Optional[float] = None) -> List[InotifyEvent]:
+        """
+        Wait up to timeout seconds and return pending events.
+
+        Events for directory watches carry the full path of the child.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events: List[InotifyEvent] = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            base = self._watches.get(wd, "")
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            path = os.path.join(base, os.fsdecode(name)) if name else base
+            events.append(InotifyEvent(path=path, mask=mask))
+
+        return events
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+            self._watches.clear()
@@ -3,14 +3,62 @@ Network utilities for connectivity checks and downloads.
 """
 
 import socket
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from pathlib import Path
-from typing import Any, Optional, Tuple, cast
+from typing import Any, Callable, Optional, Sequence, Tuple, cast
 
 import requests
 
 from configurator.exceptions import NetworkError
 
 
+def first_success(
+    checks: Sequence[Callable[[], bool]], timeout: Optional[float] = None
+) -> Optional[int]:
+    """
+    Run checks concurrently and return as soon as one succeeds.
+
+    Meant for racing equivalent endpoints: the answer comes from the fastest
+    one, and slow or dead endpoints only matter when all of them fail.
+    Checks still running when a result is known are left to finish (they
+    should have their own timeouts); a check that raises counts as failed.
+
+    Args:
+        checks: Callables returning True on success
+        timeout: Give up after this many seconds (default: wait for all)
+
+    Returns:
+        Index of the first successful check, or None
+    """
+    if not checks:
+        return None
+
+    pool = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="race")
+    futures = {pool.submit(check): index for index, check in enumerate(checks)}
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            try:
+                if future.result():
+                    return futures[future]
+            except Exception:
+                continue
+    except FuturesTimeoutError:
+        pass
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return None
+
+
+def can_connect(host: str, port: int, timeout: float = 5) -> bool:
+    """Check whether a TCP connection to host:port can be opened."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
 def check_internet(
     hosts: Optional[list[tuple[str, int]]] = None,
     timeout: int = 5,
@@ -18,6 +66,8 @@ def check_internet(
     """
     Check internet connectivity.
 
+    All hosts are tried at once; the first successful connection answers.
+
     Args:
         hosts: List of hosts to check (default: common DNS servers)
         timeout: Connection timeout in seconds
@@ -32,15 +82,8 @@ def check_internet(
             ("9.9.9.9", 53),  # Quad9 DNS
         ]
 
-    for host, port in hosts:
-        try:
-            socket.setdefaulttimeout(timeout)
-            socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
-            return True
-        except (socket.error, socket.timeout):
-            continue
-
-    return False
+    checks = [lambda host=host, port=port: can_connect(host, port, timeout) for host, port in hosts]
+    return first_success(checks) is not None
 
 
 def check_url_reachable(url: str, timeout: int = 10) -> Tuple[bool, int]:
@@ -61,6 +104,7 @@ def check_url_reachable(url: str, timeout: int = 10) -> Tuple[bool, int]:
         return False, 0
 
 
+from configurator.utils.download import get_download_engine
 from configurator.utils.retry import retry
 
 
@@ -77,8 +121,8 @@ def download_file(
     Args:
         url: URL to download from
         destination: Local path to save file
-        timeout: Download timeout in seconds
-        show_progress: Show download progress (for large files)
+        timeout: Read timeout in seconds (per chunk, not for the whole file)
+        show_progress: Unused; kept for backward compatibility
 
     Returns:
         Path to downloaded file
@@ -87,31 +131,13 @@ def download_file(
         NetworkError if download fails
     """
     try:
-        # Create destination directory if needed
-        destination.parent.mkdir(parents=True, exist_ok=True)
-
-        # Download file
-        response = requests.get(url, stream=True, timeout=timeout)
-        response.raise_for_status()
-
-        total_size = int(response.headers.get("content-length", 0))
-
-        with open(destination, "wb") as f:
-            if show_progress and total_size > 1024 * 1024:  # > 1MB
-                downloaded = 0
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-                    downloaded += len(chunk)
-            else:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
+        get_download_engine().fetch(url, destination, timeout=(min(timeout, 30), timeout))
         return destination
 
     except requests.Timeout:
         raise NetworkError(
             what=f"Download timed out: {url}",
-            why=f"Download did not complete within {timeout} seconds",
+            why=f"No data received for {timeout} seconds",
             how="Check your internet connection and try again.\n"
             "If the file is large, the download might need more time.",
         )
@@ -0,0 +1,511 @@
+"""
+Asyncio subprocess engine with streaming output and concurrency budgets.
+
+Every command the configurator runs goes through one engine instead of a
+blocking ``subprocess.run`` per call:
+
+- One event loop (on a background thread) owns every child process; sync
+  callers from any thread and async callers from any loop share it
+- stdout/stderr are read incrementally and each line is logged as it
+  arrives; only a bounded tail of each stream is kept in memory
+- Per-resource budgets (dpkg, network, cpu) bound how many commands of a
+  kind run at once, so parallel modules queue for the dpkg lock instead of
+  failing on it
+- Timeouts kill the whole process group, not just the direct child
+- Commands without shell syntax are executed directly, without /bin/sh
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import re
+import shlex
+import signal
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from configurator.exceptions import ModuleExecutionError
+
+logger = logging.getLogger(__name__)
+
+Command = Union[str, Sequence[str]]
+
+# Called with ("stdout" | "stderr", line) for every line a command prints
+LineCallback = Callable[[str, str], None]
+
+DEFAULT_BUDGETS: Dict[str, int] = {
+    "dpkg": 1,  # apt/dpkg hold exclusive locks
+    "network": 4,
+    "cpu": max(4, 2 * (os.cpu_count() or 1)),
+}
+
+# Anything the shell would interpret (conservative: quoted occurrences count too)
+_SHELL_SYNTAX = re.compile(r"[|&;<>()$`*?\[\]{}~#\n]")
+
+_SHELL_BUILTINS = frozenset(
+    {
+        ".",
+        ":",
+        "alias",
+        "cd",
+        "eval",
+        "exec",
+        "export",
+        "for",
+        "if",
+        "read",
+        "set",
+        "shopt",
+        "source",
+        "trap",
+        "ulimit",
+        "umask",
+        "unset",
+        "until",
+        "wait",
+        "while",
+    }
+)
+
+_DPKG_COMMANDS = frozenset({"apt", "apt-get", "aptitude", "dpkg", "dpkg-reconfigure"})
+_NETWORK_COMMANDS = frozenset({"curl", "wget"})
+_NETWORK_GIT_VERBS = frozenset({"clone", "fetch", "pull", "push", "ls-remote"})
+
+
+def needs_shell(command: str) -> bool:
+    """
+    Check whether a command string needs /bin/sh to mean what it says.
+
+    Pipes, redirects, expansions, globs, builtins and leading ``VAR=value``
+    assignments all do; a plain argv does not.
+    """
+    if _SHELL_SYNTAX.search(command):
+        return True
+    try:
+        words = shlex.split(command)
+    except ValueError:
+        return True
+    if not words:
+        return True
+    first = words[0]
+    return first in _SHELL_BUILTINS or ("=" in first and not first.startswith("="))
+
+
+def infer_resource(command: Command) -> str:
+    """
+    Guess which budget a command draws from.
+
+    Looks at the first program of the command (skipping sudo/env prefixes):
+    apt and dpkg use "dpkg", downloads and git transfers use "network",
+    everything else "cpu".
+    """
+    text = command if isinstance(command, str) else shlex.join(command)
+    try:
+        words = shlex.split(re.split(r"[|;&]", text, maxsplit=1)[0])
+    except ValueError:
+        words = text.split()
+
+    while words and (words[0] in ("sudo", "env", "nice", "nohup") or "=" in words[0]):
+        words = words[1:]
+        while words and words[0].startswith("-"):
+            words = words[2:] if words[0] in ("-u", "-g") else words[1:]
+
+    if not words:
+        return "cpu"
+    program = os.path.basename(words[0])
+    if program in _DPKG_COMMANDS:
+        return "dpkg"
+    if program in _NETWORK_COMMANDS:
+        return "network"
+    if program == "git" and _NETWORK_GIT_VERBS.intersection(words[1:3]):
+        return "network"
+    return "cpu"
+
+
+@dataclass
+class CommandResult:
+    """Result of a command execution."""
+
+    command: str
+    return_code: int
+    stdout: str
+    stderr: str
+
+    @property
+    def success(self) -> bool:
+        """Check if command was successful."""
+        return self.return_code == 0
+
+    @property
+    def output(self) -> str:
+        """Get combined stdout and stderr."""
+        return f"{self.stdout}\n{self.stderr}".strip()
+
+    def check_returncode(self) -> None:
+        """
+        Raise exception if return code is non-zero.
+        Mimics subprocess.CompletedProcess.check_returncode().
+        """
+        if self.return_code != 0:
+            raise ModuleExecutionError(
+                what=f"Command failed: {self.command}",
+                why=f"Exit code: {self.return_code}\n{self.output}",
+                how="Check command output for details",
+            )
+
+
+class _Tail:
+    """Keeps the last ``limit`` bytes written to it."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.chunks: Deque[bytes] = deque()
+        self.size = 0
+        self.dropped = 0
+
+    def write(self, data: bytes) -> None:
+        self.chunks.append(data)
+        self.size += len(data)
+        while self.size > self.limit:
+            excess = self.size - self.limit
+            first = self.chunks[0]
+            if len(first) <= excess:
+                self.chunks.popleft()
+                excess = len(first)
+            else:
+                self.chunks[0] = first[excess:]
+            self.size -= excess
+            self.dropped += excess
+
+    def text(self) -> str:
+        text = b"".join(self.chunks).decode("utf-8", errors="replace")
+        if self.dropped:
+            text = f"[... {self.dropped} bytes of output omitted ...]\n{text}"
+        return text
+
+
+class CommandEngine:
+    """
+    Runs commands on a shared asyncio loop.
+
+    Thread-safe; all modules share one instance through get_command_engine().
+
+    Usage:
+        engine = get_command_engine()
+        result = engine.run("apt-get install -y git", timeout=600)
+
+        # Independent commands, concurrently within their budgets
+        results = engine.run_many(["git clone A a", "git clone B b"], check=False)
+
+        # From a coroutine
+        result = await engine.run_async(["systemctl", "is-active", "xrdp"], check=False)
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        max_output: int = 8 * 1024 * 1024,
+        kill_grace: float = 5.0,
+    ):
+        """
+        Initialize CommandEngine.
+
+        Args:
+            budgets: Concurrent commands per resource (merged over DEFAULT_BUDGETS)
+            max_output: Bytes of each stream kept for the result (the tail)
+            kill_grace: Seconds between SIGTERM and SIGKILL on timeout
+        """
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.max_output = max_output
+        self.kill_grace = kill_grace
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    # ------------------------------------------------------------------
+    # Loop management
+    # ------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="command-engine", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _submit(self, coro: Coroutine[Any, Any, CommandResult]) -> concurrent.futures.Future:
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("CommandEngine.run() called from the engine loop; use run_async()")
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def _semaphore(self, resource: str) -> asyncio.Semaphore:
+        # Only touched from the engine loop, so no lock needed
+        if resource not in self._semaphores:
+            self._semaphores[resource] = asyncio.Semaphore(self.budgets.get(resource, 1))
+        return self._semaphores[resource]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run(self, command: Command, **kwargs: Any) -> CommandResult:
+        """
+        Run a command and wait for it (see run_async for arguments).
+
+        Raises:
+            ModuleExecutionError: On failure (with check), timeout or missing program
+        """
+        return self._submit(self._execute(command, **kwargs)).result()
+
+    async def run_async(self, command: Command, **kwargs: Any) -> CommandResult:
+        """
+        Run a command from any event loop.
+
+        Args:
+            command: Shell string or argv list
+            check: Raise ModuleExecutionError on a non-zero exit (default True)
+            shell: True/False, or None to use a shell only when the string needs one
+            cwd: Working directory
+            env: Environment (default: inherited)
+            timeout: Seconds before the process group is killed
+            input_text: Text written to stdin
+            capture_output: Keep stdout/stderr (False: inherit the terminal)
+            resource: Budget to draw from (default: inferred from the command)
+            on_line: Called with (stream, line) for every output line
+            log: Logger for streamed lines (DEBUG level)
+
+        Returns:
+            CommandResult
+        """
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await self._execute(command, **kwargs)
+        return await asyncio.wrap_future(self._submit(self._execute(command, **kwargs)))
+
+    def run_many(self, commands: Iterable[Command], **kwargs: Any) -> List[CommandResult]:
+        """
+        Run independent commands concurrently, each within its budget.
+
+        All commands run to completion; with check=True the first failure (in
+        input order) is raised afterwards.
+
+        Returns:
+            Results in input order
+        """
+        futures = [self._submit(self._execute(command, **kwargs)) for command in commands]
+        concurrent.futures.wait(futures)
+        return [future.result() for future in futures]
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def _execute(
+        self,
+        command: Command,
+        check: bool = True,
+        shell: Optional[bool] = False,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        input_text: Optional[str] = None,
+        capture_output: bool = True,
+        resource: Optional[str] = None,
+        on_line: Optional[LineCallback] = None,
+        log: Optional[logging.Logger] = None,
+    ) -> CommandResult:
+        cmd_str = command if isinstance(command, str) else " ".join(command)
+        if shell is None:
+            shell = isinstance(command, str) and needs_shell(command)
+        log = log or logger
+
+        async with self._semaphore(resource or infer_resource(command)):
+            pipe = asyncio.subprocess.PIPE if capture_output else None
+            stdin = asyncio.subprocess.PIPE if input_text is not None else None
+            try:
+                if shell:
+                    proc = await asyncio.create_subprocess_shell(
+                        cmd_str,
+                        stdin=stdin,
+                        stdout=pipe,
+                        stderr=pipe,
+                        cwd=cwd,
+                        env=env,
+                        start_new_session=True,
+                    )
+                else:
+                    argv = shlex.split(command) if isinstance(command, str) else list(command)
+                    proc = await asyncio.create_subprocess_exec(
+                        *argv,
+                        stdin=stdin,
+                        stdout=pipe,
+                        stderr=pipe,
+                        cwd=cwd,
+                        env=env,
+                        start_new_session=True,
+                    )
+            except FileNotFoundError:
+                program = cmd_str.split()[0] if cmd_str.split() else cmd_str
+                raise ModuleExecutionError(
+                    what=f"Command not found: {program}",
+                    why="The command or program is not installed",
+                    how=f"Install the required package:\n  sudo apt-get install {program}",
+                ) from None
+
+            stdout, stderr = _Tail(self.max_output), _Tail(self.max_output)
+            try:
+                await asyncio.wait_for(
+                    self._communicate(proc, input_text, stdout, stderr, on_line, log),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                await self._kill(proc)
+                raise ModuleExecutionError(
+                    what=f"Command timed out: {cmd_str}",
+                    why=f"Command did not complete within {timeout} seconds",
+                    how="This might indicate a hung process or network issue. Try:\n"
+                    "1. Check your internet connection\n"
+                    "2. Increase the timeout if this is expected\n"
+                    "3. Run the command manually to debug",
+                ) from None
+            except BaseException:
+                await self._kill(proc)
+                raise
+
+        result = CommandResult(
+            command=cmd_str,
+            return_code=proc.returncode if proc.returncode is not None else -1,
+            stdout=stdout.text(),
+            stderr=stderr.text(),
+        )
+        if check and not result.success:
+            raise ModuleExecutionError(
+                what=f"Command failed: {cmd_str}",
+                why=f"Exit code: {result.return_code}\n{result.stderr.strip()}",
+                how="Check the command output above for details. You may need to:\n"
+                "1. Check if required packages are installed\n"
+                "2. Verify you have the necessary permissions\n"
+                "3. Check your internet connection",
+            )
+        return result
+
+    async def _communicate(
+        self,
+        proc: asyncio.subprocess.Process,
+        input_text: Optional[str],
+        stdout: _Tail,
+        stderr: _Tail,
+        on_line: Optional[LineCallback],
+        log: logging.Logger,
+    ) -> None:
+        tasks = []
+        if proc.stdout is not None:
+            tasks.append(self._pump(proc.stdout, "stdout", stdout, on_line, log))
+        if proc.stderr is not None:
+            tasks.append(self._pump(proc.stderr, "stderr", stderr, on_line, log))
+        if proc.stdin is not None:
+            tasks.append(self._feed(proc.stdin, input_text or ""))
+        await asyncio.gather(*tasks)
+        await proc.wait()
+
+    @staticmethod
+    async def _feed(stdin: asyncio.StreamWriter, text: str) -> None:
+        try:
+            stdin.write(text.encode())
+            await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The process exited without reading its input
+        finally:
+            stdin.close()
+
+    @staticmethod
+    async def _pump(
+        stream: asyncio.StreamReader,
+        name: str,
+        sink: _Tail,
+        on_line: Optional[LineCallback],
+        log: logging.Logger,
+    ) -> None:
+        """Copy a stream into sink, emitting complete lines as they arrive."""
+        pending = b""
+        while True:
+            chunk = await stream.read(64 * 1024)
+            if not chunk:
+                break
+            sink.write(chunk)
+            # apt and curl redraw progress with carriage returns
+            lines = re.split(rb"\r\n|\r|\n", pending + chunk)
+            pending = lines.pop()
+            if len(pending) > 64 * 1024:
+                lines.append(pending)
+                pending = b""
+            for raw in lines:
+                line = raw.decode("utf-8", errors="replace")
+                if not line:
+                    continue
+                log.debug(f"[{name}] {line}")
+                if on_line is not None:
+                    on_line(name, line)
+        if pending:
+            line = pending.decode("utf-8", errors="replace")
+            log.debug(f"[{name}] {line}")
+            if on_line is not None:
+                on_line(name, line)
+
+    async def _kill(self, proc: asyncio.subprocess.Process) -> None:
+        """
+        SIGTERM the process group, then SIGKILL it after the grace period.
+
+        The group is signalled even if the direct child already exited:
+        background grandchildren may still hold its output pipes open.
+        """
+        for sig, wait in ((signal.SIGTERM, self.kill_grace), (signal.SIGKILL, None)):
+            try:
+                os.killpg(proc.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                pass
+            try:
+                await asyncio.wait_for(proc.wait(), wait)
+                return
+            except asyncio.TimeoutError:
+                continue
+
+
+_engine: Optional[CommandEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_command_engine(**kwargs: Any) -> CommandEngine:
+    """Get the process-wide command engine (kwargs apply on first call only)."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = CommandEngine(**kwargs)
+    return _engine
@@ -0,0 +1,245 @@
+"""
+Per-user fan-out of dotfiles and login shells.
+
+Desktop and shell personalization writes the same handful of files
+(.zshrc, .p10k.zsh, xsettings.xml, ...) into every regular user's home.
+UserFanout renders nothing itself: callers hand it content rendered once
+(or a small update function for files that are edited in place), and it
+
+- writes each user's files from a bounded thread pool, each one through a
+  temporary file and an atomic rename, already owned by the user
+- skips files whose content is already correct
+- fixes ownership of the directories it touched in one pass per user
+- changes login shells for all users in a single command
+
+and reports success per user.
+"""
+
+import logging
+import os
+import pwd
+import shlex
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from configurator.utils.command import CommandResult
+from configurator.utils.file import file_has_content
+
+Runner = Callable[..., CommandResult]
+
+
+def regular_users() -> List[pwd.struct_passwd]:
+    """Regular (UID 1000-59999) accounts."""
+    return [u for u in pwd.getpwall() if 1000 <= u.pw_uid < 60000]
+
+
+@dataclass
+class UserFile:
+    """
+    A file written into every user's home directory.
+
+    Exactly one of content (the same for every user) or update must be set.
+    update receives the file's current content and returns the new content,
+    or None to leave it alone; it is only called for files that exist.
+    """
+
+    path: str  # Relative to the home directory
+    content: Optional[str] = None
+    update: Optional[Callable[[str], Optional[str]]] = None
+    mode: int = 0o644
+
+
+@dataclass
+class FanoutReport:
+    """Outcome of a fan-out, per user."""
+
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)  # user -> error
+    changed: Dict[str, List[str]] = field(default_factory=dict)  # user -> paths written
+    created: List[str] = field(default_factory=list)  # files that did not exist before
+
+    @property
+    def success(self) -> bool:
+        return not self.failed
+
+
+class UserFanout:
+    """
+    Apply the same per-user changes to many accounts.
+
+    Usage:
+        fanout = UserFanout()
+        report = fanout.write_files(regular_users(), [UserFile(".zshrc", zshrc)])
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        dry_run: bool = False,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize UserFanout.
+
+        Args:
+            max_workers: Users handled concurrently
+            dry_run: Report what would change without writing
+            logger: Optional logger instance
+        """
+        self.max_workers = max(1, max_workers)
+        self.dry_run = dry_run
+        self.logger = logger or logging.getLogger(__name__)
+
+    def write_files(
+        self, users: Sequence[pwd.struct_passwd], files: Sequence[UserFile]
+    ) -> FanoutReport:
+        """
+        Write files into each user's home directory.
+
+        Args:
+            users: Accounts to configure
+            files: Files to write for each of them
+
+        Returns:
+            FanoutReport with per-user results
+        """
+        report = FanoutReport()
+        if not users or not files:
+            return report
+
+        if self.dry_run:
+            self.logger.info(
+                f"[DRY RUN] Would write {', '.join(f.path for f in files)} for {len(users)} user(s)"
+            )
+            report.succeeded = [u.pw_name for u in users]
+            return report
+
+        workers = min(self.max_workers, len(users))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="user-fanout") as pool:
+            futures = [(user, pool.submit(self._apply_user, user, files)) for user in users]
+
+        # Results are collected in submission order, so reports are stable
+        for user, future in futures:
+            try:
+                changed, created = future.result()
+            except Exception as e:
+                report.failed[user.pw_name] = str(e)
+                self.logger.warning(f"Failed to configure {user.pw_name}: {e}")
+                continue
+            report.succeeded.append(user.pw_name)
+            if changed:
+                report.changed[user.pw_name] = changed
+            report.created.extend(created)
+
+        return report
+
+    def set_login_shell(
+        self, users: Sequence[pwd.struct_passwd], shell: str, run: Runner
+    ) -> FanoutReport:
+        """
+        Make shell the login shell of every user, in one command.
+
+        Args:
+            users: Accounts to change
+            shell: Absolute path of the shell
+            run: Command runner (a module's run(), so dry-run applies)
+
+        Returns:
+            FanoutReport; changed lists the users whose shell was changed
+        """
+        report = FanoutReport()
+        pending = [u.pw_name for u in users if u.pw_shell != shell]
+        report.succeeded = [u.pw_name for u in users if u.pw_shell == shell]
+        if not pending:
+            return report
+
+        # A failure only affects that user; the names of failed users are echoed back
+        script = "; ".join(
+            f"chsh -s {shlex.quote(shell)} {shlex.quote(name)} >/dev/null "
+            f"|| echo {shlex.quote(name)}"
+            for name in pending
+        )
+        result = run(script, check=False)
+        failed = set(result.stdout.split()) if result.stdout else set()
+        if not result.success and not failed:
+            failed = set(pending)
+
+        for name in pending:
+            if name in failed:
+                report.failed[name] = f"could not change login shell to {shell}"
+            else:
+                report.succeeded.append(name)
+                report.changed[name] = [shell]
+        return report
+
+    def _apply_user(self, user: pwd.struct_passwd, files: Sequence[UserFile]):
+        """Write one user's files; returns (changed paths, created paths)."""
+        home = Path(user.pw_dir)
+        if not home.is_dir():
+            raise FileNotFoundError(f"home directory {home} does not exist")
+
+        changed: List[str] = []
+        created: List[str] = []
+        touched_dirs: Set[Path] = set()
+
+        for spec in files:
+            path = home / spec.path
+            existed = path.exists()
+            if spec.update is not None:
+                if not existed:
+                    continue
+                content = spec.update(path.read_text(encoding="utf-8"))
+                if content is None:
+                    continue
+            else:
+                content = spec.content or ""
+
+            touched_dirs.update(self._make_parents(home, path.parent))
+            touched_dirs.add(path.parent)
+            if file_has_content(path, content):
+                continue
+
+            self._atomic_write(path, content, spec.mode, user.pw_uid, user.pw_gid)
+            changed.append(str(path))
+            if not existed:
+                created.append(str(path))
+
+        # Ownership of every directory we created or wrote into, in one pass
+        if os.geteuid() == 0:
+            for directory in touched_dirs - {home}:
+                os.chown(directory, user.pw_uid, user.pw_gid, follow_symlinks=False)
+
+        return changed, created
+
+    @staticmethod
+    def _make_parents(home: Path, directory: Path) -> List[Path]:
+        """Create directory below home; returns the directories created."""
+        missing = []
+        current = directory
+        while current != home and not current.exists():
+            missing.append(current)
+            current = current.parent
+        for path in reversed(missing):
+            path.mkdir(mode=0o755, exist_ok=True)
+        return missing
+
+    @staticmethod
+    def _atomic_write(path: Path, content: str, mode: int, uid: int, gid: int) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+                os.fchmod(f.fileno(), mode)
+                if os.geteuid() == 0:
+                    os.fchown(f.fileno(), uid, gid)
+            # Replaces a symlink at path rather than following it
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
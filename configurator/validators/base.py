@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+from configurator.validators.probes import ProbeSnapshot
+
 
 class ValidationSeverity(Enum):
     """Validation result severity levels."""
@@ -75,6 +77,8 @@ class BaseValidator(ABC):
             logger: Optional logger instance. If not provided, creates one from class name.
         """
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        # Replaced by the orchestrator with the snapshot shared by the whole run
+        self.probes = ProbeSnapshot()
 
     @abstractmethod
     def validate(self) -> ValidationResult:
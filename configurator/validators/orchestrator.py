@@ -5,7 +5,9 @@ Coordinates running validators across all tiers and displays results.
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from rich.console import Console
 from rich.panel import Panel
@@ -17,6 +19,10 @@ from configurator.validators.base import (
     ValidationResult,
     ValidationSeverity,
 )
+from configurator.validators.probes import ProbeSnapshot
+
+if TYPE_CHECKING:
+    from configurator.core.state.manager import StateManager
 
 
 class ValidationOrchestrator:
@@ -26,12 +32,22 @@ class ValidationOrchestrator:
     Tier 1 (Critical): Must pass for installation to proceed
     Tier 2 (High): Important but can be overridden by user
     Tier 3 (Medium): Warnings only, installation continues
+
+    Validators of a tier run concurrently and share one ProbeSnapshot per
+    run, so facts like memory or disk space are probed once. With a state
+    manager, passing results are cached for cache_ttl seconds and reused by
+    the next run; failures are always checked again.
     """
 
+    DEFAULT_CACHE_TTL = 600
+
     def __init__(
         self,
         console: Optional[Console] = None,
         logger: Optional[logging.Logger] = None,
+        state_manager: Optional["StateManager"] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        max_workers: int = 8,
     ):
         """
         Initialize validation orchestrator.
@@ -39,10 +55,17 @@ class ValidationOrchestrator:
         Args:
             console: Rich console for output (creates new if not provided)
             logger: Logger instance (creates new if not provided)
+            state_manager: Where passing results are cached (no caching if None)
+            cache_ttl: How long a cached passing result is trusted, in seconds
+            max_workers: Validators run concurrently within a tier
         """
         self.console = console or Console()
         self.logger = logger or logging.getLogger(__name__)
         self.validators: Dict[int, List[BaseValidator]] = {1: [], 2: [], 3: []}
+        self.state_manager = state_manager
+        self.cache_ttl = cache_ttl
+        self.max_workers = max(1, max_workers)
+        self.probes = ProbeSnapshot()
 
     def register_validator(self, tier: int, validator: BaseValidator) -> None:
         """
@@ -78,6 +101,8 @@ class ValidationOrchestrator:
         """
         self._display_header()
 
+        # Fresh facts for every run, shared by all of its validators
+        self.probes = ProbeSnapshot()
         all_results: List[ValidationResult] = []
 
         # Tier 1: Critical (must pass)
@@ -126,7 +151,7 @@ class ValidationOrchestrator:
         auto_fix: bool,
     ) -> List[ValidationResult]:
         """
-        Run validators in a specific tier.
+        Run the validators of a tier concurrently (cached passes are reused).
 
         Args:
             tier: Tier number
@@ -143,49 +168,107 @@ class ValidationOrchestrator:
 
         self.console.print(f"\n[bold cyan]Running {tier_name} Validations...[/bold cyan]")
 
+        cached = {i: self._cached_result(v) for i, v in enumerate(validators)}
+        pending = [(i, v) for i, v in enumerate(validators) if cached[i] is None]
+
+        outcomes: Dict[int, Any] = {}
+        if pending:
+            workers = min(self.max_workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validate") as pool:
+                futures = {i: pool.submit(self._validate, v) for i, v in pending}
+            outcomes = {i: future.exception() or future.result() for i, future in futures.items()}
+
+        # Report (and auto-fix) in registration order
         results: List[ValidationResult] = []
 
-        for validator in validators:
-            self.logger.debug(f"Running validator: {validator.name}")
-
-            try:
-                result = validator.validate()
-                results.append(result)
-
-                # Display immediate feedback
-                if result.passed:
-                    self.console.print(f"  {result.icon} {validator.name}")
-                else:
-                    self.console.print(f"  {result.icon} {validator.name}")
-
-                    # Attempt auto-fix if enabled and available
-                    if auto_fix and validator.auto_fix_available:
-                        self.console.print("    [yellow]Attempting auto-fix...[/yellow]")
-                        try:
-                            if validator.auto_fix():
-                                # Re-validate
-                                result = validator.validate()
-                                results[-1] = result  # Update result
-                                if result.passed:
-                                    self.console.print("    [green]✓ Auto-fix successful[/green]")
-                        except Exception as e:
-                            self.console.print(f"    [red]✗ Auto-fix failed: {e}[/red]")
-
-            except Exception as e:
-                self.logger.error(f"Validator {validator.name} raised exception: {e}")
+        for index, validator in enumerate(validators):
+            hit = cached[index]
+            if hit is not None:
+                results.append(hit)
+                self.console.print(f"  {hit.icon} {validator.name} [dim](cached)[/dim]")
+                continue
+
+            outcome = outcomes[index]
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Validator {validator.name} raised exception: {outcome}")
                 # Create failure result
                 results.append(
                     ValidationResult(
                         validator_name=validator.name,
                         severity=validator.severity,
                         passed=False,
-                        message=f"Validation error: {str(e)}",
-                        details=str(e),
+                        message=f"Validation error: {str(outcome)}",
+                        details=str(outcome),
                     )
                 )
+                continue
+
+            result = outcome
+            results.append(result)
+
+            # Display immediate feedback
+            self.console.print(f"  {result.icon} {validator.name}")
+
+            # Attempt auto-fix if enabled and available
+            if not result.passed and auto_fix and validator.auto_fix_available:
+                self.console.print("    [yellow]Attempting auto-fix...[/yellow]")
+                try:
+                    if validator.auto_fix():
+                        # Re-validate against fresh facts
+                        self.probes.invalidate()
+                        result = validator.validate()
+                        results[-1] = result  # Update result
+                        if result.passed:
+                            self.console.print("    [green]✓ Auto-fix successful[/green]")
+                except Exception as e:
+                    self.console.print(f"    [red]✗ Auto-fix failed: {e}[/red]")
+
+            self._cache_result(validator, result)
 
         return results
 
+    def _validate(self, validator: BaseValidator) -> ValidationResult:
+        self.logger.debug(f"Running validator: {validator.name}")
+        try:
+            validator.probes = self.probes
+        except AttributeError:
+            pass
+        return validator.validate()
+
+    @staticmethod
+    def _cache_key(validator: BaseValidator) -> str:
+        cls = type(validator)
+        return f"{cls.__module__}.{cls.__qualname__}:{validator.name}"
+
+    def _cached_result(self, validator: BaseValidator) -> Optional[ValidationResult]:
+        """A passing result from a recent run, if there is one."""
+        if self.state_manager is None or self.cache_ttl <= 0:
+            return None
+        try:
+            data = self.state_manager.get_cached_validation(
+                self._cache_key(validator), self.cache_ttl
+            )
+            if data is None:
+                return None
+            data["severity"] = ValidationSeverity(data["severity"])
+            return ValidationResult(**data)
+        except Exception as e:
+            self.logger.debug(f"Ignoring cached result of {validator.name}: {e}")
+            return None
+
+    def _cache_result(self, validator: BaseValidator, result: ValidationResult) -> None:
+        """Remember passing results; forget the validator's entry otherwise."""
+        if self.state_manager is None or self.cache_ttl <= 0:
+            return
+        data = None
+        if result.passed:
+            data = asdict(result)
+            data["severity"] = result.severity.value
+        try:
+            self.state_manager.record_validation(self._cache_key(validator), data)
+        except Exception as e:
+            self.logger.debug(f"Could not cache result of {validator.name}: {e}")
+
     def _display_header(self) -> None:
         """Display validation header."""
         self.console.print()
@@ -0,0 +1,62 @@
+"""
+Per-run snapshot of probed system facts.
+
+Several validators look at the same facts (memory, free disk space, OS
+release, connectivity). The orchestrator hands every validator of a run the
+same ProbeSnapshot, so each fact is probed once even when validators run
+concurrently.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class ProbeSnapshot:
+    """
+    Memoized probe results, shared by the validators of one run.
+
+    Usage:
+        memory = self.probes.get("virtual_memory", psutil.virtual_memory)
+        usage = self.probes.get("disk_usage", shutil.disk_usage, "/")
+
+    The first caller of a key runs the probe; concurrent callers of the same
+    key wait for it instead of probing again. Exceptions are not cached.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[Tuple[str, Tuple[Hashable, ...]], Any] = {}
+        self._locks: Dict[Tuple[str, Tuple[Hashable, ...]], threading.Lock] = defaultdict(
+            threading.Lock
+        )
+        self._guard = threading.Lock()
+        self.probe_count = 0
+
+    def get(self, key: str, probe: Callable[..., T], *args: Hashable) -> T:
+        """
+        Get a fact, probing it on first use.
+
+        Args:
+            key: Name of the fact
+            probe: Function that probes it
+            *args: Arguments for probe (part of the cache key)
+
+        Returns:
+            The probed value
+        """
+        cache_key = (key, args)
+        with self._guard:
+            lock = self._locks[cache_key]
+
+        with lock:
+            if cache_key not in self._values:
+                self._values[cache_key] = probe(*args)
+                self.probe_count += 1
+            return self._values[cache_key]
+
+    def invalidate(self) -> None:
+        """Forget every fact (e.g. after an auto-fix changed the system)."""
+        with self._guard:
+            self._values.clear()
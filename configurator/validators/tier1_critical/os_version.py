@@ -31,7 +31,7 @@ class OSVersionValidator(BaseValidator):
         Returns:
             ValidationResult indicating if OS version is supported
         """
-        os_info = get_os_info()
+        os_info = self.probes.get("os_info", get_os_info)
         if hasattr(os_info.name, "lower"):
             os_name = os_info.name.lower()
         else:
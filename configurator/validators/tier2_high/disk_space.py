@@ -30,7 +30,7 @@ class DiskSpaceValidator(BaseValidator):
             ValidationResult indicating if disk space is sufficient
         """
         try:
-            stat = shutil.disk_usage("/")
+            stat = self.probes.get("disk_usage", shutil.disk_usage, "/")
             free_gb = stat.free / (1024**3)
         except Exception as e:
             self.logger.error(f"Failed to check disk space: {e}")
@@ -5,8 +5,10 @@ Validates that the system has internet connectivity.
 """
 
 import socket
-from typing import List, Tuple
+from functools import partial
+from typing import List, Optional, Tuple
 
+from configurator.utils.network import first_success
 from configurator.validators.base import (
     BaseValidator,
     ValidationResult,
@@ -30,6 +32,22 @@ class NetworkValidator(BaseValidator):
 
     TIMEOUT_SECONDS = 5
 
+    def _can_connect(self, host: str, port: int) -> bool:
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(self.TIMEOUT_SECONDS)
+            result = sock.connect_ex((host, port))
+            sock.close()
+            return result == 0
+        except Exception as e:
+            self.logger.debug(f"Connection to {host}:{port} failed: {e}")
+            return False
+
+    def _first_reachable(self, hosts: Tuple[Tuple[str, int], ...]) -> Optional[str]:
+        """Try all hosts at once; the first that accepts a connection wins."""
+        index = first_success([partial(self._can_connect, h, p) for h, p in hosts])
+        return None if index is None else hosts[index][0]
+
     def validate(self) -> ValidationResult:
         """
         Check if system has internet connectivity.
@@ -37,26 +55,8 @@ class NetworkValidator(BaseValidator):
         Returns:
             ValidationResult indicating if internet is accessible
         """
-        successful_hosts = []
-        failed_hosts = []
-
-        for host, port in self.TEST_HOSTS:
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(self.TIMEOUT_SECONDS)
-                result = sock.connect_ex((host, port))
-                sock.close()
-
-                if result == 0:
-                    successful_hosts.append(host)
-                else:
-                    failed_hosts.append(host)
-            except Exception as e:
-                self.logger.debug(f"Connection to {host}:{port} failed: {e}")
-                failed_hosts.append(host)
-
-        # If at least one host is reachable, consider it passing
-        passed = len(successful_hosts) > 0
+        winner = self.probes.get("reachable_host", self._first_reachable, tuple(self.TEST_HOSTS))
+        passed = winner is not None
 
         if passed:
             return ValidationResult(
@@ -64,8 +64,8 @@ class NetworkValidator(BaseValidator):
                 severity=self.severity,
                 passed=True,
                 message="Internet connectivity available",
-                details=f"Successfully connected to {len(successful_hosts)} host(s)",
-                current_value=f"{len(successful_hosts)}/{len(self.TEST_HOSTS)} hosts reachable",
+                details=f"Successfully connected to {winner}",
+                current_value=f"{winner} reachable",
                 required_value="At least 1 host reachable",
             )
         else:
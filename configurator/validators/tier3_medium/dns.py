@@ -5,7 +5,10 @@ Validates that DNS resolution is working correctly.
 """
 
 import socket
+from functools import partial
+from typing import Optional, Tuple
 
+from configurator.utils.network import first_success
 from configurator.validators.base import (
     BaseValidator,
     ValidationResult,
@@ -26,6 +29,19 @@ class DNSValidator(BaseValidator):
         "github.com",
     ]
 
+    def _resolves(self, domain: str) -> bool:
+        try:
+            socket.gethostbyname(domain)
+            return True
+        except Exception as e:
+            self.logger.debug(f"DNS lookup for {domain} failed: {e}")
+            return False
+
+    def _first_resolved(self, domains: Tuple[str, ...]) -> Optional[str]:
+        """Look all domains up at once; the first that resolves wins."""
+        index = first_success([partial(self._resolves, d) for d in domains])
+        return None if index is None else domains[index]
+
     def validate(self) -> ValidationResult:
         """
         Check if DNS resolution is working.
@@ -33,21 +49,10 @@ class DNSValidator(BaseValidator):
         Returns:
             ValidationResult indicating if DNS is functional
         """
-        successful_lookups = []
-        failed_lookups = []
-
-        for domain in self.TEST_DOMAINS:
-            try:
-                socket.gethostbyname(domain)
-                successful_lookups.append(domain)
-            except socket.gaierror:
-                failed_lookups.append(domain)
-            except Exception as e:
-                self.logger.debug(f"DNS lookup for {domain} failed: {e}")
-                failed_lookups.append(domain)
-
-        # If at least one domain resolves, consider it passing
-        passed = len(successful_lookups) > 0
+        resolved = self.probes.get(
+            "resolved_domain", self._first_resolved, tuple(self.TEST_DOMAINS)
+        )
+        passed = resolved is not None
 
         if passed:
             return ValidationResult(
@@ -55,11 +60,8 @@ class DNSValidator(BaseValidator):
                 severity=self.severity,
                 passed=True,
                 message="DNS resolution working",
-                details=(
-                    f"Successfully resolved {len(successful_lookups)}/"
-                    f"{len(self.TEST_DOMAINS)} domains"
-                ),
-                current_value=f"{len(successful_lookups)} domains resolved",
+                details=f"Successfully resolved {resolved}",
+                current_value=f"{resolved} resolved",
                 required_value="At least 1 domain resolved",
             )
         else:
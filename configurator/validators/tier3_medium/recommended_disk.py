@@ -30,7 +30,7 @@ class RecommendedDiskValidator(BaseValidator):
             ValidationResult indicating if disk space meets recommendations
         """
         try:
-            stat = shutil.disk_usage("/")
+            stat = self.probes.get("disk_usage", shutil.disk_usage, "/")
             free_gb = stat.free / (1024**3)
         except Exception as e:
             self.logger.error(f"Failed to check disk space: {e}")
@@ -29,7 +29,7 @@ class RecommendedRAMValidator(BaseValidator):
         Returns:
             ValidationResult indicating if RAM meets recommendations
         """
-        total_ram_bytes = psutil.virtual_memory().total
+        total_ram_bytes = self.probes.get("virtual_memory", psutil.virtual_memory).total
         total_ram_gb = total_ram_bytes / (1024**3)
 
         passed = total_ram_gb >= self.RECOMMENDED_RAM_GB
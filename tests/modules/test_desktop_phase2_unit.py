@@ -216,14 +216,17 @@ class TestPolkitConfiguration:
     @patch("configurator.modules.desktop.os.path.isdir", return_value=True)
     @patch.object(DesktopModule, "run")
     def test_polkit_restarts_service(self, mock_run, mock_isdir, mock_write, module):
-        """Test that Polkit service is restarted after configuration."""
+        """Test that Polkit service is restarted once, after configuration."""
         module._configure_polkit_rules()
+        assert module.pending_restarts == {"polkit": None}
+
+        module.apply_pending_service_actions()
 
         # Verify systemctl restart was called
         restart_calls = [
             str(c) for c in mock_run.call_args_list if "systemctl" in str(c) and "restart" in str(c)
         ]
-        assert len(restart_calls) >= 1
+        assert len(restart_calls) == 1
         assert "polkit" in restart_calls[0]
 
 
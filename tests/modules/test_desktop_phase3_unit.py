@@ -119,28 +119,21 @@ class TestThemeApplication:
         return DesktopModule(config={}, logger=Mock(), rollback_manager=Mock())
 
     @patch("pwd.getpwall")
-    @patch("os.makedirs")
-    @patch("shutil.chown")
-    @patch.object(DesktopModule, "write_file")
-    def test_apply_theme_to_users_writes_xsettings(
-        self, mock_write, mock_chown, mock_makedirs, mock_getpwall, module
-    ):
+    def test_apply_theme_to_users_writes_xsettings(self, mock_getpwall, module, tmp_path):
         """Test that xsettings.xml is written for users."""
         mock_user = Mock()
         mock_user.pw_name = "testuser"
         mock_user.pw_uid = 1000
-        mock_user.pw_dir = "/home/testuser"
+        mock_user.pw_gid = 1000
+        mock_user.pw_dir = str(tmp_path)
         mock_getpwall.return_value = [mock_user]
 
         module.dry_run = False
         module._apply_theme_to_users("Nordic-darker")
 
-        assert mock_write.called
-        args, _ = mock_write.call_args
-        path = args[0]
-        content = args[1]
+        path = tmp_path / ".config/xfce4/xfconf/xfce-perchannel-xml/xsettings.xml"
+        content = path.read_text()
 
-        assert "xsettings.xml" in path
         assert 'value="Nordic-darker"' in content
         assert 'property name="ThemeName"' in content
 
@@ -5,6 +5,7 @@ Tracks performance metrics over time to detect regressions.
 """
 
 import json
+import random
 import statistics
 import time
 from datetime import datetime
@@ -201,6 +202,61 @@ class TestDependencyGraphPerformance:
         assert duration < 0.5, f"Circular detection too slow: {duration:.3f}s"
         assert is_ok, "Performance regression"
 
+    def test_large_synthetic_graph_performance(self, benchmark):
+        """Test the DAG engine on a 10k-node, plugin-heavy graph."""
+        rng = random.Random(42)
+        node_count = 10_000
+        modules = [f"plugin_{i}" for i in range(node_count)]
+
+        start = time.perf_counter()
+
+        graph = DependencyGraph()
+        for i, module in enumerate(modules):
+            # Depending only on earlier nodes keeps the graph acyclic
+            deps = {modules[rng.randrange(i)] for _ in range(min(i, 5))}
+            graph.add_module(module, depends_on=sorted(deps))
+
+        graph.validate()
+        batches = graph.get_execution_batches()
+        _, chain = graph.critical_path()
+        ancestors = graph.graph.ancestors(modules[-1])
+
+        duration = time.perf_counter() - start
+
+        print("\nDAG Engine Performance (10k nodes, ~50k edges):")
+        print(f"  Duration: {duration * 1000:.2f}ms")
+        print(f"  Batches: {len(batches)}, critical path: {len(chain)} nodes")
+
+        is_ok, msg = benchmark.check_regression(
+            "dependency_graph_10k_nodes", duration, threshold_percent=30.0
+        )
+
+        print(f"  {msg}")
+
+        assert sum(len(batch) for batch in batches) == node_count
+        assert len(chain) <= len(batches)
+        assert modules[0] in ancestors
+        assert duration < 5.0, f"DAG engine too slow: {duration:.3f}s"
+        assert is_ok, "Performance regression"
+
+    def test_large_graph_cycle_reporting_performance(self):
+        """Test that a cycle in a 10k-node graph is reported in linear time."""
+        graph = DependencyGraph()
+        modules = [f"plugin_{i}" for i in range(10_000)]
+        for i, module in enumerate(modules):
+            graph.add_module(module, depends_on=modules[max(0, i - 3) : i])
+        # Close one long loop back to the start
+        graph.add_module(modules[0], depends_on=[modules[-1]])
+
+        start = time.perf_counter()
+        with pytest.raises(ValueError, match="Circular"):
+            graph.validate()
+        duration = time.perf_counter() - start
+
+        print(f"\nCycle reporting (10k nodes): {duration * 1000:.2f}ms")
+
+        assert duration < 2.0, f"Cycle reporting too slow: {duration:.3f}s"
+
 
 class TestNetworkWrapperPerformance:
     """Test network wrapper performance."""
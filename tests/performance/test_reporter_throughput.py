@@ -0,0 +1,84 @@
+"""Throughput of progress reporters under parallel execution callbacks."""
+
+import io
+import threading
+import time
+
+import pytest
+from rich.console import Console
+
+from configurator.core.reporter import CompactReporter, HeadlessReporter, RichProgressReporter
+from configurator.observability.dashboard import InstallationDashboard
+
+EVENTS_PER_SECOND = 10_000
+WORKERS = 8
+STAGES = ("Validating...", "Configuring...", "Verifying...")
+
+
+def _console():
+    return Console(file=io.StringIO(), force_terminal=True, width=120)
+
+
+def _reporter_events(reporter, worker):
+    module = f"module-{worker}"
+    reporter.start_phase(module)
+    for i in range(EVENTS_PER_SECOND // WORKERS - 2):
+        reporter.update(STAGES[i % len(STAGES)], module=module)
+    reporter.complete_phase(True, module=module)
+
+
+def _dashboard_events(dashboard, worker):
+    module = f"module-{worker}"
+    for i in range(EVENTS_PER_SECOND // WORKERS):
+        dashboard.update_module(module, "running", progress=i % 100)
+
+
+def _rich():
+    return RichProgressReporter(console=_console(), refresh_per_second=10)
+
+
+def _compact():
+    return CompactReporter(use_colors=False, stream=io.StringIO())
+
+
+def _headless():
+    return HeadlessReporter(stream=io.StringIO())
+
+
+def _dashboard():
+    dashboard = InstallationDashboard(fps=10)
+    dashboard.console = _console()
+    return dashboard
+
+
+@pytest.mark.parametrize(
+    "make, produce",
+    [
+        (_rich, _reporter_events),
+        (_compact, _reporter_events),
+        (_headless, _reporter_events),
+        (_dashboard, _dashboard_events),
+    ],
+    ids=["rich", "compact", "headless", "dashboard"],
+)
+def test_reporter_keeps_up_with_10k_events_per_second(make, produce):
+    """8 workers report 10k events; producing and rendering them all takes under a second."""
+    reporter = make()
+    reporter.start()
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=produce, args=(reporter, w)) for w in range(WORKERS)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    produced = time.perf_counter() - start
+    reporter.stop()
+    total = time.perf_counter() - start
+
+    print(
+        f"\n{make.__name__[1:]}: {EVENTS_PER_SECOND / produced:,.0f} events/s posted, "
+        f"{EVENTS_PER_SECOND / total:,.0f} events/s rendered, "
+        f"{reporter.render_loop.frames} frames"
+    )
+    assert total < 1.0
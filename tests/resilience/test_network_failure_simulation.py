@@ -87,30 +87,22 @@ class TestNetworkFailureSimulation:
 
         assert result == "recovered"
 
-    @patch("subprocess.run")
+    @patch("configurator.core.network.run_command")
     def test_apt_update_transient_failure_recovery(self, mock_run):
         """Test APT update recovers from transient failures."""
         wrapper = NetworkOperationWrapper({}, Mock())
 
-        # Simulate transient failure
-        call_count = [0]
-
-        def run_side_effect(*args, **kwargs):
-            call_count[0] += 1
-            if call_count[0] < 2:
-                # First call fails
-                return Mock(returncode=1, stderr="Temporary failure")
-            else:
-                # Second call succeeds
-                return Mock(returncode=0, stdout="", stderr="")
-
-        mock_run.side_effect = run_side_effect
+        # First call fails, second call succeeds
+        mock_run.side_effect = [
+            Mock(return_code=1, stderr="Temporary failure"),
+            Mock(return_code=0, stdout="", stderr=""),
+        ]
 
         # Should succeed after retry
         result = wrapper.apt_update_with_retry()
 
         assert result is True
-        assert call_count[0] == 2
+        assert mock_run.call_count == 2
 
     @patch("subprocess.run")
     def test_download_timeout_handling(self, mock_run):
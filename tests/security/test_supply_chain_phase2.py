@@ -5,12 +5,28 @@ Tests checksum verification, GPG validation, and download security.
 """
 
 import hashlib
-from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import MagicMock, Mock
 
 import pytest
 
 from configurator.security.supply_chain import SecureDownloader, SecurityError, SupplyChainValidator
+from configurator.utils.download import DownloadEngine
+
+
+def _fake_session(body: bytes) -> MagicMock:
+    """Session whose GET serves body."""
+
+    def get(url, **kwargs):
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.status_code = 200
+        response.headers = {"Content-Length": str(len(body))}
+        response.iter_content.return_value = [body]
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    return session
 
 
 class TestChecksumVerification:
@@ -90,24 +106,10 @@ class TestChecksumVerification:
 class TestSecureDownloader:
     """Test SecureDownloader functionality."""
 
-    @patch("subprocess.run")
-    def test_download_with_valid_checksum(self, mock_run, tmp_path):
+    def test_download_with_valid_checksum(self, tmp_path):
         """Download with valid checksum should succeed."""
-        # Mock successful download
         dest = tmp_path / "downloaded.txt"
-
-        def run_side_effect(*args, **kwargs):
-            # Simulate successful download
-            if "curl" in args[0]:
-                # Extract destination file from curl command
-                if "-o" in args[0]:
-                    idx = args[0].index("-o")
-                    dest_file = Path(args[0][idx + 1])
-                    dest_file.write_text("test content")
-                return MagicMock(returncode=0, stdout=b"", stderr=b"")
-            return MagicMock(returncode=0)
-
-        mock_run.side_effect = run_side_effect
+        engine = DownloadEngine(session=_fake_session(b"test content"))
 
         config = {
             "security_advanced": {
@@ -115,7 +117,7 @@ class TestSecureDownloader:
             }
         }
         validator = SupplyChainValidator(config, Mock())
-        downloader = SecureDownloader(validator, Mock())
+        downloader = SecureDownloader(validator, Mock(), engine=engine)
 
         expected_checksum = hashlib.sha256(b"test content").hexdigest()
 
@@ -128,21 +130,10 @@ class TestSecureDownloader:
         assert result is True
         assert dest.exists()
 
-    @patch("subprocess.run")
-    def test_download_with_invalid_checksum_fails(self, mock_run, tmp_path):
+    def test_download_with_invalid_checksum_fails(self, tmp_path):
         """Download with invalid checksum should fail."""
         dest = tmp_path / "downloaded.txt"
-
-        def run_side_effect(*args, **kwargs):
-            if "curl" in args[0]:
-                if "-o" in args[0]:
-                    idx = args[0].index("-o")
-                    dest_file = Path(args[0][idx + 1])
-                    dest_file.write_text("different content")
-                return MagicMock(returncode=0, stdout=b"", stderr=b"")
-            return MagicMock(returncode=0)
-
-        mock_run.side_effect = run_side_effect
+        engine = DownloadEngine(session=_fake_session(b"different content"))
 
         config = {
             "security_advanced": {
@@ -154,7 +145,7 @@ class TestSecureDownloader:
             }
         }
         validator = SupplyChainValidator(config, Mock())
-        downloader = SecureDownloader(validator, Mock())
+        downloader = SecureDownloader(validator, Mock(), engine=engine)
 
         wrong_checksum = "0" * 64
 
@@ -247,21 +238,10 @@ class TestChecksumDatabase:
 class TestEndToEndSecurity:
     """End-to-end security integration tests."""
 
-    @patch("subprocess.run")
-    def test_full_secure_download_workflow(self, mock_run, tmp_path):
+    def test_full_secure_download_workflow(self, tmp_path):
         """Test complete secure download workflow."""
         dest = tmp_path / "safe-file.tar.gz"
-
-        def run_side_effect(*args, **kwargs):
-            if "curl" in args[0]:
-                if "-o" in args[0]:
-                    idx = args[0].index("-o")
-                    dest_file = Path(args[0][idx + 1])
-                    dest_file.write_text("downloaded content")
-                return MagicMock(returncode=0, stdout=b"", stderr=b"")
-            return MagicMock(returncode=0)
-
-        mock_run.side_effect = run_side_effect
+        engine = DownloadEngine(session=_fake_session(b"downloaded content"))
 
         config = {
             "security_advanced": {
@@ -269,7 +249,7 @@ class TestEndToEndSecurity:
             }
         }
         validator = SupplyChainValidator(config, Mock())
-        downloader = SecureDownloader(validator, Mock())
+        downloader = SecureDownloader(validator, Mock(), engine=engine)
 
         expected_checksum = hashlib.sha256(b"downloaded content").hexdigest()
 
@@ -111,3 +111,22 @@ def test_parallel_executor_handles_failure():
 
     assert results["failing"].success is False
     assert results["failing"].error is not None
+
+
+def test_parallel_executor_starts_longest_expected_first():
+    """Test ParallelExecutor submits modules by expected duration, longest first."""
+    executor = ParallelExecutor(max_workers=1)
+    callback = Mock()
+
+    contexts = []
+    for name, expected in (("short", 5.0), ("long", 300.0), ("medium", 60.0)):
+        mod = Mock()
+        mod.validate.return_value = True
+        mod.configure.return_value = True
+        mod.verify.return_value = True
+        contexts.append(ExecutionContext(name, mod, {}, expected_duration=expected))
+
+    executor.execute(contexts, callback=callback)
+
+    started = [c.args[0] for c in callback.call_args_list if c.args[1] == "started"]
+    assert started == ["long", "medium", "short"]
@@ -0,0 +1,143 @@
+import io
+import json
+import threading
+from unittest.mock import MagicMock, Mock, patch
+
+from configurator.core.reporter import HeadlessReporter, get_reporter
+from configurator.core.reporter.compact_reporter import CompactReporter
+from configurator.core.reporter.render_loop import RenderLoop
+from configurator.core.reporter.rich_reporter import RichProgressReporter
+from configurator.observability.dashboard import InstallationDashboard
+
+# Frames this far apart never happen during a test: only stop() renders
+NO_FRAMES = 0.001
+
+
+def test_render_loop_batches_events_from_many_threads():
+    frames = []
+    loop = RenderLoop(frames.append, fps=NO_FRAMES)
+    loop.start()
+
+    def produce(n):
+        for i in range(1000):
+            loop.post((n, i))
+
+    producers = [threading.Thread(target=produce, args=(n,)) for n in range(4)]
+    for t in producers:
+        t.start()
+    for t in producers:
+        t.join()
+    loop.stop()
+
+    events = [e for frame in frames for e in frame]
+    assert len(events) == 4000
+    # Each producer's events stay in order
+    for n in range(4):
+        assert [i for p, i in events if p == n] == list(range(1000))
+    assert not loop.running
+
+
+def test_compact_reporter_writes_one_line_per_module_state_per_frame():
+    stream = io.StringIO()
+    reporter = CompactReporter(use_colors=False, show_timestamp=False, stream=stream, fps=NO_FRAMES)
+    reporter.start("Test")
+    banner = stream.getvalue()
+
+    reporter.start_phase("docker")
+    for step in ("Validating...", "Configuring...", "Configuring..."):
+        reporter.update(step, module="docker")
+    reporter.update("apt-error", success=False, module="docker")
+    reporter.start_phase("zsh")
+    reporter.update("Configuring...", module="zsh")
+    reporter.update("Configuring...", module="zsh")
+    reporter.error("boom")
+    assert stream.getvalue() == banner  # queued, not written by the producer
+
+    reporter.stop()
+    lines = [line.split() for line in stream.getvalue()[len(banner) :].splitlines()]
+    assert [(line[1], line[-1]) for line in lines[:-1]] == [
+        ("docker", "starting..."),
+        ("docker", "apt-error"),  # "Validating..." and "Configuring..." were superseded
+        ("zsh", "starting..."),
+        ("zsh", "Configuring..."),  # written once
+    ]
+    assert lines[-1][-1] == "boom"
+
+    # Without a running loop, lines are written right away
+    reporter.complete_phase(True, module="zsh")
+    assert stream.getvalue().splitlines()[-1].split()[-1] == "done"
+
+
+@patch("configurator.core.reporter.rich_reporter.Live")
+def test_rich_reporter_applies_only_changed_fields_once_per_frame(mock_live):
+    reporter = RichProgressReporter(console=MagicMock(), refresh_per_second=NO_FRAMES, dry_run=True)
+    reporter.progress = Mock()
+    reporter.start("Test")
+    reporter.start_phase("docker")
+    reporter.start_phase("zsh")
+
+    for percent in range(101):
+        reporter.update_progress(percent, module="docker")
+        reporter.update(f"step {percent}", module="docker")
+    reporter.update("Starting...", module="zsh")
+    reporter.progress.update.assert_not_called()
+
+    reporter.render_loop.drain()
+    calls = {c.args[0]: c.kwargs for c in reporter.progress.update.call_args_list}
+    assert reporter.progress.update.call_count == 1  # zsh had nothing new
+    assert calls[reporter.tasks["docker"]] == {"status": "step 100", "completed": 100}
+    assert mock_live.return_value.refresh.call_count == 1
+
+    # Nothing changed, nothing redrawn
+    reporter.update("step 100", module="docker")
+    reporter.render_loop.drain()
+    assert reporter.progress.update.call_count == 1
+    assert mock_live.return_value.refresh.call_count == 1
+    reporter.stop()
+
+
+def test_headless_reporter_writes_every_event_as_json():
+    stream = io.StringIO()
+    reporter = HeadlessReporter(stream=stream, fps=NO_FRAMES)
+    reporter.start("Test")
+    reporter.start_phase("docker", total_steps=3)
+    reporter.update_progress(50, module="docker")
+    reporter.update("Configuring...", module="docker")
+    reporter.complete_phase(False, module="docker")
+    reporter.show_summary({"docker": False})
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [e["event"] for e in events] == [
+        "started",
+        "phase_started",
+        "progress",
+        "status",
+        "phase_completed",
+        "summary",
+    ]
+    assert events[2] == {**events[2], "module": "docker", "percent": 50}
+    assert events[-1]["results"] == {"docker": False}
+    assert all("ts" in e for e in events)
+    assert isinstance(get_reporter("headless"), HeadlessReporter)
+
+
+@patch("configurator.observability.dashboard.Live")
+def test_dashboard_redraws_only_changed_rows(mock_live):
+    dashboard = InstallationDashboard(fps=NO_FRAMES)
+    dashboard.console = MagicMock()
+    dashboard.update_module("docker", "waiting")
+    dashboard.start()
+    dashboard.update_module("zsh", "running")
+    dashboard.render_loop.drain()  # first frame draws everything
+    assert set(dashboard._module_rows) == {"docker", "zsh"}
+
+    with patch.object(dashboard, "_module_row", wraps=dashboard._module_row) as rows:
+        for progress in range(50):
+            dashboard.update_module("zsh", "running", progress=progress)
+        dashboard.update_metric("cpu", 12.0)
+        dashboard.render_loop.drain()
+        assert [c.args for c in rows.call_args_list] == [("zsh",)]
+
+    assert dashboard._module_rows["zsh"][2] == "49%"
+    assert mock_live.return_value.refresh.call_count == 2
+    dashboard.stop()
@@ -48,3 +48,30 @@ def test_rich_reporter_summary():
     reporter.show_summary({"mod1": True, "mod2": False})
     # Should print a table
     assert console.print.called
+
+
+def test_reporters_show_expected_durations():
+    import io
+
+    from rich.console import Console
+
+    from configurator.core.reporter.compact_reporter import CompactReporter
+    from configurator.core.reporter.rich_reporter import _EstimateColumn
+
+    stream = io.StringIO()
+    compact = CompactReporter(use_colors=False, stream=stream)
+    compact.set_expected_durations({"docker": 150.0})
+    compact.start_phase("docker")
+    compact.start_phase("zsh")
+    assert "starting... (usually 2m 30s)" in stream.getvalue().splitlines()[0]
+    assert stream.getvalue().splitlines()[1].endswith("starting...")
+
+    reporter = RichProgressReporter(console=Console(file=io.StringIO()))
+    reporter.set_expected_durations({"docker": 150.0})
+    reporter.start_phase("docker")
+    task = reporter.progress.tasks[0]
+    assert task.fields["expected"] == 150.0
+    assert str(_EstimateColumn().render(task)).endswith("left")
+
+    reporter.complete_phase(True, module="docker")
+    assert str(_EstimateColumn().render(task)) == ""
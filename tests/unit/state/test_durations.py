@@ -0,0 +1,120 @@
+"""
+Unit tests for the module duration model.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from configurator.core.state.durations import DurationModel, format_duration, weighted_quantile
+from configurator.core.state.manager import StateManager
+from configurator.core.state.models import ModuleStatus
+from configurator.ui.visualizers.dependency_graph import DependencyGraphVisualizer
+
+NOW = 1_800_000_000.0
+DAY = 86400.0
+
+
+def test_weighted_quantile():
+    assert weighted_quantile([(3.0, 1.0), (1.0, 1.0), (2.0, 1.0)], 0.5) == 2.0
+    assert weighted_quantile([(1.0, 1.0), (2.0, 1.0), (3.0, 1.0)], 0.9) == 3.0
+    # A heavy sample pulls the quantile towards it
+    assert weighted_quantile([(1.0, 1.0), (10.0, 5.0)], 0.5) == 10.0
+
+
+def test_recent_runs_on_this_host_class_dominate():
+    samples = [
+        # Old runs were slow, recent ones are fast
+        *[("docker", "small", 600.0, NOW - 120 * DAY) for _ in range(5)],
+        *[("docker", "small", 100.0 + i, NOW - i * DAY) for i in range(3)],
+        # Only other hosts have run git
+        ("git", "large", 10.0, NOW),
+        ("git", "large", 20.0, NOW),
+    ]
+    model = DurationModel(samples, host="small", half_life_days=30, now=NOW)
+
+    docker = model.estimate("docker")
+    assert (docker.median, docker.samples, docker.host_class) == (101.0, 8, "small")
+    assert docker.p90 == 102.0  # 4 half-lives old, the slow runs barely count
+    undecayed = DurationModel(samples, host="small", half_life_days=1e6, now=NOW)
+    assert undecayed.expected("docker") == 600.0
+
+    git = model.estimate("git")
+    assert git.host_class is None  # pooled across host classes
+    assert model.expected("git") == 10.0
+    assert model.expected("git", p90=True) == 20.0
+
+    assert model.estimate("zsh") is None
+    assert model.expected("zsh") == model.default
+    assert not DurationModel([], host="small")
+
+
+def test_batches_duration_packs_parallel_workers():
+    model = DurationModel(
+        [("a", "h", 100.0, NOW), ("b", "h", 60.0, NOW), ("c", "h", 50.0, NOW)],
+        host="h",
+        now=NOW,
+    )
+    # Batch 1 on two workers: a | b + c; batch 2 alone
+    assert model.batches_duration([["a", "b", "c"], ["a"]], workers=2) == 110.0 + 100.0
+    assert model.batches_duration([["a", "b", "c"]], workers=1) == 210.0
+    assert format_duration(3725) == "1h 2m"
+
+
+def test_state_manager_records_and_aggregates_durations():
+    manager = StateManager(db_path=":memory:")
+    for seconds in (10.0, 20.0, 30.0):
+        manager.record_module_duration("docker", seconds, host_class="small")
+    manager.record_module_duration("docker", 999.0, success=False, host_class="small")
+    manager.record_module_duration("docker", 40.0, host_class="large")
+
+    manager.start_installation(profile="beginner")
+    with patch("configurator.core.state.durations.host_class", return_value="small"):
+        manager.update_module("git", status=ModuleStatus.RUNNING)
+        manager.update_module("git", status=ModuleStatus.COMPLETED)
+
+    rows = manager.get_module_durations(per_module=2)
+    assert sorted((r["module_name"], r["host_class"], r["duration_seconds"]) for r in rows) == [
+        ("docker", "large", 40.0),
+        ("docker", "small", 20.0),
+        ("docker", "small", 30.0),
+        ("git", "small", pytest.approx(0.0, abs=1.0)),
+    ]
+
+    stats = {s["module_name"]: s for s in manager.get_duration_stats(host_class="small")}
+    docker = stats["docker"]
+    assert (docker["runs"], docker["failures"]) == (4, 1)
+    assert (docker["avg_seconds"], docker["min_seconds"], docker["max_seconds"]) == (
+        20.0,
+        10.0,
+        30.0,
+    )
+    assert manager.get_duration_stats(since=time.time() + 60) == []
+    assert manager.get_installation_stats()["by_status"] == {"in_progress": 1}
+
+
+def test_history_stats_command_and_visualizer_use_recorded_durations():
+    from configurator.cli import main
+
+    manager = StateManager(db_path=":memory:")
+    with patch("configurator.core.state.durations.host_class", return_value="small"):
+        for seconds in (300.0, 310.0, 320.0):
+            manager.record_module_duration("system", seconds)
+            manager.record_module_duration("desktop", seconds * 2)
+
+        with patch("configurator.core.state.manager.StateManager", return_value=manager):
+            result = CliRunner().invoke(main, ["history", "stats"])
+
+        model = DurationModel.from_state(manager)
+
+    assert result.exit_code == 0, result.output
+    assert "desktop" in result.output
+    assert "10m 40s" in result.output  # max desktop run
+    assert "5m 20s" in result.output  # system p90
+    assert "5m 10s" in result.output  # system p50
+
+    output = DependencyGraphVisualizer(["system", "desktop"], durations=model).render_tree()
+    assert "Critical path (15m 30s): system → desktop" in output
+    assert "from past runs" in output
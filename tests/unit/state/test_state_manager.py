@@ -191,3 +191,27 @@ class TestStateManager:
 
         with pytest.raises(RuntimeError, match="No active installation"):
             manager.update_module("docker", status=ModuleStatus.RUNNING)
+
+    def test_module_fingerprints_persist_and_can_be_forgotten(self, tmp_path):
+        """Test convergence fingerprints survive restarts and are cleared on failure."""
+        db_path = tmp_path / "state.db"
+        StateManager(db_path=db_path).record_module_fingerprint("docker", "abc")
+
+        manager = StateManager(db_path=db_path)
+        assert manager.get_module_fingerprint("docker") == "abc"
+        assert manager.get_module_fingerprint("git") is None
+
+        manager.record_module_fingerprint("docker", None)
+        assert manager.get_module_fingerprint("docker") is None
+
+    def test_step_checkpoints(self):
+        """Test step checkpoints are recorded per module and cleared together."""
+        manager = StateManager(db_path=":memory:")
+        manager.record_step("desktop", "xrdp", "d1", 1.5)
+        manager.record_step("desktop", "themes", "d2", 3.0)
+        manager.record_step("desktop", "xrdp", "d3", 1.0)
+
+        assert manager.get_completed_steps("desktop") == {"xrdp": "d3", "themes": "d2"}
+
+        manager.clear_steps("desktop")
+        assert manager.get_completed_steps("desktop") == {}
@@ -0,0 +1,221 @@
+"""Unit tests for background alert dispatch, against local SMTP and HTTP stand-ins."""
+
+import json
+import socketserver
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from configurator.observability.alerting import (
+    Alert,
+    AlertChannel,
+    AlertManager,
+    AlertSeverity,
+    EmailAlertChannel,
+    WebhookAlertChannel,
+)
+from configurator.observability.dispatch import AlertDispatcher, TokenBucket
+from configurator.security.cert_monitor import (
+    AlertConfig,
+    AlertLevel,
+    CertificateAlert,
+    CertificateMonitor,
+)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib.send_message."""
+
+    def handle(self):
+        self.server.connections += 1
+        self.wfile.write(b"220 localhost ESMTP\r\n")
+        for line in self.rfile:
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.wfile.write(b"250 localhost\r\n")
+            elif command == "DATA":
+                self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                body = []
+                for data in self.rfile:
+                    if data == b".\r\n":
+                        break
+                    body.append(data.decode())
+                self.server.messages.append("".join(body))
+                self.wfile.write(b"250 OK\r\n")
+            elif command == "QUIT":
+                self.wfile.write(b"221 Bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 OK\r\n")
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def handle(self):
+        self.server.connections += 1
+        super().handle()
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status = 500 if self.server.failures > 0 else 200
+        if status == 200:
+            self.server.posts.append(payload)
+        else:
+            self.server.failures -= 1
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.connections, server.messages = 0, []
+    yield _serve(server)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def webhook_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _WebhookHandler)
+    server.connections, server.posts, server.failures = 0, [], 0
+    yield _serve(server)
+    server.shutdown()
+    server.server_close()
+
+
+def _alert(title="Threshold Exceeded: cpu", message="cpu at 95%"):
+    return Alert(AlertSeverity.WARNING, title, message, "threshold_monitor", datetime.now())
+
+
+def test_burst_is_coalesced_and_sent_over_reused_connections(smtp_server, webhook_server):
+    manager = AlertManager(coalesce_window=0.5)
+    manager.add_channel(
+        EmailAlertChannel(
+            "127.0.0.1", smtp_server.server_address[1], "", "", "vps@localhost", ["ops@x"], False
+        )
+    )
+    manager.add_channel(WebhookAlertChannel(f"http://127.0.0.1:{webhook_server.server_port}/"))
+
+    start = time.monotonic()
+    for _ in range(20):
+        manager.alert(AlertSeverity.ERROR, "Disk full", "/var at 100%", source="disk")
+    assert time.monotonic() - start < 0.1  # nothing is sent on the caller's thread
+
+    for value in (91, 92, 91):
+        manager.alert(
+            AlertSeverity.WARNING,
+            "Threshold Exceeded: cpu",
+            f"cpu at {value}%",
+            source="threshold_monitor",
+        )
+    assert manager.flush(timeout=5)
+
+    # 20 identical disk alerts and 3 cpu alerts: one digest each, per channel
+    titles = sorted(post["title"] for post in webhook_server.posts)
+    assert titles == ["Disk full (x20)", "Threshold Exceeded: cpu (x3)"]
+    cpu = next(p for p in webhook_server.posts if p["title"].startswith("Threshold"))
+    assert cpu["metadata"]["occurrences"] == 3
+    assert cpu["message"] == "Occurred 3 times:\n- cpu at 91%\n- cpu at 92%"
+    assert len(smtp_server.messages) == 2
+    # One connection per channel for all messages
+    assert (smtp_server.connections, webhook_server.connections) == (1, 1)
+
+    manager.close()
+    assert any("Subject: [ERROR] Disk full (x20)" in m for m in smtp_server.messages)
+
+
+def test_failed_sends_are_retried_with_backoff(webhook_server):
+    webhook_server.failures = 2
+    channel = WebhookAlertChannel(f"http://127.0.0.1:{webhook_server.server_port}/")
+    dispatcher = AlertDispatcher([channel], window=0, max_retries=2, backoff=0.01)
+
+    dispatcher.submit(_alert())
+    assert dispatcher.flush(timeout=5)
+    assert len(webhook_server.posts) == 1
+
+    webhook_server.failures = 3
+    dispatcher.submit(_alert(title="Other"))
+    assert dispatcher.flush(timeout=5)
+    dispatcher.close()
+
+    assert len(webhook_server.posts) == 1
+    assert dispatcher.stats["sent"] == 1
+    assert dispatcher.stats["failed"] == 1
+    assert not dispatcher.submit(_alert())
+
+
+def test_token_bucket_allows_bursts_then_the_sustained_rate():
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=lambda: now[0])
+
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    now[0] += 0.5
+    assert bucket.try_acquire() == 0.0
+    now[0] += 10
+    assert [bucket.try_acquire() for _ in range(4)][-1] == pytest.approx(0.5)
+
+
+def test_rate_limited_channel_does_not_delay_others():
+    delivered = {"slow": [], "fast": []}
+
+    class _Recorder(AlertChannel):
+        def __init__(self, name):
+            self.name = name
+
+        def send(self, alert):
+            delivered[self.name].append(alert.title)
+            return True
+
+    dispatcher = AlertDispatcher(
+        [_Recorder("slow"), _Recorder("fast")], window=0, rate_per_minute=60, burst=1
+    )
+    dispatcher._workers[1].bucket = TokenBucket(rate=1000, capacity=100)
+    for i in range(3):
+        dispatcher.submit(_alert(title=f"alert {i}"))
+
+    deadline = time.monotonic() + 2
+    while len(delivered["fast"]) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert delivered["fast"] == ["alert 0", "alert 1", "alert 2"]
+    assert delivered["slow"] == ["alert 0"]
+
+    # Closing does not wait out the rate limit beyond its timeout
+    dispatcher.close(timeout=0.1)
+    assert dispatcher.stats["dropped"] >= 1
+
+
+def test_certificate_alerts_can_go_through_the_dispatcher():
+    dispatcher = MagicMock()
+    monitor = CertificateMonitor(
+        MagicMock(), AlertConfig(email_enabled=True), dispatcher=dispatcher
+    )
+
+    with patch("configurator.security.cert_monitor.smtplib.SMTP") as smtp:
+        assert monitor.send_alerts(
+            [CertificateAlert("example.com", AlertLevel.CRITICAL, "Certificate EXPIRED", -1)]
+        )
+
+    smtp.assert_not_called()
+    alert = dispatcher.submit.call_args.args[0]
+    assert (alert.severity, alert.title) == (AlertSeverity.CRITICAL, "SSL certificate: example.com")
+    assert alert.metadata == {"domain": "example.com", "days_remaining": -1}
@@ -420,6 +420,44 @@ class TestCertificateMonitor:
         assert alert.level == AlertLevel.WARNING
         assert alert.days_remaining == 20
 
+    def test_scheduled_monitor_rearms_deadlines(self):
+        """A rescan re-arms itself and each certificate's next threshold."""
+        from configurator.core.expiry_scheduler import ExpiryEntry
+        from configurator.security.cert_monitor import CertificateMonitor, ScheduledMonitor
+
+        valid_until = datetime.now() + timedelta(days=20)
+        mock_cert = Mock(domain="example.com", valid_until=valid_until)
+        mock_cert.days_until_expiry.return_value = 20
+        mock_manager = Mock()
+        mock_manager.list_certificates.return_value = [mock_cert]
+        mock_manager.get_certificate.return_value = mock_cert
+
+        monitor = CertificateMonitor(
+            certificate_manager=mock_manager,
+            warning_threshold_days=30,
+            critical_threshold_days=14,
+        )
+        monitor.send_alerts = Mock()
+        scheduled = ScheduledMonitor(monitor, interval_hours=24)
+
+        scheduled._on_rescan(ExpiryEntry("certificate:rescan", datetime.now(), "rescan"))
+
+        rescan = scheduled.scheduler.get("certificate:rescan")
+        assert rescan.due_at > datetime.now() + timedelta(hours=23)
+        check = scheduled.scheduler.get("certificate:example.com")
+        # Already past the warning threshold: next crossing is the critical one
+        expected = valid_until - timedelta(days=14) + timedelta(seconds=1)
+        assert abs((check.due_at - expected).total_seconds()) < 1
+
+        # Crossing the critical threshold alerts and re-arms for expiry
+        mock_cert.days_until_expiry.return_value = 13
+        mock_cert.valid_until = datetime.now() + timedelta(days=13)
+        scheduled._on_check(check)
+
+        monitor.send_alerts.assert_called()
+        rearmed = scheduled.scheduler.get("certificate:example.com")
+        assert abs((rearmed.due_at - mock_cert.valid_until).total_seconds() - 1) < 1
+
 
 class TestWebServerConfig:
     """Tests for web server configuration."""
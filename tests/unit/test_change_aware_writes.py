@@ -0,0 +1,86 @@
+"""Unit tests for change-aware file writes and coalesced service restarts."""
+
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from configurator.modules.base import ConfigurationModule
+from configurator.utils.file import file_has_content, write_file
+
+
+class FakeModule(ConfigurationModule):
+    name = "Fake"
+
+    def validate(self) -> bool:
+        return True
+
+    def configure(self) -> bool:
+        return True
+
+    def verify(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def module():
+    module = FakeModule(config={}, rollback_manager=Mock())
+    module.run = Mock(return_value=Mock(success=True))
+    return module
+
+
+def test_identical_content_is_not_rewritten_or_backed_up(tmp_path):
+    target = tmp_path / "app.conf"
+    target.write_text("key = 1\n")
+    target.chmod(0o600)
+    os.utime(target, ns=(0, 0))
+
+    assert file_has_content(target, "key = 1\n")
+    assert not file_has_content(target, "key = 2\n")
+    assert not file_has_content(tmp_path / "missing", "")
+
+    with patch("configurator.utils.file.backup_file") as backup:
+        write_file(target, "key = 1\n", mode=0o644)
+        assert not backup.called
+        assert target.stat().st_mtime_ns == 0
+        assert target.stat().st_mode & 0o777 == 0o644
+
+        write_file(target, "key = 2\n")
+        backup.assert_called_once_with(target)
+        assert target.read_text() == "key = 2\n"
+
+
+def test_restarts_are_queued_only_for_changed_files(module, tmp_path):
+    conf = tmp_path / "app.conf"
+
+    assert module.write_file(str(conf), "a\n", restart="app")
+    assert not module.write_file(str(conf), "a\n", restart="other")
+    assert module.write_file(str(conf), "b\n", restart="app")
+
+    assert list(module.pending_restarts) == ["app"]
+    assert not module.daemon_reload_pending
+    assert not module.run.called
+
+
+def test_pending_actions_run_once_with_a_single_daemon_reload(module):
+    with patch("configurator.utils.file.write_file"):
+        module.write_file("/etc/systemd/system/a.service", "[Unit]\n", restart="a")
+        module.write_file("/etc/systemd/system/b.service", "[Unit]\n", restart="b")
+    module.schedule_restart("a")
+
+    assert module.apply_pending_service_actions()
+    assert [c.args[0] for c in module.run.call_args_list] == [
+        "systemctl daemon-reload",
+        "systemctl restart a",
+        "systemctl restart b",
+    ]
+
+    module.run.reset_mock()
+    assert module.apply_pending_service_actions()
+    assert not module.run.called
+
+
+def test_failed_restart_is_reported(module):
+    module.run.return_value = Mock(success=False)
+    module.schedule_restart("a")
+    assert not module.apply_pending_service_actions()
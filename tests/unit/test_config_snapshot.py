@@ -0,0 +1,128 @@
+"""Unit tests for compiled configuration snapshots."""
+
+import os
+import time
+
+import pytest
+
+from configurator.config import ConfigManager
+from configurator.config_snapshot import SnapshotCache, build_index
+
+
+def _settle(path, age=10):
+    """Backdate a file past the cache's racy window."""
+    past = time.time() - age
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SnapshotCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def user_config(tmp_path):
+    path = tmp_path / "user.yaml"
+    path.write_text("system:\n  hostname: cached-host\n")
+    _settle(path)
+    return path
+
+
+def test_unchanged_sources_skip_yaml_parsing(cache, user_config, monkeypatch):
+    first = ConfigManager(config_file=user_config, profile="beginner", snapshot_cache=cache)
+    assert list(cache.cache_dir.glob("*.json"))
+
+    def fail():
+        raise AssertionError("sources were reparsed")
+
+    monkeypatch.setattr(ConfigManager, "_merge_sources", lambda self: fail())
+    second = ConfigManager(config_file=user_config, profile="beginner", snapshot_cache=cache)
+
+    assert second.config == first.config
+    assert second.get("system.hostname") == "cached-host"
+
+
+def test_changed_source_is_reparsed(cache, user_config):
+    ConfigManager(config_file=user_config, snapshot_cache=cache)
+
+    user_config.write_text("system:\n  hostname: edited-host\n")
+    _settle(user_config, age=5)
+
+    config = ConfigManager(config_file=user_config, snapshot_cache=cache)
+    assert config.get("system.hostname") == "edited-host"
+
+
+def test_freshly_written_source_is_not_cached(cache, tmp_path):
+    path = tmp_path / "fresh.yaml"
+    path.write_text("system:\n  hostname: fresh\n")
+
+    config = ConfigManager(config_file=path, snapshot_cache=cache)
+
+    assert config.get("system.hostname") == "fresh"
+    assert not cache.cache_dir.exists()
+
+
+def test_non_json_values_are_not_cached(cache, tmp_path):
+    path = tmp_path / "dates.yaml"
+    path.write_text("maintenance:\n  window: 2024-01-01\n")
+    _settle(path)
+
+    config = ConfigManager(config_file=path, snapshot_cache=cache)
+
+    assert str(config.get("maintenance.window")) == "2024-01-01"
+    assert not list(cache.cache_dir.glob("*.json"))
+
+
+def test_index_matches_tree_walk():
+    data = {"a": {"b": {"c": 1}, "x.y": 2, 3: "int key"}, "n": None}
+    index = build_index(data)
+
+    assert index["a.b.c"] == 1
+    assert index["a.b"] == {"c": 1}
+    assert index["n"] is None
+    assert "a.x.y" not in index
+    assert "a.3" not in index
+
+
+def test_set_refreshes_index_and_module_views(cache):
+    config = ConfigManager(snapshot_cache=cache)
+    view = config.get_module_config("docker")
+    assert config.get_module_config("docker") is view
+
+    config.set("tools.docker.compose", False)
+
+    assert config.get("tools.docker.compose") is False
+    assert config.get_module_config("docker")["compose"] is False
+
+
+def test_security_view_includes_advanced_settings(cache):
+    config = ConfigManager(snapshot_cache=cache)
+    config.set("security_advanced", {"supply_chain": {"enabled": True}})
+
+    view = config.get_module_config("security")
+
+    assert view["security_advanced"] == {"supply_chain": {"enabled": True}}
+    assert view["enabled"] is True
+    assert config.get_module_config("unknown") == {}
+
+
+def test_snapshots_writable_by_others_are_ignored(cache):
+    assert cache.store("k", {"system": {"hostname": "cached"}})
+    assert cache.load("k") == {"system": {"hostname": "cached"}}
+
+    snapshot = cache.cache_dir / "k.json"
+    snapshot.chmod(0o666)
+    assert cache.load("k") is None
+
+    snapshot.chmod(0o600)
+    cache.cache_dir.chmod(0o777)
+    assert cache.load("k") is None
+    assert not cache.store("j", {"a": 1})
+
+
+def test_root_does_not_use_home_cache(monkeypatch, tmp_path):
+    monkeypatch.delenv("VPS_CONFIG_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(os, "geteuid", lambda: 0)
+
+    assert SnapshotCache.default_dir() == SnapshotCache.ROOT_CACHE_DIR
@@ -0,0 +1,117 @@
+"""Unit tests for skipping modules whose desired state is already applied."""
+
+from typing import List
+from unittest.mock import Mock, patch
+
+import pytest
+
+from configurator.core.execution.base import ExecutionContext
+from configurator.core.execution.parallel import ParallelExecutor
+from configurator.core.execution.pipeline import PipelineExecutor
+from configurator.core.mirror import Artifact
+from configurator.core.state.manager import StateManager
+from configurator.modules.base import ConfigurationModule
+
+
+class FakeModule(ConfigurationModule):
+    name = "Fake"
+
+    def __init__(self, config, managed_file):
+        super().__init__(config=config)
+        self.managed_file = managed_file
+        self.configure_calls = 0
+        self.succeed = True
+
+    def mirror_artifacts(self) -> List[Artifact]:
+        return [Artifact("deb", "git")]
+
+    def managed_files(self) -> List[str]:
+        return [str(self.managed_file)]
+
+    def validate(self) -> bool:
+        return True
+
+    def configure(self) -> bool:
+        self.configure_calls += 1
+        self.managed_file.write_text("applied\n")
+        return self.succeed
+
+    def verify(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def installed():
+    facts = Mock()
+    facts.is_package_installed.return_value = True
+    with patch("configurator.modules.base.get_system_facts", return_value=facts):
+        yield facts
+
+
+@pytest.fixture
+def module(tmp_path):
+    return FakeModule({"enabled": True}, tmp_path / "app.conf")
+
+
+def _run(executor, module, state_manager, **kwargs):
+    context = ExecutionContext("fake", module, {}, state_manager=state_manager, **kwargs)
+    return executor.execute([context])["fake"]
+
+
+def test_fingerprint_covers_config_version_and_files(module):
+    before = module.state_fingerprint()
+    assert module.state_fingerprint() == before
+
+    module.managed_file.write_text("edited by hand\n")
+    after_edit = module.state_fingerprint()
+    assert after_edit != before
+
+    module.config = {"enabled": False}
+    assert module.state_fingerprint() != after_edit
+
+    module.version = "2"
+    assert module.state_fingerprint() != after_edit
+
+
+@pytest.mark.parametrize("executor", [PipelineExecutor(), ParallelExecutor()])
+def test_second_run_is_skipped_as_converged(executor, module, installed):
+    state = StateManager(db_path=":memory:")
+
+    assert not _run(executor, module, state).converged
+    result = _run(executor, module, state)
+
+    assert result.success and result.converged
+    assert module.configure_calls == 1
+
+
+def test_drift_forces_a_rerun(module, installed):
+    state = StateManager(db_path=":memory:")
+    executor = PipelineExecutor()
+    _run(executor, module, state)
+
+    module.managed_file.write_text("drifted\n")
+    assert not _run(executor, module, state).converged
+
+    installed.is_package_installed.return_value = False
+    assert not _run(executor, module, state).converged
+
+    assert module.configure_calls == 3
+
+
+def test_force_dry_run_and_failure_always_execute(module, installed):
+    state = StateManager(db_path=":memory:")
+    executor = PipelineExecutor()
+    _run(executor, module, state)
+
+    assert not _run(executor, module, state, force=True).converged
+    assert not _run(executor, module, state, dry_run=True).converged
+
+    module.succeed = False
+    assert not _run(executor, module, state, force=True).success
+    assert state.get_module_fingerprint("fake") is None
+
+
+def test_modules_without_declared_state_never_converge(module):
+    module.mirror_artifacts = lambda: []
+    module.managed_files = lambda: []
+    assert not module.probe_converged()
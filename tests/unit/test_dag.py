@@ -0,0 +1,90 @@
+"""Unit tests for the DAG engine."""
+
+import pytest
+
+from configurator.core.dag import DAG, CycleError
+from configurator.core.dependency import DependencyGraph
+
+
+def _dag(edges):
+    dag = DAG()
+    for before, after in edges:
+        dag.add_edge(before, after)
+    return dag
+
+
+def test_layers_keep_insertion_order():
+    dag = _dag([("system", "security"), ("system", "python"), ("security", "docker")])
+    dag.add_node("netdata")
+
+    assert dag.layers() == [["system", "netdata"], ["security", "python"], ["docker"]]
+    assert dag.topological_order() == ["system", "netdata", "security", "python", "docker"]
+
+
+def test_duplicate_edges_are_ignored():
+    dag = _dag([("a", "b"), ("a", "b")])
+
+    assert dag.edge_count == 1
+    assert dag.in_degree("b") == 1
+    assert dag.layers() == [["a"], ["b"]]
+
+
+def test_cycles_are_reported_per_component():
+    dag = _dag([("a", "b"), ("b", "c"), ("c", "a"), ("x", "y"), ("y", "x"), ("c", "z")])
+    dag.add_edge("s", "s")
+
+    assert dag.find_cycles() == [["a", "b", "c", "a"], ["x", "y", "x"], ["s", "s"]]
+    with pytest.raises(CycleError) as exc_info:
+        dag.layers()
+    assert len(exc_info.value.cycles) == 3
+    assert "a -> b -> c -> a" in str(exc_info.value)
+
+
+def test_strongly_connected_components():
+    dag = _dag([("a", "b"), ("b", "a"), ("b", "c")])
+
+    components = sorted(dag.strongly_connected_components())
+
+    assert components == [["a", "b"], ["c"]]
+
+
+def test_transitive_closure_is_invalidated_on_change():
+    dag = _dag([("a", "b"), ("b", "c")])
+
+    assert dag.ancestors("c") == {"a", "b"}
+    assert dag.descendants("a") == {"b", "c"}
+    assert dag.reaches("a", "c")
+    assert not dag.reaches("c", "a")
+
+    dag.add_edge("d", "a")
+    assert dag.ancestors("c") == {"a", "b", "d"}
+
+
+def test_critical_path_uses_weights():
+    dag = _dag([("system", "desktop"), ("system", "python"), ("python", "devops")])
+
+    assert dag.critical_path() == (3.0, ["system", "python", "devops"])
+    assert dag.critical_path({"system": 1, "desktop": 10, "python": 2, "devops": 2}) == (
+        11.0,
+        ["system", "desktop"],
+    )
+    assert DAG().critical_path() == (0.0, [])
+
+
+def test_dependency_graph_batches_split_sequential_modules():
+    graph = DependencyGraph()
+    graph.add_module("system")
+    graph.add_module("docker", depends_on=["system"], force_sequential=True)
+    graph.add_module("python", depends_on=["system"])
+    graph.add_module("nodejs", depends_on=["system"])
+
+    assert graph.get_execution_batches() == [["system"], ["docker"], ["python", "nodejs"]]
+
+
+def test_dependency_graph_validate_reports_cycle():
+    graph = DependencyGraph()
+    graph.add_module("a", depends_on=["b"])
+    graph.add_module("b", depends_on=["a"])
+
+    with pytest.raises(ValueError, match="Circular dependencies"):
+        graph.validate()
@@ -0,0 +1,151 @@
+"""Unit tests for the pooled, resumable download engine."""
+
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from configurator.utils.download import DownloadEngine, DownloadTask
+
+PAYLOAD = os.urandom(300 * 1024)
+DIGEST = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves PAYLOAD with Range support; can drop the first connection mid-body."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("Range"))
+
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", server.etag) == server.etag:
+            start = int(range_header.split("=")[1].rstrip("-"))
+
+        body = PAYLOAD[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(body)))
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}")
+        self.end_headers()
+
+        if server.drop_after is not None:
+            cut, server.drop_after = server.drop_after, None
+            self.wfile.write(body[:cut])
+            self.wfile.flush()
+            self.connection.close()
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    httpd.etag = '"v1"'
+    httpd.drop_after = None
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, name="file.bin"):
+    return f"http://127.0.0.1:{server.server_address[1]}/{name}"
+
+
+def test_download_hashes_while_writing(server, tmp_path):
+    dest = tmp_path / "file.bin"
+    result = DownloadEngine(retry_delay=0).fetch(_url(server), dest)
+
+    assert result.success
+    assert result.sha256 == DIGEST
+    assert dest.read_bytes() == PAYLOAD
+    assert not (tmp_path / "file.bin.part").exists()
+
+
+def test_dropped_connection_resumes_with_range(server, tmp_path):
+    server.drop_after = 100 * 1024
+    dest = tmp_path / "file.bin"
+
+    result = DownloadEngine(retry_delay=0).fetch(_url(server), dest)
+
+    assert result.resumed
+    assert result.sha256 == DIGEST
+    assert dest.read_bytes() == PAYLOAD
+    # The retry asks only for the bytes not yet on disk
+    assert server.requests[0] is None
+    assert server.requests[1] not in (None, "bytes=0-")
+
+
+def test_partial_from_earlier_run_is_resumed(server, tmp_path):
+    dest = tmp_path / "file.bin"
+    (tmp_path / "file.bin.part").write_bytes(PAYLOAD[:5000])
+    (tmp_path / "file.bin.part.meta").write_text(
+        '{"url": "%s", "validator": "\\"v1\\""}' % _url(server)
+    )
+
+    result = DownloadEngine(retry_delay=0).fetch(_url(server), dest)
+
+    assert result.resumed
+    assert result.sha256 == DIGEST
+    assert server.requests == ["bytes=5000-"]
+
+
+def test_changed_resource_restarts_from_zero(server, tmp_path):
+    dest = tmp_path / "file.bin"
+    (tmp_path / "file.bin.part").write_bytes(b"stale bytes from an old version")
+    (tmp_path / "file.bin.part.meta").write_text(
+        '{"url": "%s", "validator": "\\"v0\\""}' % _url(server)
+    )
+
+    result = DownloadEngine(retry_delay=0).fetch(_url(server), dest)
+
+    assert result.sha256 == DIGEST
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_partial_writable_by_others_is_not_resumed(server, tmp_path):
+    dest = tmp_path / "file.bin"
+    planted = tmp_path / "file.bin.part"
+    planted.write_bytes(b"#!/bin/sh\nevil\n" + PAYLOAD[15:5000])
+    planted.chmod(0o666)
+    (tmp_path / "file.bin.part.meta").write_text(
+        '{"url": "%s", "validator": "\\"v1\\""}' % _url(server)
+    )
+
+    result = DownloadEngine(retry_delay=0).fetch(_url(server), dest)
+
+    assert not result.resumed
+    assert dest.read_bytes() == PAYLOAD
+    assert server.requests == [None]
+
+
+def test_checksum_mismatch_leaves_no_file(server, tmp_path):
+    dest = tmp_path / "file.bin"
+    result = DownloadEngine(retry_delay=0).download(_url(server), dest, expected_sha256="0" * 64)
+
+    assert not result.success
+    assert "mismatch" in result.error.lower()
+    assert not dest.exists()
+    assert not (tmp_path / "file.bin.part").exists()
+
+
+def test_download_many_preserves_order(server, tmp_path):
+    tasks = [DownloadTask(_url(server, f"f{i}.bin"), tmp_path / f"f{i}.bin") for i in range(4)]
+    tasks.append(DownloadTask("http://127.0.0.1:1/missing.bin", tmp_path / "missing.bin"))
+
+    engine = DownloadEngine(max_workers=4, per_host_limit=2, max_retries=0)
+    results = engine.download_many(tasks)
+
+    assert [r.destination for r in results] == [t.destination for t in tasks]
+    assert all(r.success and r.sha256 == DIGEST for r in results[:4])
+    assert not results[4].success
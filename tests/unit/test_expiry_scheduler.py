@@ -0,0 +1,157 @@
+"""Unit tests for the expiry scheduler."""
+
+from datetime import datetime, timedelta
+
+from configurator.core.expiry_scheduler import ExpiryEntry, ExpiryScheduler
+
+
+def test_pop_due_returns_entries_in_deadline_order():
+    """Due entries come out earliest first; future ones stay queued."""
+    scheduler = ExpiryScheduler()
+    now = datetime.now()
+
+    scheduler.schedule("b", now - timedelta(minutes=1), "notify")
+    scheduler.schedule("a", now - timedelta(minutes=5), "notify")
+    scheduler.schedule("c", now + timedelta(days=1), "notify")
+
+    due = scheduler.pop_due(now)
+
+    assert [e.key for e in due] == ["a", "b"]
+    assert len(scheduler) == 1
+    assert scheduler.next_due() == now + timedelta(days=1)
+
+
+def test_reschedule_replaces_previous_deadline():
+    """Scheduling the same key again moves its deadline."""
+    scheduler = ExpiryScheduler()
+    now = datetime.now()
+
+    scheduler.schedule("k", now - timedelta(minutes=1), "revoke")
+    scheduler.schedule("k", now + timedelta(hours=1), "revoke")
+
+    assert scheduler.pop_due(now) == []
+    assert len(scheduler) == 1
+
+
+def test_cancel_and_cancel_prefix():
+    """Cancelled entries are never dispatched."""
+    scheduler = ExpiryScheduler()
+    past = datetime.now() - timedelta(seconds=1)
+
+    scheduler.schedule("user:alice:expire", past, "revoke")
+    scheduler.schedule("user:alice:remind", past, "notify")
+    scheduler.schedule("user:bob:expire", past, "revoke")
+
+    assert scheduler.cancel("user:bob:expire") is True
+    assert scheduler.cancel("missing") is False
+    assert scheduler.cancel_prefix("user:alice:") == 2
+    assert scheduler.pop_due() == []
+    assert scheduler.next_due() is None
+
+
+def test_dispatch_due_runs_handlers():
+    """Handlers receive due entries; failures do not block the rest."""
+    scheduler = ExpiryScheduler()
+    seen = []
+
+    def failing(entry: ExpiryEntry) -> None:
+        raise RuntimeError("boom")
+
+    scheduler.register_handler("notify", lambda entry: seen.append(entry.payload["user"]))
+    scheduler.register_handler("revoke", failing)
+
+    past = datetime.now() - timedelta(seconds=1)
+    scheduler.schedule("1", past, "revoke", {"user": "alice"})
+    scheduler.schedule("2", past, "notify", {"user": "bob"})
+
+    dispatched = scheduler.dispatch_due()
+
+    assert len(dispatched) == 2
+    assert seen == ["bob"]
+
+
+def test_schedule_persists_and_restores(tmp_path):
+    """Pending entries survive a restart."""
+    state_file = tmp_path / "schedule.json"
+    due_at = datetime(2030, 1, 1, 12, 0, 0)
+
+    scheduler = ExpiryScheduler(state_file=state_file)
+    assert scheduler.restored is False
+    scheduler.schedule("k", due_at, "revoke", {"user": "alice"})
+
+    restored = ExpiryScheduler(state_file=state_file)
+
+    assert restored.restored is True
+    entry = restored.get("k")
+    assert entry is not None
+    assert entry.due_at == due_at
+    assert entry.payload == {"user": "alice"}
+
+
+def test_background_thread_wakes_on_new_deadline():
+    """The background loop dispatches an entry scheduled while it sleeps."""
+    import threading
+
+    scheduler = ExpiryScheduler()
+    fired = threading.Event()
+    scheduler.register_handler("notify", lambda entry: fired.set())
+
+    scheduler.start()
+    try:
+        scheduler.schedule("k", datetime.now() + timedelta(milliseconds=50), "notify")
+        assert fired.wait(timeout=5)
+    finally:
+        scheduler.stop()
+
+
+def test_failed_and_unhandled_entries_are_retried_with_backoff(tmp_path):
+    """A failing handler does not lose its entry; it comes back later."""
+    scheduler = ExpiryScheduler(state_file=tmp_path / "schedule.json")
+    calls = []
+
+    def flaky(entry: ExpiryEntry) -> None:
+        calls.append(entry.attempts)
+        if len(calls) == 1:
+            raise RuntimeError("revoke failed")
+
+    scheduler.register_handler("revoke", flaky)
+    now = datetime.now()
+    scheduler.schedule("k", now - timedelta(seconds=1), "revoke")
+    scheduler.schedule("orphan", now - timedelta(seconds=1), "unknown")
+
+    scheduler.dispatch_due(now)
+
+    retry = ExpiryScheduler(state_file=tmp_path / "schedule.json").get("k")
+    assert retry is not None and retry.attempts == 1
+    assert retry.due_at > now + timedelta(seconds=30)
+    assert scheduler.get("orphan").attempts == 1
+
+    scheduler.dispatch_due(now + timedelta(hours=2))
+    assert calls == [0, 1]
+    assert "k" not in scheduler
+    assert scheduler.get("orphan").attempts == 2
+
+
+def test_changes_from_other_processes_are_merged(tmp_path):
+    """Reloading picks up other writers without dropping local changes."""
+    state_file = tmp_path / "schedule.json"
+    later = datetime.now() + timedelta(days=1)
+
+    watcher = ExpiryScheduler(state_file=state_file)
+    watcher.schedule("moved", later, "revoke")
+    watcher.schedule("removed", later, "revoke")
+
+    other = ExpiryScheduler(state_file=state_file)
+    other.schedule("moved", later + timedelta(days=30), "revoke", persist=False)
+    other.schedule("added", later, "revoke", persist=False)
+    other.cancel("removed")
+
+    watcher.schedule("local", later, "notify", persist=False)
+    assert watcher.reload() is True
+
+    assert watcher.get("moved").due_at == later + timedelta(days=30)
+    assert "added" in watcher and "removed" not in watcher
+    assert "local" in watcher
+
+    watcher.save()
+    assert {"moved", "added", "local"} <= set(ExpiryScheduler(state_file=state_file)._entries)
@@ -0,0 +1,128 @@
+"""Unit tests for the batch editor extension installer."""
+
+import hashlib
+import json
+import shlex
+import zipfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from configurator.core.extensions import ExtensionInstaller, ExtensionSpec, VsixCache
+from configurator.utils.download import DownloadResult
+
+
+class FakeEngine:
+    """Serves a VSIX for every marketplace URL, except those of broken publishers."""
+
+    def __init__(self):
+        self.urls = []
+
+    def download_many(self, tasks):
+        results = []
+        for task in tasks:
+            self.urls.append(task.url)
+            parts = task.url.split("/")
+            publisher, name, version = parts[-5], parts[-3], parts[-2]
+            if publisher == "broken":
+                results.append(DownloadResult(task.url, task.destination, False, error="404"))
+                continue
+            with zipfile.ZipFile(task.destination, "w") as archive:
+                manifest = {
+                    "publisher": publisher,
+                    "name": name,
+                    "version": "1.0.0" if version == "latest" else version,
+                }
+                archive.writestr("extension/package.json", json.dumps(manifest))
+            digest = hashlib.sha256(task.destination.read_bytes()).hexdigest()
+            results.append(DownloadResult(task.url, task.destination, True, sha256=digest))
+        return results
+
+
+@pytest.fixture
+def engine():
+    fake = FakeEngine()
+    with patch("configurator.core.extensions.get_download_engine", return_value=fake):
+        yield fake
+
+
+def _package_id(path):
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read("extension/package.json"))
+    return f"{manifest['publisher']}.{manifest['name']}"
+
+
+def _installer(tmp_path, extensions_dir):
+    def run(command, **kwargs):
+        # Pretend to be the editor: install every VSIX / id given
+        args = shlex.split(command)
+        for target in [args[i + 1] for i, a in enumerate(args) if a == "--install-extension"]:
+            ext_id = _package_id(target) if target.endswith(".vsix") else target
+            if not ext_id.startswith("broken."):
+                (extensions_dir / f"{ext_id}-1.0.0").mkdir(parents=True, exist_ok=True)
+        calls["commands"].append(command)
+        return Mock(success=True)
+
+    calls = {"commands": []}
+    cache = VsixCache(cache_dir=tmp_path / "cache")
+    installer = ExtensionInstaller("code", extensions_dir, run=run, cache=cache)
+    return installer, calls
+
+
+def test_missing_extensions_install_in_one_call(tmp_path, engine):
+    extensions_dir = tmp_path / "extensions"
+    (extensions_dir / "eamodio.gitlens-15.0.0").mkdir(parents=True)
+    installer, calls = _installer(tmp_path, extensions_dir)
+
+    report = installer.install(["ms-python.python", "eamodio.gitlens", "esbenp.prettier-vscode"])
+
+    assert report.success
+    assert report.already_present == ["eamodio.gitlens"]
+    assert sorted(report.installed) == ["esbenp.prettier-vscode", "ms-python.python"]
+    assert len(calls["commands"]) == 1
+    assert calls["commands"][0].count("--install-extension") == 2
+    assert len(engine.urls) == 2
+
+    # A second run (or another editor) finds everything locally
+    report = installer.install(["ms-python.python", "eamodio.gitlens"])
+    assert sorted(report.already_present) == ["eamodio.gitlens", "ms-python.python"]
+    assert len(calls["commands"]) == 1
+
+
+def test_cached_packages_are_reused(tmp_path, engine):
+    cache = VsixCache(cache_dir=tmp_path / "cache")
+    specs = [ExtensionSpec.parse("ms-python.python"), ExtensionSpec.parse("a.b@2.1.0")]
+
+    first = cache.fetch(specs)
+    second = VsixCache(cache_dir=tmp_path / "cache").fetch(specs)
+
+    assert first == second
+    assert len(engine.urls) == 2
+    assert all(Path(p).name.endswith(".vsix") for p in first.values())
+
+    expired = VsixCache(cache_dir=tmp_path / "cache", latest_ttl=0)
+    expired.fetch(specs)
+    assert len(engine.urls) == 3  # Only the unpinned extension is fetched again
+
+
+def test_unavailable_packages_fall_back_to_the_marketplace_id(tmp_path, engine):
+    installer, calls = _installer(tmp_path, tmp_path / "extensions")
+
+    report = installer.install(["broken.ext", "not an extension"], retries=1)
+
+    assert "--install-extension broken.ext" in calls["commands"][0]
+    assert len(calls["commands"]) == 2  # One retry for what is still missing
+    assert report.failed == ["not an extension", "broken.ext"]
+
+
+def test_pinned_versions(tmp_path, engine):
+    extensions_dir = tmp_path / "extensions"
+    (extensions_dir / "ms-python.python-1.0.0").mkdir(parents=True)
+    installer = ExtensionInstaller("code", extensions_dir, run=Mock(), dry_run=True)
+
+    report = installer.install(["ms-python.python@1.0.0", "eamodio.gitlens@15.0.0"])
+
+    assert report.already_present == ["ms-python.python@1.0.0"]
+    assert report.installed == ["eamodio.gitlens@15.0.0"]
+    assert not engine.urls
@@ -0,0 +1,150 @@
+"""Unit tests for the cached system facts layer."""
+
+import os
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from configurator.utils.facts import SystemFacts, parse_dpkg_status
+
+DPKG_STATUS = """\
+Package: git
+Status: install ok installed
+Priority: optional
+Architecture: amd64
+Version: 1:2.39.2-1.1
+Description: fast, scalable, distributed revision control system
+ Git is popular.
+ .
+ Status: not a real field
+
+Package: telnet
+Status: deinstall ok config-files
+Architecture: amd64
+Version: 0.17+2.4-2
+
+Package: libc6
+Status: install ok installed
+Architecture: i386
+Version: 2.36-9
+"""
+
+UNIT_FILES = """\
+ssh.service                 enabled         enabled
+sshd.service                alias           -
+xrdp.service                enabled         enabled
+telnet.socket               masked          enabled
+"""
+
+UNITS = """\
+ssh.service     loaded    active   running OpenBSD Secure Shell server
+xrdp.service    loaded    failed   failed  xrdp daemon
+"""
+
+
+def _completed(args, stdout):
+    return subprocess.CompletedProcess(args, 0, stdout=stdout, stderr="")
+
+
+@pytest.fixture
+def facts(tmp_path):
+    status = tmp_path / "status"
+    status.write_text(DPKG_STATUS)
+    return SystemFacts(dpkg_status=status, search_path=str(tmp_path / "bin"))
+
+
+@pytest.fixture
+def systemctl():
+    calls = []
+
+    def fake_run(args, **kwargs):
+        calls.append(args[1:])
+        if args[1] == "list-unit-files":
+            return _completed(args, UNIT_FILES)
+        if args[1] == "list-units":
+            return _completed(args, UNITS)
+        if args[1:] == ["is-enabled", "sshd.service"]:
+            return _completed(args, "enabled\n")
+        return subprocess.CompletedProcess(args, 4, stdout="", stderr="not found")
+
+    with (
+        patch("configurator.utils.facts.shutil.which", return_value="/usr/bin/systemctl"),
+        patch("configurator.utils.facts.subprocess.run", side_effect=fake_run),
+    ):
+        yield calls
+
+
+def test_parse_dpkg_status_ignores_continuation_lines():
+    packages = parse_dpkg_status(DPKG_STATUS)
+
+    assert packages["git"].version == "1:2.39.2-1.1"
+    assert packages["git"].installed
+    assert not packages["telnet"].installed
+    assert packages["libc6:i386"] is packages["libc6"]
+
+
+def test_package_queries_reload_when_status_changes(facts):
+    assert facts.package_version("git") == "1:2.39.2-1.1"
+    assert facts.package_version("telnet") is None
+    assert not facts.is_package_installed("vim")
+
+    facts.dpkg_status.write_text(DPKG_STATUS + "\nPackage: vim\nStatus: install ok installed\n")
+
+    assert facts.is_package_installed("vim")
+
+
+def test_service_states_come_from_two_bulk_calls(facts, systemctl):
+    assert facts.is_service_enabled("ssh")
+    assert facts.is_service_active("ssh.service")
+    assert not facts.is_service_active("xrdp")
+    assert facts.unit_file_state("telnet.socket") == "masked"
+    assert facts.unit_file_state("nope") is None
+    assert facts.unit_file_state("nope") is None
+
+    # Aliases are resolved by systemctl, once
+    assert facts.is_service_enabled("sshd")
+    assert facts.is_service_enabled("sshd")
+
+    assert [call[0] for call in systemctl] == [
+        "list-unit-files",
+        "list-units",
+        "is-enabled",
+        "is-enabled",
+    ]
+
+
+def test_invalidate_reloads_services(facts, systemctl):
+    facts.is_service_enabled("ssh")
+    facts.invalidate("packages", "commands")
+    facts.is_service_enabled("ssh")
+    assert len(systemctl) == 2
+
+    facts.invalidate("services")
+    facts.is_service_enabled("ssh")
+    assert len(systemctl) == 4
+
+    with pytest.raises(ValueError):
+        facts.invalidate("kernel")
+
+
+def test_command_lookup_rescans_changed_directories(facts, tmp_path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    tool = bin_dir / "tool"
+    tool.write_text("#!/bin/sh\n")
+    tool.chmod(0o755)
+    (bin_dir / "data").write_text("not executable")
+
+    assert facts.which("tool") == str(tool)
+    assert not facts.command_exists("data")
+    assert not facts.command_exists("other")
+
+    other = bin_dir / "other"
+    other.write_text("#!/bin/sh\n")
+    other.chmod(0o755)
+    # Make sure the directory mtime moves even on coarse filesystems
+    os.utime(bin_dir, ns=(0, os.stat(bin_dir).st_mtime_ns + 1_000_000_000))
+
+    assert facts.command_exists("other")
+    assert facts.command_exists(str(other))
@@ -110,3 +110,187 @@ def test_persistence(tmp_path):
 
             m2 = FileIntegrityMonitor(db_path=db_path, monitored_files=[str(f1)])
             assert str(f1) in m2.baseline
+
+
+def test_stat_fast_path_skips_rehash(fim, monkeypatch):
+    monitor, f1, _ = fim
+    monkeypatch.setattr(FileIntegrityMonitor, "RACY_WINDOW_NS", 0)
+    monitor.initialize()
+
+    with patch.object(monitor, "_calculate_hash", wraps=monitor._calculate_hash) as mock_hash:
+        assert monitor.check() == []
+        mock_hash.assert_not_called()
+
+        f1.write_text("changed content")
+        violations = monitor.check()
+
+    assert [v["path"] for v in violations] == [str(f1)]
+    mock_hash.assert_called_once()
+
+
+def test_racy_entries_are_rehashed(fim):
+    """Files modified right before hashing never take the fast path."""
+    monitor, f1, _ = fim
+    monitor.initialize()
+
+    # Same size, rewritten within the racy window
+    f1.write_text("content9")
+
+    violations = monitor.check()
+    assert len(violations) == 1
+    assert "content_modified" in violations[0]["changes"]
+
+
+def test_racy_entries_get_a_fresh_signature_once_settled(fim, monkeypatch):
+    """An unchanged racy entry is rehashed once, then trusted on its new stat."""
+    monitor, f1, f2 = fim
+    monitor.initialize()
+    assert not monitor.baseline[str(f1)].stat_matches(os.stat(f1), monitor.RACY_WINDOW_NS)
+
+    # Checked after the racy window has passed
+    later = time.time_ns() + 10 * monitor.RACY_WINDOW_NS
+    monkeypatch.setattr(time, "time_ns", lambda: later)
+    assert monitor.check() == []
+
+    with patch("os.chmod"):
+        reloaded = FileIntegrityMonitor(db_path=monitor.db_path, monitored_files=[str(f1), str(f2)])
+    with patch.object(reloaded, "_calculate_hash") as mock_hash:
+        assert reloaded.check() == []
+        mock_hash.assert_not_called()
+
+
+def test_update_rewrites_single_chunk(tmp_path):
+    dir_a = tmp_path / "a"
+    dir_b = tmp_path / "b"
+    dir_a.mkdir()
+    dir_b.mkdir()
+    fa = dir_a / "x.conf"
+    fb = dir_b / "y.conf"
+    fa.write_text("a")
+    fb.write_text("b")
+
+    with patch("configurator.core.file_integrity.AuditLogger"):
+        monitor = FileIntegrityMonitor(
+            db_path=tmp_path / "fim.json", monitored_files=[str(fa), str(fb)]
+        )
+        monitor.initialize()
+
+        chunk_b = monitor._chunk_file(str(dir_b))
+        mtime_b = chunk_b.stat().st_mtime_ns
+
+        fa.write_text("aa")
+        monitor.update_baseline(str(fa))
+
+        assert chunk_b.stat().st_mtime_ns == mtime_b
+
+        reloaded = FileIntegrityMonitor(
+            db_path=tmp_path / "fim.json", monitored_files=[str(fa), str(fb)]
+        )
+        assert reloaded.baseline[str(fa)].size == 2
+        assert reloaded.check() == []
+
+
+def test_tampered_chunk_detected(fim):
+    from configurator.core.file_integrity import FIMError
+
+    monitor, f1, _ = fim
+    monitor.initialize()
+
+    chunk_file = monitor._chunk_file(str(f1.parent))
+    chunk_file.write_text(
+        chunk_file.read_text().replace(monitor.baseline[str(f1)].sha256, "0" * 64)
+    )
+
+    with pytest.raises(FIMError):
+        FileIntegrityMonitor(db_path=monitor.db_path, monitored_files=monitor.monitored_files)
+
+
+def test_missing_chunk_detected(fim):
+    from configurator.core.file_integrity import FIMError
+
+    monitor, f1, _ = fim
+    monitor.initialize()
+
+    monitor._chunk_file(str(f1.parent)).unlink()
+    f1.write_text("modified")
+
+    with pytest.raises(FIMError):
+        FileIntegrityMonitor(db_path=monitor.db_path, monitored_files=monitor.monitored_files)
+
+
+def test_legacy_baseline_loaded(tmp_path):
+    import json
+    from dataclasses import asdict
+
+    f1 = tmp_path / "f1"
+    f1.write_text("data")
+    db_path = tmp_path / "fim.json"
+
+    with patch("configurator.core.file_integrity.AuditLogger"):
+        monitor = FileIntegrityMonitor(db_path=db_path, monitored_files=[str(f1)])
+        state = monitor._get_file_state(str(f1))
+        baseline = {str(f1): asdict(state)}
+        legacy = {
+            "baseline": baseline,
+            "_signature": monitor._calculate_signature(
+                json.dumps(baseline, sort_keys=True).encode()
+            ),
+        }
+        db_path.write_text(json.dumps(legacy))
+
+        reloaded = FileIntegrityMonitor(db_path=db_path, monitored_files=[str(f1)])
+        assert str(f1) in reloaded.baseline
+        assert reloaded.check() == []
+
+
+def test_monitored_directory_detects_added_file(tmp_path):
+    tree = tmp_path / "tree"
+    (tree / "sub").mkdir(parents=True)
+    for i in range(20):
+        (tree / "sub" / f"f{i}").write_text(str(i))
+
+    with patch("configurator.core.file_integrity.AuditLogger"):
+        monitor = FileIntegrityMonitor(db_path=tmp_path / "fim.json", monitored_files=[str(tree)])
+        monitor.initialize()
+        assert len(monitor.baseline) == 20
+        assert monitor.check() == []
+
+        (tree / "sub" / "new").write_text("new")
+        violations = monitor.check()
+
+    assert [(v["type"], v["path"]) for v in violations] == [
+        ("file_added", str(tree / "sub" / "new"))
+    ]
+
+
+@pytest.mark.skipif(
+    not __import__("configurator.utils.inotify", fromlist=["is_available"]).is_available(),
+    reason="inotify not available",
+)
+def test_watch_reports_changes(fim):
+    import threading
+
+    monitor, f1, _ = fim
+    monitor.initialize()
+
+    stop = threading.Event()
+    seen = []
+
+    def on_violation(violation):
+        seen.append(violation)
+        stop.set()
+
+    thread = threading.Thread(
+        target=monitor.watch,
+        kwargs={"on_violation": on_violation, "stop_event": stop, "settle_seconds": 0.05},
+    )
+    thread.start()
+    try:
+        time.sleep(0.3)
+        f1.write_text("watched change")
+        assert stop.wait(timeout=5)
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+
+    assert seen[0]["path"] == str(f1)
@@ -0,0 +1,159 @@
+"""Unit tests for the shared git object cache."""
+
+import os
+import pwd
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from configurator.core.git_cache import GitObjectCache
+from configurator.modules.base import ConfigurationModule
+
+GIT = ["git", "-c", "user.email=dev@example.com", "-c", "user.name=dev"]
+
+
+def _commit(repo, text):
+    (repo / "README").write_text(text)
+    subprocess.run([*GIT, "-C", str(repo), "add", "README"], check=True)
+    subprocess.run([*GIT, "-C", str(repo), "commit", "-qm", text], check=True)
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    repo = tmp_path / "upstream"
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    _commit(repo, "one\n")
+    return repo
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return GitObjectCache(cache_dir=tmp_path / "cache")
+
+
+class _Module(ConfigurationModule):
+    def validate(self):
+        return True
+
+    def configure(self):
+        return True
+
+    def verify(self):
+        return True
+
+
+def test_repository_is_fetched_once_for_many_checkouts(cache, upstream, tmp_path):
+    url = f"file://{upstream}"
+    module = _Module(config={})
+
+    with (
+        patch("configurator.modules.base.get_git_cache", return_value=cache),
+        patch("configurator.modules.base.get_active_mirror", return_value=None),
+    ):
+        commands = [
+            module.git_clone_command(url, str(tmp_path / f"user{i}" / "plugin")) for i in range(3)
+        ]
+
+    assert cache.network_fetches == 1
+    for i, command in enumerate(commands):
+        assert str(cache.repo_path(url)) in command
+        subprocess.run(command, shell=True, check=True, capture_output=True)
+        checkout = tmp_path / f"user{i}" / "plugin"
+        assert (checkout / "README").read_text() == "one\n"
+        origin = subprocess.run(
+            ["git", "-C", str(checkout), "remote", "get-url", "origin"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        assert origin == url
+
+
+def test_failed_local_clone_falls_back_to_upstream(cache, upstream, tmp_path):
+    url = f"file://{upstream}"
+    module = _Module(config={})
+    with (
+        patch("configurator.modules.base.get_git_cache", return_value=cache),
+        patch("configurator.modules.base.get_active_mirror", return_value=None),
+    ):
+        command = module.git_clone_command(url, str(tmp_path / "plugin"))
+
+    shutil.rmtree(cache.repo_path(url))
+    subprocess.run(command, shell=True, check=True, capture_output=True)
+    assert (tmp_path / "plugin" / "README").read_text() == "one\n"
+
+
+def test_stale_copies_are_refreshed(cache, upstream, tmp_path):
+    url = f"file://{upstream}"
+    path = cache.ensure(url)
+    _commit(upstream, "two\n")
+
+    # Fresh within the TTL, and only refreshed once per process anyway
+    assert cache.ensure(url) == path
+    assert cache.network_fetches == 1
+
+    later = GitObjectCache(cache_dir=cache.cache_dir, ttl=0)
+    assert later.ensure(url) == path
+    assert later.network_fetches == 1
+
+    subprocess.run(["git", "clone", "-q", str(path), str(tmp_path / "co")], check=True)
+    assert (tmp_path / "co" / "README").read_text() == "two\n"
+
+
+def test_unusable_cache_falls_back_to_upstream(cache, tmp_path):
+    assert cache.ensure(f"file://{tmp_path}/missing") is None
+
+    failing = Mock(return_value=Mock(success=True))
+    assert cache.ensure("https://example.com/never-created.git", run=failing) is None
+
+    os.chmod(cache.cache_dir, 0o777)
+    assert cache.ensure("https://example.com/repo.git", run=failing) is None
+
+
+def test_cached_names_are_readable_and_distinct(cache):
+    a = cache.repo_path("https://github.com/zsh-users/zsh-autosuggestions.git")
+    b = cache.repo_path("https://gitlab.com/zsh-users/zsh-autosuggestions.git")
+
+    assert a.name.startswith("zsh-autosuggestions-") and a.name.endswith(".git")
+    assert a != b
+
+
+@pytest.mark.skipif(
+    os.geteuid() != 0 or shutil.which("su") is None, reason="needs root to clone as another user"
+)
+def test_regular_user_clones_from_root_owned_cache():
+    # pytest's tmp_path is private to root; the user needs to reach both sides
+    root = Path(tempfile.mkdtemp())
+    try:
+        root.chmod(0o755)
+        upstream = root / "upstream"
+        subprocess.run(["git", "init", "-q", str(upstream)], check=True)
+        _commit(upstream, "one\n")
+        url = f"file://{upstream}"
+        cache = GitObjectCache(cache_dir=root / "cache")
+        home = root / "home"
+        home.mkdir()
+        os.chown(home, pwd.getpwnam("nobody").pw_uid, -1)
+
+        module = _Module(config={})
+        with (
+            patch("configurator.modules.base.get_git_cache", return_value=cache),
+            patch("configurator.modules.base.get_active_mirror", return_value=None),
+        ):
+            command = module.git_clone_command(url, str(home / "plugin"))
+        assert str(cache.repo_path(url)) in command
+
+        # No upstream to fall back to: the clone has to come from the cache
+        shutil.rmtree(upstream)
+        result = subprocess.run(
+            ["su", "-s", "/bin/sh", "nobody", "-c", command], capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        assert (home / "plugin" / "README").read_text() == "one\n"
+        assert (home / "plugin").stat().st_uid == pwd.getpwnam("nobody").pw_uid
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
@@ -0,0 +1,137 @@
+"""Unit tests for the shared hashing service."""
+
+import hashlib
+import os
+from unittest.mock import patch
+
+from configurator.utils.hashing import FileSignature, HashService
+
+# Freshly written test files are always inside the real racy window
+NO_RACY_WINDOW = -(10**12)
+
+
+def test_hash_matches_hashlib(tmp_path):
+    small = tmp_path / "small.bin"
+    small.write_bytes(b"hello world")
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+
+    service = HashService()
+
+    assert service.hash_file(small) == hashlib.sha256(b"hello world").hexdigest()
+    assert service.hash_file(empty) == hashlib.sha256(b"").hexdigest()
+    assert service.hash_file(small, "md5") == hashlib.md5(b"hello world").hexdigest()
+
+
+def test_large_file_uses_mmap(tmp_path):
+    data = os.urandom(64 * 1024)
+    big = tmp_path / "big.bin"
+    big.write_bytes(data)
+
+    service = HashService()
+    service.MMAP_THRESHOLD = 1024
+
+    assert service.hash_file(big) == hashlib.sha256(data).hexdigest()
+
+
+def test_unchanged_file_is_not_rehashed(tmp_path):
+    target = tmp_path / "pkg.deb"
+    target.write_bytes(b"x" * 4096)
+
+    service = HashService()
+    service.RACY_WINDOW_NS = NO_RACY_WINDOW
+    first = service.hash_file(target)
+
+    with patch.object(service, "_digest_file") as mock_digest:
+        assert service.hash_file(target) == first
+        mock_digest.assert_not_called()
+
+    assert service.hits == 1
+
+
+def test_racy_files_are_not_cached(tmp_path):
+    target = tmp_path / "fresh.txt"
+    target.write_text("aaaa")
+
+    service = HashService()
+    service.hash_file(target)
+
+    assert len(service._cache) == 0
+
+
+def test_remembered_digest_is_used_after_racy_window(tmp_path):
+    target = tmp_path / "download.tar.gz"
+    target.write_bytes(b"payload")
+    digest = hashlib.sha256(b"payload").hexdigest()
+
+    service = HashService()
+    service.remember(target, digest)
+    assert len(service._cache) == 0
+
+    # Still racy: the parked digest must not be trusted yet
+    with patch.object(service, "_digest_file", return_value=digest) as mock_digest:
+        service.hash_file(target)
+        mock_digest.assert_called_once()
+
+    service.RACY_WINDOW_NS = NO_RACY_WINDOW
+    with patch.object(service, "_digest_file") as mock_digest:
+        assert service.hash_file(target) == digest
+        mock_digest.assert_not_called()
+
+
+def test_remembered_digest_dropped_when_file_changes(tmp_path):
+    target = tmp_path / "download.tar.gz"
+    target.write_bytes(b"payload")
+
+    service = HashService()
+    service.remember(target, "0" * 64)
+    target.write_bytes(b"tampered payload")
+    service.RACY_WINDOW_NS = NO_RACY_WINDOW
+
+    assert service.hash_file(target) == hashlib.sha256(b"tampered payload").hexdigest()
+
+
+def test_changed_file_is_rehashed(tmp_path):
+    target = tmp_path / "conf"
+    target.write_text("one")
+
+    service = HashService()
+    service.RACY_WINDOW_NS = NO_RACY_WINDOW
+    service.hash_file(target)
+
+    target.write_text("three")
+
+    assert service.hash_file(target) == hashlib.sha256(b"three").hexdigest()
+
+
+def test_hash_files_parallel(tmp_path):
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"f{i}"
+        path.write_text(str(i))
+        paths.append(path)
+    missing = tmp_path / "missing"
+
+    service = HashService(max_workers=4)
+    try:
+        digests = service.hash_files(paths + [missing])
+    finally:
+        service.shutdown()
+
+    assert digests[str(paths[3])] == hashlib.sha256(b"3").hexdigest()
+    assert digests[str(missing)] is None
+
+
+def test_verify_file_and_stable_signature(tmp_path):
+    target = tmp_path / "tool.tar.gz"
+    target.write_bytes(b"toolchain")
+
+    service = HashService()
+    expected = hashlib.sha256(b"toolchain").hexdigest()
+
+    assert service.verify_file(target, expected.upper())
+    assert not service.verify_file(target, "0" * 64)
+    assert service.stable_signature(target) is None
+
+    service.RACY_WINDOW_NS = NO_RACY_WINDOW
+    assert service.stable_signature(target) == FileSignature.of(target)
@@ -0,0 +1,128 @@
+"""Unit tests for the container image scan scheduler."""
+
+import subprocess
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+from configurator.security.image_scan import DockerImage, ImageScanScheduler, list_docker_images
+from configurator.security.vulnerability_scanner import (
+    ScanResult,
+    Vulnerability,
+    VulnerabilityScanner,
+    VulnerabilitySeverity,
+)
+
+
+class FakeScanner(VulnerabilityScanner):
+    """Finds one CVE per image; images named broken:* fail."""
+
+    SCANNER_NAME = "Fake"
+
+    def __init__(self, db="2024-01-01T00:00:00Z", updatable=True):
+        super().__init__()
+        self.db = db
+        self.updatable = updatable
+        self.db_updates = 0
+        self.scanned = []
+        self.skip_flags = set()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        return True
+
+    def get_version(self):
+        return "1.0"
+
+    def scan_system(self):
+        raise NotImplementedError
+
+    def update_db(self):
+        self.db_updates += 1
+        return self.updatable
+
+    def db_version(self):
+        return self.db
+
+    def scan_docker_image(self, image, skip_db_update=False):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.scanned.append(image)
+            self.skip_flags.add(skip_db_update)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        if image.startswith("broken"):
+            raise RuntimeError("scan failed")
+        vuln = Vulnerability(
+            cve_id=f"CVE-{image}",
+            package_name="openssl",
+            installed_version="3.0.0",
+            fixed_version="3.0.1",
+            severity=VulnerabilitySeverity.HIGH,
+            cvss_score=7.5,
+            description="test",
+            published_date=datetime(2024, 1, 2),
+            target_type="container",
+        )
+        return ScanResult("id", datetime.now(), "Fake", "1.0", f"docker:{image}", [vuln], 0.05)
+
+
+def test_list_docker_images_groups_tags_by_digest():
+    output = (
+        "sha256:aaa app:latest\n"
+        "sha256:aaa app:1.2\n"
+        "sha256:bbb nginx:stable\n"
+        "sha256:ccc <none>:<none>\n"
+    )
+    completed = subprocess.CompletedProcess([], 0, stdout=output, stderr="")
+    with patch("configurator.security.image_scan.subprocess.run", return_value=completed):
+        images = list_docker_images()
+
+    assert images == [
+        DockerImage("sha256:aaa", ["app:latest", "app:1.2"]),
+        DockerImage("sha256:bbb", ["nginx:stable"]),
+    ]
+
+
+def test_images_are_scanned_once_in_parallel_and_cached_per_db_version(tmp_path):
+    images = [DockerImage(f"sha256:{i:03d}", [f"img{i}:latest", f"img{i}:v1"]) for i in range(6)]
+    scanner = FakeScanner()
+
+    results = ImageScanScheduler(scanner, max_workers=3, cache_dir=tmp_path).scan(images)
+
+    assert scanner.db_updates == 1
+    assert scanner.skip_flags == {True}
+    assert sorted(scanner.scanned) == sorted(f"img{i}:latest" for i in range(6))
+    assert 1 < scanner.max_active <= 3
+    assert [r.target for r in results] == [f"docker:img{i}:latest, img{i}:v1" for i in range(6)]
+
+    # Same DB: every result comes from the cache, identical to the original
+    rerun = FakeScanner()
+    cached = ImageScanScheduler(rerun, cache_dir=tmp_path).scan(images)
+    assert rerun.scanned == []
+    assert [v.to_dict() for r in cached for v in r.vulnerabilities] == [
+        v.to_dict() for r in results for v in r.vulnerabilities
+    ]
+
+    # A new DB invalidates the cached results
+    updated = FakeScanner(db="2024-01-02T00:00:00Z")
+    ImageScanScheduler(updated, cache_dir=tmp_path).scan(images[:2])
+    assert len(updated.scanned) == 2
+    assert len(list(tmp_path.glob("000--*.json"))) == 1
+
+
+def test_failed_scans_are_skipped_and_unknown_db_is_not_cached(tmp_path):
+    images = [DockerImage("sha256:ok", ["ok:1"]), DockerImage("sha256:bad", ["broken:1"])]
+    scanner = FakeScanner(updatable=False)
+
+    results = ImageScanScheduler(scanner, cache_dir=tmp_path).scan(images)
+
+    assert [r.target for r in results] == ["docker:ok:1"]
+    # The DB could not be updated up front, so each scan updates it itself
+    assert scanner.skip_flags == {False}
+    assert list(tmp_path.iterdir()) == []
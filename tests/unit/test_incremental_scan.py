@@ -0,0 +1,210 @@
+"""Unit tests for dpkg-driven incremental system scans."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from configurator.security.incremental_scan import (
+    IncrementalSystemScanner,
+    build_sbom,
+    parse_dpkg_status,
+)
+from configurator.security.vulnerability_scanner import (
+    ScanResult,
+    Vulnerability,
+    VulnerabilityScanner,
+    VulnerabilitySeverity,
+)
+
+
+def _stanza(name, version, arch="amd64", status="install ok installed", source=None):
+    lines = [f"Package: {name}", f"Status: {status}", f"Architecture: {arch}"]
+    if source:
+        lines.append(f"Source: {source}")
+    lines += [f"Version: {version}", "Description: test package", " continued line"]
+    return "\n".join(lines)
+
+
+def _status(*stanzas):
+    return "\n\n".join(stanzas) + "\n"
+
+
+def _vuln(cve, package, version):
+    return Vulnerability(
+        cve_id=cve,
+        package_name=package,
+        installed_version=version,
+        fixed_version=None,
+        severity=VulnerabilitySeverity.HIGH,
+        cvss_score=7.5,
+        description="test",
+        published_date=datetime(2024, 1, 2),
+    )
+
+
+class FakeScanner(VulnerabilityScanner):
+    """Vulnerable package versions come from a dict of (name, version) -> CVE ids."""
+
+    SCANNER_NAME = "Fake"
+
+    def __init__(self, advisories, status_file, db="2024-01-01T00:00:00Z"):
+        super().__init__()
+        self.advisories = advisories
+        self.status_file = status_file
+        self.db = db
+        self.full_scans = 0
+        self.sboms = []
+
+    def is_available(self):
+        return True
+
+    def get_version(self):
+        return "1.0"
+
+    def db_version(self):
+        return self.db
+
+    def _findings(self, packages):
+        return [
+            _vuln(cve, name, version)
+            for name, version in packages
+            for cve in self.advisories.get((name, version), [])
+        ]
+
+    def scan_system(self):
+        self.full_scans += 1
+        packages = parse_dpkg_status(self.status_file.read_text()).values()
+        vulns = self._findings((p.name, p.version) for p in packages)
+        return ScanResult("full", datetime.now(), "Fake", "1.0", "system", vulns, 1.0)
+
+    def scan_sbom(self, sbom_path, skip_db_update=False):
+        with open(sbom_path) as f:
+            sbom = json.load(f)
+        listed = [(c["name"], c["version"]) for c in sbom["components"] if c["type"] == "library"]
+        self.sboms.append(sorted(name for name, _ in listed))
+        return ScanResult("sbom", datetime.now(), "Fake", "1.0", "sbom", self._findings(listed), 0)
+
+    def scan_docker_image(self, image, skip_db_update=False):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def status_file(tmp_path):
+    path = tmp_path / "status"
+    path.write_text(
+        _status(
+            _stanza("openssl", "3.0.11-1"),
+            _stanza("curl", "7.88.1-10"),
+            _stanza("bash", "5.2.15-2"),
+        )
+    )
+    return path
+
+
+ADVISORIES = {
+    ("openssl", "3.0.11-1"): ["CVE-2024-0001"],
+    ("curl", "7.88.1-10"): ["CVE-2024-0002", "CVE-2024-0003"],
+    ("curl", "7.88.1-11"): ["CVE-2024-0003"],
+    ("nginx", "1.22.1-9"): ["CVE-2024-0004"],
+}
+
+
+def test_parse_dpkg_status_keeps_installed_packages_with_their_source():
+    text = _status(
+        _stanza("libc6", "2.36-9+deb12u4", source="glibc"),
+        _stanza("libc6", "2.36-9+deb12u4", arch="i386", source="glibc"),
+        _stanza("libssl3", "3.0.11-1", source="openssl (3.0.11-1~deb12u2)"),
+        _stanza("removed", "1.0", status="deinstall ok config-files"),
+    )
+
+    packages = parse_dpkg_status(text)
+
+    assert sorted(packages) == ["libc6:amd64", "libc6:i386", "libssl3:amd64"]
+    assert packages["libssl3:amd64"].source == "openssl"
+    assert packages["libssl3:amd64"].source_version == "3.0.11-1~deb12u2"
+    assert packages["libc6:i386"].source_version == "2.36-9+deb12u4"
+
+    sbom = build_sbom(packages.values(), ("debian", "12"))
+    purls = [c["purl"] for c in sbom["components"] if c["type"] == "library"]
+    assert "pkg:deb/debian/libc6@2.36-9%2Bdeb12u4?arch=i386&distro=debian-12" in purls
+    assert sbom["dependencies"][1]["dependsOn"] == purls
+
+
+def test_unchanged_system_reuses_the_last_result(tmp_path, status_file):
+    scanner = FakeScanner(ADVISORIES, status_file)
+    incremental = IncrementalSystemScanner(scanner, cache_dir=tmp_path, dpkg_status=status_file)
+
+    first, delta = incremental.scan()
+    assert delta.mode == "full"
+    assert sorted(v.cve_id for v in delta.new) == [
+        "CVE-2024-0001",
+        "CVE-2024-0002",
+        "CVE-2024-0003",
+    ]
+
+    again, delta = incremental.scan()
+    assert delta.mode == "reused"
+    assert (delta.new, delta.resolved) == ([], [])
+    assert scanner.full_scans == 1
+    assert [v.to_dict() for v in again.vulnerabilities] == [
+        v.to_dict() for v in first.vulnerabilities
+    ]
+
+    # A new vulnerability DB means every package has to be checked again
+    scanner.db = "2024-01-02T00:00:00Z"
+    assert incremental.scan()[1].mode == "full"
+    assert scanner.full_scans == 2
+
+
+def test_only_changed_packages_are_rescanned_and_merged(tmp_path, status_file):
+    scanner = FakeScanner(ADVISORIES, status_file)
+    incremental = IncrementalSystemScanner(scanner, cache_dir=tmp_path, dpkg_status=status_file)
+    incremental.scan()
+
+    # curl upgraded, nginx installed, bash removed
+    status_file.write_text(
+        _status(
+            _stanza("openssl", "3.0.11-1"),
+            _stanza("curl", "7.88.1-11"),
+            _stanza("nginx", "1.22.1-9"),
+        )
+    )
+    result, delta = incremental.scan()
+
+    assert scanner.full_scans == 1
+    assert scanner.sboms == [["curl", "nginx"]]
+    assert delta.mode == "incremental"
+    assert delta.changed_packages == ["bash", "curl", "nginx"]
+    assert [v.cve_id for v in delta.new] == ["CVE-2024-0004"]
+    assert [v.cve_id for v in delta.resolved] == ["CVE-2024-0002"]
+    assert sorted((v.cve_id, v.installed_version) for v in result.vulnerabilities) == [
+        ("CVE-2024-0001", "3.0.11-1"),
+        ("CVE-2024-0003", "7.88.1-11"),
+        ("CVE-2024-0004", "1.22.1-9"),
+    ]
+
+    # The merged result is what the next scan compares against
+    assert incremental.scan()[1].mode == "reused"
+
+
+def test_too_many_changes_or_no_db_version_scan_fully(tmp_path, status_file):
+    scanner = FakeScanner(ADVISORIES, status_file)
+    incremental = IncrementalSystemScanner(
+        scanner, cache_dir=tmp_path, dpkg_status=status_file, max_changed_packages=1
+    )
+    incremental.scan()
+
+    status_file.write_text(_status(_stanza("curl", "7.88.1-11"), _stanza("nginx", "1.22.1-9")))
+    assert incremental.scan()[1].mode == "full"
+    assert scanner.sboms == []
+
+    # Without a DB version nothing can be reused, so nothing is stored
+    unversioned = FakeScanner(ADVISORIES, status_file, db=None)
+    other_dir = tmp_path / "unversioned"
+    scanner_without_db = IncrementalSystemScanner(
+        unversioned, cache_dir=other_dir, dpkg_status=status_file
+    )
+    scanner_without_db.scan()
+    assert scanner_without_db.scan()[1].mode == "full"
+    assert not other_dir.exists()
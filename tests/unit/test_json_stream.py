@@ -0,0 +1,83 @@
+"""Unit tests for streaming JSON extraction."""
+
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from configurator.security.json_stream import iter_json_items, stream_command_json
+
+TRIVY_PATH = ("Results", "*", "Vulnerabilities")
+
+
+def _report(count):
+    return {
+        "SchemaVersion": 2,
+        "Metadata": {"OS": {"Family": "debian"}, "Layers": [1, 2.5e3, True, None, 'a]b"{']},
+        "Results": [
+            {
+                "Target": "debian",
+                "Vulnerabilities": [
+                    {"VulnerabilityID": f"CVE-{i}", "Description": "x" * (i * 37 % 300)}
+                    for i in range(count)
+                ],
+            },
+            {"Target": "no findings"},
+            {"Target": "python", "Vulnerabilities": [{"VulnerabilityID": "CVE-last"}]},
+        ],
+    }
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_items_are_extracted_across_chunk_boundaries(indent, chunk_size):
+    text = json.dumps(_report(40), indent=indent)
+
+    items = list(iter_json_items(io.StringIO(text), TRIVY_PATH, chunk_size=chunk_size))
+
+    assert [item["VulnerabilityID"] for item in items] == [f"CVE-{i}" for i in range(40)] + [
+        "CVE-last"
+    ]
+    assert items == [v for r in _report(40)["Results"] for v in r.get("Vulnerabilities", [])]
+
+
+@pytest.mark.parametrize("indent", [None, 1])
+def test_numeric_items_are_not_cut_at_chunk_boundaries(indent):
+    items = [-2500.0, 1e-07, 3.25e10, 0, -17, 12.5, [1.5, -2e3], {"a": 6.02e23}, True, None]
+    text = json.dumps({"numbers": items}, indent=indent)
+
+    for chunk_size in (1, 2, 3):
+        stream = io.StringIO(text)
+        assert list(iter_json_items(stream, ("numbers",), chunk_size=chunk_size)) == items
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['{"Results": [{"Vulnerabilities": [{"a": 1}', '{"Results": [{"Vulnerabilities": [{"a": }]}]}'],
+)
+def test_invalid_documents_raise_value_error(text):
+    with pytest.raises(ValueError):
+        list(iter_json_items(io.StringIO(text), TRIVY_PATH, chunk_size=5))
+
+
+def test_stream_command_json_reports_failures():
+    script = "import json; print(json.dumps({'matches': [{'id': 1}, {'id': 2}]}))"
+    assert list(stream_command_json([sys.executable, "-c", script], ("matches",))) == [
+        {"id": 1},
+        {"id": 2},
+    ]
+
+    # Output cut short by a failing command surfaces as the failure, with its stderr
+    failing = "import sys; print('{\"matches\": [{\"id\": 1}'); sys.exit('db locked')"
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        list(stream_command_json([sys.executable, "-c", failing], ("matches",)))
+    assert "db locked" in excinfo.value.stderr
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(
+            stream_command_json(
+                [sys.executable, "-c", "import time; time.sleep(5)"], ("matches",), timeout=0.2
+            )
+        )
@@ -0,0 +1,219 @@
+"""Unit tests for offline artifact mirrors."""
+
+import functools
+import hashlib
+import shutil
+import subprocess
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from configurator.core.mirror import (
+    Artifact,
+    ArtifactMirror,
+    MirrorBuilder,
+    checksum_pins,
+    set_active_mirror,
+)
+from configurator.exceptions import NetworkError
+from configurator.modules.base import ConfigurationModule
+from configurator.modules.cursor import CursorModule
+from configurator.modules.databases import DatabasesModule
+from configurator.modules.desktop import DesktopModule
+from configurator.modules.docker import DockerModule
+from configurator.utils.download import DownloadEngine
+
+PAYLOAD = b"#!/bin/sh\necho installer\n" * 1000
+DIGEST = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def _serve(directory):
+    handler = functools.partial(_QuietHandler, directory=str(directory))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    root = tmp_path / "upstream"
+    root.mkdir()
+    (root / "install.sh").write_bytes(PAYLOAD)
+    httpd, base = _serve(root)
+    yield base
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _no_active_mirror():
+    yield
+    set_active_mirror(None)
+
+
+def _engine():
+    return DownloadEngine(retry_delay=0, max_retries=0)
+
+
+def _build(tmp_path, artifacts, checksums=None):
+    builder = MirrorBuilder(tmp_path / "mirror", engine=_engine(), checksums=checksums)
+    return builder, builder.build(artifacts, profile="beginner")
+
+
+def test_build_and_serve_file_from_local_mirror(tmp_path, upstream):
+    url = f"{upstream}/install.sh"
+    _, report = _build(tmp_path, [Artifact("file", url), Artifact("file", url)])
+
+    assert report.success
+    assert report.stored == [f"file:{url}"]
+    assert (tmp_path / "mirror" / "objects" / DIGEST[:2] / DIGEST).exists()
+
+    mirror = ArtifactMirror(str(tmp_path / "mirror"), engine=_engine())
+    dest = tmp_path / "out" / "install.sh"
+    assert mirror.fetch_file(url, dest) == DIGEST
+    assert dest.read_bytes() == PAYLOAD
+    assert mirror.fetch_file(f"{upstream}/unknown.sh", tmp_path / "x") is None
+
+
+def test_rebuild_only_fetches_changes(tmp_path, upstream):
+    url = f"{upstream}/install.sh"
+    _build(tmp_path, [Artifact("file", url)])
+    _, report = _build(tmp_path, [Artifact("file", url)])
+
+    assert report.stored == []
+    assert report.reused == [f"file:{url}"]
+
+
+def test_build_rejects_checksum_mismatch(tmp_path, upstream):
+    url = f"{upstream}/install.sh"
+    checksums = {"tool": {"url": url, "sha256": "0" * 64}}
+
+    _, report = _build(tmp_path, [Artifact("file", url)], checksums=checksums)
+
+    assert not report.success
+    assert f"file:{url}" in report.failed
+    assert not (tmp_path / "mirror" / "objects" / DIGEST[:2] / DIGEST).exists()
+
+
+def test_remote_mirror_serves_engine_downloads(tmp_path, upstream):
+    url = f"{upstream}/install.sh"
+    _build(tmp_path, [Artifact("file", url)])
+    httpd, base = _serve(tmp_path / "mirror")
+
+    try:
+        engine = _engine()
+        mirror = ArtifactMirror(base, engine=engine)
+        engine.mirror = mirror
+        # The engine asks the mirror before going upstream
+        dest = tmp_path / "out.sh"
+        result = engine.fetch(url, dest, expected_sha256=DIGEST)
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert result.sha256 == DIGEST
+    assert dest.read_bytes() == PAYLOAD
+    assert mirror.hits == 1
+
+
+def test_corrupted_object_is_not_served(tmp_path, upstream):
+    url = f"{upstream}/install.sh"
+    _build(tmp_path, [Artifact("file", url)])
+    (tmp_path / "mirror" / "objects" / DIGEST[:2] / DIGEST).write_bytes(b"tampered")
+
+    mirror = ArtifactMirror(str(tmp_path / "mirror"), engine=_engine())
+    dest = tmp_path / "out.sh"
+
+    assert mirror.fetch_file(url, dest) is None
+    assert not dest.exists()
+    assert mirror.verify() == [f"file:{url}"]
+
+
+def test_unreadable_index_is_an_error(tmp_path):
+    (tmp_path / "mirror").mkdir()
+
+    with pytest.raises(NetworkError):
+        ArtifactMirror(str(tmp_path / "mirror"), engine=_engine()).lookup("file", "x")
+
+    httpd, base = _serve(tmp_path / "mirror")
+    try:
+        with pytest.raises(NetworkError):
+            ArtifactMirror(base, engine=_engine()).lookup("file", "x")
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_package_installing_modules_declare_their_artifacts():
+    def keys(module):
+        return {artifact.key for artifact in module.mirror_artifacts()}
+
+    assert {"deb:xrdp", "deb:xfce4", "deb:papirus-icon-theme", "deb:zsh", "deb:fzf"} <= keys(
+        DesktopModule(config={})
+    )
+    assert "deb:docker-ce" in keys(DockerModule(config={}))
+    assert keys(CursorModule(config={})) == {f"file:{CursorModule.CURSOR_DEB_URL}"}
+
+    databases = keys(DatabasesModule(config={"mysql": False}))
+    assert "deb:postgresql-client" in databases
+    assert "deb:default-mysql-client" not in databases
+    assert "deb:mongodb-mongosh" not in databases
+
+
+def test_checksum_pins_skip_placeholders():
+    checksums = {
+        "go": {"1.21": {"url": "https://go.dev/go.tgz", "sha256": "A" * 64}},
+        "rustup": {"url": "https://sh.rustup.rs", "sha256": "TO_BE_FILLED"},
+        "p10k": {"url": "https://github.com/romkatv/powerlevel10k.git", "commit": "abc123"},
+    }
+
+    pins = checksum_pins(checksums)
+
+    assert pins["https://go.dev/go.tgz"] == {"sha256": "a" * 64}
+    assert "https://sh.rustup.rs" not in pins
+    assert pins["https://github.com/romkatv/powerlevel10k"] == {"commit": "abc123"}
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_git_bundle_clone(tmp_path):
+    repo = tmp_path / "repo.git"
+    git = ["git", "-c", "user.email=t@example.com", "-c", "user.name=t"]
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    (repo / "README").write_text("hello\n")
+    subprocess.run([*git, "-C", str(repo), "add", "README"], check=True)
+    subprocess.run([*git, "-C", str(repo), "commit", "-qm", "init"], check=True)
+
+    _, report = _build(tmp_path, [Artifact("git", f"{repo}/")])
+    assert report.success
+
+    set_active_mirror(ArtifactMirror(str(tmp_path / "mirror"), engine=_engine()))
+
+    class _Module(ConfigurationModule):
+        def validate(self):
+            return True
+
+        def configure(self):
+            return True
+
+        def verify(self):
+            return True
+
+    clone_dir = tmp_path / "clone"
+    command = _Module(config={}).git_clone_command(str(repo), str(clone_dir))
+    assert ".bundle" not in command and "objects/" in command
+
+    subprocess.run(command, shell=True, check=True, capture_output=True)
+    assert (clone_dir / "README").read_text() == "hello\n"
+    origin = subprocess.run(
+        ["git", "-C", str(clone_dir), "remote", "get-url", "origin"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    assert origin == str(repo)
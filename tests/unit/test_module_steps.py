@@ -0,0 +1,104 @@
+"""Unit tests for step-level checkpoints inside modules."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from configurator.core.execution.base import ExecutionContext
+from configurator.core.execution.pipeline import PipelineExecutor
+from configurator.core.state.manager import StateManager
+from configurator.modules.base import ConfigurationModule, ModuleStep
+
+
+class SteppedModule(ConfigurationModule):
+    name = "stepped"
+
+    def __init__(self, config):
+        super().__init__(config=config, rollback_manager=Mock())
+        self.calls = []
+        self.fail_at = None
+
+    def _step(self, name):
+        def run():
+            self.calls.append(name)
+            return name != self.fail_at
+
+        return run
+
+    def validate(self) -> bool:
+        return True
+
+    def configure(self) -> bool:
+        return self.run_steps(
+            [
+                ModuleStep("one", self._step("one"), inputs=self.get_config("one")),
+                ModuleStep("two", self._step("two"), inputs=self.get_config("two")),
+                ModuleStep("extra", self._step("extra"), critical=False),
+                ModuleStep("three", self._step("three")),
+            ]
+        )
+
+    def verify(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def state():
+    return StateManager(db_path=":memory:")
+
+
+def _attempt(state, config, fail_at=None):
+    module = SteppedModule(config)
+    module.state_manager = state
+    module.fail_at = fail_at
+    return module, module.configure()
+
+
+def test_resume_skips_completed_steps(state):
+    module, ok = _attempt(state, {"one": 1, "two": 2}, fail_at="three")
+    assert not ok
+    assert module.calls == ["one", "two", "extra", "three"]
+
+    module, ok = _attempt(state, {"one": 1, "two": 2})
+    assert ok
+    assert module.calls == ["three"]
+    assert module.resumed_steps == ["one", "two", "extra"]
+
+    # A finished run leaves no checkpoints behind
+    assert state.get_completed_steps("stepped") == {}
+    module, _ = _attempt(state, {"one": 1, "two": 2})
+    assert module.calls == ["one", "two", "extra", "three"]
+
+
+def test_changed_inputs_rerun_the_step(state):
+    _attempt(state, {"one": 1, "two": 2}, fail_at="three")
+
+    module, _ = _attempt(state, {"one": 1, "two": "changed"})
+    assert module.calls == ["two", "three"]
+
+
+def test_non_critical_failures_are_retried_but_do_not_stop_the_run(state):
+    module, ok = _attempt(state, {}, fail_at="extra")
+    assert ok
+    assert module.calls == ["one", "two", "extra", "three"]
+
+
+def test_without_state_manager_every_step_runs():
+    module = SteppedModule({})
+    assert module.configure()
+    assert module.calls == ["one", "two", "extra", "three"]
+    assert set(module.step_timings) == {"one", "two", "extra", "three"}
+
+
+def test_pipeline_reports_step_timings(state):
+    module = SteppedModule({})
+    callback = Mock()
+
+    result = PipelineExecutor().execute(
+        [ExecutionContext("stepped", module, {}, state_manager=state)], callback
+    )["stepped"]
+
+    assert result.success
+    assert list(result.metadata["step_timings"]) == ["one", "two", "extra", "three"]
+    steps = [c.args[2]["step"] for c in callback.call_args_list if c.args[1] == "step_completed"]
+    assert steps == ["one", "two", "extra", "three"]
@@ -149,6 +149,22 @@ class TestPackageCacheManager(unittest.TestCase):
         self.assertFalse(self.manager.has_package("old-pkg", "1.0"))
         self.assertTrue(self.manager.has_package("new-pkg", "1.0"))
 
+    def test_verified_package_not_rehashed(self):
+        """Repeat lookups trust the recorded stat signature."""
+        self.manager.add_package("test-pkg", "1.0.0", self.pkg_file, "http://url")
+        key = self.manager._make_cache_key("test-pkg", "1.0.0")
+
+        # The cached file was just written; move the racy window out of the way
+        with unittest.mock.patch(
+            "configurator.utils.hashing.HashService.RACY_WINDOW_NS", -(10**12)
+        ):
+            self.assertIsNotNone(self.manager.get_package("test-pkg", "1.0.0"))
+            self.assertIsNotNone(self.manager._index[key].file_signature)
+
+            with unittest.mock.patch.object(self.manager, "_verify_hash") as mock_verify:
+                self.assertIsNotNone(self.manager.get_package("test-pkg", "1.0.0"))
+                mock_verify.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,121 @@
+"""Unit tests for the asyncio command engine."""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from configurator.exceptions import ModuleExecutionError
+from configurator.utils.process import CommandEngine, infer_resource, needs_shell
+
+
+@pytest.fixture
+def engine():
+    return CommandEngine(kill_grace=0.5)
+
+
+def test_shell_only_when_needed():
+    assert not needs_shell("apt-get install -y git")
+    assert not needs_shell("git config --global user.name 'Jane Doe'")
+    assert needs_shell("curl -fsSL https://example.com | sh")
+    assert needs_shell("echo $HOME")
+    assert needs_shell("cd /tmp")
+    assert needs_shell("DEBIAN_FRONTEND=noninteractive apt-get install -y git")
+    assert needs_shell("ls /etc/*.conf")
+
+
+def test_resources_are_inferred_from_the_program():
+    assert infer_resource("apt-get install -y git") == "dpkg"
+    assert infer_resource("sudo -u bob dpkg -i x.deb") == "dpkg"
+    assert infer_resource("curl -fsSL https://example.com | gpg --dearmor") == "network"
+    assert infer_resource(["git", "clone", "https://example.com/r.git"]) == "network"
+    assert infer_resource("git config --global core.editor vim") == "cpu"
+
+
+def test_output_is_streamed_and_captured(engine):
+    lines = []
+    result = engine.run(
+        "printf 'one\\ntwo\\n'; echo err >&2",
+        shell=None,
+        on_line=lambda stream, line: lines.append((stream, line)),
+    )
+
+    assert result.stdout == "one\ntwo\n"
+    assert result.stderr == "err\n"
+    assert sorted(lines) == [("stderr", "err"), ("stdout", "one"), ("stdout", "two")]
+
+
+def test_only_the_tail_of_large_output_is_kept():
+    engine = CommandEngine(max_output=1024)
+    result = engine.run(["python3", "-c", "print('x' * 100000); print('last')"])
+
+    assert result.stdout.endswith("x\nlast\n")
+    assert "bytes of output omitted" in result.stdout
+    assert len(result.stdout) < 2048
+
+
+def test_input_and_failure_handling(engine):
+    assert engine.run(["cat"], input_text="hello").stdout == "hello"
+
+    result = engine.run("exit 3", shell=True, check=False)
+    assert result.return_code == 3
+
+    with pytest.raises(ModuleExecutionError):
+        engine.run("exit 3", shell=True)
+    with pytest.raises(ModuleExecutionError, match="Command not found"):
+        engine.run("definitely-not-a-command-xyz")
+
+
+def test_timeout_kills_the_process_group(engine, tmp_path):
+    pid_file = tmp_path / "child.pid"
+
+    start = time.monotonic()
+    with pytest.raises(ModuleExecutionError, match="timed out"):
+        engine.run(f"sleep 30 & echo $! > {pid_file}; wait", shell=True, timeout=0.5)
+    assert time.monotonic() - start < 10
+
+    child = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            os.kill(child, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("background child survived the timeout")
+
+
+def test_budgets_bound_concurrency():
+    engine = CommandEngine(budgets={"cpu": 1, "network": 2})
+
+    start = time.monotonic()
+    engine.run_many(["sleep 0.4", "sleep 0.4"])
+    serialized = time.monotonic() - start
+
+    start = time.monotonic()
+    engine.run_many(["sleep 0.4", "sleep 0.4"], resource="network")
+    concurrent = time.monotonic() - start
+
+    assert serialized >= 0.8
+    assert concurrent < 0.75
+
+
+def test_run_many_raises_after_all_commands_finish(engine, tmp_path):
+    marker = tmp_path / "done"
+
+    with pytest.raises(ModuleExecutionError):
+        engine.run_many(["false", f"sleep 0.2; touch {marker}"], shell=None)
+
+    assert marker.exists()
+
+
+def test_async_facade(engine):
+    async def main():
+        return await asyncio.gather(
+            engine.run_async(["echo", "a"]), engine.run_async(["echo", "b"])
+        )
+
+    results = asyncio.run(main())
+    assert [r.stdout for r in results] == ["a\n", "b\n"]
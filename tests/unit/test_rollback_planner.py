@@ -0,0 +1,135 @@
+"""Unit tests for the batched rollback planner and append-only action log."""
+
+import json
+import threading
+from unittest.mock import Mock, patch
+
+from configurator.core.rollback import RollbackManager, plan_rollback
+
+
+def _manager(tmp_path):
+    manager = RollbackManager(logger=Mock())
+    manager.state_file = tmp_path / "rollback-state.json"
+    return manager
+
+
+def test_plan_merges_actions_between_commands(tmp_path):
+    manager = _manager(tmp_path)
+    manager.add_package_remove(["nginx"])
+    manager.add_file_restore("/b/nginx.conf", "/etc/nginx.conf")
+    manager.add_service_stop("nginx")
+    manager.add_command("echo barrier")
+    manager.add_package_remove(["docker-ce", "nginx"])
+    manager.add_service_stop("docker")
+    manager.add_package_remove(["containerd"])
+
+    steps = plan_rollback(manager.actions)
+
+    assert [s.action_type for s in steps] == [
+        "service_stop",
+        "package_remove",
+        "command",
+        "service_stop",
+        "file_restore",
+        "package_remove",
+    ]
+    assert steps[1].description == "Remove packages: containerd, docker-ce, nginx"
+    assert steps[2].actions[0].data["command"] == "echo barrier"
+
+
+@patch("configurator.core.rollback.run_command")
+def test_rollback_runs_one_apt_and_one_systemctl_call_per_phase(mock_run, tmp_path):
+    mock_run.return_value = Mock(success=True)
+    manager = _manager(tmp_path)
+    for name in ("nginx", "redis", "docker"):
+        manager.add_package_remove([name])
+        manager.add_service_stop(name)
+
+    assert manager.rollback() is True
+    assert [c.args[0] for c in mock_run.call_args_list] == [
+        "systemctl stop docker redis nginx",
+        "systemctl disable docker redis nginx",
+        "apt-get remove -y docker redis nginx",
+    ]
+    assert not manager.state_file.exists()
+
+
+@patch("configurator.core.rollback.run_command")
+def test_failed_batch_falls_back_to_single_actions(mock_run, tmp_path):
+    mock_run.side_effect = lambda cmd, check: Mock(success=" " not in cmd.split("-y ")[-1])
+    manager = _manager(tmp_path)
+    manager.add_package_remove(["nginx"])
+    manager.add_package_remove(["no-such-package"])
+
+    assert manager.rollback() is True
+    assert [c.args[0] for c in mock_run.call_args_list] == [
+        "apt-get remove -y no-such-package nginx",
+        "apt-get remove -y no-such-package",
+        "apt-get remove -y nginx",
+    ]
+
+
+def test_file_restores_run_concurrently_per_path(tmp_path):
+    manager = _manager(tmp_path)
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.bak").write_text(f"{name} original")
+        manager.add_file_restore(str(tmp_path / f"{name}.bak"), str(tmp_path / name))
+    # Restored newest first, so the oldest backup wins
+    (tmp_path / "a.bak2").write_text("a intermediate")
+    manager.add_file_restore(str(tmp_path / "a.bak2"), str(tmp_path / "a"))
+
+    threads = set()
+    started = threading.Barrier(3, timeout=5)
+
+    def restore(backup, original):
+        threads.add(threading.current_thread().name)
+        # The first restore of each path waits for the other two paths
+        if not backup.endswith("a.bak"):
+            started.wait()
+        with open(backup) as src, open(original, "w") as dst:
+            dst.write(src.read())
+
+    with patch("configurator.core.rollback.restore_file", side_effect=restore):
+        assert manager.rollback() is True
+
+    assert (tmp_path / "a").read_text() == "a original"
+    assert (tmp_path / "c").read_text() == "c original"
+    assert len(threads) == 3
+
+
+def test_action_log_is_appended_and_fsynced_in_batches(tmp_path):
+    manager = _manager(tmp_path)
+    with patch("configurator.core.rollback.os.fsync") as fsync:
+        for i in range(20):
+            manager.add_command(f"echo {i}")
+        # Synced once, when the 16th action filled a batch
+        assert fsync.call_count == 1
+
+        lines = manager.state_file.read_text().splitlines()
+        assert [json.loads(line)["data"]["command"] for line in lines] == [
+            f"echo {i}" for i in range(20)
+        ]
+
+        # A torn line from a crash mid-append is dropped on load
+        with open(manager.state_file, "a") as f:
+            f.write('{"action_type": "comm')
+        loaded = _manager(tmp_path)
+        assert loaded.load_state() is True
+        assert len(loaded.actions) == 20
+
+        loaded.add_service_stop("nginx")
+        assert len(manager.state_file.read_text().splitlines()) == 21
+
+
+def test_load_state_reads_and_converts_legacy_file(tmp_path):
+    manager = _manager(tmp_path)
+    manager.add_service_stop("nginx")
+    legacy = {"actions": [a.to_dict() for a in manager.actions], "saved_at": "now"}
+    manager.state_file.write_text(json.dumps(legacy, indent=2))
+
+    loaded = _manager(tmp_path)
+    assert loaded.load_state() is True
+    assert loaded.actions[0].data == {"service": "nginx"}
+
+    loaded.add_package_remove(["nginx"])
+    assert len(loaded.state_file.read_text().splitlines()) == 2
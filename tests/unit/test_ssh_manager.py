@@ -566,3 +566,77 @@ class TestSSHAuditLogger:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestSSHKeyScheduling:
+    """Tests for deadline-driven key events."""
+
+    PUBLIC_KEY = "ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIexpired alice@laptop"
+
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SSHKeyManager, "KEY_REGISTRY_DIR", tmp_path)
+        monkeypatch.setattr(SSHKeyManager, "KEY_REGISTRY_FILE", tmp_path / "ssh-keys.json")
+        home = tmp_path / "home"
+        (home / ".ssh").mkdir(parents=True)
+        (home / ".ssh" / "authorized_keys").write_text(
+            f"{self.PUBLIC_KEY}\nssh-ed25519 AAAAother bob@desk\n"
+        )
+        manager = SSHKeyManager()
+        monkeypatch.setattr(manager, "_get_user_info", lambda user: MagicMock(pw_dir=str(home)))
+        return manager
+
+    def _key(self, **overrides):
+        values = dict(
+            key_id="alice-laptop",
+            user="alice",
+            public_key=self.PUBLIC_KEY,
+            key_type=KeyType.ED25519,
+            fingerprint="SHA256:alice",
+            created_at=datetime.now() - timedelta(days=100),
+            expires_at=datetime.now() - timedelta(minutes=1),
+        )
+        values.update(overrides)
+        return SSHKey(**values)
+
+    def test_expired_key_is_revoked_when_due(self, manager, tmp_path):
+        """Rotation reminder fires, then the expired key leaves authorized_keys."""
+        events = []
+        manager.add_notify_callback(lambda event, key: events.append((event, key.key_id)))
+        manager._register_key(self._key())
+
+        manager.process_due()
+
+        authorized = (tmp_path / "home" / ".ssh" / "authorized_keys").read_text()
+        assert "alice@laptop" not in authorized
+        assert "bob@desk" in authorized
+        assert events == [("rotation_due", "alice-laptop")]
+        assert manager.get_key("alice", "alice-laptop").status == KeyStatus.EXPIRED
+
+    def test_failed_grace_period_revocation_is_retried(self, manager):
+        """A revocation that fails at the grace deadline runs again later."""
+        grace_until = (datetime.now() - timedelta(minutes=1)).isoformat()
+        manager._register_key(
+            self._key(status=KeyStatus.ROTATING, metadata={"grace_period_until": grace_until})
+        )
+
+        with patch.object(
+            manager, "revoke_key", side_effect=[RuntimeError("busy"), True]
+        ) as mock_revoke:
+            manager.process_due()
+            entry = manager.scheduler.get("ssh-key:alice:alice-laptop:grace_end")
+            assert entry is not None and entry.attempts == 1
+
+            manager.process_due(datetime.now() + timedelta(hours=2))
+
+        assert mock_revoke.call_count == 2
+        assert "ssh-key:alice:alice-laptop:grace_end" not in manager.scheduler
+
+    def test_watcher_acts_on_keys_registered_elsewhere(self, manager, tmp_path):
+        """Deadlines and keys written by another process are picked up."""
+        SSHKeyManager()._register_key(self._key())
+
+        manager.process_due()
+
+        assert "alice@laptop" not in (tmp_path / "home" / ".ssh" / "authorized_keys").read_text()
+        assert manager.get_key("alice", "alice-laptop").status == KeyStatus.EXPIRED
@@ -3,6 +3,7 @@
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -505,3 +506,102 @@ def test_no_reminder_needed(temp_access_manager):
     )
 
     assert not access.needs_reminder()
+
+
+def test_grant_schedules_expiry(temp_access_manager):
+    """Granting access pushes expiry and reminder deadlines."""
+    access = temp_access_manager.grant_temp_access(
+        username="contractor-sched",
+        full_name="Sched",
+        email="sched@example.com",
+        role="developer",
+        duration_days=30,
+        reason="Testing",
+        skip_user_creation=True,
+    )
+
+    scheduler = temp_access_manager.scheduler
+    assert scheduler.get("temp-access:contractor-sched:expire").due_at == access.expires_at
+    assert "temp-access:contractor-sched:remind" in scheduler
+
+    temp_access_manager.revoke_access("contractor-sched", skip_system=True)
+    assert len(scheduler) == 0
+
+
+def test_process_due_expires_access(temp_access_manager):
+    """Due deadlines expire the grant without scanning the registry."""
+    temp_access_manager.grant_temp_access(
+        username="contractor-due",
+        full_name="Due",
+        email="due@example.com",
+        role="developer",
+        duration_days=1,
+        reason="Testing",
+        skip_user_creation=True,
+    )
+
+    with patch.object(temp_access_manager, "_disable_account") as mock_disable:
+        temp_access_manager.process_due(datetime.now())
+        assert temp_access_manager.get_access("contractor-due").status == AccessStatus.ACTIVE
+
+        temp_access_manager.get_access("contractor-due").expires_at = datetime.now()
+        temp_access_manager._save_access_registry()
+        temp_access_manager.process_due(datetime.now() + timedelta(days=2))
+
+    assert temp_access_manager.get_access("contractor-due").status == AccessStatus.EXPIRED
+    mock_disable.assert_called_once_with("contractor-due")
+
+
+def test_schedule_rebuilt_from_registry(temp_access_manager, temp_paths):
+    """A missing schedule file is rebuilt from the registry on load."""
+    temp_access_manager.grant_temp_access(
+        username="contractor-rebuild",
+        full_name="Rebuild",
+        email="rebuild@example.com",
+        role="developer",
+        duration_days=30,
+        reason="Testing",
+        skip_user_creation=True,
+    )
+    temp_access_manager.scheduler.state_file.unlink()
+
+    new_manager = TempAccessManager(
+        registry_file=temp_paths["registry"],
+        extensions_file=temp_paths["extensions"],
+        audit_log=temp_paths["audit_log"],
+    )
+
+    assert "temp-access:contractor-rebuild:expire" in new_manager.scheduler
+
+
+def test_watcher_acts_on_changes_from_other_processes(temp_paths):
+    """A long-running watcher honours extensions and grants made elsewhere."""
+
+    def manager():
+        return TempAccessManager(
+            registry_file=temp_paths["registry"],
+            extensions_file=temp_paths["extensions"],
+            audit_log=temp_paths["audit_log"],
+        )
+
+    grant = dict(email="x@example.com", role="developer", reason="Testing")
+    manager().grant_temp_access("alice", "Alice", duration_days=1, skip_user_creation=True, **grant)
+
+    watcher = manager()
+
+    cli = manager()
+    extension = cli.request_extension("alice", 30, "More time", requested_by="lead")
+    cli.approve_extension(extension.request_id, approved_by="admin")
+    manager().grant_temp_access(
+        "carol", "Carol", duration_days=30, skip_user_creation=True, **grant
+    )
+
+    with patch.object(TempAccessManager, "_disable_account") as mock_disable:
+        watcher.process_due(datetime.now() + timedelta(days=2))
+
+    mock_disable.assert_not_called()
+    fresh = manager()
+    assert fresh.get_access("alice").status == AccessStatus.ACTIVE
+    assert fresh.get_access("carol") is not None
+    assert "temp-access:carol:expire" in fresh.scheduler
+    assert "temp-access:alice:expire" in fresh.scheduler
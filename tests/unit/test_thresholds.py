@@ -0,0 +1,158 @@
+"""Unit tests for the threshold rule engine."""
+
+import random
+import time
+
+import pytest
+
+from configurator.observability.alerting import AlertManager, AlertSeverity
+from configurator.observability.metrics import MetricsCollector
+from configurator.observability.thresholds import SlidingWindow, ThresholdEngine, ThresholdRule
+
+
+def test_sliding_window_matches_brute_force():
+    rng = random.Random(7)
+    window = SlidingWindow(seconds=10, capacity=50)
+    history = []
+
+    t = 0.0
+    for _ in range(2000):
+        t += rng.choice([0.0, 0.1, 0.5, 1.0, 3.0])
+        value = rng.uniform(-100, 100)
+        window.add(t, value)
+        history.append((t, value))
+
+        expected = [v for ts, v in history if ts >= t - 10][-50:]
+        assert len(window) == len(expected)
+        assert window.avg() == pytest.approx(sum(expected) / len(expected))
+        assert (window.min(), window.max()) == (min(expected), max(expected))
+
+
+def test_rate_is_change_per_second_over_the_window():
+    window = SlidingWindow(seconds=60)
+    assert window.rate() is None
+    for second in range(0, 120, 10):
+        window.add(second, second * 5.0)
+    assert window.rate() == pytest.approx(5.0)
+
+
+def test_rules_fire_and_clear_once_with_hysteresis():
+    engine = ThresholdEngine()
+    engine.add_rule(
+        ThresholdRule(
+            "cpu",
+            90,
+            AlertSeverity.WARNING,
+            aggregate="avg",
+            window=3,
+            clear_threshold=75,
+            min_samples=2,
+        )
+    )
+
+    samples = [95, 95, 96, 88, 92, 89, 91, 70, 60, 60, 95, 99, 99, 99]
+    transitions = []
+    for t, value in enumerate(samples):
+        for event in engine.observe("cpu", value, timestamp=t):
+            transitions.append((t, event.firing))
+
+    # The average dipping to 90 (t=6) does not clear it; only falling below 75 does
+    assert transitions == [(1, True), (9, False), (13, True)]
+    assert engine.observe("unwatched", 1e9) == []
+
+
+def test_snapshot_only_touches_metrics_with_rules():
+    metrics = MetricsCollector()
+    engine = ThresholdEngine()
+    engine.add_rule(ThresholdRule("vps_module_failures_total", 3, AlertSeverity.ERROR, op=">="))
+    engine.add_rule(
+        ThresholdRule(
+            "vps_module_duration_seconds_sum",
+            1.0,
+            AlertSeverity.WARNING,
+            aggregate="rate",
+            window=60,
+        )
+    )
+
+    metrics.module_failures_total.inc(3)
+    metrics.module_duration.observe(1.0)
+    assert [e.rule.metric for e in engine.evaluate(metrics.snapshot(), timestamp=0)] == [
+        "vps_module_failures_total"
+    ]
+
+    # Module time accumulating faster than one second per second
+    metrics.module_duration.observe(30.0)
+    events = engine.evaluate(metrics.snapshot(), timestamp=10)
+    assert [(e.rule.metric, round(e.value, 1)) for e in events] == [
+        ("vps_module_duration_seconds_sum", 3.0)
+    ]
+
+
+def test_alert_manager_alerts_on_transitions_only():
+    manager = AlertManager(asynchronous=False)
+    manager.add_threshold_rule("disk", lambda v: v > 90, AlertSeverity.ERROR, "disk at {value}%")
+    manager.add_rule(
+        ThresholdRule(
+            "load",
+            4,
+            AlertSeverity.WARNING,
+            "load {value} over {threshold}",
+            aggregate="max",
+            window=5,
+        )
+    )
+
+    for value in (95, 96, 97, 50, 99):
+        manager.check_threshold("disk", value)
+    for _ in range(3):
+        manager.check_thresholds({"load": 6.5, "disk": 99})
+
+    assert [(a.title, a.message) for a in manager.history] == [
+        ("Threshold Exceeded: disk", "disk at 95%"),
+        ("Threshold Exceeded: disk", "disk at 99%"),
+        ("Threshold Exceeded: load", "load 6.5 over 4"),
+    ]
+    assert manager.history[-1].metadata == {
+        "metric": "load",
+        "value": 6.5,
+        "aggregate": "max",
+        "window": 5,
+    }
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError):
+        ThresholdRule("cpu", 90, AlertSeverity.WARNING, op="!=")
+    with pytest.raises(ValueError):
+        ThresholdRule("cpu", 90, AlertSeverity.WARNING, aggregate="avg")
+    with pytest.raises(ValueError):
+        ThresholdRule("cpu", None, AlertSeverity.WARNING)
+
+
+def test_evaluation_is_cheap_per_sample():
+    engine = ThresholdEngine()
+    names = [f"metric_{i}" for i in range(100)]
+    for name in names:
+        engine.add_rule(ThresholdRule(name, 1e9, AlertSeverity.INFO, aggregate="avg", window=60))
+        engine.add_rule(ThresholdRule(name, 1e9, AlertSeverity.INFO, aggregate="max", window=60))
+
+    snapshot = {name: float(i) for i, name in enumerate(names)}
+    start = time.perf_counter()
+    for tick in range(600):
+        engine.evaluate(snapshot, timestamp=float(tick))
+    per_sample = (time.perf_counter() - start) / (600 * len(names))
+
+    assert per_sample < 50e-6
+
+
+def test_add_threshold_rule_replaces_the_metrics_rule():
+    manager = AlertManager(asynchronous=False)
+    manager.add_threshold_rule("disk", lambda v: v > 80, AlertSeverity.WARNING, "disk {value}%")
+    manager.add_threshold_rule("disk", lambda v: v > 90, AlertSeverity.ERROR, "disk at {value}%")
+
+    manager.check_threshold("disk", 85)
+    manager.check_threshold("disk", 95)
+
+    assert len(manager.thresholds.rules) == 1
+    assert [a.message for a in manager.history] == ["disk at 95%"]
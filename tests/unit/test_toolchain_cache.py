@@ -0,0 +1,138 @@
+"""Unit tests for the toolchain artifact cache."""
+
+import hashlib
+import io
+import os
+import tarfile
+from unittest.mock import patch
+
+import pytest
+
+from configurator.core.toolchain_cache import ToolchainCache, install_tree, parse_checksums
+from configurator.utils.download import DownloadResult
+
+GO_URL = "https://go.dev/dl/go1.22.0.linux-amd64.tar.gz"
+
+
+class FakeEngine:
+    """Serves files from a dict of url -> bytes, verifying digests like the real engine."""
+
+    def __init__(self, files):
+        self.files = files
+        self.urls = []
+
+    def download(self, url, destination, expected_sha256=None, resume=True):
+        self.urls.append(url)
+        if url not in self.files:
+            return DownloadResult(url, destination, False, error="404")
+        data = self.files[url]
+        digest = hashlib.sha256(data).hexdigest()
+        if expected_sha256 and digest != expected_sha256:
+            return DownloadResult(url, destination, False, error="checksum mismatch")
+        destination.write_bytes(data)
+        return DownloadResult(url, destination, True, sha256=digest, size=len(data))
+
+
+def _tarball(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def engine():
+    tarball = _tarball({"go/VERSION": b"go1.22.0\n", "go/bin/go": b"#!/bin/sh\n"})
+    fake = FakeEngine(
+        {
+            GO_URL: tarball,
+            f"{GO_URL}.sha256": hashlib.sha256(tarball).hexdigest().encode() + b"\n",
+        }
+    )
+    with patch("configurator.core.toolchain_cache.get_download_engine", return_value=fake):
+        yield fake
+
+
+def test_parse_checksums_handles_lists_and_bare_digests():
+    a, b = "a" * 64, "B" * 64
+    text = f"{a}  node-v20.11.1-linux-x64.tar.xz\n{b} *./target/rustup-init\nnot a checksum\n"
+
+    assert parse_checksums(text) == {
+        "node-v20.11.1-linux-x64.tar.xz": a,
+        "rustup-init": b.lower(),
+    }
+    assert parse_checksums(f"{a}\n", default_name="go.tar.gz") == {"go.tar.gz": a}
+
+
+def test_archive_is_downloaded_once_and_reverified(tmp_path, engine):
+    cache = ToolchainCache(cache_dir=tmp_path / "cache")
+    sha = cache.checksums(f"{GO_URL}.sha256")["go1.22.0.linux-amd64.tar.gz"]
+
+    first = cache.fetch(GO_URL, sha)
+    second = cache.fetch(GO_URL, sha)
+    assert first == second
+    assert engine.urls.count(GO_URL) == 1
+
+    # A damaged copy is never handed out: it is fetched again
+    first.write_bytes(b"corrupted")
+    assert cache.fetch(GO_URL, sha).read_bytes() == engine.files[GO_URL]
+    assert engine.urls.count(GO_URL) == 2
+
+    # Without a checksum nothing is downloaded
+    assert cache.fetch(GO_URL, None) is None
+    assert engine.urls.count(GO_URL) == 2
+
+
+def test_checksum_lists_are_reused_until_max_age(tmp_path, engine):
+    cache = ToolchainCache(cache_dir=tmp_path / "cache")
+    url = f"{GO_URL}.sha256"
+
+    cache.checksums(url)
+    cache.checksums(url)
+    assert engine.urls.count(url) == 1
+
+    cache.checksums(url, max_age=0)
+    assert engine.urls.count(url) == 2
+
+    # Upstream unreachable: the cached list is still used
+    del engine.files[url]
+    assert cache.checksums(url, max_age=0) == {
+        "go1.22.0.linux-amd64.tar.gz": hashlib.sha256(engine.files[GO_URL]).hexdigest()
+    }
+
+
+def test_install_tree_swaps_in_the_new_release(tmp_path, engine):
+    cache = ToolchainCache(cache_dir=tmp_path / "cache")
+    archive = cache.fetch(GO_URL, hashlib.sha256(engine.files[GO_URL]).hexdigest())
+
+    goroot = tmp_path / "usr" / "local" / "go"
+    (goroot / "bin").mkdir(parents=True)
+    (goroot / "VERSION").write_text("go1.21.0\n")
+    (goroot / "stale-file").write_text("from the old release")
+
+    install_tree(archive, goroot)
+
+    assert (goroot / "VERSION").read_text() == "go1.22.0\n"
+    assert (goroot / "bin" / "go").exists()
+    assert not (goroot / "stale-file").exists()
+    # Neither the staging directory nor the old tree is left behind
+    assert [p.name for p in goroot.parent.iterdir()] == ["go"]
+
+
+@pytest.mark.skipif(os.geteuid() != 0, reason="needs root to chown")
+def test_install_tree_gives_created_parents_to_owner(tmp_path, engine):
+    cache = ToolchainCache(cache_dir=tmp_path / "cache")
+    archive = cache.fetch(GO_URL, hashlib.sha256(engine.files[GO_URL]).hexdigest())
+    nvm = tmp_path / "home" / ".nvm"
+    nvm.mkdir(parents=True)
+    destination = nvm / "versions" / "node" / "v20.11.0"
+
+    install_tree(archive, destination, owner=(65534, 65534))
+
+    assert nvm.stat().st_uid == 0  # existed already
+    for directory in (nvm / "versions", nvm / "versions" / "node", destination):
+        assert (directory.stat().st_uid, directory.stat().st_gid) == (65534, 65534)
+    assert (destination / "VERSION").stat().st_uid == 65534
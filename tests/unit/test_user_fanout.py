@@ -0,0 +1,105 @@
+"""Unit tests for the per-user fan-out engine."""
+
+import os
+import pwd
+from unittest.mock import Mock
+
+import pytest
+
+from configurator.utils.user_fanout import UserFanout, UserFile
+
+
+def _user(name, home, shell="/bin/bash"):
+    return pwd.struct_passwd((name, "x", os.getuid(), os.getgid(), "", str(home), shell))
+
+
+@pytest.fixture
+def users(tmp_path):
+    accounts = []
+    for i in range(12):
+        home = tmp_path / f"user{i}"
+        home.mkdir()
+        accounts.append(_user(f"user{i}", home))
+    return accounts
+
+
+def test_files_are_written_for_every_user(users):
+    fanout = UserFanout(max_workers=4)
+    files = [
+        UserFile(".zshrc", "export ZSH=1\n"),
+        UserFile(".config/xfce4/xsettings.xml", "<channel/>\n", mode=0o600),
+    ]
+
+    report = fanout.write_files(users, files)
+
+    assert report.success
+    assert report.succeeded == [u.pw_name for u in users]
+    assert len(report.created) == 2 * len(users)
+    for user in users:
+        xml = os.path.join(user.pw_dir, ".config/xfce4/xsettings.xml")
+        assert open(xml).read() == "<channel/>\n"
+        assert os.stat(xml).st_mode & 0o777 == 0o600
+        assert not [n for n in os.listdir(user.pw_dir) if n.startswith(".zshrc.")]
+
+    # Nothing to do the second time round
+    again = fanout.write_files(users, files)
+    assert again.success and not again.changed and not again.created
+
+
+def test_updates_only_touch_existing_files(users):
+    marker = "# Terminal Tools"
+    with open(os.path.join(users[0].pw_dir, ".bashrc"), "w") as f:
+        f.write("alias ll='ls -l'\n")
+
+    def add_tools(content):
+        return None if marker in content else content + marker + "\n"
+
+    report = UserFanout().write_files(users, [UserFile(".bashrc", update=add_tools)])
+
+    assert list(report.changed) == ["user0"]
+    assert open(os.path.join(users[0].pw_dir, ".bashrc")).read().endswith(marker + "\n")
+    assert not os.path.exists(os.path.join(users[1].pw_dir, ".bashrc"))
+
+
+def test_failures_are_reported_per_user(users, tmp_path):
+    broken = _user("ghost", tmp_path / "missing")
+
+    report = UserFanout().write_files([users[0], broken], [UserFile(".zshrc", "x\n")])
+
+    assert report.succeeded == ["user0"]
+    assert "ghost" in report.failed
+    assert not report.success
+
+
+def test_dry_run_writes_nothing(users):
+    report = UserFanout(dry_run=True).write_files(users, [UserFile(".zshrc", "x\n")])
+
+    assert len(report.succeeded) == len(users)
+    assert not os.path.exists(os.path.join(users[0].pw_dir, ".zshrc"))
+
+
+def test_login_shells_change_in_one_command(users):
+    users[0] = _user("user0", users[0].pw_dir, shell="/usr/bin/zsh")
+    run = Mock(return_value=Mock(success=False, stdout="user3\n"))
+
+    report = UserFanout().set_login_shell(users, "/usr/bin/zsh", run)
+
+    run.assert_called_once()
+    command = run.call_args[0][0]
+    assert "user0" not in command.split()
+    assert command.count("chsh -s /usr/bin/zsh") == len(users) - 1
+    assert list(report.failed) == ["user3"]
+    assert "user0" in report.succeeded and "user5" in report.changed
+
+
+def test_module_registers_created_files_for_rollback(users):
+    from configurator.modules.desktop import DesktopModule
+
+    rollback = Mock()
+    module = DesktopModule(config={}, logger=Mock(), rollback_manager=rollback)
+
+    report = module.write_user_files([UserFile(".p10k.zsh", module.P10K_CONFIG)], users[:2])
+
+    assert report.success
+    removed = [c.args[0] for c in rollback.add_command.call_args_list]
+    assert removed == [f"rm -f {u.pw_dir}/.p10k.zsh" for u in users[:2]]
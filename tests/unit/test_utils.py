@@ -2,8 +2,10 @@
 Unit tests for utility functions.
 """
 
+import time
 from unittest.mock import patch
 
+from configurator.utils.network import first_success
 from configurator.utils.system import OSInfo, get_architecture, is_root
 
 
@@ -90,3 +92,23 @@ class TestSystemUtilities:
         """Test is_root returns False for non-root UID."""
         mock_uid.return_value = 1000
         assert is_root() is False
+
+
+class TestFirstSuccess:
+    """Tests for racing equivalent checks."""
+
+    def test_fastest_success_wins(self):
+        def slow():
+            time.sleep(2)
+            return True
+
+        def failing():
+            raise OSError("unreachable")
+
+        start = time.monotonic()
+        assert first_success([slow, failing, lambda: True]) == 2
+        assert time.monotonic() - start < 1
+
+    def test_all_failures(self):
+        assert first_success([lambda: False, lambda: False]) is None
+        assert first_success([]) is None
@@ -193,6 +193,34 @@ class TestTrivyScanner:
         assert result[0].cve_id == "CVE-2024-TEST"
         assert result[0].severity == VulnerabilitySeverity.HIGH
 
+    def test_scan_keeps_details_above_threshold_and_counts_the_rest(self):
+        """Test that low-severity findings are only counted with a detail threshold"""
+        findings = [
+            {"VulnerabilityID": "CVE-C", "Severity": "CRITICAL", "FixedVersion": "2"},
+            {"VulnerabilityID": "CVE-H", "Severity": "HIGH"},
+            {"VulnerabilityID": "CVE-L", "Severity": "LOW", "FixedVersion": "2"},
+            {"VulnerabilityID": "CVE-U", "Severity": "UNKNOWN"},
+        ]
+        scanner = TrivyScanner(detail_threshold=VulnerabilitySeverity.HIGH)
+
+        with (
+            patch.object(TrivyScanner, "is_available", return_value=True),
+            patch.object(TrivyScanner, "get_version", return_value="0.50.0"),
+            patch(
+                "configurator.security.vulnerability_scanner.stream_command_json",
+                return_value=iter(findings),
+            ) as mock_stream,
+        ):
+            result = scanner.scan_system()
+
+        assert mock_stream.call_args.args[1] == ("Results", "*", "Vulnerabilities")
+        assert [v.cve_id for v in result.vulnerabilities] == ["CVE-C", "CVE-H"]
+        summary = result.get_summary()
+        assert summary["total"] == 4
+        assert summary["by_severity"]["low"] == 1
+        assert summary["by_severity"]["unknown"] == 1
+        assert summary["fixable"] == 2
+
 
 class TestGrypeScanner:
     """Tests for GrypeScanner"""
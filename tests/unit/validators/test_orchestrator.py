@@ -2,11 +2,13 @@
 Unit tests for ValidationOrchestrator.
 """
 
+import time
 from unittest.mock import Mock
 
 import pytest
 from rich.console import Console
 
+from configurator.core.state.manager import StateManager
 from configurator.validators.base import (
     BaseValidator,
     ValidationResult,
@@ -216,3 +218,71 @@ class TestValidationOrchestrator:
         assert len(results) == 1
         assert results[0].passed is False
         assert "error" in results[0].message.lower()
+
+
+class SlowProbeValidator(BaseValidator):
+    """Validator that probes a shared, slow fact."""
+
+    severity = ValidationSeverity.HIGH
+    calls = []
+
+    def __init__(self, name, passed=True):
+        super().__init__()
+        self.name = name
+        self.passed = passed
+
+    def validate(self):
+        def probe():
+            time.sleep(0.3)
+            return 42
+
+        value = self.probes.get("slow", probe)
+        self.calls.append(self.name)
+        return ValidationResult(
+            validator_name=self.name,
+            severity=self.severity,
+            passed=self.passed,
+            message=str(value),
+        )
+
+
+class TestParallelCachedValidation:
+    """Tests for concurrent tiers, shared probes and the result cache."""
+
+    def test_tier_runs_concurrently_with_shared_probes(self):
+        orchestrator = ValidationOrchestrator(console=Console(quiet=True))
+        for i in range(4):
+            orchestrator.register_validator(2, SlowProbeValidator(f"v{i}"))
+
+        start = time.monotonic()
+        passed, results = orchestrator.run_validation(interactive=False)
+
+        assert passed is True
+        assert time.monotonic() - start < 1.0
+        assert [r.validator_name for r in results] == ["v0", "v1", "v2", "v3"]
+        assert orchestrator.probes.probe_count == 1
+
+    def test_passing_results_are_cached(self, tmp_path):
+        state = StateManager(db_path=tmp_path / "state.db")
+        SlowProbeValidator.calls = []
+
+        def run():
+            orchestrator = ValidationOrchestrator(console=Console(quiet=True), state_manager=state)
+            orchestrator.register_validator(2, SlowProbeValidator("ok"))
+            orchestrator.register_validator(3, SlowProbeValidator("warn", passed=False))
+            return orchestrator.run_validation(interactive=False)
+
+        run()
+        passed, results = run()
+
+        assert passed is True
+        assert [r.passed for r in results] == [True, False]
+        # The failing check runs again, the passing one comes from the cache
+        assert SlowProbeValidator.calls == ["ok", "warn", "warn"]
+
+        expired = ValidationOrchestrator(
+            console=Console(quiet=True), state_manager=state, cache_ttl=0
+        )
+        expired.register_validator(2, SlowProbeValidator("ok"))
+        expired.run_validation(interactive=False)
+        assert SlowProbeValidator.calls[-1] == "ok"